@@ -0,0 +1,107 @@
+// Benchmark de escala das heurísticas construtivas com o índice de ocupação.
+// Gera instâncias sintéticas em memória (N encontros, ~N/50 salas) e mede
+// greedyConstruct / partiallyGreedyConstruct, além do custo de uma consulta
+// de disponibilidade pelo índice vs. a varredura linear de p.reservations
+// usada antes.
+//
+// Uso: ./bin/bench_occupancy [N1 N2 ...]   (padrão: 10000 20000 50000 100000)
+#include "include/problem.hpp"
+#include "include/occupancy.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include <chrono>
+#include <cstdlib>
+#include <filesystem>
+#include <iomanip>
+#include <iostream>
+#include <random>
+#include <sstream>
+#include <string>
+
+using bench_clock = std::chrono::steady_clock;
+
+static Problem synthetic_problem(int nMeetings, unsigned int seed) {
+    std::mt19937 rng(seed);
+    Problem p;
+    for (int s = 1; s <= 16; ++s) p.schedules.push_back({s, "", ""});
+    int nRooms = std::max(36, nMeetings / 50);
+    std::uniform_int_distribution<int> cap(20, 120);
+    for (int i = 1; i <= nRooms; ++i) {
+        Classroom c;
+        c.id = i;
+        c.capacity = cap(rng);
+        c.isLab = (i % 10 == 0);
+        c.buildingId = 1 + i % 2;
+        p.classrooms.push_back(c);
+    }
+    std::uniform_int_distribution<int> demand(10, 100), day(1, 5), sched(1, 15);
+    for (int i = 0; i < nMeetings; ++i) {
+        Meeting m;
+        m.id = std::to_string(i);
+        m.isPractical = (i % 10 == 0);
+        m.demand = m.isPractical ? std::min(30, demand(rng)) : demand(rng);
+        m.dayOfWeek = day(rng);
+        int s = sched(rng);
+        m.scheduleIds = {s, s + 1};
+        p.meetings.push_back(std::move(m));
+    }
+    return p;
+}
+
+template <typename F>
+static double time_ms(F&& f) {
+    auto t0 = bench_clock::now();
+    f();
+    return std::chrono::duration<double, std::milli>(bench_clock::now() - t0).count();
+}
+
+int main(int argc, char** argv) {
+    std::vector<int> sizes;
+    for (int i = 1; i < argc; ++i) sizes.push_back(std::atoi(argv[i]));
+    if (sizes.empty()) sizes = {10000, 20000, 50000, 100000};
+
+    // as heurísticas gravam greedy_stats.csv no diretório atual
+    auto scratch = std::filesystem::temp_directory_path() / "bench_occupancy";
+    std::filesystem::create_directories(scratch);
+    std::filesystem::current_path(scratch);
+
+    std::cout << std::setw(9) << "meetings" << std::setw(7) << "rooms" << std::setw(12) << "greedy(ms)"
+              << std::setw(13) << "partial(ms)" << std::setw(14) << "index(ns/q)" << std::setw(13) << "scan(ns/q)" << "\n";
+    for (int n : sizes) {
+        Problem base = synthetic_problem(n, 42);
+        Problem g = base, pg = base;
+
+        std::ostringstream sink;
+        auto* old = std::cout.rdbuf(sink.rdbuf());
+        double greedyMs = time_ms([&] { greedyConstruct(g); });
+        double partialMs = time_ms([&] { partiallyGreedyConstruct(pg, 0.5, 1); });
+        std::cout.rdbuf(old);
+
+        // consultas aleatórias sobre a ocupação final
+        OccupancyIndex occ(g);
+        std::mt19937 rng(7);
+        std::uniform_int_distribution<size_t> room(0, g.classrooms.size() - 1);
+        std::uniform_int_distribution<int> day(1, 5), sched(1, 16);
+        const int qIndex = 1000000, qScan = 2000;
+        long long hits = 0;
+        double indexMs = time_ms([&] {
+            for (int q = 0; q < qIndex; ++q)
+                hits += occ.isFree(room(rng), occ.dayIndex(day(rng)), occ.scheduleIndex(sched(rng)));
+        });
+        double scanMs = time_ms([&] {
+            for (int q = 0; q < qScan; ++q) {
+                int cid = g.classrooms[room(rng)].id, d = day(rng), s = sched(rng);
+                bool free = true;
+                for (const auto& r : g.reservations)
+                    if (r.classroomId == cid && r.dayOfWeek == d && r.scheduleId == s) { free = false; break; }
+                hits += free;
+            }
+        });
+
+        std::cout << std::setw(9) << n << std::setw(7) << g.classrooms.size()
+                  << std::fixed << std::setprecision(1)
+                  << std::setw(12) << greedyMs << std::setw(13) << partialMs
+                  << std::setw(14) << indexMs * 1e6 / qIndex << std::setw(13) << scanMs * 1e6 / qScan
+                  << (hits < 0 ? "?" : "") << "\n";
+    }
+    return 0;
+}
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escala das heurísticas construtivas, com baseline de regressão.
+
+Roda greedy e partial (alpha 0.25/0.5/0.75, seed fixa) sobre uma escada de
+instâncias sintéticas (scripts/generate_instance.py, seed fixa, ~36 salas por
+1000 encontros) e registra, por (motor, configuração, tamanho):
+  - wall, CPU (user+sys) e pico de RSS (mediana de --repeat execuções; RSS = máximo)
+  - construct_ms: fase construct medida pelo próprio binário (--profile), sem o parse
+  - Taxa Alocacao (%), Desperdicio Medio e Alunos em Pe
+
+Motores (--engine, separados por vírgula):
+  bin  ./bin/app em processo filho (medido com os.wait4, como o run_and_aggregate.py)
+  lib  bin/libsolver.so via scripts/solver_lib.py (só a heurística; carga fora da medição)
+  py   scripts/allocation_engine.py (só a heurística)
+lib e py rodam num processo Python novo por (configuração, tamanho), então o
+pico de RSS é o daquele tamanho e não o acumulado da escada inteira.
+
+No fim ajusta curvas de complexidade empírica (expoente k de t ~ n^k e o melhor
+modelo entre O(n), O(n log n) e O(n^2)). Com --save-baseline grava o resultado
+em bench/baseline_scaling.json; sem ele, compara com o baseline existente e sai
+com código 1 (mostrando a diferença) se alguma execução ficou mais lenta que
+--tolerance. Métricas de solução que mudaram aparecem no diff, sem reprovar.
+
+Usage:
+  python3 bench/scaling_bench.py --save-baseline
+  python3 bench/scaling_bench.py                      # compara com o baseline
+  python3 bench/scaling_bench.py --sizes 1000 10000 100000 --engine bin,lib --tolerance 0.10
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+sys.path.insert(0, str(ROOT))
+from stats_reader import read_stats  # noqa: E402
+from run_and_aggregate import run_measured  # noqa: E402
+
+BENCH_DIR = ROOT / 'bench'
+LADDER_DIR = BENCH_DIR / '.instances'
+BASELINE = BENCH_DIR / 'baseline_scaling.json'
+RESULTS_CSV = ROOT / 'data' / 'results' / 'scaling_bench.csv'
+BIN = ROOT / 'bin' / 'app'
+
+DEFAULT_SIZES = [1000, 2000, 5000, 10000, 20000, 50000]
+CONFIGS = ['greedy', 'partial:0.25:1', 'partial:0.5:1', 'partial:0.75:1']
+INSTANCE_SEED = 2024
+METRICS = ['Taxa Alocacao (%)', 'Desperdicio Medio', 'Alunos em Pe']
+FIELDS = ['engine', 'config', 'meetings', 'wall_s', 'cpu_s', 'max_rss_kb', 'construct_ms'] + METRICS
+MODELS = {
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * np.log2(n),
+    'O(n^2)': lambda n: n * n,
+}
+
+
+# ============= INSTÂNCIAS =============
+
+def ladder_instance(n):
+    """Instância sintética com n encontros (gerada uma vez; a seed fixa a torna reprodutível)."""
+    path = LADDER_DIR / f'ladder_{n}_s{INSTANCE_SEED}.json'
+    if not path.exists():
+        LADDER_DIR.mkdir(parents=True, exist_ok=True)
+        rooms = max(36, round(n * 36 / 1000))
+        cmd = [sys.executable, str(ROOT / 'scripts' / 'generate_instance.py'), '--meetings', str(n),
+               '--rooms', str(rooms), '--buildings', str(max(2, n // 5000)), '--seed', str(INSTANCE_SEED),
+               '-o', str(path)]
+        subprocess.run(cmd, check=True, stderr=subprocess.DEVNULL)
+    return path
+
+
+# ============= MOTORES =============
+
+def run_bin(binary, instance, config, scratch):
+    """Uma execução do binário; devolve a linha de resultado (sem engine/config/meetings)."""
+    stats = scratch / 'greedy_stats.jsonl'
+    if stats.exists():
+        stats.unlink()
+    cmd = [str(binary), '--heuristic', config, '--format=jsonl', '--profile', instance.name]
+    rc, usage = run_measured(cmd, scratch, scratch / 'app.log')
+    if rc != 0 or not stats.exists():
+        tail = (scratch / 'app.log').read_text(errors='replace')[-400:]
+        raise RuntimeError(f'{binary} {config} {instance.name}: código {rc}\n{tail}')
+    s = read_stats(stats)
+    prof = s.profile
+    row = {'wall_s': usage['wall_s'], 'cpu_s': usage['user_s'] + usage['sys_s'],
+           'max_rss_kb': prof['peak_rss_kb'] if prof and prof['peak_rss_kb'] else usage['max_rss_kb'],
+           'construct_ms': ''}
+    if prof:
+        phases = prof['phases']
+        row['construct_ms'] = sum(ms for ph, ms in zip(phases['phase'], phases['ms']) if ph == 'construct')
+    row.update({m: s.metrics.get(m, '') for m in METRICS})
+    return row
+
+
+def _peak_rss_kb():
+    """Pico de RSS deste processo (VmHWM no Linux, como o binário: ru_maxrss herda o pico de quem nos lançou)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _measure_in_process(fn):
+    t0, c0 = time.perf_counter(), time.process_time()
+    metrics = fn()
+    wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+    # em processo a fase construct é a própria medição
+    row = {'wall_s': wall, 'cpu_s': cpu, 'max_rss_kb': _peak_rss_kb(), 'construct_ms': wall * 1000.0}
+    row.update({m: metrics.get(m, '') for m in METRICS})
+    return row
+
+
+class InProcessEngine:
+    """Motores lib/py: a instância é carregada uma vez e só a heurística é medida."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._path = None
+        self._loaded = None
+
+    def _load(self, instance):
+        if self._path == instance:
+            return self._loaded
+        self.close()
+        if self.kind == 'lib':
+            from solver_lib import Solver
+            self._loaded = Solver(instance)
+        else:
+            import allocation_engine
+            self._loaded = allocation_engine.load_instance(instance)
+        self._path = instance
+        return self._loaded
+
+    def run(self, instance, config):
+        from allocation_engine import parse_heuristic, greedy, partially_greedy
+        name, alpha, seed = parse_heuristic(config)
+        loaded = self._load(instance)
+        if self.kind == 'lib':
+            return _measure_in_process(lambda: loaded.run(name, alpha, seed).metrics)
+        if name == 'partial':
+            return _measure_in_process(lambda: partially_greedy(loaded, alpha, seed).metrics)
+        return _measure_in_process(lambda: greedy(loaded).metrics)
+
+    def close(self):
+        if self.kind == 'lib' and self._loaded is not None:
+            self._loaded.close()
+        self._path = self._loaded = None
+
+
+def run_in_process(engine, instance, config, repeat):
+    """Roda as repetições de lib/py num processo filho novo e devolve as amostras."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), '--worker', engine, str(instance), config, str(repeat)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise RuntimeError(f'{engine} {config} em {instance} falhou (código {proc.returncode})')
+    # a última linha é o resultado; o resto é o que a heurística imprimiu
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def worker_main(engine, instance, config, repeat):
+    """Lado filho de run_in_process: imprime as amostras em JSON numa linha."""
+    runner = InProcessEngine(engine)
+    try:
+        samples = [runner.run(Path(instance), config) for _ in range(max(1, int(repeat)))]
+    finally:
+        runner.close()
+    print(json.dumps(samples))
+    return 0
+
+
+def summarize(samples):
+    """Mediana de tempo das repetições; RSS é o máximo; métricas da primeira (são determinísticas)."""
+    row = dict(samples[0])
+    for key in ('wall_s', 'cpu_s'):
+        row[key] = statistics.median(s[key] for s in samples)
+    if all(s['construct_ms'] != '' for s in samples):
+        row['construct_ms'] = statistics.median(s['construct_ms'] for s in samples)
+    row['max_rss_kb'] = max(s['max_rss_kb'] for s in samples)
+    return row
+
+
+def run_ladder(args):
+    engines = [e.strip() for e in args.engine.split(',') if e.strip()]
+    rows = []
+    scratch = Path(tempfile.mkdtemp(prefix='scaling_bench_'))
+    (scratch / 'data').mkdir()
+    os.symlink(LADDER_DIR.resolve(), scratch / 'data' / 'generated_instances')
+    try:
+        instances = {n: ladder_instance(n) for n in args.sizes}
+        for engine in engines:
+            for n in args.sizes:
+                for config in args.configs:
+                    if engine == 'bin':
+                        samples = [run_bin(args.binary, instances[n], config, scratch) for _ in range(args.repeat)]
+                    else:
+                        samples = run_in_process(engine, instances[n], config, args.repeat)
+                    row = {'engine': engine, 'config': config, 'meetings': n}
+                    row.update(summarize(samples))
+                    rows.append(row)
+                    print(f"  {engine:3s} {config:15s} n={n:>7d}  wall {row['wall_s']:8.4f}s  "
+                          f"cpu {row['cpu_s']:8.4f}s  rss {row['max_rss_kb']:>8d} kB  "
+                          f"aloc {row['Taxa Alocacao (%)']:.2f}%", flush=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return rows
+
+
+# ============= COMPLEXIDADE =============
+
+def fit_complexity(sizes, times):
+    """(expoente k de t ~ c * n^k, melhor modelo, erro relativo RMS do melhor modelo)."""
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+    ok = t > 0
+    n, t = n[ok], t[ok]
+    if len(n) < 2:
+        return float('nan'), '', float('nan')
+    k = float(np.polyfit(np.log(n), np.log(t), 1)[0])
+    best = ('', float('inf'))
+    for name, f in MODELS.items():
+        x = f(n)
+        # mínimos quadrados do erro relativo: minimiza sum((a*x/t - 1)^2)
+        a = np.sum(x / t) / np.sum((x / t) ** 2)
+        err = float(np.sqrt(np.mean((a * x / t - 1.0) ** 2)))
+        if err < best[1]:
+            best = (name, err)
+    return k, best[0], best[1]
+
+
+def report_complexity(rows):
+    print('\nComplexidade empírica (t ~ n^k, sobre construct_ms quando disponível):')
+    groups = {}
+    for r in rows:
+        groups.setdefault((r['engine'], r['config']), []).append(r)
+    for (engine, config), rs in groups.items():
+        rs = sorted(rs, key=lambda r: r['meetings'])
+        use_construct = all(r['construct_ms'] != '' for r in rs)
+        times = [r['construct_ms'] / 1000.0 if use_construct else r['wall_s'] for r in rs]
+        k, model, err = fit_complexity([r['meetings'] for r in rs], times)
+        if math.isnan(k):
+            print(f'  {engine:3s} {config:15s} (tamanhos insuficientes)')
+            continue
+        print(f'  {engine:3s} {config:15s} k={k:5.2f}  melhor modelo {model:10s} (erro rel. {err * 100:5.1f}%)')
+
+
+# ============= BASELINE =============
+
+def row_key(row):
+    return f"{row['engine']}|{row['config']}|{row['meetings']}"
+
+
+def host_info():
+    return {'platform': platform.platform(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'python': platform.python_version()}
+
+
+def save_baseline(rows, path):
+    data = {'host': host_info(), 'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'runs': {row_key(r): {k: r[k] for k in FIELDS if k not in ('engine', 'config', 'meetings')}
+                     for r in rows}}
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    os.replace(tmp, path)
+    print(f'\nBaseline gravado em {path} ({len(rows)} execuções)')
+
+
+def compare_baseline(rows, path, tolerance, min_delta_s):
+    """Imprime o diff contra o baseline; devolve o número de execuções mais lentas que a tolerância."""
+    base = json.loads(path.read_text(encoding='utf-8'))
+    if base.get('host', {}).get('platform') != host_info()['platform']:
+        print(f"\nAviso: baseline gerado em outra máquina ({base.get('host', {}).get('platform')})")
+    runs = base.get('runs', {})
+    slower, lines = 0, []
+    for r in rows:
+        key = row_key(r)
+        old = runs.get(key)
+        label = f"{r['engine']:3s} {r['config']:15s} n={r['meetings']:>7d}"
+        if old is None:
+            lines.append(f'  {label}  novo (sem baseline)')
+            continue
+        delta = r['wall_s'] - old['wall_s']
+        rel = delta / old['wall_s'] if old['wall_s'] > 0 else 0.0
+        status = ''
+        if rel > tolerance and delta > min_delta_s:
+            status = 'LENTO'
+            slower += 1
+        elif rel < -tolerance and -delta > min_delta_s:
+            status = 'mais rápido'
+        if status:
+            lines.append(f"  {label}  wall {old['wall_s']:.4f}s -> {r['wall_s']:.4f}s ({rel * 100:+.1f}%)  {status}")
+        for m in METRICS:
+            if old.get(m) != r.get(m):
+                lines.append(f'  {label}  {m}: {old.get(m)} -> {r.get(m)}  (solução mudou)')
+    missing = sorted(set(runs) - {row_key(r) for r in rows})
+    print(f'\nComparação com {path.name} (tolerância {tolerance * 100:.0f}%, mínimo {min_delta_s * 1000:.0f} ms):')
+    print('\n'.join(lines) if lines else '  sem diferenças')
+    if missing:
+        print(f'  ({len(missing)} execuções do baseline não rodaram nesta chamada)')
+    return slower
+
+
+def write_results(rows, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: (f'{r[k]:.6f}' if isinstance(r[k], float) else r[k]) for k in FIELDS})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de escala das heurísticas com baseline de regressão.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='número de encontros da escada')
+    parser.add_argument('--configs', nargs='+', default=CONFIGS, help='strings de heurística (como em --heuristic)')
+    parser.add_argument('--engine', default='bin', help='bin, lib, py (separados por vírgula)')
+    parser.add_argument('--binary', type=Path, default=BIN)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='grava o resultado como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='quanto mais lento que o baseline ainda passa (fração, padrão 0.25)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help='diferenças absolutas menores que isso nunca reprovam (ruído em instâncias pequenas)')
+    parser.add_argument('--out', type=Path, default=RESULTS_CSV)
+    parser.add_argument('--worker', nargs=4, metavar=('ENGINE', 'INSTANCE', 'CONFIG', 'REPEAT'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return worker_main(*args.worker)
+    args.repeat = max(1, args.repeat)
+    args.binary = args.binary.resolve()
+
+    rows = run_ladder(args)
+    write_results(rows, args.out)
+    print(f'\nResultados em {args.out}')
+    report_complexity(rows)
+
+    if args.save_baseline:
+        save_baseline(rows, args.baseline)
+        return 0
+    if not args.baseline.exists():
+        print(f'\nSem baseline em {args.baseline}; use --save-baseline para criar.')
+        return 0
+    slower = compare_baseline(rows, args.baseline, args.tolerance, args.min_delta_ms / 1000.0)
+    if slower:
+        print(f'\nFALHA: {slower} execução(ões) mais lenta(s) que o baseline além da tolerância.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
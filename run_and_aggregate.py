@@ -1,34 +1,61 @@
 #!/usr/bin/env python3
 """
 Executa o binário para todas as instâncias JSON em data/generated_instances/
-Renomeia o greedy_stats.csv gerado para greedy_stats_<instance>.csv
+Renomeia as estatísticas geradas (greedy_stats.jsonl) para greedy_stats_<instance>_<heurística>.jsonl
 E cria summary_instances.csv com métricas chave por instância.
+
+Cada execução roda em um diretório temporário próprio, então várias execuções
+podem rodar em paralelo sem disputar o greedy_stats.csv:
+
+  python3 run_and_aggregate.py --workers 8
+
+Configurações determinísticas (greedy, ou partial com seed != 0) ficam em um
+cache endereçado por conteúdo em data/results/.run_cache/: a chave é o hash do
+JSON da instância, do binário (que já embute DEFAULT_HEUR/DEFAULT_ALPHA/DEFAULT_SEED),
+da string de heurística, da seed e do modo (avulsa ou --batch). Uma configuração já calculada não é executada
+de novo. --no-cache ignora o cache, --clear-cache o esvazia e --cache-max-mb
+limita o tamanho (as entradas usadas há mais tempo saem primeiro).
+
+As linhas do summary são gravadas à medida que as execuções terminam, e cada
+uma alimenta data/results/aggregates.json (scripts/run_aggregates.py): média e
+variância de Welford, sketches de quantis e um reservatório por (instância,
+heurística, alpha), em memória constante. Os gráficos leem esses agregados.
+--aggregate-append soma esta rodada aos agregados já gravados; --seeds N troca
+as seeds da parcial por 1..N (varreduras grandes sem guardar cada execução) e
+--seed-start S as desloca para S..S+N-1, para uma rodada nova somar seeds novas.
+Execuções determinísticas que o grupo já tem (mesma instância, alpha e seed)
+não são somadas de novo.
+
+--batch roda as configurações fora do cache num só processo do binário
+(./bin/app --batch=MANIFESTO, um por worker): cada instância é lida uma vez
+em vez de uma vez por configuração. Nesse modo não há medida de processo por
+execução: Runtime(s), UserCPU/SysCPU e MaxRSS ficam vazios (e fora dos
+agregados) e o tempo da construção vem do perfil, em construct(ms). O cache
+separa as entradas por modo, então uma execução em lote nunca é reaproveitada
+como medida de processo, nem o contrário.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import subprocess
 import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import csv
 import sys
 import time
-import shlex
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from stats_reader import read_stats  # noqa: E402
+from run_aggregates import AGGREGATES_FILE, AggregateStore  # noqa: E402
 
 ROOT = Path(__file__).resolve().parent
 INST_DIR = ROOT / 'data' / 'generated_instances'
 BIN = ROOT / 'bin' / 'app'
 CSV_DIR = ROOT / 'data' / 'results'  # Pasta para armazenar CSVs gerados
-CSV_DIR.mkdir(exist_ok=True)
-
-if not BIN.exists():
-    print('Erro: binário ./bin/app não encontrado. Compile o projeto primeiro (make).')
-    sys.exit(1)
-
-instances = sorted(INST_DIR.glob('*.json'))
-if not instances:
-    print('Nenhuma instância JSON encontrada em data/generated_instances/')
-    sys.exit(1)
-
-summary_rows = []
 
 # Experiment configuration: by default compare greedy (once) and partial for multiple alphas/seeds.
 HEUR_CONFIG = [
@@ -36,162 +63,466 @@ HEUR_CONFIG = [
     {'name': 'partial', 'alphas': [0.25, 0.5, 0.75], 'seeds': [0, 12345]}
 ]
 
-for inst in instances:
-    name = inst.stem
-    for heur in HEUR_CONFIG:
-        if heur['name'] == 'greedy':
-            runs = [ {'heur': 'greedy'} ]
-        else:
-            runs = []
-            alphas = heur.get('alphas', [0.5])
-            seeds = heur.get('seeds', [0])
-            for a in alphas:
-                for s in seeds:
-                    runs.append({'heur': 'partial', 'alpha': a, 'seed': s})
-
-        for run_cfg in runs:
-            descr = f"{name} | {run_cfg['heur']}"
-            if run_cfg['heur'] == 'partial':
-                descr += f" alpha={run_cfg['alpha']} seed={run_cfg['seed']}"
-            print(f"-> Executando: {descr}")
+CACHE_DIR = CSV_DIR / '.run_cache'
+CACHE_VERSION = 4  # incrementar se o conteúdo das entradas mudar
+
+# fases medidas pelo binário com --profile (ver src/include/profiling.hpp); tempos exclusivos
+PROFILE_PHASES = ['json_read', 'json_parse', 'populate', 'cache_load', 'pref_index', 'sort', 'construct', 'stats',
+                  'report', 'export']
+
+SUMMARY_FIELDS = ['instance','heuristic','alpha','seed','Encontros Alocados','Encontros Total','Taxa Alocacao (%)','Demanda Alocada','Demanda Total','Taxa Demanda (%)','Desperdicio Medio','Alunos Desalocados','Vagas Ociosas SubUtilizadas','Alunos em Pe','Runtime(s)','UserCPU(s)','SysCPU(s)','MaxRSS(kB)','PrefTotal','PrefSatisfeitas','PrefSat(%)'] + \
+    [f'{phase}(ms)' for phase in PROFILE_PHASES] + ['Allocs']
+
+
+def build_runs(instances):
+    """Lista (instance, run_cfg) na ordem determinística do summary."""
+    runs = []
+    for inst in instances:
+        for heur in HEUR_CONFIG:
+            if heur['name'] == 'greedy':
+                runs.append((inst, {'heur': 'greedy'}))
+            else:
+                alphas = heur.get('alphas', [0.5])
+                seeds = heur.get('seeds', [0])
+                for a in alphas:
+                    for s in seeds:
+                        runs.append((inst, {'heur': 'partial', 'alpha': a, 'seed': s}))
+    return runs
+
+
+def heuristic_arg(run_cfg):
+    # build heuristic string: partial:<alpha>[:seed]
+    if run_cfg['heur'] == 'greedy':
+        return 'greedy'
+    alpha_s = str(run_cfg['alpha'])
+    if run_cfg['seed'] and int(run_cfg['seed']) != 0:
+        return f"partial:{alpha_s}:{run_cfg['seed']}"
+    return f"partial:{alpha_s}"
+
+
+def stats_filename(name, run_cfg, suffix='.jsonl'):
+    # destination filename includes heuristic info
+    if run_cfg['heur'] == 'greedy':
+        return f'greedy_stats_{name}_greedy{suffix}'
+    alpha_str = str(run_cfg['alpha']).replace('.', '_')
+    seed_str = str(run_cfg['seed'])
+    return f'greedy_stats_{name}_partial_a{alpha_str}_s{seed_str}{suffix}'
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def is_deterministic(run_cfg):
+    """greedy sempre; partial só com seed explícita (seed 0 usa random_device)."""
+    return run_cfg['heur'] == 'greedy' or int(run_cfg.get('seed') or 0) != 0
+
+
+class RunCache:
+    """Cache de execuções endereçado por conteúdo.
+
+    Cada entrada é <chave>.jsonl (estatísticas, ou .csv para binários antigos)
+    mais <chave>.json (tempo de CPU/parede e pico de memória da execução original). O mtime do .json
+    marca o último uso, para a evicção.
+    """
+
+    def __init__(self, root, binary_digest, enabled=True):
+        self.root = Path(root)
+        self.binary_digest = binary_digest
+        self.enabled = enabled
+        self.instance_digests = {}
+
+    def add_instances(self, instances):
+        for inst in instances:
+            self.instance_digests[inst.name] = file_digest(inst)
+
+    def key(self, inst, run_cfg, mode='process'):
+        """mode ('process' ou 'batch') entra na chave: os usos medidos não são comparáveis."""
+        if not self.enabled or not is_deterministic(run_cfg):
+            return None
+        parts = [f'v{CACHE_VERSION}', mode, self.instance_digests[inst.name], self.binary_digest,
+                 heuristic_arg(run_cfg), str(run_cfg.get('seed', ''))]
+        return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+    def get(self, key):
+        """(caminho das estatísticas, metadados) ou None."""
+        if key is None:
+            return None
+        meta_path = self.root / f'{key}.json'
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        stats = self.root / f"{key}{meta.get('suffix', '.jsonl')}"
+        if not stats.exists():
+            return None
+        os.utime(meta_path)
+        return stats, meta
+
+    def put(self, key, stats_path, meta):
+        if key is None:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = dict(meta, suffix=Path(stats_path).suffix)
+        # grava em temporários e renomeia: workers paralelos nunca veem entradas pela metade
+        for dest, write in ((self.root / f"{key}{meta['suffix']}", lambda f: f.write(Path(stats_path).read_bytes())),
+                            (self.root / f'{key}.json', lambda f: f.write(json.dumps(meta).encode()))):
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, dest)
+
+    def _entries(self):
+        """[(último uso, bytes, arquivos)] de cada entrada."""
+        entries = []
+        for meta_path in self.root.glob('*.json'):
+            files = [p for p in self.root.glob(f'{meta_path.stem}.*')]
             try:
-                start = time.perf_counter()
-                if run_cfg['heur'] == 'greedy':
-                    cmd = ['/usr/bin/time', '-l', str(BIN), inst.name]
-                else:
-                    # build heuristic string: partial:<alpha>[:seed]
-                    alpha_s = str(run_cfg['alpha'])
-                    if run_cfg['seed'] and int(run_cfg['seed']) != 0:
-                        heur_arg = f"partial:{alpha_s}:{run_cfg['seed']}"
-                    else:
-                        heur_arg = f"partial:{alpha_s}"
-                    cmd = ['/usr/bin/time', '-l', str(BIN), inst.name, f"--heuristic={heur_arg}"]
-
-                proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                end = time.perf_counter()
-                duration = end - start
-                max_rss_kb = ''
-                for line in proc.stderr.splitlines():
-                    if 'maximum resident set size' in line.lower() or 'maximum resident set size (kbytes)' in line.lower():
-                        parts = line.split()
-                        for p in reversed(parts):
-                            try:
-                                max_rss_kb = int(p)
-                                break
-                            except:
-                                continue
-                        break
-            except subprocess.CalledProcessError as e:
-                print(f'Erro ao executar {BIN} para {inst}: {e}')
+                used = meta_path.stat().st_mtime
+                size = sum(p.stat().st_size for p in files)
+            except OSError:
                 continue
+            entries.append((used, size, files))
+        return entries
+
+    def evict(self, max_bytes):
+        """Remove as entradas usadas há mais tempo até o cache caber em max_bytes."""
+        if not self.root.exists():
+            return 0
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, files in entries:
+            if total <= max_bytes:
+                break
+            for p in files:
+                p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        if self.root.exists():
+            shutil.rmtree(self.root)
+
+
+def run_measured(cmd, cwd, log_path):
+    """Executa cmd e mede o próprio processo filho via os.wait4.
+
+    Devolve (returncode, uso) com uso = {'wall_s', 'user_s', 'sys_s', 'max_rss_kb'}.
+    A saída do binário vai para log_path (não passa por pipe, então não há risco
+    de bloquear o filho enquanto esperamos por ele).
+    """
+    with open(log_path, 'wb') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        _, status, ru = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss: kB no Linux, bytes no macOS
+    max_rss_kb = ru.ru_maxrss // 1024 if sys.platform == 'darwin' else ru.ru_maxrss
+    usage = {'wall_s': wall, 'user_s': ru.ru_utime, 'sys_s': ru.ru_stime, 'max_rss_kb': int(max_rss_kb)}
+    return proc.returncode, usage
+
+
+def make_scratch_dir(name):
+    """Cria um diretório de trabalho isolado para uma execução.
+
+    O binário lê instâncias de data/generated_instances/ e grava greedy_stats.csv
+    no diretório atual, então o scratch recebe um link para as instâncias.
+    """
+    scratch = Path(tempfile.mkdtemp(prefix=f'run_{name}_'))
+    (scratch / 'data').mkdir()
+    os.symlink(INST_DIR, scratch / 'data' / 'generated_instances')
+    return scratch
+
+
+def summary_row(name, run_cfg, dest, usage):
+    stats = read_stats(dest)
+    metrics = stats.metrics
+    pref_total, pref_satisfied = stats.preference_totals()
+    summary = {
+        'instance': name,
+        'heuristic': run_cfg['heur'],
+        'alpha': run_cfg.get('alpha', ''),
+        'seed': run_cfg.get('seed', ''),
+        'Runtime(s)': f"{usage['wall_s']:.4f}" if usage['wall_s'] is not None else '',
+        'UserCPU(s)': f"{usage['user_s']:.4f}" if usage['user_s'] is not None else '',
+        'SysCPU(s)': f"{usage['sys_s']:.4f}" if usage['sys_s'] is not None else '',
+        'MaxRSS(kB)': usage['max_rss_kb'] if usage['max_rss_kb'] is not None else '',
+        'PrefTotal': pref_total,
+        'PrefSatisfeitas': pref_satisfied,
+        'PrefSat(%)': f"{(100.0 * pref_satisfied / pref_total):.2f}" if pref_total > 0 else "",
+    }
+    for key in SUMMARY_FIELDS[4:14]:
+        summary[key] = metrics.get(key, '')
+
+    profile = stats.profile
+    if profile is not None:
+        phases = profile['phases']
+        for phase, ms in zip(phases['phase'], phases['ms']):
+            summary[f'{phase}(ms)'] = f'{ms:.4f}'
+        summary['Allocs'] = sum(phases['allocs'])
+        # o binário mede o próprio pico (VmHWM); o ru_maxrss do wait4 inclui o processo que o lançou.
+        # No lote (uso vazio) esse pico seria o do processo inteiro e fica de fora.
+        if (usage['max_rss_kb'] is not None and profile['peak_rss_kb'] is not None
+                and profile['peak_rss_kb'] >= 0):
+            summary['MaxRSS(kB)'] = profile['peak_rss_kb']
+    return summary
 
-            stats = ROOT / 'greedy_stats.csv'
+
+# uso de uma execução do lote: não há medida de processo só dela
+BATCH_USAGE = {'wall_s': None, 'user_s': None, 'sys_s': None, 'max_rss_kb': None}
+
+
+def describe_run(inst, run_cfg):
+    descr = f"{inst.stem} | {run_cfg['heur']}"
+    if run_cfg['heur'] == 'partial':
+        descr += f" alpha={run_cfg['alpha']} seed={run_cfg['seed']}"
+    return descr
+
+
+def cached_row(inst, run_cfg, hit):
+    """Linha do summary de uma entrada do cache (copiando as estatísticas para data/results/)."""
+    cached, meta = hit
+    dest = CSV_DIR / stats_filename(inst.stem, run_cfg, cached.suffix)
+    shutil.copyfile(cached, dest)
+    print(f"-> Em cache: {describe_run(inst, run_cfg)}", flush=True)
+    # tempo e memória são os da execução que gerou a entrada
+    return summary_row(inst.stem, run_cfg, dest, meta['usage'])
+
+
+def execute_run(inst, run_cfg, cache=None):
+    """Executa uma configuração em seu próprio scratch e devolve a linha do summary (ou None)."""
+    name = inst.stem
+    descr = describe_run(inst, run_cfg)
+
+    key = cache.key(inst, run_cfg) if cache else None
+    hit = cache.get(key) if cache else None
+    if hit:
+        return cached_row(inst, run_cfg, hit)
+
+    print(f"-> Executando: {descr}", flush=True)
+
+    scratch = make_scratch_dir(name)
+    try:
+        cmd = [str(BIN), inst.name, '--format=jsonl', '--profile']
+        if run_cfg['heur'] != 'greedy':
+            cmd.append(f"--heuristic={heuristic_arg(run_cfg)}")
+        try:
+            returncode, usage = run_measured(cmd, scratch, scratch / 'app.log')
+        except OSError as e:
+            print(f'Erro ao executar {BIN} para {inst}: {e}')
+            return None
+        if returncode != 0:
+            tail = (scratch / 'app.log').read_text(errors='replace').strip().splitlines()[-5:]
+            print(f'Erro: {BIN} terminou com código {returncode} para {descr}')
+            for line in tail:
+                print(f'    {line}')
+            return None
+
+        # binários antigos ignoram --format e continuam gravando o CSV
+        stats = scratch / 'greedy_stats.jsonl'
+        if not stats.exists():
+            stats = scratch / 'greedy_stats.csv'
+        if not stats.exists():
+            print(f'Arquivo greedy_stats.jsonl não foi gerado para {descr}. Pulando.')
+            return None
+
+        dest = CSV_DIR / stats_filename(name, run_cfg, stats.suffix)
+        shutil.move(str(stats), str(dest))
+        print(f'  -> Movido para data/results/{dest.name}', flush=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if cache:
+        cache.put(key, dest, {'usage': usage, 'mode': 'process'})
+    return summary_row(name, run_cfg, dest, usage)
+
+
+def _execute_run_star(args):
+    return execute_run(*args)
+
+
+def _run_batch_chunk(chunk):
+    """Executa [(posição, inst, run_cfg)] numa chamada de ./bin/app --batch; devolve {posição: linha}."""
+    rows = {}
+    scratch = make_scratch_dir('batch')
+    try:
+        manifest = scratch / 'manifest.csv'
+        with open(manifest, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['instance', 'heuristic', 'alpha', 'seed', 'output'])
+            for pos, inst, run_cfg in chunk:
+                writer.writerow([inst.name, run_cfg['heur'], run_cfg.get('alpha', ''), run_cfg.get('seed', ''),
+                                 f'run_{pos}.jsonl'])
+        cmd = [str(BIN), f'--batch={manifest.name}', '--format=jsonl', '--profile']
+        try:
+            returncode, _ = run_measured(cmd, scratch, scratch / 'app.log')
+        except OSError as e:
+            print(f'Erro ao executar {BIN} em lote: {e}')
+            return rows
+        if returncode != 0:
+            print(f'Aviso: {BIN} --batch terminou com código {returncode}; execuções sem saída serão puladas')
+
+        for pos, inst, run_cfg in chunk:
+            stats = scratch / f'run_{pos}.jsonl'
             if not stats.exists():
-                print(f'Arquivo greedy_stats.csv não foi gerado para {name}. Pulando.')
+                print(f"Arquivo de estatísticas não foi gerado para {inst.stem} | {run_cfg['heur']}. Pulando.")
                 continue
+            dest = CSV_DIR / stats_filename(inst.stem, run_cfg, stats.suffix)
+            shutil.move(str(stats), str(dest))
+            # tempo da construção (sem início de processo nem leitura da instância)
+            rows[pos] = dest
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return rows
 
-            # destination filename includes heuristic info
-            if run_cfg['heur'] == 'greedy':
-                dest_name = f'greedy_stats_{name}_greedy.csv'
-            else:
-                alpha_str = str(run_cfg['alpha']).replace('.', '_')
-                seed_str = str(run_cfg['seed'])
-                dest_name = f'greedy_stats_{name}_partial_a{alpha_str}_s{seed_str}.csv'
 
-            dest = CSV_DIR / dest_name
-            shutil.move(str(stats), str(dest))
-            print(f'  -> Movido para data/results/{dest.name}')
-
-            # Ler métricas básicas do CSV (mesma lógica que antes)
-            allocated = total = alloc_rate = demand_alloc = demand_total = demand_rate = avg_waste = ''
-            unalloced_students = under_util_waste = standing_students = ''
-            pref_total = 0
-            pref_satisfied = 0
-            with open(dest, 'r') as f:
-                reader = csv.reader(f)
-                lines = [row for row in reader]
-            section = 'metrics'
-            for row in lines:
-                if not row:
-                    continue
-                first = row[0].strip() if len(row) > 0 else ''
-                if 'Preferencias por Categoria' in first:
-                    section = 'prefs'
-                    continue
-                if 'Ocupacao por Sala' in first:
-                    section = 'other'
-                    continue
-
-                if section == 'metrics' and len(row) >= 2:
-                    key = row[0].strip()
-                    val = row[1].strip()
-                    if key == 'Encontros Alocados':
-                        allocated = val
-                    elif key == 'Encontros Total':
-                        total = val
-                    elif key == 'Taxa Alocacao (%)':
-                        alloc_rate = val
-                    elif key == 'Demanda Alocada':
-                        demand_alloc = val
-                    elif key == 'Demanda Total':
-                        demand_total = val
-                    elif key == 'Taxa Demanda (%)':
-                        demand_rate = val
-                    elif key == 'Desperdicio Medio':
-                        avg_waste = val
-                    elif key == 'Alunos Desalocados':
-                        unalloced_students = val
-                    elif key == 'Vagas Ociosas SubUtilizadas':
-                        under_util_waste = val
-                    elif key == 'Alunos em Pe':
-                        standing_students = val
-
-                elif section == 'prefs' and len(row) >= 4:
-                    try:
-                        total_p = int(row[1])
-                        sat = int(row[2])
-                        pref_total += total_p
-                        pref_satisfied += sat
-                    except:
-                        pass
-
-            summary = {
-                'instance': name,
-                'heuristic': run_cfg['heur'],
-                'alpha': run_cfg.get('alpha', ''),
-                'seed': run_cfg.get('seed', ''),
-                'Encontros Alocados': allocated,
-                'Encontros Total': total,
-                'Taxa Alocacao (%)': alloc_rate,
-                'Demanda Alocada': demand_alloc,
-                'Demanda Total': demand_total,
-                'Taxa Demanda (%)': demand_rate,
-                'Desperdicio Medio': avg_waste,
-                'Alunos Desalocados': unalloced_students,
-                'Vagas Ociosas SubUtilizadas': under_util_waste,
-                'Alunos em Pe': standing_students,
-                'Runtime(s)': f"{duration:.4f}",
-                'MaxRSS(kB)': max_rss_kb,
-                'PrefTotal': pref_total,
-                'PrefSatisfeitas': pref_satisfied,
-                'PrefSat(%)': f"{(100.0 * pref_satisfied / pref_total):.2f}" if pref_total > 0 else "",
-            }
-            summary_rows.append(summary)
-
-# Escrever summary CSV em data/results/
-summary_file = CSV_DIR / 'summary_instances.csv'
-with open(summary_file, 'w', newline='') as f:
-    fieldnames=['instance','heuristic','alpha','seed','Encontros Alocados','Encontros Total','Taxa Alocacao (%)','Demanda Alocada','Demanda Total','Taxa Demanda (%)','Desperdicio Medio','Alunos Desalocados','Vagas Ociosas SubUtilizadas','Alunos em Pe','Runtime(s)','MaxRSS(kB)','PrefTotal','PrefSatisfeitas','PrefSat(%)']
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in summary_rows:
-        # garantir que todas as chaves existam
-        out = {k: row.get(k, '') for k in fieldnames}
-        writer.writerow(out)
-
-print('\n✔️ Processamento concluído.')
-print(f'Arquivo de resumo gerado: {summary_file}')
-print('Arquivos por instância:')
-print('\nArquivos CSV gerados:')
-for p in sorted(CSV_DIR.glob('greedy_stats_*.csv')):
-    print('  -', p.name)
+def execute_batch(runs, workers=1):
+    """Executa [(inst, run_cfg, cache)] em lote e devolve as linhas do summary na ordem de runs.
+
+    As configurações com entrada de lote no cache são lidas dele; as demais vão para
+    manifestos de ./bin/app --batch, um por worker, em fatias contíguas (as
+    configurações de uma instância ficam juntas, então cada instância é lida
+    uma vez por worker).
+    """
+    results = [None] * len(runs)
+    pending = []
+    for pos, (inst, run_cfg, cache) in enumerate(runs):
+        hit = cache.get(cache.key(inst, run_cfg, 'batch')) if cache else None
+        if hit:
+            results[pos] = cached_row(inst, run_cfg, hit)
+        else:
+            pending.append((pos, inst, run_cfg))
+
+    if pending:
+        workers = max(1, min(workers, len(pending)))
+        size = -(-len(pending) // workers)
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        print(f'-> Executando {len(pending)} configurações em lote ({len(chunks)} processos)', flush=True)
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            for done in pool.map(_run_batch_chunk, chunks):
+                for pos, dest in done.items():
+                    inst, run_cfg, cache = runs[pos]
+                    if cache:
+                        cache.put(cache.key(inst, run_cfg, 'batch'), dest, {'usage': BATCH_USAGE, 'mode': 'batch'})
+                    results[pos] = summary_row(inst.stem, run_cfg, dest, BATCH_USAGE)
+    return results
+
+
+AGGREGATE_SAVE_EVERY_S = 5.0  # intervalo mínimo entre gravações de aggregates.json durante a rodada
+
+
+def write_summary(results, store):
+    """Grava o summary CSV em data/results/ linha a linha, alimentando os agregados.
+
+    results é consumido à medida que as execuções terminam; aggregates.json é
+    regravado a cada AGGREGATE_SAVE_EVERY_S segundos e no fim. Devolve (arquivo, linhas,
+    execuções determinísticas que os agregados já tinham).
+    """
+    summary_file = CSV_DIR / 'summary_instances.csv'
+    written = repeated = 0
+    last_save = time.monotonic()
+    with open(summary_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for row in results:
+            if row is None:
+                continue
+            # garantir que todas as chaves existam
+            out = {k: row.get(k, '') for k in SUMMARY_FIELDS}
+            writer.writerow(out)
+            f.flush()
+            if not store.add(out):
+                repeated += 1
+            written += 1
+            if time.monotonic() - last_save >= AGGREGATE_SAVE_EVERY_S:
+                store.save()
+                last_save = time.monotonic()
+    store.save()
+    return summary_file, written, repeated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='número de execuções simultâneas (padrão: 1, serial)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='executa todas as configurações sem ler nem gravar o cache')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='esvazia data/results/.run_cache antes de executar')
+    parser.add_argument('--cache-max-mb', type=float, default=256,
+                        help='tamanho máximo do cache em MB (padrão: 256)')
+    parser.add_argument('--seeds', type=int, default=0,
+                        help='usa as seeds 1..N na heurística parcial (padrão: as de HEUR_CONFIG)')
+    parser.add_argument('--seed-start', type=int, default=1,
+                        help='primeira seed de --seeds (S..S+N-1; padrão: 1)')
+    parser.add_argument('--aggregate-append', action='store_true',
+                        help='soma esta rodada a data/results/aggregates.json em vez de recriá-lo')
+    parser.add_argument('--batch', action='store_true',
+                        help='roda as configurações num só processo por worker (./bin/app --batch), '
+                             'lendo cada instância uma vez')
+    args = parser.parse_args()
+    if args.seed_start < 1:
+        parser.error('--seed-start deve ser >= 1 (a seed 0 é sorteada pelo binário)')
+
+    CSV_DIR.mkdir(exist_ok=True)
+
+    if not BIN.exists():
+        print('Erro: binário ./bin/app não encontrado. Compile o projeto primeiro (make).')
+        sys.exit(1)
+
+    instances = sorted(INST_DIR.glob('*.json'))
+    if not instances:
+        print('Nenhuma instância JSON encontrada em data/generated_instances/')
+        sys.exit(1)
+
+    cache = RunCache(CACHE_DIR, file_digest(BIN), enabled=not args.no_cache)
+    if args.clear_cache:
+        cache.clear()
+    if cache.enabled:
+        cache.add_instances(instances)
+
+    if args.seeds > 0:
+        for heur in HEUR_CONFIG:
+            if heur['name'] == 'partial':
+                heur['seeds'] = list(range(args.seed_start, args.seed_start + args.seeds))
+
+    if args.aggregate_append and AGGREGATES_FILE.exists():
+        store = AggregateStore.load(AGGREGATES_FILE)
+    else:
+        store = AggregateStore(AGGREGATES_FILE)
+
+    runs = [(inst, run_cfg, cache) for inst, run_cfg in build_runs(instances)]
+    if args.batch:
+        summary_file, written, repeated = write_summary(execute_batch(runs, args.workers), store)
+    elif args.workers > 1:
+        # map() preserva a ordem de submissão, então o summary sai na mesma ordem do modo serial
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            summary_file, written, repeated = write_summary(pool.map(_execute_run_star, runs), store)
+    else:
+        summary_file, written, repeated = write_summary((execute_run(*run) for run in runs), store)
+
+    if cache.enabled:
+        removed = cache.evict(int(args.cache_max_mb * 1024 * 1024))
+        if removed:
+            print(f'Cache: {removed} entradas antigas removidas (limite {args.cache_max_mb:g} MB)')
+
+    print('\n✔️ Processamento concluído.')
+    print(f'Arquivo de resumo gerado: {summary_file} ({written} execuções)')
+    print(f'Agregados: {AGGREGATES_FILE} ({len(store.groups())} grupos)')
+    if repeated:
+        print(f'  {repeated} execuções determinísticas já estavam nos agregados e não foram somadas de novo')
+    print('Arquivos por instância:')
+    print('\nArquivos de estatísticas gerados:')
+    for p in sorted(CSV_DIR.glob('greedy_stats_*')):
+        print('  -', p.name)
+
+
+if __name__ == '__main__':
+    main()
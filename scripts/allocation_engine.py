@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Motor de alocação em Python (NumPy) que reproduz `greedyConstruct` e
+`partiallyGreedyConstruct` sem chamar o binário.
+
+A ocupação é um tensor booleano denso (sala x dia x horário) e todas as salas
+candidatas de um encontro são pontuadas de uma vez (desperdício + penalidade de
+preferência). Para a mesma instância, alpha e seed (!= 0) o resultado tem as
+mesmas reservas e o mesmo greedy_stats.csv do binário (exceto ExecutionTimeMs).
+
+Usage:
+  python3 scripts/allocation_engine.py data/generated_instances/instance1.json [--heuristic=partial:0.5:12345] [--out greedy_stats.csv]
+
+Em notebooks / sweeps:
+  from allocation_engine import load_instance, greedy, partially_greedy
+  inst = load_instance('data/generated_instances/instance1.json')
+  res = partially_greedy(inst, alpha=0.5, seed=12345)
+  res.metrics['Desperdicio Medio']
+"""
+import argparse
+import json
+import math
+import re
+import secrets
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+INST_DIR = ROOT / 'data' / 'generated_instances'
+
+GREEDY_PREF_PENALTY = 50
+PARTIAL_PREF_PENALTY = 15
+
+_STOI_RE = re.compile(r'\s*([+-]?\d+)')
+
+
+# ============= LEITURA (mesmas regras de Problem::loadInstance) =============
+
+def _stoi(s):
+    m = _STOI_RE.match(s)
+    if not m:
+        return None
+    v = int(m.group(1))
+    return v if -2**31 <= v < 2**31 else None
+
+
+def _is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+
+def _get_string_or(j, key, default=''):
+    v = j.get(key)
+    if v is None:
+        return default
+    if not isinstance(v, str):
+        raise TypeError(f"campo '{key}' deveria ser string: {v!r}")
+    return v
+
+
+def _get_int_or(j, key, default=0):
+    v = j.get(key)
+    if v is None:
+        return default
+    if _is_int(v):
+        return v
+    if isinstance(v, str):
+        parsed = _stoi(v)
+        return default if parsed is None else parsed
+    return default
+
+
+def _get_bool_or(j, key, default=False):
+    v = j.get(key)
+    if v is None:
+        return default
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, str):
+        return v.lower() in ('true', '1')
+    if _is_int(v):
+        return v != 0
+    return default
+
+
+def _get_strings(j, key):
+    arr = j.get(key)
+    if not isinstance(arr, list):
+        return []
+    out = []
+    for el in arr:
+        if isinstance(el, str):
+            out.append(el)
+        elif _is_int(el):
+            out.append(str(el))
+        elif isinstance(el, dict) and 'id' in el:
+            out.append(el['id'])
+    return out
+
+
+def _get_ints(j, key):
+    arr = j.get(key)
+    if not isinstance(arr, list):
+        return []
+    out = []
+    for el in arr:
+        if _is_int(el):
+            out.append(el)
+        elif isinstance(el, str):
+            parsed = _stoi(el)
+            if parsed is not None:
+                out.append(parsed)
+    return out
+
+
+def _category_item(item):
+    # campos comuns de Preference e Restriction
+    return {
+        'id': _get_string_or(item, 'id'),
+        'category': _get_string_or(item, 'category'),
+        'categoryCode': _get_string_or(item, 'categoryCode'),
+        'buildingId': _get_string_or(item, 'buildingId'),
+        'floor': _get_int_or(item, 'floor', -1),
+        'board': _get_string_or(item, 'board'),
+        'projector': _get_bool_or(item, 'projector', False),
+    }
+
+
+def _code_item(item):
+    # Professor / Subject: code (ou id) + name
+    code = ''
+    if 'code' in item:
+        code = _get_string_or(item, 'code')
+    elif 'id' in item:
+        code = _get_string_or(item, 'id')
+    return {'code': code, 'name': _get_string_or(item, 'name')}
+
+
+def normalize_instance(data):
+    """Converte o JSON bruto nos registros que Problem::loadInstance monta.
+
+    Devolve um dict seção -> lista de dicts com os nomes de campo das structs C++.
+    """
+    rec = {}
+    rec['schedules'] = [
+        {'id': _get_int_or(item, 'ID', _get_int_or(item, 'id', idx)),
+         'startTime': _get_string_or(item, 'startTime'),
+         'endTime': _get_string_or(item, 'endTime')}
+        for idx, item in enumerate(data.get('schedules') or [], start=1)
+    ]
+    rec['buildings'] = [
+        {'id': _get_int_or(item, 'ID', _get_int_or(item, 'id', idx)),
+         'name': _get_string_or(item, 'name')}
+        for idx, item in enumerate(data.get('buildings') or [], start=1)
+    ]
+    rec['classrooms'] = [
+        {'id': _get_int_or(item, 'ID', _get_int_or(item, 'id', idx)),
+         'isLab': _get_bool_or(item, 'isLab', _get_bool_or(item, 'isLaboratory', False)),
+         'capacity': _get_int_or(item, 'capacity', _get_int_or(item, 'vacancies', 0)),
+         'buildingId': _get_int_or(item, 'buildingID', _get_int_or(item, 'buildingId', _get_int_or(item, 'building', 0))),
+         'description': _get_string_or(item, 'description'),
+         'floor': _get_int_or(item, 'floor', 0),
+         'board': _get_string_or(item, 'board'),
+         'projector': _get_bool_or(item, 'projector', False)}
+        for idx, item in enumerate(data.get('classrooms') or [], start=1)
+    ]
+    rec['professors'] = [_code_item(item) for item in data.get('professors') or []]
+    rec['subjects'] = [_code_item(item) for item in data.get('subjects') or []]
+    rec['meetings'] = [
+        {'id': _get_string_or(item, 'id'),
+         'isPractical': _get_bool_or(item, 'isPractical', _get_bool_or(item, 'practical', False)),
+         'professorCodes': _get_strings(item, 'professorCodes') or _get_strings(item, 'professors'),
+         'subjectCode': _get_string_or(item, 'subjectCode') or _get_string_or(item, 'subject'),
+         'classIds': _get_strings(item, 'classIds'),
+         'scheduleIds': _get_ints(item, 'scheduleIds') or _get_ints(item, 'schedules'),
+         'demand': _get_int_or(item, 'demand', 0),
+         'vacancies': _get_int_or(item, 'vacancies', 0),
+         'dayOfWeek': _get_int_or(item, 'dayOfWeek', _get_int_or(item, 'day', 0))}
+        for item in data.get('meetings') or []
+    ]
+    rec['preferences'] = [_category_item(item) for item in data.get('preferences') or []]
+    rec['restrictions'] = [_category_item(item) for item in data.get('restrictions') or []]
+    rec['reservations'] = [
+        {'id': _get_string_or(item, 'id'),
+         'classroomId': _get_int_or(item, 'classroomID', _get_int_or(item, 'classroomId', _get_int_or(item, 'classroom', 0))),
+         'dayOfWeek': _get_int_or(item, 'dayOfWeek', _get_int_or(item, 'day', 0)),
+         'scheduleId': _get_int_or(item, 'scheduleID', _get_int_or(item, 'scheduleId', _get_int_or(item, 'schedule', 0)))}
+        for item in data.get('reservations') or []
+    ]
+    return rec
+
+
+class Instance:
+    """Instância pré-processada em arrays NumPy (uma linha por sala / encontro)."""
+
+    def __init__(self, data):
+        self._build(normalize_instance(data))
+
+    @classmethod
+    def from_records(cls, records):
+        """Monta a instância a partir de registros já normalizados (ver normalize_instance)."""
+        inst = cls.__new__(cls)
+        inst._build(records)
+        return inst
+
+    def _build(self, records):
+        rooms = records['classrooms']
+        self.room_id = np.array([r['id'] for r in rooms], dtype=np.int64)
+        self.capacity = np.array([r['capacity'] for r in rooms], dtype=np.int64)
+        self.is_lab = np.array([r['isLab'] for r in rooms], dtype=bool)
+        self.building = np.array([r['buildingId'] for r in rooms], dtype=np.int64)
+        self.floor = np.array([r['floor'] for r in rooms], dtype=np.int64)
+        self.board = np.array([r['board'] for r in rooms], dtype=object)
+        self.projector = np.array([r['projector'] for r in rooms], dtype=bool)
+        # salas com o mesmo id compartilham ocupação (classroom_free compara só o id)
+        ids, first, self.room_slot = np.unique(self.room_id, return_index=True, return_inverse=True)
+        self.room_first = first[self.room_slot]
+
+        self.meetings = records['meetings']
+        self.demand = np.array([m['demand'] for m in self.meetings], dtype=np.int64)
+        self.preferences = records['preferences']
+        self.reservations = records['reservations']
+
+        # eixos do tensor de ocupação
+        days = {m['dayOfWeek'] for m in self.meetings} | {r['dayOfWeek'] for r in self.reservations}
+        scheds = {s for m in self.meetings for s in m['scheduleIds']} | {r['scheduleId'] for r in self.reservations}
+        self.day_index = {d: i for i, d in enumerate(sorted(days))}
+        self.sched_index = {s: i for i, s in enumerate(sorted(scheds))}
+        self.initial_occupancy = np.zeros((len(ids), len(self.day_index), len(self.sched_index)), dtype=bool)
+        slot_of_id = {int(cid): i for i, cid in enumerate(ids)}
+        for r in self.reservations:
+            slot = slot_of_id.get(r['classroomId'])
+            if slot is not None:
+                self.initial_occupancy[slot, self.day_index[r['dayOfWeek']], self.sched_index[r['scheduleId']]] = True
+
+        # violações de cada preferência em cada sala (preferências x salas)
+        n_rooms = len(rooms)
+        self.pref_violations = np.zeros((len(self.preferences), n_rooms), dtype=np.int64)
+        for i, pf in enumerate(self.preferences):
+            row = self.pref_violations[i]
+            if pf['buildingId']:
+                bid = _stoi(pf['buildingId'])
+                if bid is not None:
+                    row += self.building != bid
+            if pf['floor'] != -1:
+                row += self.floor != pf['floor']
+            if pf['board']:
+                row += self.board != pf['board']
+            if pf['projector']:
+                row += ~self.projector
+        self._pref_cache = {}
+
+    def applicable_preferences(self, mi):
+        """Índices das preferências que se aplicam ao encontro `mi`."""
+        m = self.meetings[mi]
+        key = (tuple(m['professorCodes']), m['subjectCode'], tuple(m['classIds']))
+        cached = self._pref_cache.get(key)
+        if cached is None:
+            out = []
+            for i, pf in enumerate(self.preferences):
+                cat, code = pf['category'], pf['categoryCode']
+                if cat == 'professor':
+                    hit = code in m['professorCodes']
+                elif cat == 'subject':
+                    hit = code == m['subjectCode']
+                elif cat == 'class':
+                    hit = code in m['classIds']
+                else:
+                    hit = False
+                if hit:
+                    out.append(i)
+            cached = np.array(out, dtype=np.int64)
+            self._pref_cache[key] = cached
+        return cached
+
+
+def load_instance(path, cached=False):
+    """Lê um JSON de instância (caminho ou nome dentro de data/generated_instances/).
+
+    cached=True lê pelo cache binário (scripts/instance_cache.py), gerando-o se necessário.
+    """
+    p = Path(path)
+    if not p.exists():
+        p = INST_DIR / path
+    if cached:
+        from instance_cache import load_cache
+        return Instance.from_records(load_cache(p).records())
+    with open(p, 'r', encoding='utf-8') as fh:
+        return Instance(json.load(fh))
+
+
+# ============= RNG (mesma sequência do binário) =============
+
+class MT19937:
+    """Gerador com a mesma sequência de std::mt19937 para a mesma semente."""
+
+    def __init__(self, seed):
+        mt = [0] * 624
+        mt[0] = seed & 0xFFFFFFFF
+        for i in range(1, 624):
+            mt[i] = (1812433253 * (mt[i - 1] ^ (mt[i - 1] >> 30)) + i) & 0xFFFFFFFF
+        self.mt = mt
+        self.index = 624
+
+    def _twist(self):
+        mt = self.mt
+        for i in range(624):
+            y = (mt[i] & 0x80000000) | (mt[(i + 1) % 624] & 0x7FFFFFFF)
+            v = mt[(i + 397) % 624] ^ (y >> 1)
+            if y & 1:
+                v ^= 0x9908B0DF
+            mt[i] = v
+        self.index = 0
+
+    def __call__(self):
+        if self.index >= 624:
+            self._twist()
+        y = self.mt[self.index]
+        self.index += 1
+        y ^= y >> 11
+        y ^= (y << 7) & 0x9D2C5680
+        y ^= (y << 15) & 0xEFC60000
+        y ^= y >> 18
+        return y
+
+
+def rcl_pick(rng, n):
+    """Índice uniforme em [0, n), mesmo algoritmo de rcl_pick em partial_greedy.cpp."""
+    product = rng() * n
+    low = product & 0xFFFFFFFF
+    if low < n:
+        threshold = (-n & 0xFFFFFFFF) % n
+        while low < threshold:
+            product = rng() * n
+            low = product & 0xFFFFFFFF
+    return product >> 32
+
+
+# ============= CONSTRUÇÃO =============
+
+@dataclass
+class Result:
+    heuristic: str
+    meeting: np.ndarray          # índice do encontro em inst.meetings, na ordem de alocação
+    classroom: np.ndarray        # id da sala escolhida
+    day: np.ndarray
+    schedule: np.ndarray
+    waste: np.ndarray            # desperdício reportado (Distribuicao Desperdicio)
+    metrics: dict                # bloco Metrica,Valor
+    preferences: dict            # categoria -> (total, satisfeitas)
+    classroom_occupancy: list    # (id, encontros, demanda, capacidade, utilizacao %)
+    day_occupancy: list          # (dia, encontros, demanda)
+    schedule_occupancy: list     # ("dia_horario", demanda)
+    elapsed_ms: int = 0
+    alpha: float = 0.0
+    seed: int = 0
+    extra: dict = field(default_factory=dict)
+
+    def reservations(self, inst):
+        """Reservas criadas, no mesmo formato de Problem::reservations."""
+        return [{'id': inst.meetings[mi]['id'], 'classroomId': int(c), 'dayOfWeek': int(d), 'scheduleId': int(s)}
+                for mi, c, d, s in zip(self.meeting, self.classroom, self.day, self.schedule)]
+
+
+def _construct(inst, penalty, choose, waste_from_score):
+    occ = inst.initial_occupancy.copy()
+    order = np.argsort(-inst.demand, kind='stable')
+    fits_lab = inst.is_lab
+
+    placed_m, placed_r, placed_s, waste_vals, placed_viol = [], [], [], [], []
+    not_placed = 0
+    total_demand = 0
+
+    for mi in order:
+        m = inst.meetings[mi]
+        if not m['scheduleIds']:
+            continue
+        demand = m['demand']
+        total_demand += demand
+        prefs = inst.applicable_preferences(mi)
+        if prefs.size:
+            viol = inst.pref_violations[prefs].sum(axis=0)
+        else:
+            viol = np.zeros(len(inst.room_id), dtype=np.int64)
+        waste = inst.capacity - demand
+        score = waste + penalty * viol
+        eligible = waste >= 0
+        if m['isPractical']:
+            eligible &= fits_lab
+        day = inst.day_index[m['dayOfWeek']]
+
+        allocated = False
+        for sched in m['scheduleIds']:
+            free = ~occ[inst.room_slot, day, inst.sched_index[sched]]
+            cand = np.flatnonzero(eligible & free)
+            k = choose(cand, score, inst)
+            if k is None:
+                continue
+            occ[inst.room_slot[k], day, inst.sched_index[sched]] = True
+            placed_m.append(mi)
+            placed_r.append(k)
+            placed_s.append(sched)
+            # greedyConstruct reporta (score % 10000), que inclui a penalidade de preferência
+            waste_vals.append(int(score[k]) % 10000 if waste_from_score else int(waste[k]))
+            placed_viol.append(int(viol[k]))
+            allocated = True
+            break
+        if not allocated:
+            not_placed += 1
+
+    return _report(inst, placed_m, placed_r, placed_s, waste_vals, placed_viol, not_placed, total_demand)
+
+
+def _report(inst, placed_m, placed_r, placed_s, waste_vals, placed_viol, not_placed, total_demand):
+    meeting = np.array(placed_m, dtype=np.int64)
+    room = np.array(placed_r, dtype=np.int64)
+    sched = np.array(placed_s, dtype=np.int64)
+    waste = np.array(waste_vals, dtype=np.int64)
+    demand = inst.demand[meeting]
+    day = np.array([inst.meetings[mi]['dayOfWeek'] for mi in placed_m], dtype=np.int64)
+    cid = inst.room_id[room]
+
+    placed = len(placed_m)
+    total = placed + not_placed
+    demand_placed = int(demand.sum())
+    placement_rate = 100.0 * placed / total if total > 0 else 0.0
+    demand_rate = 100.0 * demand_placed / total_demand if total_demand > 0 else 0.0
+    avg_waste = float(waste.sum()) / placed if placed > 0 else 0.0
+
+    # ocupação por sala (capacidade da primeira sala com o id, como no binário)
+    ids, inv = np.unique(cid, return_inverse=True)
+    occ_count = np.bincount(inv, minlength=len(ids))
+    occ_demand = np.bincount(inv, weights=demand, minlength=len(ids)).astype(np.int64)
+    first_room = np.zeros(len(ids), dtype=np.int64)
+    first_room[inv] = inst.room_first[room]
+    occ_cap = inst.capacity[first_room]
+    under = (occ_cap > 0) & (occ_demand < occ_cap / 2.0)
+    under_utilized = int((occ_cap - occ_demand)[under].sum())
+    classroom_occupancy = [
+        (int(i), int(n), int(d), int(c), 100.0 * d / c if c > 0 else 0.0)
+        for i, n, d, c in zip(ids, occ_count, occ_demand, occ_cap)
+    ]
+
+    day_occupancy = []
+    for d in range(7):
+        mask = day == d
+        if mask.any():
+            day_occupancy.append((d, int(mask.sum()), int(demand[mask].sum())))
+
+    keys = [f'{d}_{s}' for d, s in zip(day, sched)]
+    sched_demand = {}
+    for k, dem in zip(keys, demand):
+        sched_demand[k] = sched_demand.get(k, 0) + int(dem)
+    schedule_occupancy = sorted(sched_demand.items())
+
+    pref_total, pref_sat = {}, {}
+    for mi, v in zip(placed_m, placed_viol):
+        for pi in inst.applicable_preferences(mi):
+            cat = inst.preferences[pi]['category']
+            pref_total[cat] = pref_total.get(cat, 0) + 1
+            if v == 0:
+                pref_sat[cat] = pref_sat.get(cat, 0) + 1
+    preferences = {cat: (pref_total[cat], pref_sat.get(cat, 0)) for cat in sorted(pref_total)}
+
+    metrics = {
+        'Encontros Alocados': placed,
+        'Encontros Total': total,
+        'Taxa Alocacao (%)': placement_rate,
+        'Demanda Alocada': demand_placed,
+        'Demanda Total': total_demand,
+        'Taxa Demanda (%)': demand_rate,
+        'Desperdicio Medio': avg_waste,
+        'Alunos Desalocados': total_demand - demand_placed,
+        'Vagas Ociosas SubUtilizadas': under_utilized,
+        # candidatos sempre têm capacidade >= demanda
+        'Alunos em Pe': 0,
+    }
+    return Result('', meeting, cid, day, sched, waste, metrics, preferences,
+                  classroom_occupancy, day_occupancy, schedule_occupancy)
+
+
+def greedy(inst):
+    """Equivalente a greedyConstruct: sala de menor (desperdício + penalidade)."""
+    t0 = time.perf_counter()
+
+    def choose(cand, score, inst):
+        if cand.size == 0:
+            return None
+        k = cand[np.argmin(score[cand])]
+        # o binário usa id 0 como "nenhuma sala encontrada"
+        return None if inst.room_id[k] == 0 else k
+
+    res = _construct(inst, GREEDY_PREF_PENALTY, choose, waste_from_score=True)
+    res.heuristic = 'greedy'
+    res.elapsed_ms = int((time.perf_counter() - t0) * 1000)
+    return res
+
+
+def partially_greedy(inst, alpha, seed=0):
+    """Equivalente a partiallyGreedyConstruct (RCL). seed == 0 -> semente aleatória."""
+    t0 = time.perf_counter()
+    alpha = min(max(alpha, 0.0), 1.0)
+    rng = MT19937(seed if seed != 0 else secrets.randbits(32))
+    rcl_stats = {'total': 0, 'size_sum': 0, 'multi': 0}
+
+    def choose(cand, score, inst):
+        if cand.size == 0:
+            return None
+        scores = score[cand]
+        lo, hi = int(scores.min()), int(scores.max())
+        threshold = lo
+        if hi > lo:
+            threshold = int(math.floor(lo + alpha * float(hi - lo) + 0.5))
+        rcl = cand[scores <= threshold]
+        rcl_stats['total'] += 1
+        rcl_stats['size_sum'] += rcl.size
+        if rcl.size > 1:
+            rcl_stats['multi'] += 1
+        return rcl[rcl_pick(rng, int(rcl.size))]
+
+    res = _construct(inst, PARTIAL_PREF_PENALTY, choose, waste_from_score=False)
+    res.heuristic = 'partial'
+    res.alpha = alpha
+    res.seed = seed
+    total = rcl_stats['total']
+    res.extra = {
+        'RCL_Total': total,
+        'RCL_AvgSize': rcl_stats['size_sum'] / total if total > 0 else 0.0,
+        'RCL_MultiCount': rcl_stats['multi'],
+    }
+    res.elapsed_ms = int((time.perf_counter() - t0) * 1000)
+    return res
+
+
+# ============= EXPORTAÇÃO =============
+
+def _fmt(v):
+    # mesmo formato padrão do ostream do C++ (6 dígitos significativos)
+    if isinstance(v, float):
+        return f'{v:g}'
+    return str(v)
+
+
+def write_stats_csv(res, path='greedy_stats.csv'):
+    """Grava o resultado no mesmo layout de greedy_stats.csv do binário."""
+    lines = ['Metrica,Valor']
+    for k, v in res.metrics.items():
+        lines.append(f'{k},{_fmt(v)}')
+    for k, v in res.extra.items():
+        lines.append(f'{k},{_fmt(v)}')
+
+    lines += ['', 'Preferencias por Categoria', 'Categoria,Total,Satisfeitas,Taxa (%)']
+    for cat, (count, sat) in res.preferences.items():
+        rate = 100.0 * sat / count if count > 0 else 0.0
+        lines.append(f'{cat},{count},{sat},{_fmt(rate)}')
+
+    lines += ['', 'Ocupacao por Sala', 'ClassroomId,Encontros,Demanda,Capacidade,TaxaUtilizacao(%)']
+    for cid, occ, dem, cap, util in res.classroom_occupancy:
+        lines.append(f'{cid},{occ},{dem},{cap},{_fmt(util)}')
+
+    lines += ['', 'Ocupacao por Dia', 'DiaSemanaSemana,Encontros,Demanda']
+    for d, occ, dem in res.day_occupancy:
+        lines.append(f'{d},{occ},{dem}')
+
+    lines += ['', 'Distribuicao Desperdicio', 'Desperdicio']
+    lines += [str(int(w)) for w in res.waste]
+
+    lines += ['', 'Ocupacao por Dia e Horario', 'DiaSchedule,Demanda']
+    for key, dem in res.schedule_occupancy:
+        lines.append(f'{key},{dem}')
+    if res.heuristic == 'partial':
+        lines.append(f'ExecutionTimeMs,{res.elapsed_ms}')
+
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write('\n'.join(lines) + '\n')
+
+
+def parse_heuristic(arg):
+    """Interpreta --heuristic como o binário: greedy | partial[:alpha[:seed]]."""
+    if not arg.startswith('partial'):
+        return 'greedy', 0.0, 0
+    parts = arg.split(':')
+    alpha = float(parts[1]) if len(parts) > 1 and parts[1] else 0.5
+    seed = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+    return 'partial', alpha, seed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('instance')
+    parser.add_argument('--heuristic', default='greedy')
+    parser.add_argument('--out', '-o', default='greedy_stats.csv')
+    parser.add_argument('--save-assignment', help='grava a alocação completa (mesmo formato de ./bin/app --save-assignment)')
+    args = parser.parse_args()
+
+    inst = load_instance(args.instance)
+    name, alpha, seed = parse_heuristic(args.heuristic)
+    res = partially_greedy(inst, alpha, seed) if name == 'partial' else greedy(inst)
+    for k, v in res.metrics.items():
+        print(f'  {k}: {_fmt(v)}')
+    write_stats_csv(res, args.out)
+    print(f'Dados exportados para: {args.out} ({res.elapsed_ms} ms)')
+    if args.save_assignment:
+        from assignment_io import from_result, save_assignment
+        save_assignment(args.save_assignment, from_result(res, inst))
+        print(f'Alocacao exportada para: {args.save_assignment}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Leitura e escrita da alocação completa (encontro -> sala, dia, horário).
+
+É o mesmo arquivo de `./bin/app --save-assignment=<arq>` (src/include/assignment_io.hpp):
+
+Binário colunar (padrão), little-endian, uma linha por encontro na ordem da instância:
+  0   char[8]  magic "TPASGN01"
+  8   uint64   número de encontros N
+  16  uint64   reservado (0)
+  24  int32[N] meeting, int32[N] classroomId, int32[N] dayOfWeek, int32[N] scheduleId,
+      uint8[N] allocated (0: sem sala; classroomId e scheduleId ficam 0)
+
+JSON (caminho terminado em .json), só os alocados:
+  {"meetings": N, "assignments": [{"meeting": i, "classroomID": c, "dayOfWeek": d, "scheduleID": s}, ...]}
+
+O binário é lido com np.memmap (sem copiar as colunas).
+
+Usage:
+  from assignment_io import load_assignment, save_assignment, from_result
+  a = load_assignment('alocacao.asg')
+  save_assignment('python.asg', from_result(greedy(inst), inst))   # resultado do allocation_engine
+  a.classroom[a.allocated]          # salas dos encontros alocados
+
+  python3 scripts/assignment_io.py alocacao.asg [--to alocacao.json]
+"""
+import argparse
+import json
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'TPASGN01'
+HEADER = struct.Struct('<8sQQ')
+COLUMNS = ['meeting', 'classroom', 'day', 'schedule']
+
+
+@dataclass
+class Assignment:
+    meeting: np.ndarray     # int32, índice do encontro (0..N-1)
+    classroom: np.ndarray   # int32, id da sala (0 se sem sala)
+    day: np.ndarray         # int32, dia da semana
+    schedule: np.ndarray    # int32, id do horário (0 se sem sala)
+    allocated: np.ndarray   # bool
+
+    @property
+    def meetings(self):
+        return int(self.meeting.size)
+
+    @property
+    def placed(self):
+        return int(np.count_nonzero(self.allocated))
+
+    def reservations(self):
+        """Reservas dos alocados, no formato de Problem::reservations (mais o índice do encontro)."""
+        idx = np.flatnonzero(self.allocated)
+        return [{'meeting': int(i), 'classroomId': int(self.classroom[i]), 'dayOfWeek': int(self.day[i]),
+                 'scheduleId': int(self.schedule[i])} for i in idx]
+
+
+def empty_assignment(n_meetings):
+    n = int(n_meetings)
+    return Assignment(np.arange(n, dtype='<i4'), np.zeros(n, dtype='<i4'), np.zeros(n, dtype='<i4'),
+                      np.zeros(n, dtype='<i4'), np.zeros(n, dtype=bool))
+
+
+def from_result(result, inst):
+    """Alocação densa a partir de um allocation_engine.Result sobre a instância inst.
+
+    Os sem sala ficam com o dia do próprio encontro, como no arquivo do binário.
+    """
+    a = empty_assignment(len(inst.meetings))
+    a.day[:] = [m['dayOfWeek'] for m in inst.meetings]
+    m = np.asarray(result.meeting, dtype=np.int64)
+    a.classroom[m] = result.classroom
+    a.day[m] = result.day
+    a.schedule[m] = result.schedule
+    a.allocated[m] = True
+    return a
+
+
+def _load_binary(path):
+    buf = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, n, _ = HEADER.unpack(bytes(buf[:HEADER.size]))
+    if buf.size != HEADER.size + 17 * n:
+        raise ValueError(f'{path}: truncado ou corrompido')
+    cols = [buf[HEADER.size + 4 * n * k: HEADER.size + 4 * n * (k + 1)].view('<i4') for k in range(4)]
+    allocated = buf[HEADER.size + 16 * n:].view(bool)
+    return Assignment(*cols, allocated)
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+    a = empty_assignment(data['meetings'])
+    if data['assignments']:
+        rows = np.array([(r['meeting'], r['classroomID'], r['dayOfWeek'], r['scheduleID'])
+                         for r in data['assignments']], dtype=np.int64)
+        a.classroom[rows[:, 0]] = rows[:, 1]
+        a.day[rows[:, 0]] = rows[:, 2]
+        a.schedule[rows[:, 0]] = rows[:, 3]
+        a.allocated[rows[:, 0]] = True
+    return a
+
+
+def load_assignment(path):
+    """Lê uma alocação gravada pelo binário ou por save_assignment (formato detectado pelo conteúdo)."""
+    with open(path, 'rb') as fh:
+        head = fh.read(len(MAGIC))
+    return _load_binary(path) if head == MAGIC else _load_json(path)
+
+
+def save_assignment(path, assignment):
+    """Grava a alocação (JSON se o caminho terminar em .json, binário caso contrário); escrita atômica."""
+    path = Path(path)
+    a = assignment
+    if path.suffix == '.json':
+        idx = np.flatnonzero(a.allocated)
+        data = {'meetings': a.meetings,
+                'assignments': [{'meeting': int(i), 'classroomID': int(a.classroom[i]), 'dayOfWeek': int(a.day[i]),
+                                 'scheduleID': int(a.schedule[i])} for i in idx]}
+        payload = json.dumps(data, separators=(',', ':')).encode() + b'\n'
+    else:
+        parts = [HEADER.pack(MAGIC, a.meetings, 0)]
+        parts += [np.ascontiguousarray(getattr(a, c), dtype='<i4').tobytes() for c in COLUMNS]
+        parts.append(np.ascontiguousarray(a.allocated, dtype='u1').tobytes())
+        payload = b''.join(parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(payload)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('assignment')
+    parser.add_argument('--to', help='converte para outro arquivo (.json ou binário)')
+    args = parser.parse_args()
+
+    a = load_assignment(args.assignment)
+    print(f'{args.assignment}: {a.meetings} encontros, {a.placed} alocados, {a.meetings - a.placed} sem sala')
+    if args.to:
+        save_assignment(args.to, a)
+        print(f'Alocacao convertida para: {args.to}')
+
+
+if __name__ == '__main__':
+    main()
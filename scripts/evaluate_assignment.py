@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Avaliador independente de uma alocação: recalcula todas as métricas a partir
+da instância e do arquivo de --save-assignment, sem passar pelo binário.
+
+Tudo é feito em NumPy sobre colunas (cache binário da instância + colunas da
+alocação), sem laço por encontro; 1M de encontros leva poucos segundos.
+
+Calcula:
+  - bloco Metrica,Valor (taxas de alocação e de demanda, desperdício médio,
+    Vagas Ociosas SubUtilizadas, Alunos em Pe) com as mesmas regras do binário;
+  - ocupação por sala, por dia e a matriz dia x horário;
+  - preferências por categoria, exatas (cada preferência conta pela própria
+    violação) e no critério do binário (todas satisfeitas só se o encontro não
+    viola nenhuma);
+  - restrições rígidas violadas: sala inexistente, dia diferente do encontro,
+    horário fora das opções, prático fora de laboratório, dois encontros na
+    mesma célula sala x dia x horário e encontro sobre reserva fixa.
+
+Diferenças conhecidas em relação às estatísticas do binário:
+  - o desperdício é max(0, capacidade - demanda); a gulosa reporta
+    (score % 10000), que inclui a penalidade de preferência. --compare aceita
+    os dois critérios e só anota quando o arquivo usa o da gulosa;
+  - a Distribuicao Desperdicio sai na ordem dos encontros, não na de alocação;
+  - com ids de sala repetidos, vale a primeira sala com o id.
+
+Usage:
+  python3 scripts/evaluate_assignment.py instance1.json alocacao.asg
+  python3 scripts/evaluate_assignment.py instance1.json alocacao.asg --compare greedy_stats.csv
+  python3 scripts/evaluate_assignment.py instance1.json alocacao.asg --csv avaliacao.csv
+
+Sai com código 1 se houver restrição rígida violada (2 se --compare achar divergência).
+"""
+import argparse
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from allocation_engine import GREEDY_PREF_PENALTY, INST_DIR, _fmt, _stoi, write_stats_csv  # noqa: E402
+from assignment_io import load_assignment  # noqa: E402
+from instance_cache import load_cache  # noqa: E402
+
+VIOLATIONS = ('Sala inexistente', 'Dia diferente do encontro', 'Horario fora das opcoes',
+              'Pratico fora de laboratorio', 'Conflito entre encontros', 'Conflito com reserva fixa')
+
+
+@dataclass
+class Evaluation:
+    metrics: dict                # bloco Metrica,Valor
+    preferences: dict            # categoria -> (total, satisfeitas), critério exato
+    preferences_binary: dict     # categoria -> (total, satisfeitas), critério do binário
+    classroom_occupancy: list    # (id, encontros, demanda, capacidade, utilizacao %)
+    day_occupancy: list          # (dia, encontros, demanda)
+    schedule_occupancy: list     # ("dia_horario", demanda), ordenado como o std::map do binário
+    heatmap: np.ndarray          # demanda por dia x horário
+    heatmap_days: np.ndarray
+    heatmap_schedules: np.ndarray
+    waste: np.ndarray            # desperdício de cada alocado, na ordem dos encontros
+    violations: dict             # nome -> índices dos encontros que violam
+    heuristic: str = 'evaluate'
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def hard_violations(self):
+        return sum(v.size for v in self.violations.values())
+
+
+def _strings_at(cache, ids):
+    """Decodifica só as strings do pool com esses ids (o pool inteiro tem milhões em 1M de encontros)."""
+    offsets = cache.array('strings.offsets')
+    data = cache.array('strings.data')
+    return [bytes(data[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in np.asarray(ids).tolist()]
+
+
+def _empty_string_id(cache):
+    """Id da string vazia no pool (-1 se não houver)."""
+    empty = np.flatnonzero(np.diff(cache.array('strings.offsets')) == 0)
+    return int(empty[0]) if empty.size else -1
+
+
+def _dense(*columns):
+    """Id denso de cada linha para a combinação das colunas (mesmos valores -> mesmo id)."""
+    key = np.zeros(columns[0].size, dtype=np.int64)
+    for col in columns:
+        _, inv = np.unique(col, return_inverse=True)
+        inv = inv.reshape(-1)
+        span = int(inv.max()) + 1 if inv.size else 1
+        key = key * span + inv
+        # recompacta para não estourar o int64 com muitas colunas
+        _, key = np.unique(key, return_inverse=True)
+        key = key.reshape(-1)
+    return key
+
+
+def _segments(offsets):
+    """Para offsets de um campo variável: (índice do dono de cada valor, tamanhos)."""
+    counts = np.diff(offsets.astype(np.int64))
+    return np.repeat(np.arange(counts.size), counts), counts
+
+
+def _match_codes(cache, field_name, codes):
+    """Pares (encontro, preferência) em que o campo variável do encontro contém o código da preferência."""
+    owner, _ = _segments(cache.array(f'meetings.{field_name}.offsets'))
+    values = cache.array(f'meetings.{field_name}.values').astype(np.int64)
+    return _join(owner, values, codes)
+
+
+def _join(owner, values, codes):
+    """Junta valores (por dono) com uma lista de códigos: pares (dono, posição em codes)."""
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    lo = np.searchsorted(sorted_codes, values, side='left')
+    hi = np.searchsorted(sorted_codes, values, side='right')
+    n = hi - lo
+    left = np.repeat(owner, n)
+    # posição de cada par dentro do intervalo [lo, hi) do seu valor
+    start = np.repeat(lo, n)
+    within = np.arange(left.size) - np.repeat(np.cumsum(n) - n, n)
+    return left, order[start + within]
+
+
+def applicable_pairs(cache):
+    """Todos os pares (encontro, preferência) aplicáveis, sem repetição.
+
+    Mesmo critério de Instance.applicable_preferences: professor/turma se o
+    código está na lista do encontro, disciplina se é igual.
+    """
+    category = _strings_at(cache, cache.array('preferences.category'))
+    code = cache.array('preferences.categoryCode').astype(np.int64)
+    cat = np.array(category, dtype=object)
+    pairs_m, pairs_p = [], []
+    for name, field_name in (('professor', 'professorCodes'), ('class', 'classIds')):
+        idx = np.flatnonzero(cat == name)
+        if idx.size:
+            m, k = _match_codes(cache, field_name, code[idx])
+            pairs_m.append(m)
+            pairs_p.append(idx[k])
+    idx = np.flatnonzero(cat == 'subject')
+    if idx.size:
+        subject = cache.array('meetings.subjectCode').astype(np.int64)
+        m, k = _join(np.arange(subject.size), subject, code[idx])
+        pairs_m.append(m)
+        pairs_p.append(idx[k])
+    if not pairs_m:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    n_prefs = max(len(category), 1)
+    key = np.unique(np.concatenate(pairs_m) * n_prefs + np.concatenate(pairs_p))
+    return key // n_prefs, key % n_prefs
+
+
+def preference_violations(cache, pref, room):
+    """Violações da preferência pref[i] na sala (linha) room[i], como Instance.pref_violations."""
+    building = [_stoi(b) if b else None for b in _strings_at(cache, cache.array('preferences.buildingId'))]
+    has_building = np.array([b is not None for b in building], dtype=bool)
+    pref_building = np.array([b or 0 for b in building], dtype=np.int64)
+    pref_floor = cache.array('preferences.floor').astype(np.int64)
+    pref_board = cache.array('preferences.board').astype(np.int64)
+    pref_projector = cache.array('preferences.projector').astype(bool)
+    empty = _empty_string_id(cache)
+
+    room_building = cache.array('classrooms.buildingId').astype(np.int64)
+    room_floor = cache.array('classrooms.floor').astype(np.int64)
+    room_board = cache.array('classrooms.board').astype(np.int64)
+    room_projector = cache.array('classrooms.projector').astype(bool)
+
+    viol = (has_building[pref] & (room_building[room] != pref_building[pref])).astype(np.int64)
+    viol += (pref_floor[pref] != -1) & (room_floor[room] != pref_floor[pref])
+    viol += (pref_board[pref] != empty) & (room_board[room] != pref_board[pref])
+    viol += pref_projector[pref] & ~room_projector[room]
+    return viol
+
+
+def _category_counts(categories, pref, satisfied):
+    out = {}
+    names = np.array(categories, dtype=object)[pref] if pref.size else np.zeros(0, dtype=object)
+    for cat in sorted(set(names.tolist())):
+        mask = names == cat
+        out[cat] = (int(mask.sum()), int(satisfied[mask].sum()))
+    return out
+
+
+def evaluate(cache, a):
+    """Avalia a alocação `a` (assignment_io.Assignment) sobre a instância aberta em `cache`."""
+    n = cache.count('meetings')
+    if a.meetings != n:
+        raise ValueError(f'alocacao tem {a.meetings} encontros, a instancia tem {n}')
+    meeting = np.asarray(a.meeting, dtype=np.int64)
+    if meeting.size and (meeting.min() < 0 or meeting.max() >= n or np.unique(meeting).size != n):
+        raise ValueError('coluna meeting nao e uma permutacao dos encontros da instancia')
+    # colunas da alocação reordenadas pelo índice do encontro
+    row = np.empty(n, dtype=np.int64)
+    row[meeting] = np.arange(n)
+    allocated = np.asarray(a.allocated, dtype=bool)[row]
+    cid = np.asarray(a.classroom, dtype=np.int64)[row]
+    day = np.asarray(a.day, dtype=np.int64)[row]
+    sched = np.asarray(a.schedule, dtype=np.int64)[row]
+
+    demand = cache.array('meetings.demand').astype(np.int64)
+    meeting_day = cache.array('meetings.dayOfWeek').astype(np.int64)
+    practical = cache.array('meetings.isPractical').astype(bool)
+    sched_owner, sched_count = _segments(cache.array('meetings.scheduleIds.offsets'))
+    sched_values = cache.array('meetings.scheduleIds.values').astype(np.int64)
+
+    room_id = cache.array('classrooms.id').astype(np.int64)
+    capacity = cache.array('classrooms.capacity').astype(np.int64)
+    is_lab = cache.array('classrooms.isLab').astype(bool)
+    ids, first = np.unique(room_id, return_index=True)
+
+    # linha da primeira sala com o id escolhido (-1: sala inexistente)
+    pos = np.searchsorted(ids, cid)
+    known = (pos < ids.size) & (ids[np.minimum(pos, max(ids.size - 1, 0))] == cid) if ids.size else \
+        np.zeros(n, dtype=bool)
+    room = np.where(known, first[np.minimum(pos, max(ids.size - 1, 0))] if ids.size else 0, -1)
+
+    # ---- restrições rígidas ----
+    placed_idx = np.flatnonzero(allocated)
+    in_options = np.bincount(sched_owner, weights=sched_values == np.repeat(sched, sched_count),
+                             minlength=n) > 0
+    violations = {
+        'Sala inexistente': np.flatnonzero(allocated & ~known),
+        'Dia diferente do encontro': np.flatnonzero(allocated & (day != meeting_day)),
+        'Horario fora das opcoes': np.flatnonzero(allocated & ~in_options),
+        'Pratico fora de laboratorio': np.flatnonzero(allocated & known & practical & ~is_lab[np.maximum(room, 0)]),
+    }
+
+    # células sala x dia x horário: encontros alocados e reservas fixas
+    res_cid = cache.array('reservations.classroomId').astype(np.int64)
+    res_day = cache.array('reservations.dayOfWeek').astype(np.int64)
+    res_sched = cache.array('reservations.scheduleId').astype(np.int64)
+    cell = _dense(np.concatenate([cid[placed_idx], res_cid]), np.concatenate([day[placed_idx], res_day]),
+                  np.concatenate([sched[placed_idx], res_sched]))
+    n_cells = int(cell.max()) + 1 if cell.size else 0
+    m_cell, r_cell = cell[:placed_idx.size], cell[placed_idx.size:]
+    fixed = np.bincount(r_cell, minlength=n_cells) > 0
+    per_cell = np.bincount(m_cell, minlength=n_cells)
+    # no conflito entre encontros, o primeiro encontro da célula (menor índice) fica como legítimo
+    order = np.lexsort((placed_idx, m_cell))
+    later = np.zeros(placed_idx.size, dtype=bool)
+    later[order[1:]] = m_cell[order[1:]] == m_cell[order[:-1]]
+    violations['Conflito entre encontros'] = placed_idx[later & (per_cell[m_cell] > 1) & ~fixed[m_cell]]
+    violations['Conflito com reserva fixa'] = placed_idx[fixed[m_cell]]
+
+    # ---- métricas (mesmas regras de toResult) ----
+    # encontros sem horário ficam fora dos totais, como na construção do binário
+    considered = (sched_count > 0) | allocated
+    p_demand = demand[placed_idx]
+    p_room = room[placed_idx]
+    p_cap = np.where(p_room >= 0, capacity[np.maximum(p_room, 0)], 0)
+    placed = int(placed_idx.size)
+    total = int(considered.sum())
+    demand_placed = int(p_demand.sum())
+    total_demand = int(demand[considered].sum())
+    waste = np.maximum(p_cap - p_demand, 0)
+    standing = int(np.maximum(p_demand - p_cap, 0).sum())
+
+    occ_ids, inv = np.unique(cid[placed_idx], return_inverse=True)
+    inv = inv.reshape(-1)
+    occ_count = np.bincount(inv, minlength=occ_ids.size)
+    occ_demand = np.bincount(inv, weights=p_demand, minlength=occ_ids.size).astype(np.int64)
+    occ_cap = np.zeros(occ_ids.size, dtype=np.int64)
+    occ_cap[inv] = p_cap
+    under = (occ_cap > 0) & (occ_demand < occ_cap / 2.0)
+    classroom_occupancy = [
+        (int(i), int(c), int(d), int(k), 100.0 * d / k if k > 0 else 0.0)
+        for i, c, d, k in zip(occ_ids, occ_count, occ_demand, occ_cap)
+    ]
+
+    p_day = day[placed_idx]
+    in_week = (p_day >= 0) & (p_day < 7)
+    day_count = np.bincount(p_day[in_week], minlength=7)
+    day_demand = np.bincount(p_day[in_week], weights=p_demand[in_week], minlength=7).astype(np.int64)
+    day_occupancy = [(d, int(day_count[d]), int(day_demand[d])) for d in range(7) if day_count[d]]
+
+    p_sched = sched[placed_idx]
+    heat_days, di = np.unique(p_day, return_inverse=True)
+    heat_scheds, si = np.unique(p_sched, return_inverse=True)
+    heatmap = np.zeros((heat_days.size, heat_scheds.size), dtype=np.int64)
+    np.add.at(heatmap, (di.reshape(-1), si.reshape(-1)), p_demand)
+    r, c = np.nonzero(heatmap)
+    schedule_occupancy = sorted((f'{heat_days[i]}_{heat_scheds[j]}', int(heatmap[i, j])) for i, j in zip(r, c))
+
+    # ---- preferências ----
+    categories = _strings_at(cache, cache.array('preferences.category'))
+    pm, pp = applicable_pairs(cache)
+    keep = allocated[pm] & (room[pm] >= 0)
+    pm, pp = pm[keep], pp[keep]
+    viol = preference_violations(cache, pp, room[pm])
+    meeting_viol = np.bincount(pm, weights=viol, minlength=n)
+    preferences = _category_counts(categories, pp, viol == 0)
+    preferences_binary = _category_counts(categories, pp, meeting_viol[pm] == 0)
+    # desperdício como a gulosa o reporta: (desperdício + penalidade * violadas) % 10000
+    greedy_waste = (waste + GREEDY_PREF_PENALTY * meeting_viol[placed_idx].astype(np.int64)) % 10000
+
+    metrics = {
+        'Encontros Alocados': placed,
+        'Encontros Total': total,
+        'Taxa Alocacao (%)': 100.0 * placed / total if total > 0 else 0.0,
+        'Demanda Alocada': demand_placed,
+        'Demanda Total': total_demand,
+        'Taxa Demanda (%)': 100.0 * demand_placed / total_demand if total_demand > 0 else 0.0,
+        'Desperdicio Medio': float(waste.sum()) / placed if placed > 0 else 0.0,
+        'Alunos Desalocados': total_demand - demand_placed,
+        'Vagas Ociosas SubUtilizadas': int((occ_cap - occ_demand)[under].sum()),
+        'Alunos em Pe': standing,
+    }
+    return Evaluation(metrics, preferences, preferences_binary, classroom_occupancy, day_occupancy,
+                      schedule_occupancy, heatmap, heat_days, heat_scheds, waste, violations,
+                      extra={'greedy_waste': greedy_waste})
+
+
+def compare(ev, stats, notes=None):
+    """Divergências entre a avaliação e as estatísticas do binário (stats_reader.StatsFile).
+
+    Diferenças esperadas, que não são divergência, vão para notes (se for uma lista).
+    """
+    diffs = []
+    metrics = ev.metrics
+    binary_waste = sorted(stats.table('waste_distribution')['waste'])
+    waste = ev.waste
+    greedy_waste = ev.extra.get('greedy_waste')
+    if binary_waste != sorted(waste.tolist()) and greedy_waste is not None and \
+            binary_waste == sorted(greedy_waste.tolist()):
+        # a gulosa reporta (score % 10000), com a penalidade de preferência: confere nesse critério
+        waste = greedy_waste
+        metrics = dict(metrics)
+        metrics['Desperdicio Medio'] = float(waste.sum()) / waste.size if waste.size else 0.0
+        if notes is not None:
+            notes.append('desperdicio no criterio da gulosa (score % 10000, com a penalidade de preferencia); '
+                         f"sem a penalidade a media e {_fmt(ev.metrics['Desperdicio Medio'])}")
+    for k, v in metrics.items():
+        got = stats.metrics.get(k)
+        # o binário grava floats com 6 dígitos significativos
+        if got is None or abs(float(_fmt(v)) - got) > 1e-9 * max(1.0, abs(got)):
+            diffs.append(f'{k}: avaliado {_fmt(v)}, binario {got}')
+    prefs = stats.table('preferences')
+    binary_prefs = {c: (t, s) for c, t, s in zip(prefs['category'], prefs['total'], prefs['satisfied'])}
+    if binary_prefs != ev.preferences_binary:
+        diffs.append(f'Preferencias: avaliado {ev.preferences_binary}, binario {binary_prefs}')
+    rooms = stats.table('classroom_occupancy')
+    binary_rooms = list(zip(rooms['classroom_id'], rooms['meetings'], rooms['demand'], rooms['capacity']))
+    if binary_rooms != [r[:4] for r in ev.classroom_occupancy]:
+        diffs.append('Ocupacao por Sala difere')
+    days = stats.table('day_occupancy')
+    if list(zip(days['day'], days['meetings'], days['demand'])) != ev.day_occupancy:
+        diffs.append('Ocupacao por Dia difere')
+    cells = stats.table('schedule_occupancy')
+    if sorted((f'{d}_{s}', dem) for d, s, dem in zip(cells['day'], cells['schedule'], cells['demand'])) != \
+            ev.schedule_occupancy:
+        diffs.append('Ocupacao por Dia e Horario difere')
+    if binary_waste != sorted(waste.tolist()):
+        diffs.append('Distribuicao Desperdicio difere')
+    return diffs
+
+
+def print_report(ev, out=sys.stdout):
+    m = ev.metrics
+    out.write('\n  Avaliacao da alocacao\n')
+    out.write(f"  Encontros alocados: {m['Encontros Alocados']}/{m['Encontros Total']} "
+              f"({_fmt(m['Taxa Alocacao (%)'])}%)\n")
+    out.write(f"  Demanda alocada: {m['Demanda Alocada']}/{m['Demanda Total']} ({_fmt(m['Taxa Demanda (%)'])}%)\n")
+    out.write(f"  Desperdicio medio: {_fmt(m['Desperdicio Medio'])}\n")
+    out.write(f"  Vagas ociosas (salas subutilizadas): {m['Vagas Ociosas SubUtilizadas']}\n")
+    out.write(f"  Alunos em pe: {m['Alunos em Pe']}\n")
+    if ev.preferences:
+        out.write('  Preferencias (satisfeitas exatas / criterio do binario / total):\n')
+        for cat, (total, sat) in ev.preferences.items():
+            out.write(f'    {cat}: {sat} / {ev.preferences_binary[cat][1]} / {total}\n')
+    out.write('  Restricoes rigidas:\n')
+    for name in VIOLATIONS:
+        idx = ev.violations[name]
+        sample = ', '.join(str(i) for i in idx[:5]) + (', ...' if idx.size > 5 else '')
+        out.write(f'    {name}: {idx.size}' + (f' (encontros {sample})' if idx.size else '') + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('instance', help='JSON da instância (caminho ou nome em data/generated_instances/)')
+    parser.add_argument('assignment', help='alocação gravada por --save-assignment (binária ou .json)')
+    parser.add_argument('--csv', help='grava as métricas no layout de greedy_stats.csv')
+    parser.add_argument('--compare', help='estatísticas do binário (greedy_stats.csv/.jsonl) para conferir')
+    args = parser.parse_args()
+
+    path = Path(args.instance)
+    if not path.exists():
+        path = INST_DIR / args.instance
+    ev = evaluate(load_cache(path), load_assignment(args.assignment))
+    print_report(ev)
+    if args.csv:
+        write_stats_csv(ev, args.csv)
+        print(f'Dados exportados para: {args.csv}')
+    status = 1 if ev.hard_violations else 0
+    if args.compare:
+        from stats_reader import read_stats
+        notes = []
+        diffs = compare(ev, read_stats(args.compare), notes)
+        print(f'  Comparacao com {args.compare}: ' + ('sem divergencias' if not diffs else f'{len(diffs)} divergencias'))
+        for d in diffs:
+            print(f'    {d}')
+        for n in notes:
+            print(f'    Nota: {n}')
+        if diffs and not status:
+            status = 2
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Gerador de instâncias sintéticas no mesmo esquema JSON de data/generated_instances/.
+
+As chaves seguem as instâncias distribuídas (ID, buildingID, classes, schedules,
+professors, classroomID, scheduleID, ...), então o resultado é lido por
+Problem::loadInstance, allocation_engine.load_instance e instance_cache.py.
+A exceção é o prédio das preferências: sai como buildingId, a chave que os
+leitores usam, para essas preferências valerem na alocação.
+
+Tudo é sorteado de um numpy.random.Generator criado a partir de --seed: a mesma
+linha de comando gera sempre o mesmo arquivo. Os encontros são sorteados e
+escritos em blocos de --chunk linhas, então a memória não cresce com --meetings
+(1M de encontros usa o mesmo pico que 10 mil).
+
+Padrões calibrados pela instance1 (36 salas, 2 prédios, 16 horários, dias 2-7,
+demanda 10-70, 70% dos encontros com 2 horários consecutivos).
+
+Usage:
+  python3 scripts/generate_instance.py --meetings 100000 --rooms 3000 --seed 7
+  python3 scripts/generate_instance.py --meetings 1000000 --rooms 30000 --buildings 40 \\
+      --lab-ratio 0.1 --demand lognormal --pref-density 0.05 --reservations 0.01 \\
+      -o data/generated_instances/univ_1m.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+INST_DIR = ROOT / 'data' / 'generated_instances'
+
+DAYS = (2, 3, 4, 5, 6, 7)  # segunda a sábado, como nas instâncias reais
+BOARDS = ('B', 'N', 'W')
+# número de horários consecutivos por encontro (proporções da instance1)
+SPAN_SIZES = np.array([1, 2, 3, 4])
+SPAN_PROBS = np.array([0.10, 0.70, 0.10, 0.10])
+DEMAND_DISTS = ('uniform', 'normal', 'lognormal')
+
+
+def sample_demand(rng, dist, n, lo, hi):
+    """Demanda inteira em [lo, hi] na distribuição pedida."""
+    if dist == 'uniform':
+        return rng.integers(lo, hi + 1, size=n)
+    mid = (lo + hi) / 2
+    if dist == 'normal':
+        values = rng.normal(mid, (hi - lo) / 4, size=n)
+    else:
+        # cauda longa: mediana em ~40% do intervalo, poucas turmas grandes
+        values = lo + rng.lognormal(np.log(max((hi - lo) * 0.4, 1)), 0.5, size=n)
+    return np.clip(np.rint(values), lo, hi).astype(np.int64)
+
+
+def schedule_times(n):
+    """Horários de 50 min a partir das 07:30, com intervalo de 10 min a cada dois."""
+    out, minutes = [], 7 * 60 + 30
+    for i in range(n):
+        start, end = minutes, minutes + 50
+        out.append((f'{start // 60 % 24:02d}:{start % 60:02d}', f'{end // 60 % 24:02d}:{end % 60:02d}'))
+        minutes = end + (10 if i % 2 else 0)
+    return out
+
+
+def professor_code(i):
+    n = 1_000_000 + i * 7919 % 9_000_000
+    return f'{n // 1_000_000}.{n // 1000 % 1000:03d}.{n % 1000:03d}'
+
+
+class _ListWriter:
+    """Escreve uma lista JSON item a item (indentação igual à das instâncias)."""
+
+    def __init__(self, fh, key, first):
+        self.fh = fh
+        self.empty = True
+        fh.write(('' if first else ',\n') + f'    "{key}": [')
+
+    def write(self, item):
+        self.fh.write(('\n' if self.empty else ',\n') + '        ' + item)
+        self.empty = False
+
+    def close(self):
+        self.fh.write(']' if self.empty else '\n    ]')
+
+
+def generate(fh, args):
+    """Escreve a instância em fh; devolve um resumo do que foi gerado."""
+    rng = np.random.default_rng(args.seed)
+    dumps = json.dumps
+    n_rooms, n_sched = args.rooms, args.schedules
+    n_prof = args.professors or max(1, args.meetings // 4)
+    n_subj = args.subjects or max(1, args.meetings // 3)
+
+    fh.write('{\n')
+    first = True
+
+    def section(key):
+        nonlocal first
+        w = _ListWriter(fh, key, first)
+        first = False
+        return w
+
+    w = section('schedules')
+    for i, (start, end) in enumerate(schedule_times(n_sched), 1):
+        w.write(dumps({'ID': i, 'startTime': start, 'endTime': end}))
+    w.close()
+
+    w = section('buildings')
+    for b in range(1, args.buildings + 1):
+        w.write(dumps({'ID': b, 'name': f'P{b:02d}'}))
+    w.close()
+
+    # salas: capacidade concentrada perto da demanda máxima (como as de 60 lugares da instance1);
+    # laboratórios são menores
+    is_lab = rng.random(n_rooms) < args.lab_ratio
+    capacity = args.demand_max * (0.55 + 0.45 * rng.beta(3.0, 1.2, n_rooms))
+    capacity[is_lab] *= 0.6
+    capacity = np.maximum(5, np.rint(capacity / 5) * 5).astype(np.int64)
+    if n_rooms:
+        # garante ao menos uma sala que comporta a maior turma
+        capacity[rng.integers(n_rooms)] = max(args.demand_max, capacity.max())
+    building = rng.integers(1, args.buildings + 1, n_rooms)
+    floor = rng.integers(0, 4, n_rooms)
+    board = rng.choice(len(BOARDS), n_rooms)
+    projector = rng.random(n_rooms) < 0.8
+    w = section('classrooms')
+    per_building = {}
+    for r in range(n_rooms):
+        b = int(building[r])
+        per_building[b] = k = per_building.get(b, 0) + 1
+        prefix = 'LAB' if is_lab[r] else 'SL'
+        w.write(dumps({'ID': r + 1, 'isLab': bool(is_lab[r]), 'capacity': int(capacity[r]), 'buildingID': b,
+                       'description': f'P{b:02d}-{prefix}{int(floor[r])}{k:02d}', 'floor': int(floor[r]),
+                       'board': BOARDS[board[r]], 'projector': bool(projector[r])}))
+    w.close()
+
+    w = section('professors')
+    for i in range(n_prof):
+        w.write(dumps({'code': professor_code(i), 'name': f'PROFESSOR {i + 1}'}))
+    w.close()
+
+    w = section('subjects')
+    for i in range(n_subj):
+        w.write(dumps({'code': f'SUB{i + 1:05d}', 'name': f'DISCIPLINA {i + 1}'}))
+    w.close()
+
+    # encontros em blocos: só um bloco de arrays existe por vez
+    any_lab = bool(is_lab.any())
+    total_demand = 0
+    w = section('meetings')
+    for start in range(0, args.meetings, args.chunk):
+        n = min(args.chunk, args.meetings - start)
+        demand = sample_demand(rng, args.demand, n, args.demand_min, args.demand_max)
+        span = np.minimum(rng.choice(SPAN_SIZES, n, p=SPAN_PROBS), n_sched)
+        first_slot = 1 + (rng.random(n) * (n_sched - span + 1)).astype(np.int64)
+        day = rng.choice(DAYS, n)
+        practical = (rng.random(n) < args.lab_ratio) if any_lab else np.zeros(n, dtype=bool)
+        prof = rng.integers(0, n_prof, n)
+        subj = rng.integers(1, n_subj + 1, n)
+        total_demand += int(demand.sum())
+        for i in range(n):
+            d = int(demand[i])
+            s0 = int(first_slot[i])
+            w.write(dumps({'isPractical': bool(practical[i]), 'professors': [professor_code(int(prof[i]))],
+                           'subjectCode': f'SUB{int(subj[i]):05d}', 'classes': [str(start + i + 1)],
+                           'schedules': list(range(s0, s0 + int(span[i]))), 'demand': d, 'vacancies': d,
+                           'dayOfWeek': int(day[i])}))
+    w.close()
+
+    # preferências de professores (fração --pref-density); restrições com 1/3 dessa densidade
+    def category_rules(key, density):
+        w = section(key)
+        picked = np.flatnonzero(rng.random(n_prof) < density)
+        for i in picked.tolist():
+            w.write(dumps({
+                'category': 'professor', 'categoryCode': professor_code(i),
+                # os leitores só olham buildingId (string); a chave "building" das instâncias
+                # distribuídas é ignorada por eles
+                'buildingId': str(int(rng.integers(1, args.buildings + 1))) if rng.random() < 0.5 else None,
+                'floor': int(rng.integers(0, 4)) if rng.random() < 0.3 else None,
+                'board': BOARDS[rng.integers(len(BOARDS))] if rng.random() < 0.5 else None,
+                'projector': bool(rng.random() < 0.5)}))
+        w.close()
+        return len(picked)
+
+    n_prefs = category_rules('preferences', args.pref_density)
+    n_restr = category_rules('restrictions', args.pref_density / 3)
+
+    # reservas: fração das células (sala, dia, horário), sem repetição
+    cells = n_rooms * len(DAYS) * n_sched
+    n_res = min(cells, int(round(args.reservations * cells)))
+    chosen = set()
+    while len(chosen) < n_res:
+        chosen.update(rng.integers(0, cells, n_res - len(chosen)).tolist())
+    w = section('reservations')
+    for c in sorted(chosen):
+        room, rest = divmod(c, len(DAYS) * n_sched)
+        d, s = divmod(rest, n_sched)
+        w.write(dumps({'classroomID': room + 1, 'dayOfWeek': DAYS[d], 'scheduleID': s + 1}))
+    w.close()
+    fh.write('\n}\n')
+
+    seats = int(capacity.sum()) * len(DAYS) * n_sched
+    return {'meetings': args.meetings, 'classrooms': n_rooms, 'labs': int(is_lab.sum()),
+            'professors': n_prof, 'subjects': n_subj, 'preferences': n_prefs,
+            'restrictions': n_restr, 'reservations': n_res, 'demand_total': total_demand,
+            'seats_total': seats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera uma instância sintética (JSON) para testes de escala.')
+    parser.add_argument('-o', '--output', help='arquivo de saída (padrão: data/generated_instances/'
+                                               'synthetic_<meetings>_s<seed>.json; "-" = stdout)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--meetings', type=int, default=1000)
+    parser.add_argument('--rooms', type=int, default=36)
+    parser.add_argument('--buildings', type=int, default=2)
+    parser.add_argument('--schedules', type=int, default=16, help='horários por dia')
+    parser.add_argument('--professors', type=int, default=0, help='padrão: meetings/4')
+    parser.add_argument('--subjects', type=int, default=0, help='padrão: meetings/3')
+    parser.add_argument('--lab-ratio', type=float, default=0.0,
+                        help='fração de salas que são laboratórios (e de encontros práticos)')
+    parser.add_argument('--demand', choices=DEMAND_DISTS, default='uniform', help='distribuição da demanda')
+    parser.add_argument('--demand-min', type=int, default=10)
+    parser.add_argument('--demand-max', type=int, default=70)
+    parser.add_argument('--pref-density', type=float, default=0.03,
+                        help='fração de professores com preferência')
+    parser.add_argument('--reservations', type=float, default=0.001,
+                        help='fração das células (sala, dia, horário) já reservadas')
+    parser.add_argument('--chunk', type=int, default=65536, help='encontros sorteados por bloco')
+    args = parser.parse_args()
+
+    if args.meetings < 0 or args.rooms < 1 or args.buildings < 1 or args.schedules < 1:
+        parser.error('--meetings >= 0; --rooms, --buildings e --schedules >= 1')
+    if not 1 <= args.demand_min <= args.demand_max:
+        parser.error('esperado 1 <= --demand-min <= --demand-max')
+    for name in ('lab_ratio', 'pref_density', 'reservations'):
+        if not 0.0 <= getattr(args, name) <= 1.0:
+            parser.error(f'--{name.replace("_", "-")} deve estar em [0, 1]')
+    args.chunk = max(1, args.chunk)
+
+    if args.output == '-':
+        summary = generate(sys.stdout, args)
+        out = 'stdout'
+    else:
+        out = Path(args.output) if args.output else INST_DIR / f'synthetic_{args.meetings}_s{args.seed}.json'
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, 'w', encoding='utf-8', buffering=1 << 20) as fh:
+            summary = generate(fh, args)
+
+    print(f'  -> {out}: ' + ', '.join(f'{k}={v}' for k, v in summary.items()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
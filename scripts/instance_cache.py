@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Cache binário colunar das instâncias JSON.
+
+Converte data/generated_instances/<nome>.json em
+data/generated_instances/.cache/<nome>.bin. Strings são internadas em um pool
+único (cada coluna de texto guarda ids inteiros) e campos de tamanho variável
+(scheduleIds, professorCodes, classIds) viram offsets + valores. O cache guarda
+o tamanho e o mtime (ns) do JSON de origem e é descartado quando eles mudam
+(mesma regra dos .pyc do Python).
+
+Leitores:
+  - Python: load_cache(json) devolve arrays NumPy mapeados em memória;
+  - C++: Problem::loadInstanceFile usa o cache automaticamente quando ele está em dia.
+
+Formato (little-endian):
+  0   char[8]  magic "TPINST01"
+  8   uint64   tamanho do JSON de origem
+  16  int64    mtime do JSON de origem (ns)
+  24  uint32   número de arrays N
+  28  uint32   reservado (0)
+  32  N x 72   entradas: char nome[48], char dtype[8] ("i4", "i8", "u1"),
+               uint64 número de elementos, uint64 offset absoluto (alinhado em 8)
+
+Usage:
+  python3 scripts/instance_cache.py [instance.json ...] [--force]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from allocation_engine import normalize_instance  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+INST_DIR = ROOT / 'data' / 'generated_instances'
+
+MAGIC = b'TPINST01'
+HEADER = struct.Struct('<8sQqII')
+ENTRY = struct.Struct('<48s8sQQ')
+
+# seção -> colunas (tipo: i4/u1 escalar, str = id no pool, sufixo [] = campo de tamanho variável)
+SCHEMA = {
+    'schedules': [('id', 'i4'), ('startTime', 'str'), ('endTime', 'str')],
+    'buildings': [('id', 'i4'), ('name', 'str')],
+    'classrooms': [('id', 'i4'), ('isLab', 'u1'), ('capacity', 'i4'), ('buildingId', 'i4'),
+                   ('description', 'str'), ('floor', 'i4'), ('board', 'str'), ('projector', 'u1')],
+    'professors': [('code', 'str'), ('name', 'str')],
+    'subjects': [('code', 'str'), ('name', 'str')],
+    'meetings': [('id', 'str'), ('isPractical', 'u1'), ('professorCodes', 'str[]'), ('subjectCode', 'str'),
+                 ('classIds', 'str[]'), ('scheduleIds', 'i4[]'), ('demand', 'i4'), ('vacancies', 'i4'),
+                 ('dayOfWeek', 'i4')],
+    'preferences': [('id', 'str'), ('category', 'str'), ('categoryCode', 'str'), ('buildingId', 'str'),
+                    ('floor', 'i4'), ('board', 'str'), ('projector', 'u1')],
+    'restrictions': [('id', 'str'), ('category', 'str'), ('categoryCode', 'str'), ('buildingId', 'str'),
+                     ('floor', 'i4'), ('board', 'str'), ('projector', 'u1')],
+    'reservations': [('id', 'str'), ('classroomId', 'i4'), ('dayOfWeek', 'i4'), ('scheduleId', 'i4')],
+}
+
+
+def cache_path(json_path):
+    json_path = Path(json_path)
+    return json_path.parent / '.cache' / (json_path.stem + '.bin')
+
+
+def _source_key(json_path):
+    st = os.stat(json_path)
+    return st.st_size, st.st_mtime_ns
+
+
+# ============= ESCRITA =============
+
+def build_cache(json_path, out_path=None):
+    """Converte um JSON de instância no cache binário (escrita atômica)."""
+    json_path = Path(json_path)
+    out_path = Path(out_path) if out_path else cache_path(json_path)
+    size, mtime_ns = _source_key(json_path)
+    with open(json_path, 'r', encoding='utf-8') as fh:
+        records = normalize_instance(json.load(fh))
+
+    pool = {}
+
+    def intern(s):
+        sid = pool.get(s)
+        if sid is None:
+            sid = pool[s] = len(pool)
+        return sid
+
+    arrays = []
+    for section, columns in SCHEMA.items():
+        rows = records[section]
+        for field, kind in columns:
+            name = f'{section}.{field}'
+            if kind.endswith('[]'):
+                base = kind[:-2]
+                values = [v for r in rows for v in r[field]]
+                if base == 'str':
+                    values = [intern(v) for v in values]
+                offsets = np.zeros(len(rows) + 1, dtype='<i8')
+                np.cumsum([len(r[field]) for r in rows], out=offsets[1:])
+                arrays.append((name + '.offsets', offsets))
+                arrays.append((name + '.values', np.array(values, dtype='<i4')))
+            elif kind == 'str':
+                arrays.append((name, np.array([intern(r[field]) for r in rows], dtype='<i4')))
+            else:
+                arrays.append((name, np.array([r[field] for r in rows], dtype='<' + kind if kind != 'u1' else 'u1')))
+
+    encoded = [s.encode('utf-8') for s in pool]
+    str_offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+    np.cumsum([len(b) for b in encoded], out=str_offsets[1:])
+    arrays.append(('strings.offsets', str_offsets))
+    arrays.append(('strings.data', np.frombuffer(b''.join(encoded), dtype='u1')))
+
+    table_end = HEADER.size + ENTRY.size * len(arrays)
+    offset = (table_end + 7) // 8 * 8
+    entries = []
+    for name, arr in arrays:
+        entries.append((name, arr, offset))
+        offset = (offset + arr.nbytes + 7) // 8 * 8
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(HEADER.pack(MAGIC, size, mtime_ns, len(arrays), 0))
+            for name, arr, off in entries:
+                fh.write(ENTRY.pack(name.encode(), arr.dtype.str.lstrip('<|').encode(), arr.size, off))
+            for name, arr, off in entries:
+                fh.write(b'\0' * (off - fh.tell()))
+                fh.write(arr.tobytes())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return out_path
+
+
+# ============= LEITURA =============
+
+def _read_header(path):
+    with open(path, 'rb') as fh:
+        magic, size, mtime_ns, n, _ = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f'{path}: não é um cache de instância')
+        table = {}
+        for _ in range(n):
+            name, dtype, count, off = ENTRY.unpack(fh.read(ENTRY.size))
+            table[name.rstrip(b'\0').decode()] = (dtype.rstrip(b'\0').decode(), count, off)
+    return size, mtime_ns, table
+
+
+def is_fresh(json_path):
+    """True se o cache existe e foi gerado a partir da versão atual do JSON."""
+    path = cache_path(json_path)
+    if not path.exists():
+        return False
+    try:
+        size, mtime_ns, _ = _read_header(path)
+    except (ValueError, struct.error):
+        return False
+    return (size, mtime_ns) == _source_key(json_path)
+
+
+def ensure_cache(json_path, force=False):
+    """Gera (ou regenera) o cache se estiver ausente ou desatualizado."""
+    if force or not is_fresh(json_path):
+        return build_cache(json_path)
+    return cache_path(json_path)
+
+
+class InstanceCache:
+    """Cache aberto: cada array é uma view sobre o arquivo mapeado em memória."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        _, _, self._table = _read_header(self.path)
+        self._buf = np.memmap(self.path, dtype=np.uint8, mode='r')
+        self._strings = None
+
+    def array(self, name):
+        """Array bruto pelo nome (ex.: 'meetings.demand', 'meetings.scheduleIds.values')."""
+        dtype, count, off = self._table[name]
+        dt = np.dtype(dtype).newbyteorder('<')
+        return self._buf[off:off + count * dt.itemsize].view(dt)
+
+    def names(self):
+        return list(self._table)
+
+    def count(self, section):
+        field, kind = SCHEMA[section][0]
+        name = f'{section}.{field}' + ('.offsets' if kind.endswith('[]') else '')
+        n = self._table[name][1]
+        return n - 1 if kind.endswith('[]') else n
+
+    def strings(self):
+        """Pool de strings decodificado (carregado sob demanda)."""
+        if self._strings is None:
+            offsets = self.array('strings.offsets')
+            data = self.array('strings.data').tobytes()
+            self._strings = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+        return self._strings
+
+    def column(self, section, field):
+        """Coluna decodificada: array NumPy, lista de str, ou lista de listas (campos variáveis)."""
+        kind = dict(SCHEMA[section])[field]
+        name = f'{section}.{field}'
+        if kind.endswith('[]'):
+            offsets = self.array(name + '.offsets')
+            values = self.array(name + '.values')
+            if kind == 'str[]':
+                pool = self.strings()
+                values = [pool[v] for v in values.tolist()]
+            else:
+                values = values.tolist()
+            return [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        arr = self.array(name)
+        if kind == 'str':
+            pool = self.strings()
+            return [pool[v] for v in arr.tolist()]
+        if kind == 'u1':
+            return arr.astype(bool)
+        return arr
+
+    def records(self):
+        """Mesmos registros de allocation_engine.normalize_instance."""
+        out = {}
+        for section, columns in SCHEMA.items():
+            cols = {field: self.column(section, field) for field, _ in columns}
+            n = self.count(section)
+            out[section] = [
+                {field: (cols[field][i].item() if isinstance(cols[field], np.ndarray) else cols[field][i])
+                 for field, _ in columns}
+                for i in range(n)
+            ]
+        return out
+
+
+def load_cache(json_path):
+    """Abre o cache de um JSON, gerando-o antes se necessário."""
+    return InstanceCache(ensure_cache(json_path))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('instances', nargs='*', help='JSONs de instância (padrão: data/generated_instances/*.json)')
+    parser.add_argument('--force', action='store_true', help='regera mesmo se o cache estiver em dia')
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.instances] or sorted(INST_DIR.glob('*.json'))
+    for p in paths:
+        if not args.force and is_fresh(p):
+            print(f'  = {p.name}: cache em dia')
+            continue
+        out = build_cache(p)
+        print(f'  -> {p.name}: {out} ({out.stat().st_size / 1024:.1f} kB, JSON {p.stat().st_size / 1024:.1f} kB)')
+
+
+if __name__ == '__main__':
+    main()
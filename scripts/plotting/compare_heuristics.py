@@ -1,80 +1,70 @@
 #!/usr/bin/env python3
 """
-Gera gráficos comparativos entre heurísticas a partir de data/results/summary_instances.csv
+Gera gráficos comparativos entre heurísticas a partir de data/results/aggregates.json
 
 Compara Greedy vs Partial (com diferentes alphas e seeds) através de boxplots para:
 - Desperdício Médio (vagas não utilizadas por encontro)
 - Taxa de Alocação (% de encontros alocados)
 - Tempo de Execução (segundos)
 
+Os boxplots vêm dos sketches de quantis de cada heurística (todas as
+instâncias e alphas mesclados), então o custo não cresce com o número de execuções.
+
 Saídas: PNG em results/
 """
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import sys
 from pathlib import Path
 
+import matplotlib.pyplot as plt
+import seaborn as sns
+
 # Setup
 ROOT = Path(__file__).resolve().parent.parent.parent
-CSV_DIR = ROOT / 'data' / 'results'
 OUT_DIR = ROOT / 'results'
 OUT_DIR.mkdir(exist_ok=True)
+sys.path.insert(0, str(ROOT / 'scripts'))
+from run_aggregates import AGGREGATES_FILE, AggregateStore  # noqa: E402
 
 # Validar arquivo de entrada
-summary_file = CSV_DIR / 'summary_instances.csv'
-if not summary_file.exists():
-    print(f'Arquivo não encontrado: {summary_file}')
+if not AGGREGATES_FILE.exists():
+    print(f'Arquivo não encontrado: {AGGREGATES_FILE}')
     print('   Rode run_and_aggregate.py primeiro.')
     raise SystemExit(1)
 
-# Carregar dados
-df = pd.read_csv(summary_file)
-print(f'Carregado {len(df)} linhas de {summary_file}')
+# Carregar agregados e mesclar por heurística
+store = AggregateStore.load(AGGREGATES_FILE)
+heuristics = sorted({g.heuristic for g in store.groups()})
+combined = {h: store.combined(heuristic=h) for h in heuristics}
+print(f'Carregado {sum(c.runs for c in combined.values())} execuções de {AGGREGATES_FILE}')
+
 
-# Garantir coluna 'heuristic' (fallback para dados antigos)
-if 'heuristic' not in df.columns and 'file' in df.columns:
-    df['heuristic'] = df['file'].apply(lambda x: 'partial' if 'partial' in x else 'greedy')
+def boxplot(metric, title, ylabel, filename):
+    plt.figure(figsize=(8, 6))
+    ax = plt.gca()
+    boxes = [combined[h].box_stats(metric, label=h) for h in heuristics if combined[h].stats[metric].n > 0]
+    bplot = ax.bxp(boxes, showfliers=False, patch_artist=True)
+    for patch, color in zip(bplot['boxes'], sns.color_palette('Set2', len(boxes))):
+        patch.set_facecolor(color)
+    plt.title(title, fontsize=14, fontweight='bold')
+    plt.ylabel(ylabel, fontsize=12)
+    plt.xlabel('Heurística', fontsize=12)
+    plt.tight_layout()
+    plt.savefig(OUT_DIR / filename, dpi=150)
+    print(f'✓ Gerado: results/{filename}')
+    plt.close()
 
-# Converter colunas numéricas
-numeric_cols = ['Taxa Alocacao (%)', 'Taxa Demanda (%)', 'Desperdicio Medio', 'Runtime(s)']
-for col in numeric_cols:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
 
 # Gerar boxplots comparativos
 print('\nGerando gráficos comparativos...\n')
 
 # 1. Desperdício Médio
-plt.figure(figsize=(8, 6))
-sns.boxplot(data=df, x='heuristic', y='Desperdicio Medio', palette='Set2')
-plt.title('Desperdício Médio por Heurística', fontsize=14, fontweight='bold')
-plt.ylabel('Desperdício (vagas)', fontsize=12)
-plt.xlabel('Heurística', fontsize=12)
-plt.tight_layout()
-plt.savefig(OUT_DIR / 'compare_waste_boxplot.png', dpi=150)
-print('✓ Gerado: results/compare_waste_boxplot.png')
-plt.close()
+boxplot('Desperdicio Medio', 'Desperdício Médio por Heurística', 'Desperdício (vagas)', 'compare_waste_boxplot.png')
 
 # 2. Taxa de Alocação
-plt.figure(figsize=(8, 6))
-sns.boxplot(data=df, x='heuristic', y='Taxa Alocacao (%)', palette='Set2')
-plt.title('Taxa de Alocação por Heurística', fontsize=14, fontweight='bold')
-plt.ylabel('Taxa de Alocação (%)', fontsize=12)
-plt.xlabel('Heurística', fontsize=12)
-plt.tight_layout()
-plt.savefig(OUT_DIR / 'compare_allocation_boxplot.png', dpi=150)
-print('✓ Gerado: results/compare_allocation_boxplot.png')
-plt.close()
+boxplot('Taxa Alocacao (%)', 'Taxa de Alocação por Heurística', 'Taxa de Alocação (%)',
+        'compare_allocation_boxplot.png')
 
 # 3. Tempo de Execução
-plt.figure(figsize=(8, 6))
-sns.boxplot(data=df, x='heuristic', y='Runtime(s)', palette='Set2')
-plt.title('Tempo de Execução por Heurística', fontsize=14, fontweight='bold')
-plt.ylabel('Tempo (segundos)', fontsize=12)
-plt.xlabel('Heurística', fontsize=12)
-plt.tight_layout()
-plt.savefig(OUT_DIR / 'compare_runtime_boxplot.png', dpi=150)
-print('✓ Gerado: results/compare_runtime_boxplot.png')
-plt.close()
+boxplot('Runtime(s)', 'Tempo de Execução por Heurística', 'Tempo (segundos)', 'compare_runtime_boxplot.png')
 
 print('\nProcessamento concluído!')
@@ -2,26 +2,42 @@
 """
 Gráfico mostrando a relação entre alpha (parameter de RCL) 
 e desperdício médio (waste) nas heurísticas parciais.
+
+Lê data/results/aggregates.json (média/desvio de Welford e quartis dos
+sketches), então não depende do número de execuções guardadas.
 """
 
-import pandas as pd
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+from run_aggregates import AGGREGATES_FILE, AggregateStore  # noqa: E402
+
+METRIC = 'Desperdicio Medio'
 
 # Configurar estilo
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 10)
 
-# Carregar dados
-df = pd.read_csv('data/results/summary_instances.csv')
+# Carregar agregados (gerados pelo run_and_aggregate.py)
+if not AGGREGATES_FILE.exists():
+    print(f'Arquivo não encontrado: {AGGREGATES_FILE}')
+    print('   Rode run_and_aggregate.py primeiro (ou scripts/run_aggregates.py <summary.csv>).')
+    raise SystemExit(1)
+store = AggregateStore.load(AGGREGATES_FILE)
 
 # Separar greedy e partial
-greedy = df[df['heuristic'] == 'greedy']
-partial = df[df['heuristic'] == 'partial']
+greedy = store.combined(heuristic='greedy').stats[METRIC]
+alphas = store.alphas('partial')
+partial = {a: store.combined(heuristic='partial', alpha=a) for a in alphas}
+instances = sorted({g.instance for g in store.groups(heuristic='partial')})
 
-greedy_avg = greedy['Desperdicio Medio'].mean()
-greedy_std = greedy['Desperdicio Medio'].std()
+greedy_avg = greedy.mean
+greedy_std = greedy.std if greedy.n > 1 else 0.0
 
 # ============================================================================
 # Gráfico 1: Desperdício Médio vs Alpha (com intervalo de confiança)
@@ -30,9 +46,10 @@ fig, axes = plt.subplots(2, 2, figsize=(15, 12))
 
 # Subplot 1.1: Linha com pontos (todas as instâncias + seed)
 ax = axes[0, 0]
-for instance in sorted(partial['instance'].unique()):
-    inst_data = partial[partial['instance'] == instance].groupby('alpha')['Desperdicio Medio'].mean()
-    ax.plot(inst_data.index, inst_data.values, marker='o', label=instance, linewidth=2, markersize=8)
+for instance in instances:
+    groups = store.groups(instance=instance, heuristic='partial')
+    ax.plot([g.alpha for g in groups], [g.stats[METRIC].mean for g in groups],
+            marker='o', label=instance, linewidth=2, markersize=8)
 
 ax.axhline(y=greedy_avg, color='red', linestyle='--', linewidth=2.5, label=f'Greedy: {greedy_avg:.2f}')
 ax.fill_between([0, 1], greedy_avg - greedy_std, greedy_avg + greedy_std, 
@@ -42,15 +59,16 @@ ax.set_ylabel('Desperdício Médio (vagas/encontro)', fontsize=12, fontweight='b
 ax.set_title('Desperdício Médio vs Alpha (por instância)', fontsize=13, fontweight='bold')
 ax.legend(loc='best', fontsize=10)
 ax.grid(True, alpha=0.3)
-ax.set_xticks([0.25, 0.5, 0.75])
+ax.set_xticks(alphas)
 
-# Subplot 1.2: Box plot por alpha
+# Subplot 1.2: Box plot por alpha (quartis dos sketches de quantis)
 ax = axes[0, 1]
-alpha_order = sorted(partial['alpha'].unique())
-sns.boxplot(data=partial, x='alpha', y='Desperdicio Medio', ax=ax, 
-            palette='Set2', order=alpha_order)
+boxes = [partial[a].box_stats(METRIC, label=f'{a:g}') for a in alphas]
+bplot = ax.bxp(boxes, showfliers=False, patch_artist=True)
+for patch, color in zip(bplot['boxes'], sns.color_palette('Set2', len(boxes))):
+    patch.set_facecolor(color)
 ax.axhline(y=greedy_avg, color='red', linestyle='--', linewidth=2.5, label='Greedy')
-ax.fill_between([-0.5, len(alpha_order)-0.5], greedy_avg - greedy_std, greedy_avg + greedy_std,
+ax.fill_between([0.5, len(alphas) + 0.5], greedy_avg - greedy_std, greedy_avg + greedy_std,
                 alpha=0.2, color='red')
 ax.set_xlabel('Alpha (RCL parameter)', fontsize=12, fontweight='bold')
 ax.set_ylabel('Desperdício Médio (vagas/encontro)', fontsize=12, fontweight='bold')
@@ -60,22 +78,20 @@ ax.grid(True, alpha=0.3, axis='y')
 
 # Subplot 2.1: Diferença relativa vs Greedy
 ax = axes[1, 0]
-alpha_summary = partial.groupby('alpha')['Desperdicio Medio'].agg(['mean', 'std', 'count'])
-alpha_summary['diff_vs_greedy'] = alpha_summary['mean'] - greedy_avg
-alpha_summary['pct_diff'] = (alpha_summary['diff_vs_greedy'] / greedy_avg) * 100
+pct_diff = [(partial[a].stats[METRIC].mean - greedy_avg) / greedy_avg * 100 for a in alphas]
 
-bars = ax.bar(range(len(alpha_summary)), alpha_summary['pct_diff'], 
+bars = ax.bar(range(len(alphas)), pct_diff, 
               color=['#2ecc71', '#f39c12', '#e74c3c'], alpha=0.7, edgecolor='black', linewidth=1.5)
 ax.axhline(y=0, color='red', linestyle='--', linewidth=2, label='Greedy (baseline)')
 ax.set_xlabel('Alpha (RCL parameter)', fontsize=12, fontweight='bold')
 ax.set_ylabel('Diferença Percentual (%)', fontsize=12, fontweight='bold')
 ax.set_title('Diferença Relativa vs Greedy', fontsize=13, fontweight='bold')
-ax.set_xticks(range(len(alpha_summary)))
-ax.set_xticklabels(alpha_summary.index)
+ax.set_xticks(range(len(alphas)))
+ax.set_xticklabels([f'{a:g}' for a in alphas])
 ax.grid(True, alpha=0.3, axis='y')
 
 # Adicionar valores nas barras
-for i, (bar, val) in enumerate(zip(bars, alpha_summary['pct_diff'])):
+for i, (bar, val) in enumerate(zip(bars, pct_diff)):
     ax.text(bar.get_x() + bar.get_width()/2, val + 1, f'{val:.1f}%', 
             ha='center', va='bottom', fontsize=10, fontweight='bold')
 
@@ -87,17 +103,12 @@ ax.axis('off')
 summary_data = []
 summary_data.append(['Heurística', 'Média', 'Desvio', 'Min', 'Max', 'N'])
 summary_data.append(['Greedy', f'{greedy_avg:.4f}', f'{greedy_std:.4f}', 
-                     f'{greedy["Desperdicio Medio"].min():.4f}', 
-                     f'{greedy["Desperdicio Medio"].max():.4f}', f'{len(greedy)}'])
-
-for alpha in sorted(partial['alpha'].unique()):
-    subset = partial[partial['alpha'] == alpha]
-    mean_val = subset['Desperdicio Medio'].mean()
-    std_val = subset['Desperdicio Medio'].std()
-    min_val = subset['Desperdicio Medio'].min()
-    max_val = subset['Desperdicio Medio'].max()
-    summary_data.append([f'Partial (α={alpha})', f'{mean_val:.4f}', f'{std_val:.4f}', 
-                        f'{min_val:.4f}', f'{max_val:.4f}', f'{len(subset)}'])
+                     f'{greedy.min:.4f}', f'{greedy.max:.4f}', f'{greedy.n}'])
+
+for alpha in alphas:
+    w = partial[alpha].stats[METRIC]
+    summary_data.append([f'Partial (α={alpha:g})', f'{w.mean:.4f}', f'{w.std:.4f}', 
+                        f'{w.min:.4f}', f'{w.max:.4f}', f'{w.n}'])
 
 table = ax.table(cellText=summary_data, cellLoc='center', loc='center',
                 colWidths=[0.25, 0.15, 0.15, 0.15, 0.15, 0.1])
@@ -122,7 +133,8 @@ ax.set_title('Resumo Estatístico', fontsize=13, fontweight='bold', pad=20)
 
 # Layout geral
 plt.tight_layout()
-plt.savefig('results/alpha_vs_waste_analysis.png', dpi=300, bbox_inches='tight')
+(ROOT / 'results').mkdir(exist_ok=True)
+plt.savefig(ROOT / 'results' / 'alpha_vs_waste_analysis.png', dpi=300, bbox_inches='tight')
 print("✓ Gráfico salvo: results/alpha_vs_waste_analysis.png")
 
 # ============================================================================
@@ -132,25 +144,27 @@ print("\n" + "=" * 90)
 print("ANÁLISE DETALHADA: DESPERDÍCIO MÉDIO POR ALPHA E INSTÂNCIA")
 print("=" * 90)
 
-summary_by_inst = partial.pivot_table(
-    values='Desperdicio Medio', 
-    index='instance', 
-    columns='alpha', 
-    aggfunc='mean'
-)
-
 print("\nTabela de Desperdício Médio (por instância e alpha):")
-print(summary_by_inst.to_string())
+width = max([len('instance')] + [len(i) for i in instances])
+print(f"{'instance':<{width}}" + ''.join(f'{a:>12g}' for a in alphas))
+for instance in instances:
+    cells = ''
+    for alpha in alphas:
+        groups = store.groups(instance=instance, heuristic='partial', alpha=alpha)
+        cells += f'{groups[0].stats[METRIC].mean:>12.4f}' if groups else f"{'NaN':>12}"
+    print(f'{instance:<{width}}' + cells)
 
 print("\nDiferença percentual vs Greedy (por instância):")
-for instance in sorted(partial['instance'].unique()):
-    greedy_waste = greedy[greedy['instance'] == instance]['Desperdicio Medio'].values[0]
+for instance in instances:
+    greedy_groups = store.groups(instance=instance, heuristic='greedy')
+    if not greedy_groups:
+        continue
+    greedy_waste = greedy_groups[0].stats[METRIC].mean
     print(f"\n{instance}:")
-    for alpha in sorted(partial['alpha'].unique()):
-        partial_waste = partial[(partial['instance'] == instance) & 
-                               (partial['alpha'] == alpha)]['Desperdicio Medio'].mean()
+    for group in store.groups(instance=instance, heuristic='partial'):
+        partial_waste = group.stats[METRIC].mean
         diff_pct = ((partial_waste - greedy_waste) / greedy_waste) * 100
-        print(f"  α={alpha}: {partial_waste:.4f} ({diff_pct:+.2f}% vs greedy {greedy_waste:.4f})")
+        print(f"  α={group.alpha:g}: {partial_waste:.4f} ({diff_pct:+.2f}% vs greedy {greedy_waste:.4f})")
 
 print("\n" + "=" * 90)
 print("INTERPRETAÇÃO")
@@ -1,7 +1,7 @@
 """
 Script para visualizar estatísticas da heurística gulosa com Matplotlib.
-Lê o arquivo greedy_stats.csv gerado por constructive_heuristic.cpp
-e gera gráficos profissionais.
+Lê o arquivo greedy_stats.jsonl (ou greedy_stats.csv) gerado por
+constructive_heuristic.cpp e gera gráficos profissionais.
 Arquivo movido para scripts/plotting; paths relativos usam a raiz do projeto.
 """
 
@@ -19,56 +19,24 @@ plt.rcParams['font.size'] = 10
 # Raiz do projeto (um nível acima desta pasta)
 ROOT = Path(__file__).resolve().parent.parent
 
+sys.path.insert(0, str(ROOT))
+from stats_reader import read_stats  # noqa: E402
 
-def load_stats(csv_file=None):
-    """Carrega estatísticas do arquivo CSV."""
-    if csv_file is None:
-        csv_file = ROOT / 'greedy_stats.csv'
-    else:
-        csv_file = Path(csv_file)
 
-    if not csv_file.exists():
-        print(f"Erro: arquivo '{csv_file}' não encontrado.")
-        print("   Execute primeiro o programa C++ para gerar o arquivo.")
-        sys.exit(1)
-    
-    # Ler as linhas do arquivo
-    with open(csv_file, 'r') as f:
-        lines = f.readlines()
-    
-    # Encontrar onde começa a seção de preferências
-    metrics_lines = []
-    prefs_lines = []
-    in_prefs = False
-    
-    for line in lines:
-        if 'Preferencias por Categoria' in line:
-            in_prefs = True
-            continue
-        
-        if in_prefs:
-            prefs_lines.append(line)
-        else:
-            metrics_lines.append(line)
-    
-    # Converter para DataFrames
-    from io import StringIO
-    df_metrics = pd.read_csv(StringIO(''.join(metrics_lines)))
-    
-    # Processar preferências se existirem e tiverem dados
+def load_stats(stats):
+    """Métricas e preferências como DataFrames (colunas do CSV: Metrica/Valor, Categoria/Total/...)."""
+    metrics = stats.metrics
+    df_metrics = pd.DataFrame({'Metrica': list(metrics), 'Valor': list(metrics.values())})
+
+    prefs = stats.table('preferences')
     df_prefs = pd.DataFrame()
-    if prefs_lines:
-        prefs_content = ''.join(prefs_lines).strip()
-        if prefs_content and 'Categoria' in prefs_lines[0]:
-            try:
-                df_prefs = pd.read_csv(StringIO(prefs_content))
-                # Remover linhas vazias
-                df_prefs = df_prefs.dropna(how='all')
-                if len(df_prefs) == 0 or (len(df_prefs) == 1 and df_prefs.iloc[0].isna().all()):
-                    df_prefs = pd.DataFrame()
-            except:
-                df_prefs = pd.DataFrame()
-    
+    if prefs['category']:
+        df_prefs = pd.DataFrame({
+            'Categoria': prefs['category'],
+            'Total': prefs['total'],
+            'Satisfeitas': prefs['satisfied'],
+            'Taxa (%)': prefs['rate_pct'],
+        })
     return df_metrics, df_prefs
 
 def plot_allocation_overview(df_metrics, results_dir):
@@ -224,56 +192,31 @@ def plot_preferences(df_prefs, results_dir):
     plt.close()
 
 
-def load_detailed_data(csv_file=None):
-    if csv_file is None:
-        csv_file = ROOT / 'greedy_stats.csv'
+def load_detailed_data(stats_file=None):
+    """Abre o arquivo de estatísticas (seções lidas sob demanda, ver scripts/stats_reader.py)."""
+    if stats_file is None:
+        stats_file = ROOT / 'greedy_stats.jsonl'
+        if not stats_file.exists():
+            stats_file = ROOT / 'greedy_stats.csv'
     else:
-        csv_file = Path(csv_file)
-    with open(csv_file, 'r') as f:
-        lines = f.readlines()
-    
-    sections = {}
-    current_section = None
-    section_data = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        if line in ['Ocupacao por Sala', 'Ocupacao por Dia', 'Distribuicao Desperdicio', 'Ocupacao por Dia e Horario']:
-            if current_section:
-                sections[current_section] = section_data
-            current_section = line
-            section_data = []
-        elif current_section and (line.startswith('ClassroomId') or line.startswith('DiaSemanaSemana') or 
-                                  line.startswith('Desperdicio') or line.startswith('DiaSchedule')):
-            continue
-        elif current_section:
-            section_data.append(line)
-    
-    if current_section:
-        sections[current_section] = section_data
-    
-    return sections
+        stats_file = Path(stats_file)
+
+    if not stats_file.exists():
+        print(f"Erro: arquivo '{stats_file}' não encontrado.")
+        print("   Execute primeiro o programa C++ para gerar o arquivo.")
+        sys.exit(1)
+    return read_stats(stats_file)
 
 
 def plot_classroom_occupancy(sections, results_dir):
     fig, axes = plt.subplots(2, 2, figsize=(16, 10))
     fig.suptitle('Análise de Ocupação por Sala', fontsize=14, fontweight='bold')
     
-    classrooms = []
-    occupancy = []
-    utilization = []
-    capacity = []
-    
-    for line in sections.get('Ocupacao por Sala', []):
-        parts = line.split(',')
-        if len(parts) >= 5:
-            classrooms.append(f"S{parts[0]}")
-            occupancy.append(int(parts[1]))
-            utilization.append(float(parts[4]))
-            capacity.append(int(parts[3]))
+    occ = sections.table('classroom_occupancy')
+    classrooms = [f"S{c}" for c in occ['classroom_id']]
+    occupancy = occ['meetings']
+    utilization = occ['util_pct']
+    capacity = occ['capacity']
     
     ax = axes[0, 0]
     colors = ['#2ecc71' if u <= 100 else '#f39c12' if u <= 200 else '#e74c3c' for u in utilization]
@@ -324,15 +267,9 @@ def plot_daily_occupancy(sections, results_dir):
     fig.suptitle('Análise de Ocupação por Dia da Semana', fontsize=14, fontweight='bold')
     
     days = {0: 'Domingo', 1: 'Segunda', 2: 'Terça', 3: 'Quarta', 4: 'Quinta', 5: 'Sexta', 6: 'Sábado'}
-    day_occupancy = {}
-    day_demand = {}
-    
-    for line in sections.get('Ocupacao por Dia', []):
-        parts = line.split(',')
-        if len(parts) >= 3:
-            day_id = int(parts[0])
-            day_occupancy[day_id] = int(parts[1])
-            day_demand[day_id] = int(parts[2])
+    occ = sections.table('day_occupancy')
+    day_occupancy = dict(zip(occ['day'], occ['meetings']))
+    day_demand = dict(zip(occ['day'], occ['demand']))
     
     sorted_days = sorted(day_occupancy.keys())
     day_names = [days.get(d, f'Dia {d}') for d in sorted_days]
@@ -369,12 +306,7 @@ def plot_waste_distribution(sections, results_dir):
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     fig.suptitle('Análise de Desperdício de Capacidade', fontsize=14, fontweight='bold')
     
-    waste_values = []
-    for line in sections.get('Distribuicao Desperdicio', []):
-        try:
-            waste_values.append(int(line))
-        except:
-            pass
+    waste_values = list(sections.table('waste_distribution')['waste'])
     
     if waste_values:
         ax = axes[0]
@@ -403,43 +335,10 @@ def plot_waste_distribution(sections, results_dir):
 
 
 def plot_schedule_heatmap(sections, results_dir):
-    import numpy as np
-    
-    schedule_data = {}
-    for line in sections.get('Ocupacao por Dia e Horario', []):
-        parts = line.split(',')
-        if len(parts) >= 2:
-            key = parts[0]
-            demand = int(parts[1])
-            schedule_data[key] = demand
-    
-    days = {}
-    schedules = set()
-    
-    for key, demand in schedule_data.items():
-        day, sched = key.split('_')
-        day_id = int(day)
-        sched_id = int(sched)
-        schedules.add(sched_id)
-        
-        if day_id not in days:
-            days[day_id] = {}
-        days[day_id][sched_id] = demand
-    
-    sorted_days = sorted(days.keys())
-    sorted_schedules = sorted(schedules)
-    
-    matrix = []
+    matrix, sorted_days, sorted_schedules = sections.schedule_matrix()
     day_names = {0: 'Dom', 1: 'Seg', 2: 'Ter', 3: 'Qua', 4: 'Qui', 5: 'Sex', 6: 'Sab'}
     day_labels = [day_names.get(d, f'D{d}') for d in sorted_days]
     
-    for day_id in sorted_days:
-        row = []
-        for sched_id in sorted_schedules:
-            demand = days[day_id].get(sched_id, 0)
-            row.append(demand)
-        matrix.append(row)
-    
     fig, ax = plt.subplots(figsize=(14, 6))
     im = ax.imshow(matrix, cmap='YlOrRd', aspect='auto')
     
@@ -471,8 +370,8 @@ def main():
     RESULTS_DIR = ROOT / 'results'
     RESULTS_DIR.mkdir(exist_ok=True)
 
-    df_metrics, df_prefs = load_stats(ROOT / 'greedy_stats.csv')
-    sections = load_detailed_data(ROOT / 'greedy_stats.csv')
+    sections = load_detailed_data()
+    df_metrics, df_prefs = load_stats(sections)
 
     try:
         plot_allocation_overview(df_metrics, RESULTS_DIR)
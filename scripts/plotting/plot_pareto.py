@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fronteira de Pareto das metaheurísticas multiobjetivo (pareto_front.csv):
+dispersão de cada par de objetivos, uma cor por arquivo.
+
+Uso: python3 scripts/plotting/plot_pareto.py [pareto_front.csv ...]
+"""
+
+import sys
+from itertools import combinations
+from pathlib import Path
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+OBJECTIVES = ['DemandaNaoAlocada', 'VagasOciosas', 'AlunosEmPe', 'PrefVioladas']
+LABELS = {
+    'DemandaNaoAlocada': 'Demanda não alocada (alunos)',
+    'VagasOciosas': 'Vagas ociosas',
+    'AlunosEmPe': 'Alunos em pé',
+    'PrefVioladas': 'Preferências violadas',
+}
+
+paths = sys.argv[1:] or ['pareto_front.csv']
+fronts = {Path(path).stem: pd.read_csv(path) for path in paths}
+
+# objetivos constantes em todas as fronteiras não rendem gráfico
+objectives = [o for o in OBJECTIVES if any(df[o].nunique() > 1 for df in fronts.values())]
+pairs = list(combinations(objectives, 2)) or [(OBJECTIVES[0], OBJECTIVES[1])]
+
+cols = min(3, len(pairs))
+rows = (len(pairs) + cols - 1) // cols
+fig, axes = plt.subplots(rows, cols, figsize=(6 * cols, 5 * rows), squeeze=False)
+
+for ax, (x, y) in zip(axes.flat, pairs):
+    for name, df in fronts.items():
+        ax.scatter(df[x], df[y], s=30, alpha=0.7, edgecolor='black', linewidth=0.5, label=name)
+    ax.set_xlabel(LABELS[x], fontsize=11, fontweight='bold')
+    ax.set_ylabel(LABELS[y], fontsize=11, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    if len(fronts) > 1:
+        ax.legend(fontsize=9)
+
+for ax in list(axes.flat)[len(pairs):]:
+    ax.axis('off')
+
+fig.suptitle('Fronteira de Pareto', fontsize=14, fontweight='bold')
+plt.tight_layout()
+Path('results').mkdir(exist_ok=True)
+plt.savefig('results/pareto_front.png', dpi=300, bbox_inches='tight')
+print("✓ Gráfico salvo: results/pareto_front.png")
+
+for name, df in fronts.items():
+    print(f"\n{name}: {len(df)} soluções")
+    print(df[OBJECTIVES].describe().loc[['min', 'max']].to_string())
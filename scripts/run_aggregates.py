@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Agregados incrementais das execuções, em memória constante.
+
+Cada grupo (instância, heurística, alpha) guarda, sem reter as execuções:
+  - média, variância (Welford), mínimo e máximo de cada métrica de METRICS
+  - um sketch de quantis (DDSketch, erro relativo de 1%) para as métricas de
+    SKETCH_METRICS: desperdício médio, taxa de alocação e tempo de execução
+  - um reservatório uniforme de até RESERVOIR_SIZE execuções (algoritmo R),
+    pronto para bootstrap (bootstrap_ci)
+  - as seeds das execuções determinísticas já somadas (gulosa, ou parcial com
+    seed != 0), como intervalos contíguos (SeedRanges): a mesma execução vinda
+    de novo (--aggregate-append com as mesmas seeds, ou do cache) é ignorada em
+    vez de contar duas vezes. As varreduras de --seeds/--seed-start são
+    contíguas, então o grupo guarda poucos intervalos em vez de cada seed
+
+Tudo é mesclável: grupos de execuções diferentes (ou de várias instâncias)
+se combinam sem perder nada além da aproximação do sketch. O
+run_and_aggregate.py atualiza data/results/aggregates.json à medida que as
+execuções terminam, e os gráficos leem só esse arquivo.
+
+Usage:
+  from run_aggregates import AggregateStore
+  store = AggregateStore.load()
+  for g in store.groups(heuristic='partial'):
+      g.stats['Desperdicio Medio'].mean, g.sketches['Runtime(s)'].quantile(0.95)
+  merged = store.combined(heuristic='greedy')   # um RunningGroup com tudo somado
+
+  python3 scripts/run_aggregates.py data/results/summary_instances.csv   # (re)gera a partir de um summary
+"""
+import bisect
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGGREGATES_FILE = ROOT / 'data' / 'results' / 'aggregates.json'
+FORMAT_VERSION = 1
+
+METRICS = ['Taxa Alocacao (%)', 'Taxa Demanda (%)', 'Desperdicio Medio', 'Alunos Desalocados', 'Alunos em Pe',
+           'PrefSat(%)', 'Runtime(s)', 'MaxRSS(kB)']
+SKETCH_METRICS = ['Desperdicio Medio', 'Taxa Alocacao (%)', 'Runtime(s)']
+RESERVOIR_SIZE = 1000
+
+
+def _number(value):
+    """float ou None (campos vazios ou não numéricos do summary)."""
+    if value is None or value == '':
+        return None
+    try:
+        x = float(value)
+    except (TypeError, ValueError):
+        return None
+    return x if math.isfinite(x) else None
+
+
+class Welford:
+    """Média e variância em uma passada (Welford); merge pela fórmula de Chan."""
+
+    __slots__ = ('n', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other):
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Variância amostral (n - 1), como o std() do pandas."""
+        return self.m2 / (self.n - 1) if self.n > 1 else float('nan')
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.n > 1 else float('nan')
+
+    def to_dict(self):
+        return {'n': self.n, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min if self.n else None, 'max': self.max if self.n else None}
+
+    @classmethod
+    def from_dict(cls, d):
+        w = cls()
+        w.n, w.mean, w.m2 = d['n'], d['mean'], d['m2']
+        if w.n:
+            w.min, w.max = d['min'], d['max']
+        return w
+
+
+class QuantileSketch:
+    """DDSketch: baldes logarítmicos com erro relativo garantido nos quantis.
+
+    O valor x > 0 cai no balde ceil(log_gamma(x)), gamma = (1 + a) / (1 - a), e o
+    quantil devolvido tem erro relativo <= a. Negativos vão para uma segunda
+    tabela e |x| < MIN_VALUE conta como zero. Com mais de max_buckets baldes,
+    os menores se fundem (perde precisão só na cauda baixa).
+    """
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, x):
+        return math.ceil(math.log(x) / self.log_gamma)
+
+    def _value(self, key):
+        return 2.0 * self.gamma ** key / (self.gamma + 1.0)
+
+    def add(self, x, weight=1):
+        if x > self.MIN_VALUE:
+            k = self._key(x)
+            self.positive[k] = self.positive.get(k, 0) + weight
+            self._collapse(self.positive)
+        elif x < -self.MIN_VALUE:
+            k = self._key(-x)
+            self.negative[k] = self.negative.get(k, 0) + weight
+            self._collapse(self.negative)
+        else:
+            self.zero += weight
+        self.count += weight
+
+    def _collapse(self, store):
+        if len(store) <= self.max_buckets:
+            return
+        keys = sorted(store)
+        excess = len(keys) - self.max_buckets
+        merged = sum(store.pop(k) for k in keys[:excess])
+        store[keys[excess]] += merged
+
+    def merge(self, other):
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, c in theirs.items():
+                mine[k] = mine.get(k, 0) + c
+            self._collapse(mine)
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_dict(self):
+        return {'relative_accuracy': self.relative_accuracy, 'max_buckets': self.max_buckets,
+                'positive': {str(k): c for k, c in self.positive.items()},
+                'negative': {str(k): c for k, c in self.negative.items()},
+                'zero': self.zero, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, d):
+        s = cls(d['relative_accuracy'], d['max_buckets'])
+        s.positive = {int(k): c for k, c in d['positive'].items()}
+        s.negative = {int(k): c for k, c in d['negative'].items()}
+        s.zero, s.count = d['zero'], d['count']
+        return s
+
+
+class Reservoir:
+    """Amostra uniforme de até `size` execuções (algoritmo R).
+
+    O sorteio usa um hash de (grupo, número da execução) em vez de um gerador
+    com estado, então o reservatório salvo em JSON continua do mesmo jeito que
+    continuaria em memória.
+    """
+
+    def __init__(self, key, size=RESERVOIR_SIZE):
+        self.key = key
+        self.size = size
+        self.seen = 0
+        self.items = []
+
+    def _uniform_index(self, n, salt=''):
+        digest = hashlib.blake2b(f'{self.key}|{salt}|{n}'.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % n
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        j = self._uniform_index(self.seen)
+        if j < self.size:
+            self.items[j] = item
+
+    def merge(self, other):
+        """Reservatório da união: cada vaga vem de um dos lados com peso proporcional ao seen."""
+        total = self.seen + other.seen
+        if other.seen == 0:
+            return
+        if total <= self.size:
+            self.items += other.items
+            self.seen = total
+            return
+        mine, theirs = list(self.items), list(other.items)
+        left, right = self.seen, other.seen
+        merged = []
+        for i in range(min(self.size, len(mine) + len(theirs))):
+            pick_mine = theirs == [] or (mine != [] and self._uniform_index(left + right, f'm{i}') < left)
+            source = mine if pick_mine else theirs
+            merged.append(source.pop(self._uniform_index(len(source), f's{i}')))
+            if pick_mine:
+                left -= 1
+            else:
+                right -= 1
+        self.items = merged
+        self.seen = total
+
+    def values(self, metric):
+        return [item[metric] for item in self.items if item.get(metric) is not None]
+
+    def to_dict(self):
+        return {'size': self.size, 'seen': self.seen, 'items': self.items}
+
+    @classmethod
+    def from_dict(cls, key, d):
+        r = cls(key, d['size'])
+        r.seen, r.items = d['seen'], d['items']
+        return r
+
+
+class SeedRanges:
+    """Conjunto de seeds inteiras como intervalos fechados [início, fim], ordenados e sem adjacência."""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __contains__(self, seed):
+        i = bisect.bisect_right(self.starts, seed) - 1
+        return i >= 0 and seed <= self.ends[i]
+
+    def __len__(self):
+        return sum(e - s + 1 for s, e in zip(self.starts, self.ends))
+
+    def add(self, seed):
+        """Insere a seed; False se ela já estava no conjunto."""
+        i = bisect.bisect_right(self.starts, seed) - 1
+        if i >= 0 and seed <= self.ends[i]:
+            return False
+        joins_left = i >= 0 and self.ends[i] == seed - 1
+        joins_right = i + 1 < len(self.starts) and self.starts[i + 1] == seed + 1
+        if joins_left and joins_right:
+            self.ends[i] = self.ends[i + 1]
+            del self.starts[i + 1], self.ends[i + 1]
+        elif joins_left:
+            self.ends[i] = seed
+        elif joins_right:
+            self.starts[i + 1] = seed
+        else:
+            self.starts.insert(i + 1, seed)
+            self.ends.insert(i + 1, seed)
+        return True
+
+    def merge(self, other):
+        starts, ends = [], []
+        for s, e in sorted(zip(self.starts + other.starts, self.ends + other.ends)):
+            if ends and s <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+        self.starts, self.ends = starts, ends
+
+    def to_dict(self):
+        return [[s, e] for s, e in zip(self.starts, self.ends)]
+
+    @classmethod
+    def from_dict(cls, d):
+        """Lê [[início, fim], ...]; aceita também a lista de seeds avulsas dos arquivos antigos."""
+        r = cls()
+        for item in d:
+            if isinstance(item, list):
+                r.merge(cls._single(*item))
+            else:
+                seed = _seed_number(item)
+                if seed is not None:
+                    r.add(seed)
+        return r
+
+    @classmethod
+    def _single(cls, start, end):
+        r = cls()
+        r.starts, r.ends = [start], [end]
+        return r
+
+
+class RunningGroup:
+    """Agregados de um grupo (instância, heurística, alpha)."""
+
+    def __init__(self, instance, heuristic, alpha):
+        self.instance = instance
+        self.heuristic = heuristic
+        self.alpha = alpha
+        self.stats = {m: Welford() for m in METRICS}
+        self.sketches = {m: QuantileSketch() for m in SKETCH_METRICS}
+        self.reservoir = Reservoir(self.key)
+        self.seeds = SeedRanges()  # seeds determinísticas já somadas
+
+    @property
+    def key(self):
+        return f'{self.instance}|{self.heuristic}|{"" if self.alpha is None else self.alpha}'
+
+    @property
+    def runs(self):
+        return self.reservoir.seen
+
+    def add(self, row):
+        """Soma uma execução; False (sem somar) se a execução determinística já estava no grupo."""
+        seed = deterministic_seed(row)
+        if seed is not None and not self.seeds.add(seed):
+            return False
+        sample = {}
+        for metric in METRICS:
+            x = _number(row.get(metric))
+            sample[metric] = x
+            if x is None:
+                continue
+            self.stats[metric].add(x)
+            if metric in self.sketches:
+                self.sketches[metric].add(x)
+        sample['seed'] = row.get('seed', '')
+        self.reservoir.add(sample)
+        return True
+
+    def merge(self, other):
+        for metric in METRICS:
+            self.stats[metric].merge(other.stats[metric])
+        for metric in SKETCH_METRICS:
+            self.sketches[metric].merge(other.sketches[metric])
+        self.reservoir.merge(other.reservoir)
+        self.seeds.merge(other.seeds)
+
+    def box_stats(self, metric, label=None):
+        """Estatísticas de boxplot a partir do sketch (para Axes.bxp); bigodes a 1.5 IQR, limitados a min/max."""
+        sketch, w = self.sketches[metric], self.stats[metric]
+        q1, med, q3 = sketch.quantile(0.25), sketch.quantile(0.5), sketch.quantile(0.75)
+        iqr = q3 - q1
+        return {'label': label if label is not None else self.key, 'med': med, 'q1': q1, 'q3': q3,
+                'whislo': max(w.min, q1 - 1.5 * iqr), 'whishi': min(w.max, q3 + 1.5 * iqr),
+                'mean': w.mean, 'fliers': []}
+
+    def to_dict(self):
+        return {'instance': self.instance, 'heuristic': self.heuristic, 'alpha': self.alpha,
+                'stats': {m: w.to_dict() for m, w in self.stats.items()},
+                'sketches': {m: s.to_dict() for m, s in self.sketches.items()},
+                'reservoir': self.reservoir.to_dict(), 'seeds': self.seeds.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d):
+        g = cls(d['instance'], d['heuristic'], d['alpha'])
+        for m, w in d['stats'].items():
+            if m in g.stats:
+                g.stats[m] = Welford.from_dict(w)
+        for m, s in d['sketches'].items():
+            if m in g.sketches:
+                g.sketches[m] = QuantileSketch.from_dict(s)
+        g.reservoir = Reservoir.from_dict(g.key, d['reservoir'])
+        g.seeds = SeedRanges.from_dict(d.get('seeds', []))
+        return g
+
+
+def _seed_number(seed):
+    """Seed inteira de uma execução determinística; '' (gulosa) vira 0, que a parcial nunca usa
+    (seed 0 é sorteada). None se não for um inteiro."""
+    seed = str(seed).strip()
+    if seed == '':
+        return 0
+    try:
+        return int(seed)
+    except ValueError:
+        return None
+
+
+def deterministic_seed(row):
+    """Seed que identifica uma execução determinística (0 na gulosa); None se a seed foi sorteada."""
+    if row.get('heuristic') == 'greedy':
+        return 0
+    seed = str(row.get('seed', '')).strip()
+    return _seed_number(seed) if seed not in ('', '0') else None
+
+
+def group_key(row):
+    """(instância, heurística, alpha) de uma linha do summary; alpha None para a gulosa."""
+    heuristic = row.get('heuristic', '')
+    alpha = _number(row.get('alpha')) if heuristic != 'greedy' else None
+    return row.get('instance', ''), heuristic, alpha
+
+
+class AggregateStore:
+    """Conjunto de grupos, gravado em data/results/aggregates.json."""
+
+    def __init__(self, path=AGGREGATES_FILE):
+        self.path = Path(path)
+        self._groups = {}
+
+    @classmethod
+    def load(cls, path=AGGREGATES_FILE):
+        store = cls(path)
+        data = json.loads(Path(path).read_text())
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f'{path}: versão {data.get("version")} (esperada {FORMAT_VERSION})')
+        for d in data['groups']:
+            g = RunningGroup.from_dict(d)
+            store._groups[(g.instance, g.heuristic, g.alpha)] = g
+        return store
+
+    def add(self, row):
+        """Soma uma linha do summary ao seu grupo; False se era uma execução determinística repetida."""
+        key = group_key(row)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = RunningGroup(*key)
+        return group.add(row)
+
+    def groups(self, instance=None, heuristic=None, alpha=None):
+        """Grupos filtrados, ordenados por (instância, heurística, alpha)."""
+        out = [g for g in self._groups.values()
+               if (instance is None or g.instance == instance) and (heuristic is None or g.heuristic == heuristic)
+               and (alpha is None or g.alpha == alpha)]
+        return sorted(out, key=lambda g: (g.instance, g.heuristic, -1.0 if g.alpha is None else g.alpha))
+
+    def combined(self, **filters):
+        """Um RunningGroup com os grupos filtrados mesclados (ex.: combined(heuristic='partial', alpha=0.5))."""
+        merged = RunningGroup(filters.get('instance', '*'), filters.get('heuristic', '*'), filters.get('alpha'))
+        for g in self.groups(**filters):
+            merged.merge(g)
+        return merged
+
+    def instances(self):
+        return sorted({g.instance for g in self._groups.values()})
+
+    def alphas(self, heuristic='partial'):
+        return sorted({g.alpha for g in self._groups.values() if g.heuristic == heuristic and g.alpha is not None})
+
+    def save(self):
+        """Grava em um temporário e renomeia (quem lê nunca vê o arquivo pela metade)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': FORMAT_VERSION, 'metrics': METRICS, 'sketch_metrics': SKETCH_METRICS,
+                'groups': [g.to_dict() for g in self.groups()]}
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, self.path)
+
+
+def bootstrap_ci(values, statistic=None, n_boot=2000, confidence=0.95, seed=0):
+    """Intervalo de confiança por bootstrap percentil (ex.: sobre reservoir.values(metric))."""
+    import numpy as np
+
+    data = np.asarray(values, dtype=float)
+    if data.size == 0:
+        return float('nan'), float('nan')
+    statistic = statistic or np.mean
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(data, size=(n_boot, data.size), replace=True)
+    boots = np.apply_along_axis(statistic, 1, samples)
+    tail = (1.0 - confidence) / 2.0
+    return float(np.quantile(boots, tail)), float(np.quantile(boots, 1.0 - tail))
+
+
+def main():
+    import csv
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    store = AggregateStore(AGGREGATES_FILE)
+    with open(sys.argv[1], newline='') as f:
+        for row in csv.DictReader(f):
+            store.add(row)
+    store.save()
+    print(f'{len(store.groups())} grupos gravados em {AGGREGATES_FILE}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Bindings ctypes para bin/libsolver.so (build: `make lib`).
+
+Carrega uma instância uma vez e roda várias configurações da heurística
+sobre ela, sem iniciar o binário nem reler o JSON a cada execução. As
+métricas têm os mesmos nomes do greedy_stats.csv e a alocação volta como
+arrays NumPy indexados pelo encontro.
+
+Usage:
+  python3 scripts/solver_lib.py data/generated_instances/instance1.json --heuristic=partial:0.5:12345
+
+Em código:
+  from solver_lib import Solver
+  with Solver('data/generated_instances/instance1.json') as s:
+      for seed in range(1, 101):
+          res = s.run('partial', alpha=0.5, seed=seed)
+          print(res.metrics['Desperdicio Medio'])
+"""
+import argparse
+import ctypes
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LIB = ROOT / 'bin' / 'libsolver.so'
+INST_DIR = ROOT / 'data' / 'generated_instances'
+
+
+@dataclass
+class SolverResult:
+    metrics: dict             # nome da métrica -> valor (mesmas chaves do greedy_stats.csv)
+    classroom: np.ndarray     # id da sala por encontro (-1 = não alocado)
+    schedule: np.ndarray      # horário por encontro (-1 = não alocado)
+
+
+def _load_library(path):
+    lib = ctypes.CDLL(str(path))
+    lib.solver_load.argtypes = [ctypes.c_char_p]
+    lib.solver_load.restype = ctypes.c_void_p
+    lib.solver_free.argtypes = [ctypes.c_void_p]
+    lib.solver_free.restype = None
+    lib.solver_num_meetings.argtypes = [ctypes.c_void_p]
+    lib.solver_num_meetings.restype = ctypes.c_int
+    lib.solver_num_metrics.argtypes = []
+    lib.solver_num_metrics.restype = ctypes.c_int
+    lib.solver_metric_name.argtypes = [ctypes.c_int]
+    lib.solver_metric_name.restype = ctypes.c_char_p
+    int_p = np.ctypeslib.ndpointer(dtype=np.int32, flags='C_CONTIGUOUS')
+    dbl_p = np.ctypeslib.ndpointer(dtype=np.float64, flags='C_CONTIGUOUS')
+    lib.solver_run.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_double, ctypes.c_uint,
+                               dbl_p, int_p, int_p]
+    lib.solver_run.restype = ctypes.c_int
+    return lib
+
+
+class Solver:
+    """Instância carregada na biblioteca; cada run() parte das reservas originais."""
+
+    def __init__(self, instance, lib_path=DEFAULT_LIB):
+        path = Path(instance)
+        if not path.exists():
+            path = INST_DIR / instance
+        self._lib = _load_library(lib_path)
+        self._handle = self._lib.solver_load(str(path).encode())
+        if not self._handle:
+            raise RuntimeError(f'não foi possível carregar a instância: {path}')
+        self.num_meetings = self._lib.solver_num_meetings(self._handle)
+        self.metric_names = [self._lib.solver_metric_name(i).decode()
+                             for i in range(self._lib.solver_num_metrics())]
+
+    def run(self, heuristic='greedy', alpha=0.5, seed=0):
+        """heuristic: 'greedy' ou 'partial'. seed == 0 -> semente aleatória."""
+        if self._handle is None:
+            raise RuntimeError('Solver já foi fechado')
+        metrics = np.zeros(len(self.metric_names), dtype=np.float64)
+        classroom = np.empty(self.num_meetings, dtype=np.int32)
+        schedule = np.empty(self.num_meetings, dtype=np.int32)
+        placed = self._lib.solver_run(self._handle, heuristic.encode(), float(alpha), int(seed),
+                                      metrics, classroom, schedule)
+        if placed < 0:
+            raise RuntimeError(f'falha ao executar {heuristic}')
+        return SolverResult(dict(zip(self.metric_names, metrics.tolist())), classroom, schedule)
+
+    def close(self):
+        # __init__ pode ter falhado antes de _handle existir
+        if getattr(self, '_handle', None) is not None:
+            self._lib.solver_free(self._handle)
+            self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def main():
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from allocation_engine import parse_heuristic
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('instance')
+    parser.add_argument('--heuristic', default='greedy')
+    parser.add_argument('--lib', default=str(DEFAULT_LIB))
+    args = parser.parse_args()
+
+    name, alpha, seed = parse_heuristic(args.heuristic)
+    with Solver(args.instance, args.lib) as s:
+        res = s.run(name, alpha, seed)
+    for k, v in res.metrics.items():
+        print(f'  {k}: {v:g}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Leitor único das estatísticas gravadas pelo binário.
+
+Aceita os dois formatos:
+  - greedy_stats.jsonl (./bin/app ... --format=jsonl): uma seção tipada por linha,
+    {"section": <nome>, "values": {...}} ou {"section": <nome>, "columns": {<coluna>: [...]}}
+  - greedy_stats.csv: o CSV com seções em texto (formato padrão)
+
+O arquivo é lido uma vez e só separado em seções; cada seção é convertida
+apenas quando acessada.
+
+Seções:
+  run                 heuristic, alpha, seed, elapsed_ms (o que estiver disponível)
+  metrics             bloco Metrica,Valor ({nome: número})
+  preferences         category, total, satisfied, rate_pct
+  classroom_occupancy classroom_id, meetings, demand, capacity, util_pct
+  day_occupancy       day, meetings, demand
+  waste_distribution  waste
+  schedule_occupancy  day, schedule, demand
+  profile             só com --profile: {'phases': {phase, calls, ms, allocs, bytes}, 'peak_rss_kb': n}
+
+Usage:
+  from stats_reader import read_stats
+  stats = read_stats('data/results/greedy_stats_instance1_greedy.jsonl')
+  stats.metrics['Taxa Alocacao (%)'], stats.table('day_occupancy')['demand']
+
+O modo lote (./bin/app --batch=MANIFESTO) com saída "-" escreve em stdout, para
+cada execução, uma linha {"section": "batch", "line": ..., "instance": ..., "load_ms": ...}
+seguida das seções acima; read_batch_stream separa as execuções:
+  for header, stats in read_batch_stream(proc.stdout): ...
+"""
+import csv
+import json
+from pathlib import Path
+
+SECTIONS = ('run', 'metrics', 'preferences', 'classroom_occupancy', 'day_occupancy',
+            'waste_distribution', 'schedule_occupancy', 'profile')
+
+# colunas (nome, tipo) das seções em tabela, na ordem do CSV
+COLUMNS = {
+    'preferences': [('category', str), ('total', int), ('satisfied', int), ('rate_pct', float)],
+    'classroom_occupancy': [('classroom_id', int), ('meetings', int), ('demand', int), ('capacity', int),
+                            ('util_pct', float)],
+    'day_occupancy': [('day', int), ('meetings', int), ('demand', int)],
+    'waste_distribution': [('waste', int)],
+    'schedule_occupancy': [('day', int), ('schedule', int), ('demand', int)],
+    'profile': [('phase', str), ('calls', int), ('ms', float), ('allocs', int), ('bytes', int)],
+}
+
+# títulos das seções no CSV
+CSV_TITLES = {
+    'Preferencias por Categoria': 'preferences',
+    'Ocupacao por Sala': 'classroom_occupancy',
+    'Ocupacao por Dia': 'day_occupancy',
+    'Distribuicao Desperdicio': 'waste_distribution',
+    'Ocupacao por Dia e Horario': 'schedule_occupancy',
+    'Perfil de Execucao': 'profile',
+}
+
+_SECTION_PREFIX = '{"section":"'
+
+
+def _section_name(line):
+    if line.startswith(_SECTION_PREFIX):
+        return line[len(_SECTION_PREFIX):line.index('"', len(_SECTION_PREFIX))]
+    return json.loads(line)['section']
+
+
+def _number(s):
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return float(s)
+        except ValueError:
+            return s
+
+
+class StatsFile:
+    """Estatísticas de uma execução, com seções convertidas sob demanda."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._raw = None
+        self._parsed = {}
+
+    @classmethod
+    def from_jsonl_lines(cls, lines, name='<stdout>.jsonl'):
+        """Estatísticas já em memória (linhas JSON Lines de uma execução)."""
+        stats = cls(name)
+        stats._raw = stats._split_jsonl(lines)
+        return stats
+
+    @property
+    def format(self):
+        return 'jsonl' if self.path.suffix == '.jsonl' else 'csv'
+
+    def sections(self):
+        return [s for s in SECTIONS if s in self._split()]
+
+    def section(self, name):
+        if name not in self._parsed:
+            raw = self._split().get(name)
+            if self.format == 'jsonl':
+                self._parsed[name] = self._parse_jsonl(name, raw)
+            else:
+                self._parsed[name] = self._parse_csv(name, raw)
+        return self._parsed[name]
+
+    @property
+    def run(self):
+        return self.section('run')
+
+    @property
+    def metrics(self):
+        return self.section('metrics')
+
+    def table(self, name):
+        """Seção em tabela como {coluna: lista}."""
+        return self.section(name)
+
+    @property
+    def profile(self):
+        """Perfil por fase do binário (None se a execução não usou --profile)."""
+        return self.section('profile') if 'profile' in self._split() else None
+
+    def preference_totals(self):
+        """(total de preferências, satisfeitas) somando todas as categorias."""
+        prefs = self.table('preferences')
+        return sum(prefs['total']), sum(prefs['satisfied'])
+
+    def schedule_matrix(self):
+        """Demanda por dia x horário: (matriz, dias, horários), ambos ordenados."""
+        import numpy as np
+
+        occ = self.table('schedule_occupancy')
+        days = sorted(set(occ['day']))
+        schedules = sorted(set(occ['schedule']))
+        row = {d: i for i, d in enumerate(days)}
+        col = {s: j for j, s in enumerate(schedules)}
+        matrix = np.zeros((len(days), len(schedules)), dtype=int)
+        for d, s, demand in zip(occ['day'], occ['schedule'], occ['demand']):
+            matrix[row[d], col[s]] = demand
+        return matrix, days, schedules
+
+    # ---- separação em seções (uma leitura do arquivo) ----
+
+    def _split(self):
+        if self._raw is not None:
+            return self._raw
+        text = self.path.read_text(encoding='utf-8')
+        raw = {}
+        if self.format == 'jsonl':
+            raw = self._split_jsonl(text.splitlines())
+        else:
+            current = 'metrics'
+            raw[current] = []
+            for line in text.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                if line in CSV_TITLES:
+                    current = CSV_TITLES[line]
+                    raw[current] = []
+                elif line.startswith('ExecutionTimeMs,'):
+                    raw['run'] = [line]
+                else:
+                    raw[current].append(line)
+            raw.setdefault('run', [])
+        self._raw = raw
+        return raw
+
+    @staticmethod
+    def _split_jsonl(lines):
+        raw = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            raw[_section_name(line)] = line
+        return raw
+
+    # ---- conversão ----
+
+    @staticmethod
+    def _parse_jsonl(name, line):
+        if line is None:
+            return {} if name in ('run', 'metrics') else {c: [] for c, _ in COLUMNS[name]}
+        record = json.loads(line)
+        if name == 'profile':
+            return {'phases': record['columns'], 'peak_rss_kb': record.get('peak_rss_kb')}
+        if name == 'run':
+            return {k: v for k, v in record.items() if k != 'section'}
+        return record['values'] if 'values' in record else record['columns']
+
+    def _parse_csv(self, name, lines):
+        lines = lines or []
+        if name == 'metrics':
+            # primeira linha é o cabeçalho Metrica,Valor
+            return {k: _number(v) for k, v in (l.split(',', 1) for l in lines[1:])}
+        if name == 'run':
+            run = {'heuristic': 'partial' if 'RCL_Total' in self.metrics else 'greedy'}
+            if lines:
+                run['elapsed_ms'] = int(lines[0].split(',', 1)[1])
+            return run
+
+        peak = None
+        if name == 'profile' and lines and lines[-1].startswith('PicoRSS(kB),'):
+            peak = int(lines[-1].split(',', 1)[1])
+            lines = lines[:-1]
+
+        columns = COLUMNS[name]
+        out = {c: [] for c, _ in columns}
+        for row in csv.reader(lines[1:]):
+            if name == 'schedule_occupancy':
+                # chave "dia_horario" vira duas colunas
+                day, sched = row[0].split('_')
+                row = [day, sched] + row[1:]
+            for (col, kind), value in zip(columns, row):
+                out[col].append(kind(value))
+        if name == 'profile':
+            return {'phases': out, 'peak_rss_kb': peak}
+        return out
+
+
+def read_stats(path):
+    """Abre um greedy_stats.jsonl / greedy_stats.csv (nada é convertido até o primeiro acesso)."""
+    return StatsFile(path)
+
+
+def read_batch_stream(lines):
+    """Separa a saída de ./bin/app --batch=... em execuções: gera (cabeçalho, StatsFile).
+
+    lines é qualquer iterável de linhas (arquivo, proc.stdout em modo texto);
+    cabeçalho = {'line', 'instance', 'load_ms'} da linha {"section": "batch"}.
+    """
+    header, body = None, []
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        if _section_name(line) == 'batch':
+            if header is not None:
+                yield header, StatsFile.from_jsonl_lines(body)
+            header = {k: v for k, v in json.loads(line).items() if k != 'section'}
+            body = []
+        else:
+            body.append(line)
+    if header is not None:
+        yield header, StatsFile.from_jsonl_lines(body)
@@ -0,0 +1,135 @@
+#include "include/assignment_io.hpp"
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <iterator>
+#include <nlohmann/json.hpp>
+
+using json = nlohmann::json;
+
+namespace {
+
+const char MAGIC[8] = {'T', 'P', 'A', 'S', 'G', 'N', '0', '1'};
+const size_t HEADER_SIZE = 24;
+const size_t ROW_SIZE = 4 * sizeof(int32_t) + 1;
+
+bool endsWith(const std::string& s, const std::string& suffix) {
+    return s.size() >= suffix.size() && s.compare(s.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+template <typename T>
+void appendLE(std::string& buf, T v) {
+    char bytes[sizeof(T)];
+    std::memcpy(bytes, &v, sizeof(T));
+    buf.append(bytes, sizeof(T));
+}
+
+template <typename T>
+T readLE(const char* p) {
+    T v;
+    std::memcpy(&v, p, sizeof(T));
+    return v;
+}
+
+bool writeBinary(std::ofstream& f, const Problem& p) {
+    const size_t n = p.meetings.size();
+    std::vector<int32_t> room(n, 0), day(n, 0), sched(n, 0);
+    std::vector<uint8_t> allocated(n, 0);
+    for (size_t i = 0; i < n; ++i) day[i] = p.meetings[i].dayOfWeek;
+    for (const Reservation& r : p.reservations) {
+        if (r.meeting < 0 || static_cast<size_t>(r.meeting) >= n) continue;
+        room[r.meeting] = r.classroomId;
+        day[r.meeting] = r.dayOfWeek;
+        sched[r.meeting] = r.scheduleId;
+        allocated[r.meeting] = 1;
+    }
+
+    std::string buf(MAGIC, sizeof(MAGIC));
+    buf.reserve(HEADER_SIZE + ROW_SIZE * n);
+    appendLE<uint64_t>(buf, n);
+    appendLE<uint64_t>(buf, 0);
+    for (size_t i = 0; i < n; ++i) appendLE<int32_t>(buf, static_cast<int32_t>(i));
+    for (const auto* column : {&room, &day, &sched})
+        for (int32_t v : *column) appendLE<int32_t>(buf, v);
+    buf.append(reinterpret_cast<const char*>(allocated.data()), n);
+    f.write(buf.data(), static_cast<std::streamsize>(buf.size()));
+    return static_cast<bool>(f);
+}
+
+bool writeJson(std::ofstream& f, const Problem& p) {
+    json assignments = json::array();
+    for (const Reservation& r : p.reservations) {
+        if (r.meeting < 0) continue;
+        assignments.push_back(
+            {{"meeting", r.meeting}, {"classroomID", r.classroomId}, {"dayOfWeek", r.dayOfWeek}, {"scheduleID", r.scheduleId}});
+    }
+    f << json{{"meetings", p.meetings.size()}, {"assignments", std::move(assignments)}}.dump() << "\n";
+    return static_cast<bool>(f);
+}
+
+bool readBinary(const std::string& path, const std::string& buf, std::vector<Reservation>& out, int& meetings) {
+    const uint64_t n = buf.size() >= HEADER_SIZE ? readLE<uint64_t>(buf.data() + 8) : 0;
+    if (buf.size() < HEADER_SIZE || buf.size() != HEADER_SIZE + ROW_SIZE * n) {
+        std::cerr << "Erro: " << path << " truncado ou corrompido\n";
+        return false;
+    }
+    const char* col = buf.data() + HEADER_SIZE;
+    auto at = [&](int column, size_t i) { return readLE<int32_t>(col + (column * n + i) * sizeof(int32_t)); };
+    const char* allocated = col + 4 * n * sizeof(int32_t);
+    for (size_t i = 0; i < n; ++i) {
+        if (!allocated[i]) continue;
+        Reservation r;
+        r.meeting = at(0, i);
+        r.classroomId = at(1, i);
+        r.dayOfWeek = at(2, i);
+        r.scheduleId = at(3, i);
+        out.push_back(std::move(r));
+    }
+    meetings = static_cast<int>(n);
+    return true;
+}
+
+bool readJson(const std::string& path, const std::string& buf, std::vector<Reservation>& out, int& meetings) {
+    try {
+        const json j = json::parse(buf);
+        meetings = j.at("meetings").get<int>();
+        for (const auto& item : j.at("assignments")) {
+            Reservation r;
+            r.meeting = item.at("meeting").get<int>();
+            r.classroomId = item.at("classroomID").get<int>();
+            r.dayOfWeek = item.at("dayOfWeek").get<int>();
+            r.scheduleId = item.at("scheduleID").get<int>();
+            out.push_back(std::move(r));
+        }
+    } catch (const std::exception& e) {
+        std::cerr << "Erro ao ler a alocacao " << path << ": " << e.what() << std::endl;
+        return false;
+    }
+    return true;
+}
+
+} // namespace
+
+bool writeAssignment(const std::string& path, const Problem& p) {
+    std::ofstream f(path, std::ios::binary);
+    if (!f.is_open()) {
+        std::cerr << "Erro: nao foi possivel criar " << path << "\n";
+        return false;
+    }
+    return endsWith(path, ".json") ? writeJson(f, p) : writeBinary(f, p);
+}
+
+bool readAssignment(const std::string& path, std::vector<Reservation>& out, int& meetings) {
+    std::ifstream f(path, std::ios::binary);
+    if (!f.is_open()) {
+        std::cerr << "Erro ao abrir ou ler o arquivo: " << path << std::endl;
+        return false;
+    }
+    const std::string buf((std::istreambuf_iterator<char>(f)), std::istreambuf_iterator<char>());
+    out.clear();
+    // o formato vem do conteúdo, não da extensão
+    if (buf.size() >= sizeof(MAGIC) && std::memcmp(buf.data(), MAGIC, sizeof(MAGIC)) == 0)
+        return readBinary(path, buf, out, meetings);
+    return readJson(path, buf, out, meetings);
+}
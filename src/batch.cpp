@@ -0,0 +1,163 @@
+#include "include/batch.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/profiling.hpp"
+#include <chrono>
+#include <fstream>
+#include <iostream>
+#include <map>
+#include <nlohmann/json.hpp>
+#include <random>
+#include <sstream>
+
+using ordered_json = nlohmann::ordered_json;
+
+namespace {
+
+bool endsWith(const std::string& s, const std::string& suffix) {
+    return s.size() >= suffix.size() && s.compare(s.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+std::string trim(const std::string& s) {
+    const size_t b = s.find_first_not_of(" \t\r");
+    if (b == std::string::npos) return "";
+    const size_t e = s.find_last_not_of(" \t\r");
+    return s.substr(b, e - b + 1);
+}
+
+StatsFormat outputFormat(const std::string& path, StatsFormat fallback) {
+    if (endsWith(path, ".jsonl")) return StatsFormat::Jsonl;
+    if (endsWith(path, ".csv")) return StatsFormat::Csv;
+    return fallback;
+}
+
+} // namespace
+
+bool readManifest(const std::string& path, std::vector<BatchRun>& out) {
+    std::ifstream f(path);
+    if (!f.is_open()) {
+        std::cerr << "Erro ao abrir o manifesto: " << path << "\n";
+        return false;
+    }
+    std::string text;
+    int lineNo = 0;
+    while (std::getline(f, text)) {
+        ++lineNo;
+        const std::string line = trim(text);
+        if (line.empty() || line[0] == '#') continue;
+
+        std::vector<std::string> fields;
+        std::istringstream ss(line);
+        std::string field;
+        while (std::getline(ss, field, ',')) fields.push_back(trim(field));
+        if (line.back() == ',') fields.push_back("");
+        if (fields[0] == "instance") continue;  // cabeçalho
+        if (fields.size() < 2 || fields.size() > 5) {
+            std::cerr << "Erro: " << path << ":" << lineNo
+                      << ": esperado instance,heuristic,alpha,seed,output\n";
+            return false;
+        }
+        fields.resize(5);
+
+        BatchRun run;
+        run.line = lineNo;
+        run.instance = fields[0];
+        // mesmo tratamento do posicional do binário
+        const std::string prefix = "data/generated_instances/";
+        if (run.instance.rfind(prefix, 0) == 0) run.instance = run.instance.substr(prefix.size());
+        if (fields[1] == "partial") {
+            run.partial = true;
+        } else if (fields[1] != "greedy") {
+            std::cerr << "Erro: " << path << ":" << lineNo << ": heuristica desconhecida " << fields[1]
+                      << " (use greedy ou partial)\n";
+            return false;
+        }
+        try {
+            if (!fields[2].empty()) run.alpha = std::stod(fields[2]);
+            if (!fields[3].empty()) run.seed = static_cast<unsigned int>(std::stoul(fields[3]));
+        } catch (...) {
+            std::cerr << "Erro: " << path << ":" << lineNo << ": alpha ou seed invalido\n";
+            return false;
+        }
+        run.output = fields[4] == "-" ? "" : fields[4];
+        out.push_back(std::move(run));
+    }
+    return true;
+}
+
+int runBatch(const std::vector<BatchRun>& runs, const BatchOptions& options) {
+    using clock = std::chrono::steady_clock;
+
+    // linhas de cada instância, na ordem em que a instância aparece pela primeira vez
+    std::vector<std::string> instances;
+    std::map<std::string, std::vector<const BatchRun*>> runsOf;
+    for (const BatchRun& run : runs) {
+        auto& rows = runsOf[run.instance];
+        if (rows.empty()) instances.push_back(run.instance);
+        rows.push_back(&run);
+    }
+
+    int failed = 0;
+    std::vector<Reservation> reservations;
+    for (const std::string& instance : instances) {
+        const std::vector<const BatchRun*>& rows = runsOf[instance];
+        auto l0 = clock::now();
+        Problem p;
+        if (!p.loadInstanceFile("data/generated_instances/" + instance)) {
+            std::cerr << "Erro: instancia " << instance << " nao pode ser lida; " << rows.size()
+                      << " execucoes puladas\n";
+            failed += static_cast<int>(rows.size());
+            continue;
+        }
+        p.ensurePreferenceIndex();
+        const long long loadMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - l0).count();
+        std::cerr << "Instancia " << instance << ": " << p.meetings.size() << " encontros, lida em " << loadMs
+                  << " ms, " << rows.size() << " execucoes\n";
+
+        for (const BatchRun* run : rows) {
+            prof::reset();  // o perfil de cada execução não inclui a leitura da instância nem as anteriores
+            auto t0 = clock::now();
+            reservations.assign(p.reservations.begin(), p.reservations.end());
+            ConstructionResult res;
+            if (run->partial) {
+                unsigned int seed = run->seed;
+                if (seed == 0) {
+                    std::random_device rd;
+                    seed = rd();
+                }
+                std::mt19937 rng(seed);
+                res = runPartiallyGreedy(p, reservations, run->alpha, rng, options.prefPenalty);
+                res.seed = seed;
+            } else {
+                res = runGreedy(p, reservations);
+            }
+            res.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+
+            if (run->output.empty()) {
+                ordered_json header = {{"section", "batch"}, {"line", run->line}, {"instance", instance},
+                                       {"load_ms", loadMs}};
+                std::cout << header.dump() << "\n";
+                res.writeJsonl(std::cout);
+                if (prof::enabled()) prof::writeJsonl(std::cout);
+                std::cout.flush();
+            } else {
+                const StatsFormat format = outputFormat(run->output, options.format);
+                if (!res.writeStats(run->output, format)) {
+                    std::cerr << "Erro: nao foi possivel criar " << run->output << " (linha " << run->line << ")\n";
+                    ++failed;
+                    continue;
+                }
+                // perfil por fase acrescentado ao arquivo, como nas execuções avulsas
+                if (prof::enabled()) {
+                    std::ofstream stats(run->output, std::ios::app);
+                    if (format == StatsFormat::Jsonl) prof::writeJsonl(stats);
+                    else prof::writeCsv(stats);
+                }
+            }
+            std::cerr << "  linha " << run->line << ": " << (run->partial ? "partial" : "greedy");
+            if (run->partial) std::cerr << " alpha=" << res.alpha << " seed=" << res.seed;
+            std::cerr << " -> " << (run->output.empty() ? "stdout" : run->output) << " (" << res.placed << "/"
+                      << res.total() << " alocados, " << res.elapsedMs << " ms)\n";
+        }
+    }
+    return failed;
+}
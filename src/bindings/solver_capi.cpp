@@ -0,0 +1,112 @@
+// API C da biblioteca compartilhada (bin/libsolver.so), usada por
+// scripts/solver_lib.py via ctypes. Uma instância é carregada uma vez e cada
+// solver_run parte das reservas originais dela, então várias configurações
+// (heurística, alpha, seed) podem rodar sobre o mesmo Problem sem reler o JSON.
+#include "include/problem.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include <exception>
+#include <iostream>
+#include <string>
+
+namespace {
+
+struct SolverHandle {
+    Problem problem;
+    std::vector<Reservation> initialReservations;
+};
+
+const char* METRIC_NAMES[] = {
+    "Encontros Alocados",
+    "Encontros Total",
+    "Taxa Alocacao (%)",
+    "Demanda Alocada",
+    "Demanda Total",
+    "Taxa Demanda (%)",
+    "Desperdicio Medio",
+    "Alunos Desalocados",
+    "Vagas Ociosas SubUtilizadas",
+    "Alunos em Pe",
+    "PrefTotal",
+    "PrefSatisfeitas",
+    "RCL_Total",
+    "RCL_AvgSize",
+    "RCL_MultiCount",
+    "ExecutionTimeMs",
+};
+const int N_METRICS = sizeof(METRIC_NAMES) / sizeof(METRIC_NAMES[0]);
+
+void fill_metrics(const ConstructionResult& r, double* out) {
+    int prefTotal = 0, prefSat = 0;
+    for (const auto& [cat, count] : r.prefCategoryCount) prefTotal += count;
+    for (const auto& [cat, count] : r.prefSatisfied) prefSat += count;
+    const double values[] = {
+        double(r.placed), double(r.total()), r.placementRate(),
+        double(r.demandPlaced), double(r.totalDemand), r.demandRate(),
+        r.avgWaste(), double(r.unallocatedStudents()), double(r.underUtilizedWaste),
+        double(r.standingStudents), double(prefTotal), double(prefSat),
+        double(r.rclTotal), r.rclAvgSize(), double(r.rclMultiCount), double(r.elapsedMs),
+    };
+    for (int i = 0; i < N_METRICS; ++i) out[i] = values[i];
+}
+
+} // namespace
+
+extern "C" {
+
+// Carrega a instância (caminho completo). NULL se não puder ser lida.
+void* solver_load(const char* path) {
+    try {
+        auto* h = new SolverHandle();
+        if (!h->problem.loadInstanceFile(path)) { delete h; return nullptr; }
+        h->initialReservations = h->problem.reservations;
+        return h;
+    } catch (const std::exception& e) {
+        std::cerr << "solver_load: " << e.what() << std::endl;
+        return nullptr;
+    }
+}
+
+void solver_free(void* handle) {
+    delete static_cast<SolverHandle*>(handle);
+}
+
+int solver_num_meetings(void* handle) {
+    return static_cast<int>(static_cast<SolverHandle*>(handle)->problem.meetings.size());
+}
+
+int solver_num_metrics() { return N_METRICS; }
+
+const char* solver_metric_name(int i) {
+    return (i >= 0 && i < N_METRICS) ? METRIC_NAMES[i] : nullptr;
+}
+
+// Executa uma construção. heuristic: "greedy" ou "partial".
+// metrics: solver_num_metrics() posições (ordem de solver_metric_name).
+// classroom/schedule: solver_num_meetings() posições, indexadas pelo encontro;
+// -1 para encontros não alocados. Devolve o número de encontros alocados, ou -1 em erro.
+int solver_run(void* handle, const char* heuristic, double alpha, unsigned int seed,
+               double* metrics, int* classroom, int* schedule) {
+    try {
+        auto* h = static_cast<SolverHandle*>(handle);
+        Problem& p = h->problem;
+        p.reservations = h->initialReservations;
+
+        const std::string heur = heuristic ? heuristic : "greedy";
+        ConstructionResult r = heur.rfind("partial", 0) == 0 ? runPartiallyGreedy(p, alpha, seed) : runGreedy(p);
+
+        if (metrics) fill_metrics(r, metrics);
+        if (classroom && schedule) {
+            for (size_t i = 0; i < p.meetings.size(); ++i) { classroom[i] = -1; schedule[i] = -1; }
+            for (const auto& a : r.assignments) {
+                classroom[a.meeting] = a.classroomId;
+                schedule[a.meeting] = a.scheduleId;
+            }
+        }
+        return r.placed;
+    } catch (const std::exception& e) {
+        std::cerr << "solver_run: " << e.what() << std::endl;
+        return -1;
+    }
+}
+
+} // extern "C"
@@ -0,0 +1,305 @@
+#include "include/constructive/construction_result.hpp"
+#include "include/profiling.hpp"
+#include <cctype>
+#include <fstream>
+#include <iomanip>
+#include <nlohmann/json.hpp>
+
+using ordered_json = nlohmann::ordered_json;
+
+const char* statsFilename(StatsFormat format) {
+    return format == StatsFormat::Jsonl ? "greedy_stats.jsonl" : "greedy_stats.csv";
+}
+
+void ConstructionResult::recordPlacement(const Problem& p, int meeting, int classroomPos, int scheduleId, int waste, int violated) {
+    const Meeting& m = p.meetings[meeting];
+    const Classroom& chosenClassroom = p.classrooms[classroomPos];
+    const int classroomId = chosenClassroom.id;
+    assignments.push_back({meeting, classroomId, m.dayOfWeek, scheduleId});
+
+    ++placed;
+    totalDemand += m.demand;
+    demandPlaced += m.demand;
+    wasteTotal += waste;
+    wasteValues.push_back(waste);
+
+    // Verificar alunos em pé APENAS após alocação: se demanda > capacidade
+    if (m.demand > chosenClassroom.capacity) {
+        standingStudents += (m.demand - chosenClassroom.capacity);
+    }
+
+    // Dados por sala
+    classroomOccupancy[classroomId]++;
+    classroomDemand[classroomId] += m.demand;
+    classroomCapacity[classroomId] = chosenClassroom.capacity;
+
+    // Dados por dia
+    dayOccupancy[m.dayOfWeek]++;
+    dayDemand[m.dayOfWeek] += m.demand;
+
+    // Dados por dia/horário
+    std::string daySchedKey = std::to_string(m.dayOfWeek) + "_" + std::to_string(scheduleId);
+    scheduleOccupancy[daySchedKey].push_back(m.demand);
+
+    // coleta preferências satisfeitas/violadas
+    for (int pi : p.prefIndex.prefsOf(meeting)) {
+        const std::string& cat = p.preferences[pi].category;
+        prefCategoryCount[cat]++;
+        // verifica satisfação (simplificado: apenas conta totais)
+        if (violated == 0) {
+            prefSatisfied[cat]++;
+        } else {
+            // nota: essa é uma aproximação; uma análise mais precisa
+            // exigiria guardar referência à sala escolhida e comparar
+            prefViolated[cat]++;
+        }
+    }
+}
+
+void ConstructionResult::recordUnallocated(const Problem& p, int meeting) {
+    unallocated.push_back(meeting);
+    ++notPlaced;
+    totalDemand += p.meetings[meeting].demand;
+}
+
+void ConstructionResult::recordAll(const Problem& p, const std::vector<Placement>& placements,
+                                   const std::vector<int>& unallocated) {
+    prof::Scope phase("stats");
+    for (const Placement& a : placements) {
+        recordPlacement(p, a.meeting, a.classroomPos, a.scheduleId, a.waste, a.violated);
+    }
+    for (int mi : unallocated) recordUnallocated(p, mi);
+    finalize();
+}
+
+void ConstructionResult::finalize() {
+    // Calcular vagas ociosas em salas com ocupação < 50%
+    underUtilizedWaste = 0;
+    for (const auto& [cid, dem] : classroomDemand) {
+        auto it = classroomCapacity.find(cid);
+        int cap = it == classroomCapacity.end() ? 0 : it->second;
+        if (cap > 0 && dem < cap / 2.0) {
+            underUtilizedWaste += (cap - dem);
+        }
+    }
+}
+
+void ConstructionResult::printReport(std::ostream& out) const {
+    out << "\n";
+    if (heuristic == "partial") {
+        out << "  Parâmetros: alpha = " << std::fixed << std::setprecision(2) << alpha
+            << ", seed = " << seed << "\n\n";
+    } else {
+        // título centralizado na largura da moldura (40)
+        std::string title = heuristic + " HEURISTIC REPORT";
+        for (char& c : title) c = static_cast<char>(std::toupper(static_cast<unsigned char>(c)));
+        const size_t left = title.size() < 40 ? (40 - title.size() + 1) / 2 : 0;
+        const size_t right = title.size() < 40 ? 40 - title.size() - left : 0;
+        out << "========================================\n";
+        out << std::string(left, ' ') << title << std::string(right, ' ') << "\n";
+        out << "========================================\n\n";
+    }
+
+    out << std::fixed << std::setprecision(2);
+    out << "ALOCAÇÃO GERAL:\n";
+    out << "  Encontros alocados:    " << placed << " / " << total()
+        << " (" << placementRate() << "%)\n";
+    out << "  Encontros não alocados: " << notPlaced << "\n";
+    out << "  Demanda alocada:        " << demandPlaced << " / " << totalDemand
+        << " alunos (" << demandRate() << "%)\n";
+    out << "  Desperdício médio:      " << avgWaste() << " vagas/encontro\n";
+
+    out << "\nMÉTRICAS DE REFERÊNCIA:\n";
+    out << "  Alunos desalocados:                      " << unallocatedStudents() << "\n";
+    out << "  Vagas ociosas (<50% ocupação):           " << underUtilizedWaste << "\n";
+    out << "  Alunos em pé (demanda > capacidade):     " << standingStudents << "\n";
+
+    if (!prefCategoryCount.empty()) {
+        out << "\nPREFERÊNCIAS:\n";
+        for (const auto &[cat, count] : prefCategoryCount) {
+            auto s = prefSatisfied.find(cat);
+            auto v = prefViolated.find(cat);
+            int sat = s == prefSatisfied.end() ? 0 : s->second;
+            int viol = v == prefViolated.end() ? 0 : v->second;
+            double satRate = count > 0 ? (100.0 * sat / count) : 0.0;
+            out << "  " << cat << ":\n";
+            out << "    Total:       " << count << "\n";
+            out << "    Satisfeitas: " << sat << " (" << satRate << "%)\n";
+            out << "    Violadas:    " << viol << "\n";
+        }
+    }
+
+    out << "\n========================================\n\n";
+}
+
+void ConstructionResult::writeCsv(std::ostream& csv) const {
+    // formato padrão do ostream (6 dígitos significativos), independente do estado do stream
+    std::ios::fmtflags flags = csv.flags();
+    std::streamsize prec = csv.precision();
+    csv.unsetf(std::ios::floatfield);
+    csv.precision(6);
+
+    csv << "Metrica,Valor\n";
+    csv << "Encontros Alocados," << placed << "\n";
+    csv << "Encontros Total," << total() << "\n";
+    csv << "Taxa Alocacao (%)," << placementRate() << "\n";
+    csv << "Demanda Alocada," << demandPlaced << "\n";
+    csv << "Demanda Total," << totalDemand << "\n";
+    csv << "Taxa Demanda (%)," << demandRate() << "\n";
+    csv << "Desperdicio Medio," << avgWaste() << "\n";
+    csv << "Alunos Desalocados," << unallocatedStudents() << "\n";
+    csv << "Vagas Ociosas SubUtilizadas," << underUtilizedWaste << "\n";
+    csv << "Alunos em Pe," << standingStudents << "\n";
+    if (heuristic == "partial") {
+        csv << "RCL_Total," << rclTotal << "\n";
+        csv << "RCL_AvgSize," << rclAvgSize() << "\n";
+        csv << "RCL_MultiCount," << rclMultiCount << "\n";
+    }
+
+    csv << "\nPreferencias por Categoria\n";
+    csv << "Categoria,Total,Satisfeitas,Taxa (%)\n";
+    for (const auto &[cat, count] : prefCategoryCount) {
+        auto s = prefSatisfied.find(cat);
+        int sat = s == prefSatisfied.end() ? 0 : s->second;
+        double satRate = count > 0 ? (100.0 * sat / count) : 0.0;
+        csv << cat << "," << count << "," << sat << "," << satRate << "\n";
+    }
+
+    // Ocupação por sala
+    csv << "\nOcupacao por Sala\n";
+    csv << "ClassroomId,Encontros,Demanda,Capacidade,TaxaUtilizacao(%)\n";
+    for (const auto &[cid, occ] : classroomOccupancy) {
+        auto c = classroomCapacity.find(cid);
+        int cap = c == classroomCapacity.end() ? 0 : c->second;
+        int dem = classroomDemand.at(cid);
+        double util = cap > 0 ? (100.0 * dem / cap) : 0.0;
+        csv << cid << "," << occ << "," << dem << "," << cap << "," << util << "\n";
+    }
+
+    // Ocupação por dia
+    csv << "\nOcupacao por Dia\n";
+    csv << "DiaSemanaSemana,Encontros,Demanda\n";
+    for (int d = 0; d < 7; ++d) {
+        auto it = dayOccupancy.find(d);
+        if (it != dayOccupancy.end()) {
+            csv << d << "," << it->second << "," << dayDemand.at(d) << "\n";
+        }
+    }
+
+    // Distribuição de desperdício
+    csv << "\nDistribuicao Desperdicio\n";
+    csv << "Desperdicio\n";
+    for (int w : wasteValues) csv << w << "\n";
+
+    // Ocupação por dia/horário
+    csv << "\nOcupacao por Dia e Horario\n";
+    csv << "DiaSchedule,Demanda\n";
+    for (const auto &[key, demands] : scheduleOccupancy) {
+        int totalDemandSched = 0;
+        for (int d : demands) totalDemandSched += d;
+        csv << key << "," << totalDemandSched << "\n";
+    }
+    if (heuristic == "partial") csv << "ExecutionTimeMs," << elapsedMs << "\n";
+
+    csv.flags(flags);
+    csv.precision(prec);
+}
+
+bool ConstructionResult::writeCsv(const std::string& path) const {
+    std::ofstream csv(path);
+    if (!csv.is_open()) return false;
+    writeCsv(csv);
+    return true;
+}
+
+void ConstructionResult::writeJsonl(std::ostream& out) const {
+    ordered_json run = {{"section", "run"}, {"heuristic", heuristic}};
+    if (heuristic == "partial") {
+        run["alpha"] = alpha;
+        run["seed"] = seed;
+    }
+    run["elapsed_ms"] = elapsedMs;
+    out << run.dump() << "\n";
+
+    ordered_json metrics = ordered_json::object();
+    metrics["Encontros Alocados"] = placed;
+    metrics["Encontros Total"] = total();
+    metrics["Taxa Alocacao (%)"] = placementRate();
+    metrics["Demanda Alocada"] = demandPlaced;
+    metrics["Demanda Total"] = totalDemand;
+    metrics["Taxa Demanda (%)"] = demandRate();
+    metrics["Desperdicio Medio"] = avgWaste();
+    metrics["Alunos Desalocados"] = unallocatedStudents();
+    metrics["Vagas Ociosas SubUtilizadas"] = underUtilizedWaste;
+    metrics["Alunos em Pe"] = standingStudents;
+    if (heuristic == "partial") {
+        metrics["RCL_Total"] = rclTotal;
+        metrics["RCL_AvgSize"] = rclAvgSize();
+        metrics["RCL_MultiCount"] = rclMultiCount;
+    }
+    out << ordered_json{{"section", "metrics"}, {"values", metrics}}.dump() << "\n";
+
+    ordered_json prefs = {{"category", ordered_json::array()}, {"total", ordered_json::array()},
+                          {"satisfied", ordered_json::array()}, {"rate_pct", ordered_json::array()}};
+    for (const auto &[cat, count] : prefCategoryCount) {
+        auto s = prefSatisfied.find(cat);
+        int sat = s == prefSatisfied.end() ? 0 : s->second;
+        prefs["category"].push_back(cat);
+        prefs["total"].push_back(count);
+        prefs["satisfied"].push_back(sat);
+        prefs["rate_pct"].push_back(count > 0 ? (100.0 * sat / count) : 0.0);
+    }
+    out << ordered_json{{"section", "preferences"}, {"columns", prefs}}.dump() << "\n";
+
+    ordered_json rooms = {{"classroom_id", ordered_json::array()}, {"meetings", ordered_json::array()},
+                          {"demand", ordered_json::array()}, {"capacity", ordered_json::array()},
+                          {"util_pct", ordered_json::array()}};
+    for (const auto &[cid, occ] : classroomOccupancy) {
+        auto c = classroomCapacity.find(cid);
+        int cap = c == classroomCapacity.end() ? 0 : c->second;
+        int dem = classroomDemand.at(cid);
+        rooms["classroom_id"].push_back(cid);
+        rooms["meetings"].push_back(occ);
+        rooms["demand"].push_back(dem);
+        rooms["capacity"].push_back(cap);
+        rooms["util_pct"].push_back(cap > 0 ? (100.0 * dem / cap) : 0.0);
+    }
+    out << ordered_json{{"section", "classroom_occupancy"}, {"columns", rooms}}.dump() << "\n";
+
+    ordered_json days = {{"day", ordered_json::array()}, {"meetings", ordered_json::array()},
+                         {"demand", ordered_json::array()}};
+    for (int d = 0; d < 7; ++d) {  // mesmos dias da seção do CSV
+        auto it = dayOccupancy.find(d);
+        if (it == dayOccupancy.end()) continue;
+        days["day"].push_back(d);
+        days["meetings"].push_back(it->second);
+        days["demand"].push_back(dayDemand.at(d));
+    }
+    out << ordered_json{{"section", "day_occupancy"}, {"columns", days}}.dump() << "\n";
+
+    out << ordered_json{{"section", "waste_distribution"}, {"columns", {{"waste", wasteValues}}}}.dump() << "\n";
+
+    // chave "dia_horario" separada em duas colunas inteiras
+    ordered_json slots = {{"day", ordered_json::array()}, {"schedule", ordered_json::array()},
+                          {"demand", ordered_json::array()}};
+    for (const auto &[key, demands] : scheduleOccupancy) {
+        size_t sep = key.find('_');
+        int totalDemandSched = 0;
+        for (int d : demands) totalDemandSched += d;
+        slots["day"].push_back(std::stoi(key.substr(0, sep)));
+        slots["schedule"].push_back(std::stoi(key.substr(sep + 1)));
+        slots["demand"].push_back(totalDemandSched);
+    }
+    out << ordered_json{{"section", "schedule_occupancy"}, {"columns", slots}}.dump() << "\n";
+}
+
+bool ConstructionResult::writeJsonl(const std::string& path) const {
+    std::ofstream out(path);
+    if (!out.is_open()) return false;
+    writeJsonl(out);
+    return true;
+}
+
+bool ConstructionResult::writeStats(const std::string& path, StatsFormat format) const {
+    return format == StatsFormat::Jsonl ? writeJsonl(path) : writeCsv(path);
+}
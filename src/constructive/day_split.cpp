@@ -0,0 +1,202 @@
+#include "include/constructive/day_split.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/constructive/multi_start.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <iostream>
+#include <map>
+#include <random>
+#include <thread>
+
+namespace {
+
+// Junta os resultados dos dias num só, com alocações, desperdícios e não alocados
+// na ordem global da construção (rank = posição do encontro nela)
+ConstructionResult mergeDays(std::vector<ConstructionResult>& parts, const std::vector<int>& rank) {
+    prof::Scope phase("stats");
+    ConstructionResult out;
+    out.heuristic = parts.empty() ? "greedy" : parts.front().heuristic;
+    out.alpha = parts.empty() ? 0.0 : parts.front().alpha;
+
+    struct Item { int rank; int part; size_t k; };
+    std::vector<Item> placedItems, unallocatedItems;
+    for (size_t d = 0; d < parts.size(); ++d) {
+        ConstructionResult& r = parts[d];
+        for (size_t k = 0; k < r.assignments.size(); ++k) {
+            placedItems.push_back({rank[r.assignments[k].meeting], static_cast<int>(d), k});
+        }
+        for (size_t k = 0; k < r.unallocated.size(); ++k) {
+            unallocatedItems.push_back({rank[r.unallocated[k]], static_cast<int>(d), k});
+        }
+
+        out.placed += r.placed;
+        out.notPlaced += r.notPlaced;
+        out.totalDemand += r.totalDemand;
+        out.demandPlaced += r.demandPlaced;
+        out.wasteTotal += r.wasteTotal;
+        out.standingStudents += r.standingStudents;
+        for (const auto& [cat, n] : r.prefSatisfied) out.prefSatisfied[cat] += n;
+        for (const auto& [cat, n] : r.prefViolated) out.prefViolated[cat] += n;
+        for (const auto& [cat, n] : r.prefCategoryCount) out.prefCategoryCount[cat] += n;
+        for (const auto& [cid, n] : r.classroomOccupancy) out.classroomOccupancy[cid] += n;
+        for (const auto& [cid, n] : r.classroomDemand) out.classroomDemand[cid] += n;
+        for (const auto& [cid, cap] : r.classroomCapacity) out.classroomCapacity[cid] = cap;
+        for (const auto& [day, n] : r.dayOccupancy) out.dayOccupancy[day] += n;
+        for (const auto& [day, n] : r.dayDemand) out.dayDemand[day] += n;
+        for (auto& [key, demands] : r.scheduleOccupancy) {
+            std::vector<int>& dst = out.scheduleOccupancy[key];
+            dst.insert(dst.end(), demands.begin(), demands.end());
+        }
+        out.rclTotal += r.rclTotal;
+        out.rclSizeSum += r.rclSizeSum;
+        out.rclMultiCount += r.rclMultiCount;
+    }
+
+    auto byRank = [](const Item& a, const Item& b) { return a.rank < b.rank; };
+    std::sort(placedItems.begin(), placedItems.end(), byRank);
+    std::sort(unallocatedItems.begin(), unallocatedItems.end(), byRank);
+    out.assignments.reserve(placedItems.size());
+    out.wasteValues.reserve(placedItems.size());
+    for (const Item& it : placedItems) {
+        out.assignments.push_back(parts[it.part].assignments[it.k]);
+        out.wasteValues.push_back(parts[it.part].wasteValues[it.k]);
+    }
+    out.unallocated.reserve(unallocatedItems.size());
+    for (const Item& it : unallocatedItems) out.unallocated.push_back(parts[it.part].unallocated[it.k]);
+
+    out.finalize();
+    return out;
+}
+
+} // namespace
+
+DaySplitResult runByDay(Problem& p, const DaySplitOptions& options) {
+    using clock = std::chrono::steady_clock;
+    auto t0 = clock::now();
+
+    DaySplitResult out;
+    out.seed = options.seed;
+    if (options.partial && out.seed == 0) {
+        std::random_device rd;
+        out.seed = rd();
+    }
+
+    // montado uma vez aqui; as threads só leem p
+    p.ensurePreferenceIndex();
+
+    // encontros (na ordem da instância) e reservas fixas de cada dia
+    std::map<int, std::vector<int>> meetingsOfDay;
+    for (size_t i = 0; i < p.meetings.size(); ++i) {
+        meetingsOfDay[p.meetings[i].dayOfWeek].push_back(static_cast<int>(i));
+    }
+    std::map<int, std::vector<Reservation>> reservationsOfDay;
+    for (const Reservation& r : p.reservations) {
+        if (meetingsOfDay.count(r.dayOfWeek)) reservationsOfDay[r.dayOfWeek].push_back(r);
+    }
+
+    std::vector<std::vector<int>> dayMeetings;
+    for (auto& [day, meetings] : meetingsOfDay) {
+        DayRun run;
+        run.day = day;
+        run.meetings = static_cast<int>(meetings.size());
+        run.fixedReservations = static_cast<int>(reservationsOfDay[day].size());
+        if (options.partial) run.seed = multiStartSeed(out.seed, day);
+        out.days.push_back(run);
+        dayMeetings.push_back(std::move(meetings));
+    }
+    const int nDays = static_cast<int>(out.days.size());
+
+    int threads = options.threads > 0 ? options.threads : static_cast<int>(std::thread::hardware_concurrency());
+    threads = std::max(1, std::min(threads, nDays));
+    out.threads = threads;
+
+    // dias maiores primeiro, para nenhuma thread pegar um dia grande no fim
+    std::vector<int> order(nDays);
+    for (int d = 0; d < nDays; ++d) order[d] = d;
+    std::stable_sort(order.begin(), order.end(), [&](int a, int b) {
+        return out.days[a].meetings > out.days[b].meetings;
+    });
+
+    std::vector<ConstructionResult> parts(nDays);
+    std::atomic<int> next{0};
+    auto worker = [&](int t) {
+        for (int i = next++; i < nDays; i = next++) {
+            auto d0 = clock::now();
+            const int d = order[i];
+            DayRun& run = out.days[d];
+            std::vector<Reservation> reservations = std::move(reservationsOfDay.at(run.day));
+            reservations.reserve(reservations.size() + dayMeetings[d].size());
+            if (options.partial) {
+                std::mt19937 rng(run.seed);
+                parts[d] = runPartiallyGreedy(p, reservations, std::move(dayMeetings[d]), options.alpha, rng,
+                                              options.prefPenalty);
+            } else {
+                parts[d] = runGreedy(p, reservations, std::move(dayMeetings[d]));
+            }
+            run.placed = parts[d].placed;
+            run.thread = t;
+            run.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - d0).count();
+        }
+    };
+
+    std::vector<std::thread> pool;
+    for (int t = 1; t < threads; ++t) pool.emplace_back(worker, t);
+    worker(0);
+    for (auto& th : pool) th.join();
+
+    // posição de cada encontro na ordem da construção global
+    std::vector<int> idx(p.meetings.size());
+    for (size_t i = 0; i < idx.size(); ++i) idx[i] = static_cast<int>(i);
+    std::stable_sort(idx.begin(), idx.end(), [&](int a, int b) {
+        return p.meetings[a].demand > p.meetings[b].demand;
+    });
+    std::vector<int> rank(p.meetings.size());
+    for (size_t k = 0; k < idx.size(); ++k) rank[idx[k]] = static_cast<int>(k);
+
+    out.result = mergeDays(parts, rank);
+    if (options.partial) {
+        out.result.heuristic = "partial";
+        out.result.seed = out.seed;
+    }
+    out.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+    out.result.elapsedMs = out.elapsedMs;
+    return out;
+}
+
+void byDayConstruct(Problem& p, const DaySplitOptions& options, StatsFormat format) {
+    DaySplitResult ds = runByDay(p, options);
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  Decomposicao por dia: " << ds.days.size() << " dias em " << ds.threads << " threads";
+        if (options.partial) std::cout << " (seed mestre " << ds.seed << ")";
+        std::cout << "\n";
+        for (const DayRun& d : ds.days) {
+            std::cout << "    Dia " << d.day << ": " << d.placed << " / " << d.meetings << " encontros alocados, "
+                      << d.fixedReservations << " reservas fixas, " << d.elapsedMs << " ms (thread " << d.thread
+                      << ")\n";
+        }
+        ds.result.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = ds.result.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Dados exportados para: " << statsFilename(format) << "\n";
+        std::cout << "Tempo de execucao (ms): " << ds.elapsedMs << "\n";
+    }
+
+    for (const Assignment& a : ds.result.assignments) {
+        Reservation r;
+        r.id = p.meetings[a.meeting].id;
+        r.meeting = a.meeting;
+        r.classroomId = a.classroomId;
+        r.dayOfWeek = a.dayOfWeek;
+        r.scheduleId = a.scheduleId;
+        p.reservations.push_back(std::move(r));
+    }
+}
@@ -0,0 +1,902 @@
+#include "include/constructive/exact_matching.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/occupancy.hpp"
+#include "include/room_index.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <climits>
+#include <cmath>
+#include <fstream>
+#include <iostream>
+#include <limits>
+#include <map>
+#include <thread>
+#include <unordered_map>
+
+namespace {
+
+// custo de uma aresta proibida no húngaro (a sobra com custo 0 sempre existe, então nunca é escolhida)
+constexpr double FORBIDDEN = 1e15;
+// no relaxado, bloco com mais entradas que isso na matriz encontros x tipos fica
+// só com o limite por contagem de salas
+constexpr size_t MAX_TYPE_ENTRIES = size_t(1) << 24;
+
+// custo do encontro na sala (posição em p.classrooms); -1 se a sala não serve.
+// Sala de id 0 nunca é usada: a gulosa trata id 0 como "nenhuma sala".
+int roomCost(const Problem& p, int mi, size_t ci, int prefPenalty) {
+    const Meeting& m = p.meetings[mi];
+    const Classroom& c = p.classrooms[ci];
+    if (c.id == 0 || c.capacity < m.demand || (m.isPractical && !c.isLab)) return -1;
+    return c.capacity - m.demand + prefPenalty * p.prefIndex.violationsOf(mi)[ci];
+}
+
+// Melhor sala livre na célula (menor custo; empate: a primeira da instância),
+// com a mesma varredura por capacidade da gulosa. false se nenhuma serve.
+bool bestFreeRoom(const Problem& p, const RoomIndex& roomIndex, const OccupancyIndex& occupancy, int mi,
+                  int dayIdx, int schedIdx, int prefPenalty, int& bestCost, size_t& bestPos) {
+    const Meeting& m = p.meetings[mi];
+    const std::vector<int>& rooms = roomIndex.rooms(m.isPractical);
+    const std::vector<int>& capacities = roomIndex.capacities(m.isPractical);
+    const std::vector<int>& viol = p.prefIndex.violationsOf(mi);
+    bestCost = INT_MAX;
+    bool found = false;
+    for (size_t k = roomIndex.firstFitting(m.isPractical, m.demand); k < rooms.size(); ++k) {
+        const int waste = capacities[k] - m.demand;
+        if (waste > bestCost) break;
+        const size_t ci = rooms[k];
+        if (p.classrooms[ci].id == 0 || !occupancy.isFree(ci, dayIdx, schedIdx)) continue;
+        const int cost = waste + prefPenalty * viol[ci];
+        if (cost < bestCost || (cost == bestCost && ci < bestPos)) {
+            bestCost = cost;
+            bestPos = ci;
+            found = true;
+        }
+    }
+    return found;
+}
+
+// Atribuição de custo mínimo (método húngaro com potenciais, O(n^2 m)), n <= m.
+// a: matriz n x m por linha; devolve a coluna de cada linha.
+std::vector<int> hungarian(int n, int m, const std::vector<double>& a) {
+    const double inf = std::numeric_limits<double>::infinity();
+    std::vector<double> u(n + 1, 0.0), v(m + 1, 0.0), minv(m + 1);
+    std::vector<int> owner(m + 1, 0), way(m + 1, 0);
+    std::vector<char> used(m + 1);
+    for (int i = 1; i <= n; ++i) {
+        owner[0] = i;
+        int j0 = 0;
+        std::fill(minv.begin(), minv.end(), inf);
+        std::fill(used.begin(), used.end(), 0);
+        do {
+            used[j0] = 1;
+            const int i0 = owner[j0];
+            const double* row = &a[static_cast<size_t>(i0 - 1) * m];
+            double delta = inf;
+            int j1 = 0;
+            for (int j = 1; j <= m; ++j) {
+                if (used[j]) continue;
+                const double cur = row[j - 1] - u[i0] - v[j];
+                if (cur < minv[j]) {
+                    minv[j] = cur;
+                    way[j] = j0;
+                }
+                if (minv[j] < delta) {
+                    delta = minv[j];
+                    j1 = j;
+                }
+            }
+            for (int j = 0; j <= m; ++j) {
+                if (used[j]) {
+                    u[owner[j]] += delta;
+                    v[j] -= delta;
+                } else {
+                    minv[j] -= delta;
+                }
+            }
+            j0 = j1;
+        } while (owner[j0] != 0);
+        do {
+            const int j1 = way[j0];
+            owner[j0] = owner[j1];
+            j0 = j1;
+        } while (j0);
+    }
+    std::vector<int> col(n, -1);
+    for (int j = 1; j <= m; ++j) {
+        if (owner[j] > 0) col[owner[j] - 1] = j - 1;
+    }
+    return col;
+}
+
+// Atribuição ótima de nM encontros a nC células em que qualquer encontro pode
+// ficar de fora: cost(i, k) < 0 se a célula não serve, save(i) é quanto o
+// encontro economiza ao ser alocado. Só entram encontros e células com alguma
+// aresta que compensa (cost < save); o lado menor vira linha e as colunas são o
+// outro lado mais uma sobra de custo 0 por linha. Devolve os pares (i, k)
+// escolhidos e soma em value os custos reduzidos (cost - save, sempre < 0).
+template <class Cost, class Save>
+std::vector<std::pair<int, int>> optionalAssignment(int nM, int nC, Cost cost, Save save, double& value) {
+    std::vector<std::pair<int, int>> out;
+    if (nM == 0 || nC == 0) return out;
+    std::vector<double> w(static_cast<size_t>(nM) * nC, FORBIDDEN);
+    std::vector<int> rows, cols;
+    std::vector<char> colUsed(nC, 0);
+    for (int i = 0; i < nM; ++i) {
+        const double s = save(i);
+        bool any = false;
+        for (int k = 0; k < nC; ++k) {
+            const int c = cost(i, k);
+            if (c < 0 || c - s >= 0) continue;  // não serve ou não compensa: a sobra (0) é melhor
+            w[static_cast<size_t>(i) * nC + k] = c - s;
+            colUsed[k] = 1;
+            any = true;
+        }
+        if (any) rows.push_back(i);
+    }
+    for (int k = 0; k < nC; ++k) {
+        if (colUsed[k]) cols.push_back(k);
+    }
+    if (rows.empty()) return out;
+
+    const int rM = static_cast<int>(rows.size()), rC = static_cast<int>(cols.size());
+    const bool rowsAreMeetings = rM <= rC;
+    const int n = std::min(rM, rC);
+    const int m = rM + rC;
+    std::vector<double> a(static_cast<size_t>(n) * m, 0.0);
+    for (int i = 0; i < rM; ++i) {
+        for (int k = 0; k < rC; ++k) {
+            const double x = w[static_cast<size_t>(rows[i]) * nC + cols[k]];
+            if (rowsAreMeetings) a[static_cast<size_t>(i) * m + k] = x;
+            else a[static_cast<size_t>(k) * m + i] = x;
+        }
+    }
+    const std::vector<int> col = hungarian(n, m, a);
+    for (int r = 0; r < n; ++r) {
+        const int j = col[r];
+        const int i = rowsAreMeetings ? r : j;
+        const int k = rowsAreMeetings ? j : r;
+        if (i >= rM || k >= rC) continue;  // sobra
+        const double x = a[static_cast<size_t>(r) * m + j];
+        if (x >= FORBIDDEN / 2) continue;
+        value += x;
+        out.emplace_back(rows[i], cols[k]);
+    }
+    return out;
+}
+
+// Transporte de custo mínimo: cada uma das n linhas vai para uma coluna e a
+// coluna j recebe até cap[j] linhas (caminhos aumentantes com potenciais, como o
+// húngaro, mas com colunas de capacidade). cost(i, j): custo da linha i na
+// coluna j. A última coluna precisa de capacidade n. Devolve a coluna de cada linha.
+template <class Cost>
+std::vector<int> transport(int n, const std::vector<int>& cap, Cost cost) {
+    const double inf = std::numeric_limits<double>::infinity();
+    const int m = static_cast<int>(cap.size());
+    std::vector<double> u(n, 0.0), v(m, 0.0), dist(m), rowDist(n);
+    std::vector<int> colOf(n, -1), way(m);
+    std::vector<std::vector<int>> members(m);
+    std::vector<char> used(m);
+    std::vector<int> tree, reached;
+    // início com v = 0: cada linha numa coluna de menor custo que ainda tenha vaga
+    // (aresta justa com u = esse custo); só as outras precisam de caminho aumentante
+    std::vector<int> pending;
+    for (int i = 0; i < n; ++i) {
+        double best = inf;
+        int free = -1;
+        for (int j = 0; j < m; ++j) {
+            const double c = cost(i, j);
+            if (c > best) continue;
+            const bool vacant = static_cast<int>(members[j].size()) < cap[j];
+            if (c < best) {
+                best = c;
+                free = vacant ? j : -1;
+            } else if (free < 0 && vacant) {
+                free = j;
+            }
+        }
+        if (free >= 0) {
+            u[i] = best;
+            members[free].push_back(i);
+            colOf[i] = free;
+        } else {
+            pending.push_back(i);
+        }
+    }
+    for (int i : pending) {
+        // Dijkstra pelos custos reduzidos: linha -> coluna -> linhas já nela,
+        // até uma coluna com vaga
+        std::fill(dist.begin(), dist.end(), inf);
+        std::fill(used.begin(), used.end(), 0);
+        tree.assign(1, i);
+        reached.clear();
+        rowDist[i] = 0.0;
+        size_t scanned = 0;
+        int end;
+        while (true) {
+            for (; scanned < tree.size(); ++scanned) {
+                const int r = tree[scanned];
+                for (int j = 0; j < m; ++j) {
+                    if (used[j]) continue;
+                    const double d = rowDist[r] + cost(r, j) - u[r] - v[j];
+                    if (d < dist[j]) {
+                        dist[j] = d;
+                        way[j] = r;
+                    }
+                }
+            }
+            end = -1;
+            for (int j = 0; j < m; ++j) {
+                if (!used[j] && (end < 0 || dist[j] < dist[end])) end = j;
+            }
+            used[end] = 1;
+            if (static_cast<int>(members[end].size()) < cap[end]) break;
+            reached.push_back(end);
+            for (int r : members[end]) {
+                rowDist[r] = dist[end];
+                tree.push_back(r);
+            }
+        }
+        // potenciais: as arestas usadas continuam justas e nenhuma fica negativa
+        const double total = dist[end];
+        for (int r : tree) u[r] += total - rowDist[r];
+        for (int j : reached) v[j] -= total - dist[j];
+        // cada linha do caminho passa para a coluna seguinte
+        for (int j = end;;) {
+            const int r = way[j];
+            const int prev = colOf[r];
+            members[j].push_back(r);
+            colOf[r] = j;
+            if (prev < 0) break;
+            std::vector<int>& from = members[prev];
+            from.erase(std::find(from.begin(), from.end(), r));
+            j = prev;
+        }
+    }
+    return colOf;
+}
+
+// estimativa de operações do húngaro para nM encontros x nC células
+long long assignmentWork(long long nM, long long nC) {
+    const long long side = std::min(nM, nC);
+    return side * side * (nM + nC);
+}
+
+// Um bloco (dia, horário): encontros que podem usar o horário x salas livres na célula.
+// Salas com o mesmo id dividem a célula e viram um nó só (vale a de menor custo).
+struct Block {
+    int day = 0;
+    int scheduleId = 0;
+    int dayIdx = -1;
+    int schedIdx = -1;
+    int component = -1;
+    std::vector<int> meetings;
+    std::vector<int> groups;  // grupos de salas (por id) livres na célula
+    bool large = false;       // só no relaxado: tipos demais para guardar (MAX_TYPE_ENTRIES)
+    // custo (-1: não serve) e sala escolhida, encontros x grupos (componentes exatos)
+    std::vector<int> cost;
+    std::vector<int> pos;
+    // relaxados: grupos com o mesmo custo para todos os encontros do bloco são
+    // intercambiáveis e viram um tipo, com capacidade = número de grupos
+    std::vector<std::vector<int>> typeGroups;  // índices em groups
+    std::vector<int> typeCost;                 // tipos x encontros
+    // blocos grandes: melhor sala livre de cada encontro (custo -1 se nenhuma)
+    std::vector<int> bestCost;
+    std::vector<int> bestPos;
+
+    int costAt(size_t i, size_t g) const { return cost[i * groups.size() + g]; }
+    int posAt(size_t i, size_t g) const { return pos[i * groups.size() + g]; }
+};
+
+// Blocos do mesmo dia ligados por encontros de vários horários: a alocação de
+// um componente não depende da dos outros.
+struct Component {
+    std::vector<int> blocks;
+    std::vector<int> meetings;  // ordem da instância
+    int cells = 0;
+    bool relaxed = false;       // grande demais para a atribuição conjunta
+};
+
+struct Match {
+    int meeting;
+    int pos;         // sala em p.classrooms
+    int scheduleId;
+    int cost;        // custo real
+};
+
+struct Solution {
+    double value = 0.0;  // soma dos custos reduzidos escolhidos (<= 0)
+    std::vector<Match> matches;
+};
+
+// Componente inteiro como uma atribuição só (encontros x células sala-horário): exato
+Solution solveComponent(const Component& comp, const std::vector<Block>& blocks, double unallocatedPenalty) {
+    Solution out;
+    const int nM = static_cast<int>(comp.meetings.size());
+    // posição do encontro (índice em comp.meetings) em cada bloco do componente; -1 se não está
+    std::unordered_map<int, int> indexOf;
+    for (int i = 0; i < nM; ++i) indexOf[comp.meetings[i]] = i;
+    std::vector<int> local(static_cast<size_t>(nM) * comp.blocks.size(), -1);
+    std::vector<std::pair<int, int>> cells;  // (bloco no componente, grupo)
+    for (size_t j = 0; j < comp.blocks.size(); ++j) {
+        const Block& b = blocks[comp.blocks[j]];
+        for (size_t li = 0; li < b.meetings.size(); ++li) local[indexOf[b.meetings[li]] * comp.blocks.size() + j] = li;
+        for (size_t g = 0; g < b.groups.size(); ++g) cells.emplace_back(static_cast<int>(j), static_cast<int>(g));
+    }
+    auto cost = [&](int i, int k) {
+        const int li = local[static_cast<size_t>(i) * comp.blocks.size() + cells[k].first];
+        return li < 0 ? -1 : blocks[comp.blocks[cells[k].first]].costAt(li, cells[k].second);
+    };
+    const auto pairs = optionalAssignment(nM, static_cast<int>(cells.size()), cost,
+                                          [&](int) { return unallocatedPenalty; }, out.value);
+    for (const auto& [i, k] : pairs) {
+        const Block& b = blocks[comp.blocks[cells[k].first]];
+        const int li = local[static_cast<size_t>(i) * comp.blocks.size() + cells[k].first];
+        out.matches.push_back({comp.meetings[i], b.posAt(li, cells[k].second), b.scheduleId,
+                               b.costAt(li, cells[k].second)});
+    }
+    return out;
+}
+
+// Bloco de um componente relaxado. base: quanto cada encontro economiza ao ser
+// alocado (unallocatedPenalty para quem tem um horário só, o multiplicador para os demais).
+// Atribuição exata do bloco como transporte encontros x tipos de grupo; roomOf(encontro, grupo)
+// devolve a sala do grupo para o encontro.
+template <class RoomOf>
+Solution solveBlock(const Block& b, const std::vector<double>& base, RoomOf roomOf) {
+    Solution out;
+    const int nM = static_cast<int>(b.meetings.size());
+    if (b.large) {
+        // limite da atribuição pela contagem de células: cada grupo recebe no máximo
+        // um encontro, então só os b.groups.size() que mais economizam (cada um na
+        // sua melhor sala) entram. Vale como limite, mas é bem mais fraco que a atribuição
+        std::vector<std::pair<double, int>> gain;
+        for (int i = 0; i < nM; ++i) {
+            if (b.bestCost[i] < 0) continue;
+            const double w = b.bestCost[i] - base[b.meetings[i]];
+            if (w < 0) gain.emplace_back(w, i);
+        }
+        const size_t keep = std::min(gain.size(), b.groups.size());
+        std::partial_sort(gain.begin(), gain.begin() + keep, gain.end());
+        for (size_t k = 0; k < keep; ++k) {
+            const int i = gain[k].second;
+            out.value += gain[k].first;
+            out.matches.push_back({b.meetings[i], b.bestPos[i], b.scheduleId, b.bestCost[i]});
+        }
+        return out;
+    }
+
+    // só entra quem tem algum tipo que compensa; a última coluna é ficar sem sala (custo 0)
+    const int nT = static_cast<int>(b.typeGroups.size());
+    auto costOf = [&](int i, int t) { return b.typeCost[static_cast<size_t>(t) * nM + i]; };
+    std::vector<int> rows;
+    for (int i = 0; i < nM; ++i) {
+        for (int t = 0; t < nT; ++t) {
+            const int c = costOf(i, t);
+            if (c >= 0 && c < base[b.meetings[i]]) {
+                rows.push_back(i);
+                break;
+            }
+        }
+    }
+    if (rows.empty()) return out;
+    std::vector<int> cap(nT + 1);
+    for (int t = 0; t < nT; ++t) cap[t] = static_cast<int>(b.typeGroups[t].size());
+    cap[nT] = static_cast<int>(rows.size());
+    const size_t m = nT + 1;
+    std::vector<double> w(rows.size() * m, 0.0);
+    for (size_t r = 0; r < rows.size(); ++r) {
+        const double save = base[b.meetings[rows[r]]];
+        for (int t = 0; t < nT; ++t) {
+            const int c = costOf(rows[r], t);
+            w[r * m + t] = c < 0 ? FORBIDDEN : c - save;
+        }
+    }
+    const std::vector<int> col = transport(static_cast<int>(rows.size()), cap,
+                                           [&](int r, int t) { return w[r * m + t]; });
+
+    std::vector<size_t> used(nT, 0);
+    for (size_t r = 0; r < rows.size(); ++r) {
+        const int t = col[r];
+        if (t == nT) continue;
+        const int mi = b.meetings[rows[r]];
+        const int c = costOf(rows[r], t);
+        const double x = c - base[mi];
+        if (x >= 0) continue;  // não compensa: o mesmo que ficar sem sala
+        const int g = b.groups[b.typeGroups[t][used[t]++]];
+        out.value += x;
+        out.matches.push_back({mi, roomOf(mi, g), b.scheduleId, c});
+    }
+    return out;
+}
+
+template <class F>
+void parallelFor(int count, int threads, F&& fn) {
+    std::atomic<int> next{0};
+    auto worker = [&]() {
+        for (int i = next++; i < count; i = next++) fn(i);
+    };
+    std::vector<std::thread> pool;
+    for (int t = 1; t < threads; ++t) pool.emplace_back(worker);
+    worker();
+    for (auto& th : pool) th.join();
+}
+
+int findRoot(std::vector<int>& parent, int x) {
+    while (parent[x] != x) x = parent[x] = parent[parent[x]];
+    return x;
+}
+
+} // namespace
+
+bool ExactResult::optimal() const {
+    return cost <= static_cast<long long>(std::ceil(lowerBound - 1e-6));
+}
+
+double ExactResult::gapTo(long long value) const {
+    return value > 0 ? 100.0 * (value - lowerBound) / value : 0.0;
+}
+
+long long exactCost(const Problem& p, const ConstructionResult& r, const ExactOptions& options) {
+    // sala pelo id: a primeira com o id, como nas estatísticas
+    std::unordered_map<int, size_t> posOfId;
+    for (size_t ci = 0; ci < p.classrooms.size(); ++ci) posOfId.emplace(p.classrooms[ci].id, ci);
+    long long cost = static_cast<long long>(options.unallocatedPenalty) * r.notPlaced;
+    for (const Assignment& a : r.assignments) {
+        auto it = posOfId.find(a.classroomId);
+        if (it == posOfId.end()) continue;
+        const int waste = p.classrooms[it->second].capacity - p.meetings[a.meeting].demand;
+        cost += std::max(0, waste) + options.prefPenalty * p.prefIndex.violationsOf(a.meeting)[it->second];
+    }
+    return cost;
+}
+
+ExactResult runExact(Problem& p, const ExactOptions& options) {
+    using clock = std::chrono::steady_clock;
+    auto t0 = clock::now();
+    p.ensurePreferenceIndex();
+
+    ExactResult out;
+    int threads = options.threads > 0 ? options.threads : static_cast<int>(std::thread::hardware_concurrency());
+    out.threads = std::max(1, threads);
+    const double U = options.unallocatedPenalty;
+
+    const OccupancyIndex fixed(p);  // só as reservas da instância
+    const RoomIndex roomIndex(p);
+    const int n = static_cast<int>(p.meetings.size());
+
+    // mesma ordem da gulosa: demanda decrescente, empates na ordem da instância
+    std::vector<int> order(n);
+    for (int i = 0; i < n; ++i) order[i] = i;
+    std::stable_sort(order.begin(), order.end(), [&](int a, int b) {
+        return p.meetings[a].demand > p.meetings[b].demand;
+    });
+
+    // horários distintos de cada encontro, na ordem da instância
+    std::vector<std::vector<int>> scheds(n);
+    for (int mi = 0; mi < n; ++mi) {
+        for (int s : p.meetings[mi].scheduleIds) {
+            if (std::find(scheds[mi].begin(), scheds[mi].end(), s) == scheds[mi].end()) scheds[mi].push_back(s);
+        }
+    }
+
+    // grupos de salas por id (mesma ordem dos slots do OccupancyIndex)
+    std::vector<std::vector<int>> groups;
+    {
+        std::unordered_map<int, int> groupOfId;
+        for (size_t ci = 0; ci < p.classrooms.size(); ++ci) {
+            auto it = groupOfId.emplace(p.classrooms[ci].id, static_cast<int>(groups.size())).first;
+            if (it->second == static_cast<int>(groups.size())) groups.emplace_back();
+            groups[it->second].push_back(static_cast<int>(ci));
+        }
+    }
+
+    // sala de menor custo do grupo para o encontro (empate: a primeira); custo -1 se nenhuma serve
+    auto roomOfGroup = [&](int mi, int g, int& cost) {
+        int pos = -1;
+        cost = -1;
+        for (int ci : groups[g]) {
+            const int c = roomCost(p, mi, ci, options.prefPenalty);
+            if (c >= 0 && (cost < 0 || c < cost)) {
+                cost = c;
+                pos = ci;
+            }
+        }
+        return pos;
+    };
+    std::vector<Block> blocks;
+    std::vector<Component> components;
+    std::vector<int> componentOf(n, -1);
+    {
+        prof::Scope phase("blocks");
+        std::map<std::pair<int, int>, int> blockOf;
+        for (int mi = 0; mi < n; ++mi) {
+            for (int s : scheds[mi]) blockOf.emplace(std::make_pair(p.meetings[mi].dayOfWeek, s), 0);
+        }
+        for (auto& [key, idx] : blockOf) {
+            idx = static_cast<int>(blocks.size());
+            Block b;
+            b.day = key.first;
+            b.scheduleId = key.second;
+            b.dayIdx = fixed.dayIndex(b.day);
+            b.schedIdx = fixed.scheduleIndex(b.scheduleId);
+            for (size_t g = 0; g < groups.size(); ++g) {
+                if (fixed.isFree(groups[g][0], b.dayIdx, b.schedIdx)) b.groups.push_back(static_cast<int>(g));
+            }
+            blocks.push_back(std::move(b));
+        }
+
+        // componentes: blocos ligados pelos encontros de vários horários
+        std::vector<int> parent(blocks.size());
+        for (size_t i = 0; i < parent.size(); ++i) parent[i] = static_cast<int>(i);
+        for (int mi = 0; mi < n; ++mi) {
+            int first = -1;
+            for (int s : scheds[mi]) {
+                const int bi = blockOf[{p.meetings[mi].dayOfWeek, s}];
+                blocks[bi].meetings.push_back(mi);
+                if (first < 0) first = bi;
+                else parent[findRoot(parent, bi)] = findRoot(parent, first);
+            }
+        }
+        std::vector<int> componentOfRoot(blocks.size(), -1);
+        for (size_t bi = 0; bi < blocks.size(); ++bi) {
+            int& c = componentOfRoot[findRoot(parent, static_cast<int>(bi))];
+            if (c < 0) {
+                c = static_cast<int>(components.size());
+                components.emplace_back();
+            }
+            blocks[bi].component = c;
+            components[c].blocks.push_back(static_cast<int>(bi));
+            components[c].cells += static_cast<int>(blocks[bi].groups.size());
+        }
+        for (int mi = 0; mi < n; ++mi) {
+            if (scheds[mi].empty()) continue;
+            componentOf[mi] = blocks[blockOf[{p.meetings[mi].dayOfWeek, scheds[mi][0]}]].component;
+            components[componentOf[mi]].meetings.push_back(mi);
+        }
+        for (Component& comp : components) {
+            comp.relaxed = assignmentWork(comp.meetings.size(), comp.cells) > options.maxBlockWork;
+            out.relaxedComponents += comp.relaxed;
+        }
+        out.blocks = static_cast<int>(blocks.size());
+        out.components = static_cast<int>(components.size());
+        for (int mi = 0; mi < n; ++mi) {
+            out.relaxedMeetings += componentOf[mi] >= 0 && components[componentOf[mi]].relaxed && scheds[mi].size() > 1;
+        }
+
+        // custos de cada bloco: matriz completa nos componentes exatos, tipos de grupo
+        // nos relaxados (ou só a melhor sala, se os tipos não couberem)
+        parallelFor(static_cast<int>(blocks.size()), out.threads, [&](int bi) {
+            Block& b = blocks[bi];
+            const size_t nM = b.meetings.size(), nR = b.groups.size();
+            if (components[b.component].relaxed) {
+                std::map<std::vector<int>, int> typeOf;
+                std::vector<int> column(nM);
+                for (size_t g = 0; g < nR && !b.large; ++g) {
+                    bool any = false;
+                    for (size_t i = 0; i < nM; ++i) {
+                        roomOfGroup(b.meetings[i], b.groups[g], column[i]);
+                        any = any || column[i] >= 0;
+                    }
+                    if (!any) continue;
+                    const auto [it, added] = typeOf.emplace(column, static_cast<int>(b.typeGroups.size()));
+                    if (added) {
+                        b.typeGroups.emplace_back();
+                        b.typeCost.insert(b.typeCost.end(), column.begin(), column.end());
+                        b.large = b.typeCost.size() > MAX_TYPE_ENTRIES;
+                    }
+                    b.typeGroups[it->second].push_back(static_cast<int>(g));
+                }
+                if (!b.large) return;
+                b.typeGroups.clear();
+                b.typeCost.clear();
+                b.typeCost.shrink_to_fit();
+                b.bestCost.assign(nM, -1);
+                b.bestPos.assign(nM, -1);
+                for (size_t i = 0; i < nM; ++i) {
+                    int cost;
+                    size_t pos = 0;
+                    if (bestFreeRoom(p, roomIndex, fixed, b.meetings[i], b.dayIdx, b.schedIdx, options.prefPenalty,
+                                     cost, pos)) {
+                        b.bestCost[i] = cost;
+                        b.bestPos[i] = static_cast<int>(pos);
+                    }
+                }
+                return;
+            }
+            b.cost.assign(nM * nR, -1);
+            b.pos.assign(nM * nR, -1);
+            for (size_t i = 0; i < nM; ++i) {
+                for (size_t g = 0; g < nR; ++g) {
+                    for (int ci : groups[b.groups[g]]) {
+                        const int c = roomCost(p, b.meetings[i], ci, options.prefPenalty);
+                        if (c >= 0 && (b.cost[i * nR + g] < 0 || c < b.cost[i * nR + g])) {
+                            b.cost[i * nR + g] = c;
+                            b.pos[i * nR + g] = ci;
+                        }
+                    }
+                }
+            }
+        });
+        for (const Block& b : blocks) out.largeBlocks += b.large;
+    }
+
+    std::vector<int> posOf(n, -1), schedOf(n, 0), costOf(n, 0);
+
+    // componentes exatos: uma atribuição por componente, em paralelo
+    long long exactPart = 0;
+    {
+        prof::Scope phase("matching");
+        std::vector<Solution> sols(components.size());
+        parallelFor(static_cast<int>(components.size()), out.threads, [&](int c) {
+            if (!components[c].relaxed) sols[c] = solveComponent(components[c], blocks, U);
+        });
+        for (size_t c = 0; c < components.size(); ++c) {
+            if (components[c].relaxed) continue;
+            exactPart += static_cast<long long>(options.unallocatedPenalty) * components[c].meetings.size();
+            for (const Match& mt : sols[c].matches) {
+                posOf[mt.meeting] = mt.pos;
+                schedOf[mt.meeting] = mt.scheduleId;
+                costOf[mt.meeting] = mt.cost;
+                exactPart += mt.cost - options.unallocatedPenalty;
+            }
+        }
+    }
+
+    std::vector<int> relaxedBlocks;
+    for (size_t bi = 0; bi < blocks.size(); ++bi) {
+        if (components[blocks[bi].component].relaxed) relaxedBlocks.push_back(static_cast<int>(bi));
+    }
+    std::vector<char> multi(n, 0);
+    double singleConstant = 0.0;  // quem tem um horário só economiza U ao ser alocado
+    for (int mi = 0; mi < n; ++mi) {
+        if (componentOf[mi] < 0 || !components[componentOf[mi]].relaxed) continue;
+        multi[mi] = scheds[mi].size() > 1;
+        if (!multi[mi]) singleConstant += U;
+    }
+
+    // gulosa: custo de referência e, nos componentes relaxados, a primeira alocação viável
+    ConstructionResult greedy;
+    {
+        std::vector<Reservation> reservations = p.reservations;
+        greedy = runGreedy(p, reservations);
+    }
+    out.greedyCost = exactCost(p, greedy, options);
+
+    if (relaxedBlocks.empty()) {
+        out.cost = exactPart;
+        out.lowerBound = static_cast<double>(exactPart);
+        out.trace.push_back({0, out.lowerBound, out.lowerBound, out.cost, out.cost, 0.0});
+    } else {
+        // componentes relaxados: cada bloco sozinho; os multiplicadores substituem U
+        // para os encontros de vários horários
+        OccupancyIndex exactOccupancy(fixed);
+        for (int mi = 0; mi < n; ++mi) {
+            if (posOf[mi] >= 0) exactOccupancy.occupy(posOf[mi], fixed.dayIndex(p.meetings[mi].dayOfWeek),
+                                                       fixed.scheduleIndex(schedOf[mi]));
+        }
+        // multiplicadores iniciais: o custo que o encontro paga na gulosa ou, se ela
+        // não o alocou, o da sua opção mais barata
+        std::vector<double> base(n, U);
+        for (int bi : relaxedBlocks) {
+            const Block& b = blocks[bi];
+            const size_t nM = b.meetings.size();
+            for (size_t i = 0; i < nM; ++i) {
+                const int mi = b.meetings[i];
+                if (!multi[mi]) continue;
+                int best = b.large ? b.bestCost[i] : -1;
+                for (size_t t = 0; !b.large && t < b.typeGroups.size(); ++t) {
+                    const int c = b.typeCost[t * nM + i];
+                    if (c >= 0 && (best < 0 || c < best)) best = c;
+                }
+                if (best >= 0) base[mi] = std::min<double>(base[mi], best);
+            }
+        }
+        // a gulosa é a primeira alocação dos relaxados (nenhuma célula deles é de
+        // um componente exato)
+        std::vector<int> bestPosOf = posOf, bestSchedOf = schedOf;
+        out.cost = exactPart;
+        for (int mi = 0; mi < n; ++mi) {
+            if (componentOf[mi] >= 0 && components[componentOf[mi]].relaxed) out.cost += options.unallocatedPenalty;
+        }
+        {
+            std::unordered_map<int, int> posOfId;  // a primeira sala com o id, como em exactCost
+            for (size_t ci = 0; ci < p.classrooms.size(); ++ci) posOfId.emplace(p.classrooms[ci].id, static_cast<int>(ci));
+            for (const Assignment& a : greedy.assignments) {
+                const int mi = a.meeting;
+                if (componentOf[mi] < 0 || !components[componentOf[mi]].relaxed) continue;
+                const int ci = posOfId.at(a.classroomId);
+                const int c = roomCost(p, mi, ci, options.prefPenalty);
+                if (c < 0) continue;
+                bestPosOf[mi] = ci;
+                bestSchedOf[mi] = a.scheduleId;
+                out.cost += c - options.unallocatedPenalty;
+                if (multi[mi]) base[mi] = c;
+            }
+        }
+        std::vector<int> rPos(n), rSched(n), rCost(n), count(n);
+        std::vector<Solution> sols(relaxedBlocks.size());
+        auto roomOf = [&](int mi, int g) {
+            int cost;
+            return roomOfGroup(mi, g, cost);
+        };
+        out.lowerBound = -std::numeric_limits<double>::infinity();
+        double theta = 2.0;
+        int stalled = 0;
+        for (int it = 0; it < std::max(1, options.iterations); ++it) {
+            {
+                prof::Scope phase("matching");
+                parallelFor(static_cast<int>(relaxedBlocks.size()), out.threads,
+                            [&](int k) { sols[k] = solveBlock(blocks[relaxedBlocks[k]], base, roomOf); });
+            }
+
+            // limite inferior da iteração
+            double bound = exactPart + singleConstant;
+            for (int mi = 0; mi < n; ++mi) {
+                if (multi[mi]) bound += base[mi] + std::min(0.0, U - base[mi]);
+            }
+            for (const Solution& s : sols) bound += s.value;
+
+            // alocação viável: cada encontro no bloco de menor custo, o resto pelo melhor encaixe
+            long long cost = exactPart;
+            {
+                prof::Scope phase("repair");
+                std::fill(count.begin(), count.end(), 0);
+                std::fill(rPos.begin(), rPos.end(), -1);
+                for (size_t k = 0; k < relaxedBlocks.size(); ++k) {
+                    const bool large = blocks[relaxedBlocks[k]].large;
+                    for (const Match& mt : sols[k].matches) {
+                        ++count[mt.meeting];
+                        if (large) continue;  // escolhas sem conflito garantido
+                        if (rPos[mt.meeting] < 0 || mt.cost < rCost[mt.meeting]) {
+                            rPos[mt.meeting] = mt.pos;
+                            rSched[mt.meeting] = mt.scheduleId;
+                            rCost[mt.meeting] = mt.cost;
+                        }
+                    }
+                }
+                OccupancyIndex occupancy(exactOccupancy);
+                for (int mi = 0; mi < n; ++mi) {
+                    if (rPos[mi] < 0) continue;
+                    occupancy.occupy(rPos[mi], fixed.dayIndex(p.meetings[mi].dayOfWeek), fixed.scheduleIndex(rSched[mi]));
+                    cost += rCost[mi];
+                }
+                for (int mi : order) {
+                    if (componentOf[mi] < 0 || !components[componentOf[mi]].relaxed || rPos[mi] >= 0) continue;
+                    const int dayIdx = fixed.dayIndex(p.meetings[mi].dayOfWeek);
+                    int bestCost = options.unallocatedPenalty;  // só aloca se compensar
+                    for (int s : scheds[mi]) {
+                        int c;
+                        size_t pos = 0;
+                        if (bestFreeRoom(p, roomIndex, occupancy, mi, dayIdx, fixed.scheduleIndex(s),
+                                         options.prefPenalty, c, pos) && c < bestCost) {
+                            bestCost = c;
+                            rPos[mi] = static_cast<int>(pos);
+                            rSched[mi] = s;
+                        }
+                    }
+                    if (rPos[mi] >= 0) occupancy.occupy(rPos[mi], dayIdx, fixed.scheduleIndex(rSched[mi]));
+                    cost += bestCost;
+                }
+            }
+
+            if (cost < out.cost) {
+                out.cost = cost;
+                for (int mi = 0; mi < n; ++mi) {
+                    if (componentOf[mi] < 0 || !components[componentOf[mi]].relaxed) continue;
+                    bestPosOf[mi] = rPos[mi];
+                    bestSchedOf[mi] = rSched[mi];
+                }
+            }
+            if (bound > out.lowerBound + 1e-9) {
+                out.lowerBound = bound;
+                stalled = 0;
+            } else if (++stalled >= 20) {  // 20 iterações sem melhorar o limite: passo pela metade
+                theta /= 2.0;
+                stalled = 0;
+            }
+
+            // subgradiente: 1 - vezes alocado nos blocos - (sem sala na relaxação)
+            double norm = 0.0;
+            std::vector<double> grad(n, 0.0);
+            for (int mi = 0; mi < n; ++mi) {
+                if (!multi[mi]) continue;
+                grad[mi] = 1.0 - count[mi] - (base[mi] > U ? 1.0 : 0.0);
+                norm += grad[mi] * grad[mi];
+            }
+            const double step = norm > 0 ? theta * (out.cost - bound) / norm : 0.0;
+            out.trace.push_back({it, bound, out.lowerBound, cost, out.cost, step});
+            const long long elapsed = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+            if (out.optimal() || norm == 0 || theta < 1e-4 || elapsed >= options.timeLimitMs) break;
+            for (int mi = 0; mi < n; ++mi) {
+                if (multi[mi]) base[mi] += step * grad[mi];
+            }
+        }
+        posOf = bestPosOf;
+        schedOf = bestSchedOf;
+    }
+
+    // resultado na ordem da gulosa, com o desperdício real de cada encontro
+    ConstructionResult& res = out.result;
+    res.heuristic = "exact";
+    {
+        prof::Scope phase("stats");
+        for (int mi : order) {
+            if (scheds[mi].empty()) continue;
+            const int ci = posOf[mi];
+            if (ci < 0) {
+                res.recordUnallocated(p, mi);
+                continue;
+            }
+            const Classroom& c = p.classrooms[ci];
+            res.recordPlacement(p, mi, ci, schedOf[mi], c.capacity - p.meetings[mi].demand,
+                                p.prefIndex.violationsOf(mi)[ci]);
+        }
+        res.finalize();
+    }
+    out.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+    res.elapsedMs = out.elapsedMs;
+    return out;
+}
+
+void ExactResult::writeTraceCsv(std::ostream& out) const {
+    out << "Iteracao,LimiteInferior,MelhorLimiteInferior,Custo,MelhorCusto,Passo\n";
+    for (const auto& r : trace) {
+        out << r.iteration << "," << r.lowerBound << "," << r.bestLowerBound << "," << r.cost << "," << r.bestCost
+            << "," << r.step << "\n";
+    }
+}
+
+bool ExactResult::writeTraceCsv(const std::string& path) const {
+    std::ofstream f(path);
+    if (!f.is_open()) {
+        std::cerr << "Erro: nao foi possivel criar " << path << "\n";
+        return false;
+    }
+    writeTraceCsv(f);
+    return true;
+}
+
+void exactConstruct(Problem& p, const ExactOptions& options, StatsFormat format) {
+    ExactResult ex = runExact(p, options);
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  Exato por blocos (dia, horario): " << ex.blocks << " blocos em " << ex.components
+                  << " componentes, " << ex.threads << " threads\n";
+        if (ex.relaxedComponents > 0) {
+            std::cout << "  Componentes relaxados: " << ex.relaxedComponents << " (" << ex.relaxedMeetings
+                      << " encontros com varios horarios, " << ex.largeBlocks << " blocos so com limite por contagem, "
+                      << ex.trace.size() << " iteracoes do subgradiente)\n";
+        }
+        std::cout << "  Custo da alocacao: " << ex.cost << " | limite inferior: " << ex.lowerBound
+                  << " | gap: " << ex.gapTo(ex.cost) << "%" << (ex.optimal() ? " (otimo comprovado)" : "") << "\n";
+        std::cout << "  Gulosa na mesma funcao de custo: " << ex.greedyCost << " (gap para o limite: "
+                  << ex.gapTo(ex.greedyCost) << "%)\n";
+        if (ex.largeBlocks > 0) {
+            std::cout << "  Aviso: " << ex.largeBlocks << " blocos usam so o limite por contagem de salas; "
+                      << "os gaps medem esse limite fraco, nao a qualidade da alocacao\n";
+        }
+        ex.result.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = ex.result.writeStats(statsFilename(format), format) && ex.writeTraceCsv("exact_trace.csv");
+    }
+    if (written) {
+        std::cout << "Dados exportados para: " << statsFilename(format) << " e exact_trace.csv\n";
+        std::cout << "Tempo de execucao (ms): " << ex.elapsedMs << "\n";
+    }
+
+    for (const Assignment& a : ex.result.assignments) {
+        Reservation r;
+        r.id = p.meetings[a.meeting].id;
+        r.meeting = a.meeting;
+        r.classroomId = a.classroomId;
+        r.dayOfWeek = a.dayOfWeek;
+        r.scheduleId = a.scheduleId;
+        p.reservations.push_back(std::move(r));
+    }
+}
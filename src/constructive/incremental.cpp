@@ -0,0 +1,289 @@
+#include "include/constructive/incremental.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/occupancy.hpp"
+#include "include/room_index.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <chrono>
+#include <climits>
+#include <iostream>
+#include <queue>
+#include <unordered_map>
+
+namespace {
+
+// Aplica o delta; oldToNew leva o índice antigo de cada encontro ao novo (-1 se removido)
+// e changed marca os encontros novos ou alterados (índices novos)
+void applyDelta(Problem& p, const InstanceDelta& delta, std::vector<int>& oldToNew, std::vector<char>& changed) {
+    prof::Scope phase("populate");
+    const size_t n = p.meetings.size();
+    std::vector<char> removed(n, 0), modified(n, 0);
+    for (int mi : delta.removedMeetings) removed[mi] = 1;
+    for (const auto& [mi, m] : delta.modifiedMeetings) {
+        p.meetings[mi] = m;
+        modified[mi] = 1;
+    }
+
+    std::vector<Meeting> meetings;
+    meetings.reserve(n + delta.addedMeetings.size());
+    oldToNew.assign(n, -1);
+    changed.clear();
+    for (size_t i = 0; i < n; ++i) {
+        if (removed[i]) continue;
+        oldToNew[i] = static_cast<int>(meetings.size());
+        changed.push_back(modified[i]);
+        meetings.push_back(std::move(p.meetings[i]));
+    }
+    for (const Meeting& m : delta.addedMeetings) {
+        meetings.push_back(m);
+        changed.push_back(1);
+    }
+    p.meetings = std::move(meetings);
+
+    auto sameCell = [](const Reservation& a, const Reservation& b) {
+        return a.classroomId == b.classroomId && a.dayOfWeek == b.dayOfWeek && a.scheduleId == b.scheduleId;
+    };
+    p.reservations.erase(std::remove_if(p.reservations.begin(), p.reservations.end(), [&](const Reservation& r) {
+        return std::any_of(delta.removedReservations.begin(), delta.removedReservations.end(),
+                           [&](const Reservation& x) { return sameCell(r, x); });
+    }), p.reservations.end());
+    p.reservations.insert(p.reservations.end(), delta.addedReservations.begin(), delta.addedReservations.end());
+    p.buildPreferenceIndex();
+}
+
+struct Choice {
+    size_t pos = 0;
+    int sched = 0;
+};
+
+// Alocação em andamento: sala (posição em p.classrooms) e horário de cada encontro,
+// e quem ocupa cada célula sala x dia x horário (-1: livre ou reserva fixa)
+class Allocation {
+public:
+    Allocation(const Problem& p, OccupancyIndex& occupancy)
+        : p(p), occupancy(occupancy), nDays(occupancy.dayCount()), nScheds(occupancy.scheduleCount()),
+          room(p.meetings.size(), -1), sched(p.meetings.size(), 0),
+          occupant(p.classrooms.size() * nDays * nScheds, -1) {}
+
+    int roomOf(int mi) const { return room[mi]; }
+    int schedOf(int mi) const { return sched[mi]; }
+    int occupantOf(size_t pos, int dayIdx, int schedIdx) const { return occupant[cell(pos, dayIdx, schedIdx)]; }
+
+    void place(int mi, size_t pos, int scheduleId) {
+        const int d = occupancy.dayIndex(p.meetings[mi].dayOfWeek), s = occupancy.scheduleIndex(scheduleId);
+        occupancy.occupy(pos, d, s);
+        occupant[cell(pos, d, s)] = mi;
+        room[mi] = static_cast<int>(pos);
+        sched[mi] = scheduleId;
+    }
+
+    void remove(int mi) {
+        const int d = occupancy.dayIndex(p.meetings[mi].dayOfWeek), s = occupancy.scheduleIndex(sched[mi]);
+        occupancy.release(room[mi], d, s);
+        occupant[cell(room[mi], d, s)] = -1;
+        room[mi] = -1;
+    }
+
+private:
+    const Problem& p;
+    OccupancyIndex& occupancy;
+    size_t nDays, nScheds;
+    std::vector<int> room, sched;
+    std::vector<int> occupant;
+
+    size_t cell(size_t pos, int dayIdx, int schedIdx) const { return (pos * nDays + dayIdx) * nScheds + schedIdx; }
+};
+
+// Melhor sala livre com o critério da gulosa: primeiro horário do encontro com
+// alguma sala livre e, nele, o menor desperdício + GREEDY_PREF_PENALTY por preferência violada
+bool bestFree(const Problem& p, const OccupancyIndex& occupancy, const RoomIndex& roomIndex, int mi, Choice& out) {
+    const Meeting& m = p.meetings[mi];
+    const std::vector<int>& violations = p.prefIndex.violationsOf(mi);
+    const std::vector<int>& rooms = roomIndex.rooms(m.isPractical);
+    const std::vector<int>& capacities = roomIndex.capacities(m.isPractical);
+    const size_t firstFit = roomIndex.firstFitting(m.isPractical, m.demand);
+    const int dayIdx = occupancy.dayIndex(m.dayOfWeek);
+    for (int sched : m.scheduleIds) {
+        const int schedIdx = occupancy.scheduleIndex(sched);
+        int bestScore = INT_MAX;
+        size_t bestPos = 0;
+        for (size_t k = firstFit; k < rooms.size(); ++k) {
+            const int waste = capacities[k] - m.demand;
+            if (waste > bestScore) break;
+            const size_t ci = rooms[k];
+            if (!occupancy.isFree(ci, dayIdx, schedIdx)) continue;
+            const int score = waste + GREEDY_PREF_PENALTY * violations[ci];
+            if (score < bestScore || (score == bestScore && ci < bestPos)) {
+                bestScore = score;
+                bestPos = ci;
+            }
+        }
+        if (bestScore != INT_MAX) {
+            out.pos = bestPos;
+            out.sched = sched;
+            return true;
+        }
+    }
+    return false;
+}
+
+// Melhor célula ocupada por um encontro de demanda menor (mesmo score), em qualquer horário do encontro
+bool bestDisplacement(const Problem& p, const OccupancyIndex& occupancy, const RoomIndex& roomIndex,
+                      const Allocation& alloc, int mi, Choice& out) {
+    const Meeting& m = p.meetings[mi];
+    const std::vector<int>& violations = p.prefIndex.violationsOf(mi);
+    const std::vector<int>& rooms = roomIndex.rooms(m.isPractical);
+    const std::vector<int>& capacities = roomIndex.capacities(m.isPractical);
+    const size_t firstFit = roomIndex.firstFitting(m.isPractical, m.demand);
+    const int dayIdx = occupancy.dayIndex(m.dayOfWeek);
+    int bestScore = INT_MAX;
+    for (int sched : m.scheduleIds) {
+        const int schedIdx = occupancy.scheduleIndex(sched);
+        for (size_t k = firstFit; k < rooms.size(); ++k) {
+            const int waste = capacities[k] - m.demand;
+            if (waste >= bestScore) break;
+            const size_t ci = rooms[k];
+            const int victim = alloc.occupantOf(ci, dayIdx, schedIdx);
+            if (victim < 0 || p.meetings[victim].demand >= m.demand) continue;
+            const int score = waste + GREEDY_PREF_PENALTY * violations[ci];
+            if (score < bestScore) {
+                bestScore = score;
+                out.pos = ci;
+                out.sched = sched;
+            }
+        }
+    }
+    return bestScore != INT_MAX;
+}
+
+} // namespace
+
+IncrementalResult runIncremental(Problem& p, const std::vector<Reservation>& previous, const InstanceDelta& delta) {
+    using clock = std::chrono::steady_clock;
+    const auto t0 = clock::now();
+    IncrementalResult out;
+
+    std::vector<int> oldToNew;
+    std::vector<char> changed;
+    applyDelta(p, delta, oldToNew, changed);
+
+    prof::Scope construct("construct");
+    const int n = static_cast<int>(p.meetings.size());
+    OccupancyIndex occupancy(p, p.reservations);
+    const RoomIndex roomIndex(p);
+    Allocation alloc(p, occupancy);
+    std::unordered_map<int, size_t> posOfId;
+    for (size_t ci = p.classrooms.size(); ci-- > 0;) posOfId[p.classrooms[ci].id] = ci;
+
+    // reservas anteriores que continuam válidas ficam onde estão
+    std::vector<int> prevRoom(n, -1), prevSched(n, 0);
+    std::vector<char> affected(changed.begin(), changed.end());
+    for (const Reservation& r : previous) {
+        if (r.meeting < 0 || r.meeting >= static_cast<int>(oldToNew.size())) continue;
+        const int mi = oldToNew[r.meeting];
+        if (mi < 0 || prevRoom[mi] >= 0) continue;  // removido, ou reserva repetida
+        const auto it = posOfId.find(r.classroomId);
+        if (it == posOfId.end()) {
+            affected[mi] = 1;
+            continue;
+        }
+        prevRoom[mi] = static_cast<int>(it->second);
+        prevSched[mi] = r.scheduleId;
+        if (changed[mi]) continue;
+
+        const Meeting& m = p.meetings[mi];
+        const int d = occupancy.dayIndex(m.dayOfWeek), s = occupancy.scheduleIndex(r.scheduleId);
+        const bool valid = r.dayOfWeek == m.dayOfWeek && d >= 0 && s >= 0 &&
+                           std::find(m.scheduleIds.begin(), m.scheduleIds.end(), r.scheduleId) != m.scheduleIds.end() &&
+                           (!m.isPractical || p.classrooms[it->second].isLab) && occupancy.isFree(it->second, d, s);
+        if (valid) alloc.place(mi, it->second, r.scheduleId);
+        else affected[mi] = 1;
+    }
+
+    // fila por demanda decrescente (empates na ordem da instância, como na gulosa)
+    auto later = [&](int a, int b) {
+        return p.meetings[a].demand != p.meetings[b].demand ? p.meetings[a].demand < p.meetings[b].demand : a > b;
+    };
+    std::priority_queue<int, std::vector<int>, decltype(later)> queue(later);
+    for (int mi = 0; mi < n; ++mi) {
+        if (affected[mi]) ++out.affected;
+        if (alloc.roomOf(mi) < 0) queue.push(mi);
+    }
+
+    // quem desloca tem demanda estritamente maior e a fila sai em demanda não crescente,
+    // então um deslocado só volta a ser deslocado se for realocado antes: cada um sai no máximo uma vez
+    Choice choice;
+    while (!queue.empty()) {
+        const int mi = queue.top();
+        queue.pop();
+        if (bestFree(p, occupancy, roomIndex, mi, choice)) {
+            alloc.place(mi, choice.pos, choice.sched);
+            continue;
+        }
+        if (!affected[mi] || !bestDisplacement(p, occupancy, roomIndex, alloc, mi, choice)) continue;
+        const int victim = alloc.occupantOf(choice.pos, occupancy.dayIndex(p.meetings[mi].dayOfWeek),
+                                            occupancy.scheduleIndex(choice.sched));
+        alloc.remove(victim);
+        alloc.place(mi, choice.pos, choice.sched);
+        affected[victim] = 1;
+        ++out.displaced;
+        queue.push(victim);
+    }
+
+    // resultado completo, na ordem de registro da gulosa
+    std::vector<int> order(n);
+    for (int i = 0; i < n; ++i) order[i] = i;
+    std::stable_sort(order.begin(), order.end(),
+                     [&](int a, int b) { return p.meetings[a].demand > p.meetings[b].demand; });
+    prof::Scope phase("stats");
+    ConstructionResult& res = out.result;
+    res.heuristic = "incremental";
+    for (int mi : order) {
+        const Meeting& m = p.meetings[mi];
+        const int pos = alloc.roomOf(mi);
+        if (pos < 0) {
+            res.recordUnallocated(p, mi);
+            if (prevRoom[mi] >= 0) ++out.lost;
+            continue;
+        }
+        const Classroom& c = p.classrooms[pos];
+        res.recordPlacement(p, mi, pos, alloc.schedOf(mi), std::max(0, c.capacity - m.demand),
+                            p.prefIndex.violationsOf(mi)[pos]);
+        if (prevRoom[mi] < 0) ++out.newlyPlaced;
+        else if (prevRoom[mi] == pos && prevSched[mi] == alloc.schedOf(mi)) ++out.kept;
+        else ++out.moved;
+
+        Reservation r;
+        r.id = m.id;
+        r.meeting = mi;
+        r.classroomId = c.id;
+        r.dayOfWeek = m.dayOfWeek;
+        r.scheduleId = alloc.schedOf(mi);
+        p.reservations.push_back(std::move(r));
+    }
+    res.finalize();
+    res.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+    return out;
+}
+
+void incrementalConstruct(Problem& p, const std::vector<Reservation>& previous, const InstanceDelta& delta,
+                          StatsFormat format) {
+    IncrementalResult inc = runIncremental(p, previous, delta);
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  Re-solucao incremental: " << inc.kept << " mantidos, " << inc.affected << " afetados, "
+                  << inc.displaced << " deslocados, " << inc.moved << " mudaram de sala/horario, "
+                  << inc.newlyPlaced << " alocados agora, " << inc.lost << " perderam a sala ("
+                  << inc.result.elapsedMs << " ms)\n";
+        inc.result.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = inc.result.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Dados exportados para: " << statsFilename(format) << "\n";
+    }
+}
@@ -0,0 +1,195 @@
+#include "include/constructive/multi_start.hpp"
+#include "include/constructive/partial_greedy.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <fstream>
+#include <iostream>
+#include <random>
+#include <thread>
+
+namespace {
+
+int totalViolated(const ConstructionResult& r) {
+    int n = 0;
+    for (const auto& [cat, count] : r.prefViolated) n += count;
+    return n;
+}
+
+// melhor construção vista por uma thread
+struct ThreadBest {
+    ConstructionResult result;
+    double objective = 0.0;
+    int iteration = -1;
+};
+
+} // namespace
+
+bool parseMultiStartObjective(const std::string& name, MultiStartObjective& out) {
+    if (name == "unallocated") out = MultiStartObjective::Unallocated;
+    else if (name == "waste") out = MultiStartObjective::Waste;
+    else if (name == "standing") out = MultiStartObjective::Standing;
+    else if (name == "weighted") out = MultiStartObjective::Weighted;
+    else return false;
+    return true;
+}
+
+const char* multiStartObjectiveName(MultiStartObjective objective) {
+    switch (objective) {
+        case MultiStartObjective::Unallocated: return "unallocated";
+        case MultiStartObjective::Waste: return "waste";
+        case MultiStartObjective::Standing: return "standing";
+        case MultiStartObjective::Weighted: return "weighted";
+    }
+    return "weighted";
+}
+
+double multiStartObjectiveValue(const ConstructionResult& r, MultiStartObjective objective) {
+    switch (objective) {
+        case MultiStartObjective::Unallocated: return r.unallocatedStudents();
+        case MultiStartObjective::Waste: return r.avgWaste();
+        case MultiStartObjective::Standing: return r.standingStudents;
+        case MultiStartObjective::Weighted: break;
+    }
+    return double(r.unallocatedStudents()) + r.wasteTotal + 15.0 * totalViolated(r);
+}
+
+unsigned int multiStartSeed(unsigned int masterSeed, int iteration) {
+    // seed_seq tem algoritmo fixado pelo padrão: a mesma seed em qualquer plataforma
+    std::seed_seq seq{masterSeed, static_cast<unsigned int>(iteration)};
+    unsigned int seed = 0;
+    seq.generate(&seed, &seed + 1);
+    return seed == 0 ? 1u : seed;
+}
+
+MultiStartResult runMultiStart(Problem& p, const MultiStartOptions& options) {
+    using clock = std::chrono::steady_clock;
+    auto t0 = clock::now();
+
+    MultiStartResult out;
+    out.masterSeed = options.masterSeed;
+    if (out.masterSeed == 0) {
+        std::random_device rd;
+        out.masterSeed = rd();
+    }
+    const int iterations = std::max(1, options.iterations);
+    int threads = options.threads > 0 ? options.threads : static_cast<int>(std::thread::hardware_concurrency());
+    threads = std::max(1, std::min(threads, iterations));
+    out.threads = threads;
+    out.trace.resize(iterations);
+
+    // montado uma vez aqui; as threads só leem p
+    p.ensurePreferenceIndex();
+
+    std::atomic<int> next{0};
+    std::vector<ThreadBest> bests(threads);
+    auto worker = [&](int t) {
+        std::vector<Reservation> reservations;
+        reservations.reserve(p.reservations.size() + p.meetings.size());
+        ThreadBest& best = bests[t];
+        for (int it = next++; it < iterations; it = next++) {
+            auto i0 = clock::now();
+            reservations.assign(p.reservations.begin(), p.reservations.end());
+            const unsigned int seed = multiStartSeed(out.masterSeed, it);
+            std::mt19937 rng(seed);
+            ConstructionResult r = runPartiallyGreedy(p, reservations, options.alpha, rng, options.prefPenalty);
+            if (options.localSearch.enabled) {
+                localSearch(p, p.reservations, r, reservations, options.localSearch);
+            }
+            r.seed = seed;
+            r.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - i0).count();
+
+            MultiStartIteration& row = out.trace[it];
+            row.iteration = it;
+            row.seed = seed;
+            row.thread = t;
+            row.objective = multiStartObjectiveValue(r, options.objective);
+            row.placed = r.placed;
+            row.demandPlaced = r.demandPlaced;
+            row.avgWaste = r.avgWaste();
+            row.standingStudents = r.standingStudents;
+            row.prefViolated = totalViolated(r);
+            row.elapsedMs = r.elapsedMs;
+
+            if (best.iteration < 0 || row.objective < best.objective ||
+                (row.objective == best.objective && it < best.iteration)) {
+                best.result = std::move(r);
+                best.objective = row.objective;
+                best.iteration = it;
+            }
+        }
+    };
+
+    std::vector<std::thread> pool;
+    for (int t = 1; t < threads; ++t) pool.emplace_back(worker, t);
+    worker(0);
+    for (auto& th : pool) th.join();
+
+    const ThreadBest* winner = nullptr;
+    for (const auto& b : bests) {
+        if (b.iteration < 0) continue;
+        if (!winner || b.objective < winner->objective ||
+            (b.objective == winner->objective && b.iteration < winner->iteration)) {
+            winner = &b;
+        }
+    }
+    out.best = winner->result;
+    out.bestIteration = winner->iteration;
+    out.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(clock::now() - t0).count();
+    return out;
+}
+
+void MultiStartResult::writeTraceCsv(std::ostream& out) const {
+    out << "Iteracao,Seed,Thread,Objetivo,Alocados,DemandaAlocada,DesperdicioMedio,AlunosEmPe,PrefVioladas,Tempo(ms)\n";
+    for (const auto& r : trace) {
+        out << r.iteration << "," << r.seed << "," << r.thread << "," << r.objective << "," << r.placed << ","
+            << r.demandPlaced << "," << r.avgWaste << "," << r.standingStudents << "," << r.prefViolated << ","
+            << r.elapsedMs << "\n";
+    }
+}
+
+bool MultiStartResult::writeTraceCsv(const std::string& path) const {
+    std::ofstream f(path);
+    if (!f.is_open()) {
+        std::cerr << "Erro: nao foi possivel criar " << path << "\n";
+        return false;
+    }
+    writeTraceCsv(f);
+    return true;
+}
+
+void multiStartConstruct(Problem& p, const MultiStartOptions& options, StatsFormat format) {
+    MultiStartResult ms = runMultiStart(p, options);
+    const MultiStartIteration& best = ms.trace[ms.bestIteration];
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  Multi-start: " << ms.trace.size() << " construcoes em " << ms.threads
+                  << " threads (seed mestre " << ms.masterSeed << ", objetivo "
+                  << multiStartObjectiveName(options.objective) << ")\n";
+        std::cout << "  Melhor: iteracao " << best.iteration << " (seed " << best.seed << "), objetivo "
+                  << best.objective << "\n";
+        ms.best.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = ms.best.writeStats(statsFilename(format), format) && ms.writeTraceCsv("multistart_trace.csv");
+    }
+    if (written) {
+        std::cout << "Dados exportados para: " << statsFilename(format) << " e multistart_trace.csv\n";
+        std::cout << "Tempo de execucao (ms): " << ms.elapsedMs << "\n";
+    }
+
+    // a melhor alocação fica em p.reservations, como nas construções simples
+    for (const Assignment& a : ms.best.assignments) {
+        Reservation r;
+        r.id = p.meetings[a.meeting].id;
+        r.meeting = a.meeting;
+        r.classroomId = a.classroomId;
+        r.dayOfWeek = a.dayOfWeek;
+        r.scheduleId = a.scheduleId;
+        p.reservations.push_back(std::move(r));
+    }
+}
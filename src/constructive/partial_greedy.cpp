@@ -1,19 +1,42 @@
 #include "include/constructive/partial_greedy.hpp"
+#include "include/occupancy.hpp"
+#include "include/room_index.hpp"
+#include "include/profiling.hpp"
 #include <random>
 #include <algorithm>
 #include <iostream>
 #include <climits>
 #include <string>
-#include <iomanip>
 #include <chrono>
-#include <map>
-#include <fstream>
+#include <cmath>
+#include <cstdint>
+
+// Sorteia um índice uniforme em [0, n) a partir do mt19937.
+// Mesmo algoritmo (multiplicação de Lemire) que o libstdc++ usa em
+// uniform_int_distribution, mas escrito aqui para o sorteio não depender da
+// biblioteca padrão (a libc++ do macOS usa outro método) e poder ser
+// reproduzido fora do binário (scripts/allocation_engine.py).
+static size_t rcl_pick(std::mt19937& rng, size_t n) {
+    uint32_t range = static_cast<uint32_t>(n);
+    uint64_t product = static_cast<uint64_t>(rng()) * range;
+    uint32_t low = static_cast<uint32_t>(product);
+    if (low < range) {
+        uint32_t threshold = static_cast<uint32_t>(-range) % range;
+        while (low < threshold) {
+            product = static_cast<uint64_t>(rng()) * range;
+            low = static_cast<uint32_t>(product);
+        }
+    }
+    return static_cast<size_t>(product >> 32);
+}
+
+ConstructionResult runPartiallyGreedy(Problem& p, double alpha, unsigned int seed) {
+    return runPartiallyGreedy(p, alpha, seed, PARTIAL_PREF_PENALTY);
+}
 
-void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed) {
+ConstructionResult runPartiallyGreedy(Problem& p, double alpha, unsigned int seed, int prefPenalty) {
     using clock = std::chrono::high_resolution_clock;
     auto t0 = clock::now();
-    if (alpha < 0.0) alpha = 0.0;
-    if (alpha > 1.0) alpha = 1.0;
 
     std::mt19937 rng;
     if (seed == 0) {
@@ -22,103 +45,96 @@ void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed) {
     } else {
         rng.seed(seed);
     }
-    auto classroom_free = [&](int classroomId, int day, int scheduleId) {
-        for (const auto& r : p.reservations) {
-            if (r.classroomId == classroomId && r.dayOfWeek == day && r.scheduleId == scheduleId) return false;
-        }
-        return true;
-    };
+    p.ensurePreferenceIndex();
 
-    auto applicable_preferences = [&](const Meeting& m) {
-        std::vector<Preference> out;
-        for (const auto &pref : p.preferences) {
-            if (pref.category == "professor") {
-                for (const auto &pc : m.professorCodes) if (pc == pref.categoryCode) { out.push_back(pref); break; }
-            } else if (pref.category == "subject") {
-                if (pref.categoryCode == m.subjectCode) out.push_back(pref);
-            } else if (pref.category == "class") {
-                for (const auto &cid : m.classIds) if (cid == pref.categoryCode) { out.push_back(pref); break; }
-            }
-        }
-        return out;
-    };
+    ConstructionResult res = runPartiallyGreedy(p, p.reservations, alpha, rng, prefPenalty);
+    res.seed = seed;
+    auto t1 = clock::now();
+    res.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(t1 - t0).count();
+    return res;
+}
+
+ConstructionResult runPartiallyGreedy(const Problem& p, std::vector<Reservation>& reservations, double alpha,
+                                      std::mt19937& rng, int prefPenalty) {
+    std::vector<int> all(p.meetings.size());
+    for (size_t i = 0; i < all.size(); ++i) all[i] = static_cast<int>(i);
+    return runPartiallyGreedy(p, reservations, std::move(all), alpha, rng, prefPenalty);
+}
+
+ConstructionResult runPartiallyGreedy(const Problem& p, std::vector<Reservation>& reservations,
+                                      std::vector<int> meetings, double alpha, std::mt19937& rng,
+                                      int prefPenalty) {
+    using clock = std::chrono::high_resolution_clock;
+    auto t0 = clock::now();
+    if (alpha < 0.0) alpha = 0.0;
+    if (alpha > 1.0) alpha = 1.0;
+    if (prefPenalty < 0) prefPenalty = 0;
+
+    ConstructionResult res;
+    res.heuristic = "partial";
+    res.alpha = alpha;
 
-    int placed = 0;
-    int notPlaced = 0;
-    int totalDemand = 0;
-    int demandPlaced = 0;
-    int wasteTotal = 0;
-    int underUtilizedWaste = 0;  // vagas ociosas em salas com <50% ocupação
-    int standingStudents = 0;    // alunos em pé (demanda > capacidade)
-    std::map<std::string, int> prefSatisfied;
-    std::map<std::string, int> prefViolated;
-    std::map<std::string, int> prefCategoryCount;
+    prof::Scope construct("construct");  // "sort" e "stats" são medidos à parte
 
-    // Estatísticas para verificar comportamento da RCL (aleatoriedade)
-    int rcl_total = 0;          // número de vezes que uma RCL foi construída
-    long long rcl_size_sum = 0; // soma dos tamanhos de RCL (para média)
-    int rcl_multi_count = 0;    // quantas RCLs tinham tamanho > 1 (onde houve escolha aleatória)
+    // só os dias e horários destes encontros (na decomposição por dia, um dia só)
+    OccupancyIndex occupancy(p, reservations, meetings);
+    const RoomIndex roomIndex(p);
 
-    std::map<int, int> classroomOccupancy;
-    std::map<int, int> classroomDemand;
-    std::map<int, int> classroomCapacity;
-    std::map<int, int> dayOccupancy;
-    std::map<int, int> dayDemand;
-    std::vector<int> wasteValues;
-    std::map<std::string, std::vector<int>> scheduleOccupancy;
 
-    // penalidade por preferência reduzida para a heurística parcialmente gulosa
-    const int PARTIAL_PREF_PENALTY = 15; // ajustado conforme solicitado
+    std::vector<int> idx = std::move(meetings);
+    {
+        prof::Scope phase("sort");
+        std::stable_sort(idx.begin(), idx.end(), [&](int a, int b){
+            return p.meetings[a].demand > p.meetings[b].demand;
+        });
+    }
 
-    std::vector<int> idx(p.meetings.size());
-    for (size_t i = 0; i < idx.size(); ++i) idx[i] = static_cast<int>(i);
-    std::sort(idx.begin(), idx.end(), [&](int a, int b){
-        return p.meetings[a].demand > p.meetings[b].demand;
-    });
+    struct Cand { int id; int score; int violated; int waste; size_t pos; };
+    std::vector<Cand> rcl;
+    // registros adiados para depois do laço, para a fase "stats" ser medida uma vez só
+    std::vector<Placement> placements;
+    std::vector<int> unallocated;
 
     for (int mi : idx) {
         const Meeting& m = p.meetings[mi];
         if (m.scheduleIds.empty()) continue;
 
-        totalDemand += m.demand;
-        auto prefs = applicable_preferences(m);
+        const std::vector<int>& prefViolations = p.prefIndex.violationsOf(mi);
+        const std::vector<int>& rooms = roomIndex.rooms(m.isPractical);
+        const std::vector<int>& capacities = roomIndex.capacities(m.isPractical);
+        const size_t firstFit = roomIndex.firstFitting(m.isPractical, m.demand);
+        // maior penalidade que alguma sala pode ter para este encontro
+        const int maxPenalty = prefPenalty * p.prefIndex.maxViolationsOf(mi);
 
         bool allocated = false;
+        const int dayIdx = occupancy.dayIndex(m.dayOfWeek);
         for (int sched : m.scheduleIds) {
             if (allocated) break;
-
-            struct Cand { int id; int score; int violated; int waste; };
-            std::vector<Cand> cands;
-
-            for (const auto& c : p.classrooms) {
-                if (!classroom_free(c.id, m.dayOfWeek, sched)) continue;
-                if (m.isPractical && !c.isLab) continue;
-                if (c.capacity < m.demand) continue;  // Sala não cabe: não é candidata
-                int waste = c.capacity - m.demand;
-
-                int prefPenalty = 0;
-                int violatedCount = 0;
-                for (const auto &pf : prefs) {
-                    if (!pf.buildingId.empty()) {
-                        try {
-                            int bid = std::stoi(pf.buildingId);
-                            if (bid != c.buildingId) { prefPenalty += PARTIAL_PREF_PENALTY; ++violatedCount; }
-                        } catch (...) {}
-                    }
-                    if (pf.floor != -1 && pf.floor != c.floor) { prefPenalty += PARTIAL_PREF_PENALTY; ++violatedCount; }
-                    if (!pf.board.empty() && pf.board != c.board) { prefPenalty += PARTIAL_PREF_PENALTY; ++violatedCount; }
-                    if (pf.projector && !c.projector) { prefPenalty += PARTIAL_PREF_PENALTY; ++violatedCount; }
-                }
-                int score = waste + prefPenalty;
-                cands.push_back({c.id, score, violatedCount, waste});
-            }
-
-            if (cands.empty()) continue;
-
+            const int schedIdx = occupancy.scheduleIndex(sched);
+
+            auto candAt = [&](size_t k) {
+                const size_t ci = rooms[k];
+                int waste = capacities[k] - m.demand;
+                int violatedCount = prefViolations[ci];
+                int penalty = prefPenalty * violatedCount;
+                int score = waste + penalty;
+                return Cand{p.classrooms[ci].id, score, violatedCount, waste, ci};
+            };
+
+            // Só as salas livres a partir de firstFit são candidatas. O score fica entre
+            // o desperdício e o desperdício + maxPenalty, então as varreduras param cedo:
+            // o menor score subindo a partir de firstFit, o maior descendo do fim
             int minScore = INT_MAX, maxScore = INT_MIN;
-            for (const auto &cc : cands) {
-                if (cc.score < minScore) minScore = cc.score;
-                if (cc.score > maxScore) maxScore = cc.score;
+            for (size_t k = firstFit; k < rooms.size(); ++k) {
+                if (capacities[k] - m.demand > minScore) break;
+                if (!occupancy.isFree(rooms[k], dayIdx, schedIdx)) continue;
+                minScore = std::min(minScore, candAt(k).score);
+            }
+            if (minScore == INT_MAX) continue;  // nenhuma sala livre em que o encontro caiba
+            for (size_t k = rooms.size(); k-- > firstFit;) {
+                if (capacities[k] - m.demand + maxPenalty < maxScore) break;
+                if (!occupancy.isFree(rooms[k], dayIdx, schedIdx)) continue;
+                maxScore = std::max(maxScore, candAt(k).score);
             }
 
             int threshold = minScore;
@@ -127,175 +143,67 @@ void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed) {
                 threshold = static_cast<int>(std::floor(t + 0.5));
             }
 
-            std::vector<Cand> rcl;
-            for (const auto &cc : cands) if (cc.score <= threshold) rcl.push_back(cc);
-
-            // coletar estatísticas da RCL
-            ++rcl_total;
-            rcl_size_sum += static_cast<long long>(rcl.size());
-            if (rcl.size() > 1) ++rcl_multi_count;
-
-            if (rcl.empty()) {
-                Cand best = cands[0];
-                for (const auto &cc : cands) if (cc.score < best.score) best = cc;
-                rcl.push_back(best);
+            rcl.clear();
+            for (size_t k = firstFit; k < rooms.size(); ++k) {
+                if (capacities[k] - m.demand > threshold) break;
+                if (!occupancy.isFree(rooms[k], dayIdx, schedIdx)) continue;
+                const Cand cc = candAt(k);
+                if (cc.score <= threshold) rcl.push_back(cc);
             }
 
-            std::uniform_int_distribution<size_t> dist(0, rcl.size() - 1);
-            size_t choice = dist(rng);
+            // coletar estatísticas da RCL
+            ++res.rclTotal;
+            res.rclSizeSum += static_cast<long long>(rcl.size());
+            if (rcl.size() > 1) ++res.rclMultiCount;
+
+            // o sorteio é sobre a RCL na ordem da instância: basta achar o choice-ésimo por posição
+            size_t choice = rcl_pick(rng, rcl.size());
+            std::nth_element(rcl.begin(), rcl.begin() + choice, rcl.end(),
+                             [](const Cand& x, const Cand& y) { return x.pos < y.pos; });
             int chosenId = rcl[choice].id;
             int chosenViol = rcl[choice].violated;
             int chosenWaste = rcl[choice].waste;
 
             Reservation r;
             r.id = m.id;
+            r.meeting = mi;
             r.classroomId = chosenId;
             r.dayOfWeek = m.dayOfWeek;
             r.scheduleId = sched;
-            p.reservations.push_back(std::move(r));
-
-            const Classroom* chosenClassroom = nullptr;
-            for (const auto& c : p.classrooms) if (c.id == chosenId) { chosenClassroom = &c; break; }
-
-            ++placed;
-            demandPlaced += m.demand;
-            int realWaste = chosenWaste;
-            wasteTotal += realWaste;
-            wasteValues.push_back(realWaste);
-
-            // Verificar alunos em pé APENAS após alocação: se demanda > capacidade
-            if (chosenClassroom && m.demand > chosenClassroom->capacity) {
-                standingStudents += (m.demand - chosenClassroom->capacity);
-            }
-
-            classroomOccupancy[chosenId]++;
-            classroomDemand[chosenId] += m.demand;
-            if (chosenClassroom) classroomCapacity[chosenId] = chosenClassroom->capacity;
+            occupancy.reserve(reservations, rcl[choice].pos, std::move(r));
 
-            dayOccupancy[m.dayOfWeek]++;
-            dayDemand[m.dayOfWeek] += m.demand;
-
-            std::string daySchedKey = std::to_string(m.dayOfWeek) + "_" + std::to_string(sched);
-            scheduleOccupancy[daySchedKey].push_back(m.demand);
-
-            for (const auto &pf : prefs) {
-                prefCategoryCount[pf.category]++;
-                if (chosenViol == 0) prefSatisfied[pf.category]++; else prefViolated[pf.category]++;
-            }
+            placements.push_back({mi, static_cast<int>(rcl[choice].pos), sched, chosenWaste, chosenViol});
 
             allocated = true;
             break;
         }
 
-        if (!allocated) ++notPlaced;
-    }
-
-    int total = placed + notPlaced;
-    double placementRate = total > 0 ? (100.0 * placed / total) : 0.0;
-    double demandRate = totalDemand > 0 ? (100.0 * demandPlaced / totalDemand) : 0.0;
-    double avgWaste = placed > 0 ? (double)wasteTotal / placed : 0.0;
-    
-    // Calcular vagas ociosas em salas com ocupação < 50%
-    for (const auto& [cid, dem] : classroomDemand) {
-        int cap = classroomCapacity[cid];
-        if (cap > 0 && dem < cap / 2.0) {
-            underUtilizedWaste += (cap - dem);
-        }
+        if (!allocated) unallocated.push_back(mi);
     }
-    
-    int unallocatedStudents = totalDemand - demandPlaced;
 
-    std::cout << "\n";
-    std::cout << "  Parâmetros: alpha = " << std::fixed << std::setprecision(2) << alpha 
-              << ", seed = " << seed << "\n\n";
-
-    std::cout << std::fixed << std::setprecision(2);
-    std::cout << "ALOCAÇÃO GERAL:\n";
-    std::cout << "  Encontros alocados:    " << placed << " / " << total 
-              << " (" << placementRate << "%)\n";
-    std::cout << "  Encontros não alocados: " << notPlaced << "\n";
-    std::cout << "  Demanda alocada:        " << demandPlaced << " / " << totalDemand 
-              << " alunos (" << demandRate << "%)\n";
-    std::cout << "  Desperdício médio:      " << avgWaste << " vagas/encontro\n";
+    res.recordAll(p, placements, unallocated);
+    auto t1 = clock::now();
+    res.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(t1 - t0).count();
+    return res;
+}
 
-    std::cout << "\nMÉTRICAS DE REFERÊNCIA:\n";
-    std::cout << "  Alunos desalocados:                      " << unallocatedStudents << "\n";
-    std::cout << "  Vagas ociosas (<50% ocupação):           " << underUtilizedWaste << "\n";
-    std::cout << "  Alunos em pé (demanda > capacidade):     " << standingStudents << "\n";
+void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed, StatsFormat format) {
+    partiallyGreedyConstruct(p, alpha, seed, format, PARTIAL_PREF_PENALTY);
+}
 
-    if (!prefCategoryCount.empty()) {
-        std::cout << "\nPREFERÊNCIAS:\n";
-        for (const auto &[cat, count] : prefCategoryCount) {
-            int sat = prefSatisfied[cat];
-            int viol = prefViolated[cat];
-            double satRate = count > 0 ? (100.0 * sat / count) : 0.0;
-            std::cout << "  " << cat << ":\n";
-            std::cout << "    Total:       " << count << "\n";
-            std::cout << "    Satisfeitas: " << sat << " (" << satRate << "%)\n";
-            std::cout << "    Violadas:    " << viol << "\n";
-        }
+void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed, StatsFormat format, int prefPenalty) {
+    ConstructionResult res = runPartiallyGreedy(p, alpha, seed, prefPenalty);
+    {
+        prof::Scope phase("report");
+        res.printReport(std::cout);
     }
 
-    std::cout << "\n========================================\n\n";
-
-    std::ofstream csv("greedy_stats.csv");
-    if (csv.is_open()) {
-        csv << "Metrica,Valor\n";
-        csv << "Encontros Alocados," << placed << "\n";
-        csv << "Encontros Total," << total << "\n";
-        csv << "Taxa Alocacao (%)," << placementRate << "\n";
-        csv << "Demanda Alocada," << demandPlaced << "\n";
-        csv << "Demanda Total," << totalDemand << "\n";
-        csv << "Taxa Demanda (%)," << demandRate << "\n";
-        csv << "Desperdicio Medio," << avgWaste << "\n";
-        csv << "Alunos Desalocados," << unallocatedStudents << "\n";
-        csv << "Vagas Ociosas SubUtilizadas," << underUtilizedWaste << "\n";
-        csv << "Alunos em Pe," << standingStudents << "\n";
-        double rcl_avg_size = rcl_total > 0 ? (double)rcl_size_sum / rcl_total : 0.0;
-        csv << "RCL_Total," << rcl_total << "\n";
-        csv << "RCL_AvgSize," << rcl_avg_size << "\n";
-        csv << "RCL_MultiCount," << rcl_multi_count << "\n";
-
-        csv << "\nPreferencias por Categoria\n";
-        csv << "Categoria,Total,Satisfeitas,Taxa (%)\n";
-        for (const auto &[cat, count] : prefCategoryCount) {
-            int sat = prefSatisfied[cat];
-            double satRate = count > 0 ? (100.0 * sat / count) : 0.0;
-            csv << cat << "," << count << "," << sat << "," << satRate << "\n";
-        }
-
-        csv << "\nOcupacao por Sala\n";
-        csv << "ClassroomId,Encontros,Demanda,Capacidade,TaxaUtilizacao(%)\n";
-        for (const auto &[cid, occ] : classroomOccupancy) {
-            int cap = classroomCapacity[cid];
-            int dem = classroomDemand[cid];
-            double util = cap > 0 ? (100.0 * dem / cap) : 0.0;
-            csv << cid << "," << occ << "," << dem << "," << cap << "," << util << "\n";
-        }
-
-        csv << "\nOcupacao por Dia\n";
-        csv << "DiaSemanaSemana,Encontros,Demanda\n";
-        for (int d = 0; d < 7; ++d) {
-            if (dayOccupancy.count(d) > 0) csv << d << "," << dayOccupancy[d] << "," << dayDemand[d] << "\n";
-        }
-
-        csv << "\nDistribuicao Desperdicio\n";
-        csv << "Desperdicio\n";
-        for (int w : wasteValues) csv << w << "\n";
-
-        csv << "\nOcupacao por Dia e Horario\n";
-        csv << "DiaSchedule,Demanda\n";
-        for (const auto &[key, demands] : scheduleOccupancy) {
-            int totalDemandSched = 0; for (int d : demands) totalDemandSched += d;
-            csv << key << "," << totalDemandSched << "\n";
-        }
-
-        // compute elapsed time and export
-        auto t1 = clock::now();
-        auto elapsed = std::chrono::duration_cast<std::chrono::milliseconds>(t1 - t0).count();
-        csv << "ExecutionTimeMs," << elapsed << "\n";
-        csv.close();
-
-        std::cout << "Tempo de execucao (ms): " << elapsed << "\n";
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = res.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Tempo de execucao (ms): " << res.elapsedMs << "\n";
     }
 }
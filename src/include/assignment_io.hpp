@@ -0,0 +1,26 @@
+#ifndef ASSIGNMENT_IO_HPP
+#define ASSIGNMENT_IO_HPP
+
+#include "problem.hpp"
+#include <string>
+#include <vector>
+
+// Alocação completa (encontro -> sala, dia, horário) fora do processo: as
+// reservas de p.reservations feitas pelas heurísticas (meeting >= 0). As
+// reservas fixas continuam no JSON da instância e não entram no arquivo.
+//
+// Dois formatos (o mesmo leitor aceita os dois; ver também scripts/assignment_io.py):
+//  - binário colunar (padrão), little-endian, uma linha por encontro na ordem da instância:
+//      0   char[8]  magic "TPASGN01"
+//      8   uint64   número de encontros N
+//      16  uint64   reservado (0)
+//      24  int32[N] meeting, int32[N] classroomId, int32[N] dayOfWeek, int32[N] scheduleId,
+//          uint8[N] allocated (0: sem sala; classroomId e scheduleId ficam 0)
+//  - JSON (caminho terminado em .json), só os alocados:
+//      {"meetings": N, "assignments": [{"meeting": i, "classroomID": c, "dayOfWeek": d, "scheduleID": s}, ...]}
+bool writeAssignment(const std::string& path, const Problem& p);
+// Reservas gravadas por writeAssignment (meeting = índice do encontro);
+// meetings recebe o número de encontros da instância em que a alocação foi feita
+bool readAssignment(const std::string& path, std::vector<Reservation>& out, int& meetings);
+
+#endif // ASSIGNMENT_IO_HPP
@@ -0,0 +1,51 @@
+#ifndef BATCH_HPP
+#define BATCH_HPP
+
+#include "constructive/construction_result.hpp"
+#include "constructive/partial_greedy.hpp"
+#include <string>
+#include <vector>
+
+// Modo lote (./bin/app --batch=MANIFESTO): várias execuções num só processo.
+// Cada instância distinta é lida uma vez (JSON ou cache) e cada linha roda
+// sobre uma cópia nova das reservas da instância, então as execuções não
+// interferem entre si e dão o mesmo resultado que chamadas separadas.
+//
+// Manifesto em CSV, uma execução por linha:
+//     instance,heuristic,alpha,seed,output
+//     instance1.json,greedy,,,res/g1.jsonl
+//     instance1.json,partial,0.5,7,res/p1.csv
+//     instance2.json,partial,0.25,12345,-
+// - instance: como o posicional do binário (relativo a data/generated_instances/)
+// - heuristic: greedy ou partial; alpha vazio -> 0.5; seed vazia ou 0 -> random_device
+//   (a seed sorteada vai para as estatísticas)
+// - output: arquivo de estatísticas (.jsonl ou .csv pela extensão; outra extensão
+//   segue --format). Vazio ou "-" -> registro em stdout: uma linha
+//   {"section": "batch", "line": ..., "instance": ..., "load_ms": ...} seguida das
+//   seções JSON Lines da execução (scripts/stats_reader.py: read_batch_stream)
+// - com --profile, cada saída recebe o perfil por fase da própria execução (a
+//   leitura da instância fica de fora; o pico de RSS é o do processo do lote)
+// O cabeçalho, linhas vazias e linhas começando com '#' são ignorados.
+// As instâncias rodam na ordem em que aparecem pela primeira vez, cada uma com
+// todas as suas linhas; o progresso vai para stderr.
+struct BatchRun {
+    int line = 0;            // linha no manifesto (1 = primeira)
+    std::string instance;
+    bool partial = false;
+    double alpha = 0.5;
+    unsigned int seed = 0;
+    std::string output;      // vazio -> stdout
+};
+
+struct BatchOptions {
+    StatsFormat format = StatsFormat::Csv;  // saídas sem extensão conhecida
+    int prefPenalty = PARTIAL_PREF_PENALTY; // da parcialmente gulosa (--pref-penalty)
+};
+
+// false (com a mensagem em stderr) se o arquivo não puder ser lido ou tiver linha inválida
+bool readManifest(const std::string& path, std::vector<BatchRun>& out);
+// Executa o lote; devolve o número de execuções que falharam
+// (instância que não pôde ser lida ou saída que não pôde ser gravada)
+int runBatch(const std::vector<BatchRun>& runs, const BatchOptions& options);
+
+#endif // BATCH_HPP
@@ -0,0 +1,103 @@
+#ifndef CONSTRUCTION_RESULT_HPP
+#define CONSTRUCTION_RESULT_HPP
+
+#include "../problem.hpp"
+#include <map>
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Formato do arquivo de estatísticas gravado pelo binário
+enum class StatsFormat {
+    Csv,   // greedy_stats.csv (seções em texto)
+    Jsonl  // greedy_stats.jsonl (uma seção tipada por linha; ver scripts/stats_reader.py)
+};
+
+// "greedy_stats.csv" ou "greedy_stats.jsonl"
+const char* statsFilename(StatsFormat format);
+
+// Um encontro alocado por uma heurística
+struct Assignment {
+    int meeting = -1;      // índice em p.meetings
+    int classroomId = 0;
+    int dayOfWeek = 0;
+    int scheduleId = 0;
+};
+
+// Argumentos de ConstructionResult::recordPlacement guardados para registro posterior
+struct Placement {
+    int meeting = -1;
+    int classroomPos = -1;  // índice em p.classrooms
+    int scheduleId = 0;
+    int waste = 0;
+    int violated = 0;
+};
+
+// Resultado de uma construção: a alocação e as estatísticas do relatório
+// (as mesmas que vão para o terminal e para greedy_stats.csv).
+struct ConstructionResult {
+    std::string heuristic = "greedy";  // "greedy", "partial", "exact", "nsga2", ...
+    double alpha = 0.0;
+    unsigned int seed = 0;
+
+    std::vector<Assignment> assignments; // na ordem de alocação
+    std::vector<int> unallocated;        // índices de encontros não alocados
+
+    int placed = 0;
+    int notPlaced = 0;
+    int totalDemand = 0;
+    int demandPlaced = 0;
+    int wasteTotal = 0;
+    int underUtilizedWaste = 0;  // vagas ociosas em salas com <50% ocupação
+    int standingStudents = 0;    // alunos em pé (demanda > capacidade)
+    std::map<std::string, int> prefSatisfied;     // categoria -> quantidade satisfeitas
+    std::map<std::string, int> prefViolated;      // categoria -> quantidade violadas
+    std::map<std::string, int> prefCategoryCount; // categoria -> total de preferências
+
+    // Dados detalhados para gráficos avançados
+    std::map<int, int> classroomOccupancy;        // classroomId -> número de encontros alocados
+    std::map<int, int> classroomDemand;           // classroomId -> demanda total alocada
+    std::map<int, int> classroomCapacity;         // classroomId -> capacidade (para calcular utilização)
+    std::map<int, int> dayOccupancy;              // dayOfWeek -> número de encontros alocados
+    std::map<int, int> dayDemand;                 // dayOfWeek -> demanda total alocada
+    std::vector<int> wasteValues;                 // desperdício de cada encontro alocado
+    std::map<std::string, std::vector<int>> scheduleOccupancy; // "day_schedule" -> [demandas alocadas]
+
+    // Estatísticas da RCL (apenas heurística parcialmente gulosa)
+    int rclTotal = 0;          // número de vezes que uma RCL foi construída
+    long long rclSizeSum = 0;  // soma dos tamanhos de RCL (para média)
+    int rclMultiCount = 0;     // quantas RCLs tinham tamanho > 1
+    long long elapsedMs = 0;
+
+    // Registra um encontro alocado na sala p.classrooms[classroomPos] (posição, não id:
+    // quem chama já a tem). waste é o valor reportado em "Distribuicao Desperdicio";
+    // violated é o número de preferências violadas pela sala escolhida.
+    // Não abrem fase de perfil: quem chama mede o laço de registro inteiro como "stats".
+    void recordPlacement(const Problem& p, int meeting, int classroomPos, int scheduleId, int waste, int violated);
+    void recordUnallocated(const Problem& p, int meeting);
+    // Registra os alocados e os não alocados (cada lista na sua ordem) e chama finalize(),
+    // tudo numa fase "stats" só
+    void recordAll(const Problem& p, const std::vector<Placement>& placements, const std::vector<int>& unallocated);
+    // Calcula as métricas que dependem da alocação completa (vagas ociosas). Também não
+    // abre fase: quem chama a inclui no seu "stats"
+    void finalize();
+
+    int total() const { return placed + notPlaced; }
+    double placementRate() const { return total() > 0 ? (100.0 * placed / total()) : 0.0; }
+    double demandRate() const { return totalDemand > 0 ? (100.0 * demandPlaced / totalDemand) : 0.0; }
+    double avgWaste() const { return placed > 0 ? (double)wasteTotal / placed : 0.0; }
+    int unallocatedStudents() const { return totalDemand - demandPlaced; }
+    double rclAvgSize() const { return rclTotal > 0 ? (double)rclSizeSum / rclTotal : 0.0; }
+
+    // Relatório legível (terminal)
+    void printReport(std::ostream& out) const;
+    // Mesmo layout de greedy_stats.csv
+    void writeCsv(std::ostream& out) const;
+    bool writeCsv(const std::string& path) const;
+    // Mesmas seções em JSON Lines: {"section": <nome>, ...} por linha, colunas como arrays
+    void writeJsonl(std::ostream& out) const;
+    bool writeJsonl(const std::string& path) const;
+    bool writeStats(const std::string& path, StatsFormat format) const;
+};
+
+#endif
@@ -2,15 +2,29 @@
 #define CONSTRUCTIVE_HEURISTIC_HPP
 
 #include "../problem.hpp"
+#include "construction_result.hpp"
 
-void greedyConstruct(Problem& p);
+// Peso de cada preferência violada no score da gulosa (desperdício + peso * violações).
+// A re-solução incremental e o solver exato usam o mesmo peso
+constexpr int GREEDY_PREF_PENALTY = 50;
+
+// greedyConstruct imprime o relatório e grava greedy_stats.csv (ou .jsonl, ver StatsFormat);
+// runGreedy só constrói e devolve o resultado (sem E/S)
+void greedyConstruct(Problem& p, StatsFormat format = StatsFormat::Csv);
+ConstructionResult runGreedy(Problem& p);
+// Núcleo sem efeitos em p: as reservas novas vão para reservations (ver runPartiallyGreedy
+// em partial_greedy.hpp); exige p.prefIndex em dia
+ConstructionResult runGreedy(const Problem& p, std::vector<Reservation>& reservations);
+// Idem, só para os encontros de meetings (índices em p.meetings, na ordem da instância)
+ConstructionResult runGreedy(const Problem& p, std::vector<Reservation>& reservations, std::vector<int> meetings);
 // Heurística parcialmente gulosa (RCL - Restricted Candidate List)
 // alpha: 0.0 -> comportamento determinístico (igual ao greedy)
 // alpha: 1.0 -> RCL máximo (mais aleatoriedade)
 // partiallyGreedyConstruct: alpha em [0,1] controla o tamanho da RCL.
 // seed == 0 -> usa random_device para semear (não determinístico)
 // seed != 0 -> usa seed fornecida para permitir reprodutibilidade
-void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed = 0);
+void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed = 0, StatsFormat format = StatsFormat::Csv);
+ConstructionResult runPartiallyGreedy(Problem& p, double alpha, unsigned int seed);
 
 #endif 
 // Ambos os algoritmos usados neste trabalho (NSGA-II e MOLA) precisam de soluc¸
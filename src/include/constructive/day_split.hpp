@@ -0,0 +1,54 @@
+#ifndef DAY_SPLIT_HPP
+#define DAY_SPLIT_HPP
+
+#include "../problem.hpp"
+#include "construction_result.hpp"
+#include "partial_greedy.hpp"
+#include <vector>
+
+// Construção decomposta por dia: o dia de cada encontro é fixo e nenhuma
+// reserva atravessa dias, então a alocação de cada dia da semana não depende
+// das outras. Os encontros e as reservas já existentes são separados por dia
+// e cada dia roda a gulosa (ou a parcialmente gulosa) numa thread, com sua
+// cópia das reservas e seu índice de ocupação, que só tem as células (sala,
+// horário) daquele dia e só percorre os encontros dele. As estatísticas dos dias são
+// juntas na ordem global da construção (demanda decrescente).
+//
+// Gulosa: a alocação e o relatório são os mesmos da gulosa global.
+// Parcialmente gulosa: cada dia tem seu mt19937, semeado com multiStartSeed(seed, dia),
+// então o resultado não depende do número de threads (mas difere da construção
+// global com a mesma seed, que usa um gerador só).
+struct DaySplitOptions {
+    bool partial = false;            // false -> gulosa
+    double alpha = 0.0;
+    unsigned int seed = 0;           // 0 -> random_device
+    int prefPenalty = PARTIAL_PREF_PENALTY;
+    int threads = 0;                 // 0 -> std::thread::hardware_concurrency()
+};
+
+// Um dia da decomposição
+struct DayRun {
+    int day = 0;                     // dayOfWeek
+    int meetings = 0;
+    int fixedReservations = 0;       // reservas da instância nesse dia
+    unsigned int seed = 0;           // só na parcialmente gulosa
+    int placed = 0;
+    int thread = 0;
+    long long elapsedMs = 0;
+};
+
+struct DaySplitResult {
+    ConstructionResult result;       // os dias juntos
+    std::vector<DayRun> days;        // em ordem de dia
+    unsigned int seed = 0;           // seed mestre usada
+    int threads = 0;
+    long long elapsedMs = 0;
+};
+
+// Só constrói (sem E/S). p.reservations não é alterado.
+DaySplitResult runByDay(Problem& p, const DaySplitOptions& options);
+// Imprime o resumo por dia e o relatório, grava greedy_stats.csv/.jsonl
+// e coloca a alocação em p.reservations, como nas construções simples.
+void byDayConstruct(Problem& p, const DaySplitOptions& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
@@ -0,0 +1,82 @@
+#ifndef EXACT_MATCHING_HPP
+#define EXACT_MATCHING_HPP
+
+#include "../problem.hpp"
+#include "constructive_heuristic.hpp"
+#include "construction_result.hpp"
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Solver exato por decomposição em blocos (dia, horário). Como o dia de cada
+// encontro é fixo e salas só conflitam dentro do mesmo dia e horário, cada
+// bloco é um problema de atribuição: encontros que podem usar o horário x
+// salas livres na célula, custo = desperdício + prefPenalty x preferências
+// violadas, e unallocatedPenalty por encontro sem sala.
+//
+// Encontros com vários horários ligam os blocos do seu dia. Cada componente de
+// blocos ligados continua sendo uma atribuição (encontros x células sala-horário)
+// e é resolvido exatamente pelo método húngaro; os componentes rodam em paralelo.
+// Componente grande demais para isso (maxBlockWork) é relaxado: a restrição
+// "um horário só" dos encontros de vários horários sai (relaxação lagrangiana,
+// multiplicadores por subgradiente, começando pelos custos da gulosa), cada
+// bloco vira uma atribuição separada e cada iteração dá um limite inferior
+// válido e uma alocação viável (cada encontro no bloco de menor custo, o resto
+// pelo melhor encaixe; a gulosa é a primeira). Nos blocos relaxados, salas com
+// o mesmo custo para todos os encontros do bloco viram um tipo com capacidade,
+// e a atribuição do bloco é resolvida exatamente como transporte encontros x
+// tipos. Custo igual ao limite prova o ótimo.
+struct ExactOptions {
+    int prefPenalty = GREEDY_PREF_PENALTY;  // mesmo peso da gulosa
+    int unallocatedPenalty = 10000;  // custo de deixar um encontro sem sala
+    int iterations = 200;            // máximo de iterações do subgradiente
+    long long timeLimitMs = 60000;   // o subgradiente para depois disso (a primeira iteração sempre roda)
+    int threads = 0;                 // 0 -> std::thread::hardware_concurrency()
+    // componente em que o húngaro custaria mais que isso (linhas^2 x colunas) é relaxado
+    long long maxBlockWork = 2000000000LL;
+};
+
+// Uma linha do traço por iteração
+struct ExactIteration {
+    int iteration = 0;
+    double lowerBound = 0.0;      // limite da iteração
+    double bestLowerBound = 0.0;
+    long long cost = 0;           // custo da alocação reparada da iteração
+    long long bestCost = 0;
+    double step = 0.0;
+};
+
+struct ExactResult {
+    ConstructionResult result;  // melhor alocação encontrada
+    long long cost = 0;         // custo dela
+    double lowerBound = 0.0;    // melhor limite inferior
+    long long greedyCost = 0;   // custo da gulosa na mesma função (para medir o gap dela)
+    int blocks = 0;
+    int components = 0;         // grupos de blocos ligados por encontros de vários horários
+    int relaxedComponents = 0;  // acima de maxBlockWork (só limite inferior)
+    int largeBlocks = 0;        // blocos dos relaxados com tipos demais (só limite por contagem de salas)
+    int relaxedMeetings = 0;    // encontros de vários horários nos componentes relaxados
+    int threads = 0;
+    std::vector<ExactIteration> trace;
+    long long elapsedMs = 0;
+
+    bool optimal() const;
+    // gap relativo (%) de um custo para o limite inferior
+    double gapTo(long long value) const;
+
+    // traço em CSV: Iteracao,LimiteInferior,MelhorLimiteInferior,Custo,MelhorCusto,Passo
+    void writeTraceCsv(std::ostream& out) const;
+    bool writeTraceCsv(const std::string& path) const;
+};
+
+// Custo de uma alocação na função do solver exato (exige p.prefIndex em dia)
+long long exactCost(const Problem& p, const ConstructionResult& r, const ExactOptions& options);
+
+// Só resolve (sem E/S). p.reservations não é alterado.
+ExactResult runExact(Problem& p, const ExactOptions& options);
+// Imprime limites, gap da gulosa e o relatório da melhor alocação; grava as
+// estatísticas em greedy_stats.csv/.jsonl e o traço em exact_trace.csv.
+// A alocação vai para p.reservations, como nas construções simples.
+void exactConstruct(Problem& p, const ExactOptions& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
@@ -0,0 +1,36 @@
+#ifndef INCREMENTAL_HPP
+#define INCREMENTAL_HPP
+
+#include "../problem.hpp"
+#include "construction_result.hpp"
+#include <vector>
+
+// Re-solução incremental (warm start): parte de uma alocação anterior e de um
+// InstanceDelta em vez de construir tudo de novo. Toda reserva anterior que
+// continua válida fica onde está; só são realocados os encontros afetados
+// (novos, alterados, ou cuja sala/horário deixou de estar disponível), com o
+// mesmo critério de melhor encaixe da gulosa. Um afetado que não cabe em
+// nenhuma sala livre toma a sala de um encontro de demanda menor, que volta
+// para a fila (cada encontro é deslocado no máximo uma vez). Encontros que
+// estavam sem sala só tentam salas livres.
+struct IncrementalResult {
+    ConstructionResult result;  // alocação completa; mesmas métricas de uma construção do zero
+    int kept = 0;         // na mesma sala e horário da alocação anterior
+    int affected = 0;     // novos, alterados ou com a reserva anterior inválida
+    int displaced = 0;    // tirados da sala por um afetado
+    int moved = 0;        // alocados antes e agora em outra sala/horário
+    int newlyPlaced = 0;  // sem sala antes (ou novos) e alocados agora
+    int lost = 0;         // alocados antes e agora sem sala
+};
+
+// Aplica delta a p (p.meetings, p.reservations e p.prefIndex passam a ser os da
+// instância alterada) e refaz a alocação a partir de previous (reservas com
+// meeting = índice na instância antes do delta). p.reservations deve ter só as
+// reservas fixas; ao final recebe também as da alocação nova.
+// Sem alocação anterior, o resultado é o da gulosa sobre a instância alterada.
+IncrementalResult runIncremental(Problem& p, const std::vector<Reservation>& previous, const InstanceDelta& delta);
+// Idem, imprimindo o relatório e gravando greedy_stats.csv (ou .jsonl)
+void incrementalConstruct(Problem& p, const std::vector<Reservation>& previous, const InstanceDelta& delta,
+                          StatsFormat format = StatsFormat::Csv);
+
+#endif
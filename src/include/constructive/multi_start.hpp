@@ -0,0 +1,77 @@
+#ifndef MULTI_START_HPP
+#define MULTI_START_HPP
+
+#include "../problem.hpp"
+#include "construction_result.hpp"
+#include "partial_greedy.hpp"
+#include "../metaheuristics/local_search.hpp"
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Multi-start (GRASP) da heurística parcialmente gulosa: o Problem é carregado
+// uma vez e N construções RCL rodam em um pool de threads. Cada iteração usa
+// sua própria cópia das reservas e um mt19937 semeado com uma seed derivada da
+// seed mestre e do número da iteração, então o resultado não depende do número
+// de threads e a melhor iteração pode ser reproduzida com --heuristic=partial:<alpha>:<seed>.
+
+// Objetivo minimizado na escolha da melhor construção
+enum class MultiStartObjective {
+    Unallocated,  // alunos desalocados (demanda não atendida)
+    Waste,        // desperdício médio (vagas ociosas por encontro alocado)
+    Standing,     // alunos em pé
+    Weighted      // alunos desalocados + desperdício total + 15 x preferências violadas
+};
+
+// "unallocated", "waste", "standing", "weighted"; false se o nome não existir
+bool parseMultiStartObjective(const std::string& name, MultiStartObjective& out);
+const char* multiStartObjectiveName(MultiStartObjective objective);
+double multiStartObjectiveValue(const ConstructionResult& r, MultiStartObjective objective);
+
+struct MultiStartOptions {
+    int iterations = 100;
+    int threads = 0;              // 0 -> std::thread::hardware_concurrency()
+    double alpha = 0.5;
+    int prefPenalty = PARTIAL_PREF_PENALTY;
+    unsigned int masterSeed = 0;  // 0 -> random_device
+    MultiStartObjective objective = MultiStartObjective::Weighted;
+    LocalSearchOptions localSearch;  // enabled -> busca local após cada construção (GRASP completo)
+};
+
+// Uma linha do traço por iteração
+struct MultiStartIteration {
+    int iteration = 0;
+    unsigned int seed = 0;
+    int thread = 0;
+    double objective = 0.0;
+    int placed = 0;
+    int demandPlaced = 0;
+    double avgWaste = 0.0;
+    int standingStudents = 0;
+    int prefViolated = 0;
+    long long elapsedMs = 0;
+};
+
+struct MultiStartResult {
+    ConstructionResult best;       // empate: a menor iteração
+    int bestIteration = -1;
+    unsigned int masterSeed = 0;
+    int threads = 0;
+    std::vector<MultiStartIteration> trace;  // na ordem das iterações
+    long long elapsedMs = 0;
+
+    // traço em CSV: Iteracao,Seed,Thread,Objetivo,...
+    void writeTraceCsv(std::ostream& out) const;
+    bool writeTraceCsv(const std::string& path) const;
+};
+
+// seed da iteração i (nunca 0, que significaria random_device em runPartiallyGreedy)
+unsigned int multiStartSeed(unsigned int masterSeed, int iteration);
+
+// Só constrói (sem E/S). p.reservations não é alterado.
+MultiStartResult runMultiStart(Problem& p, const MultiStartOptions& options);
+// Imprime o relatório da melhor construção, grava as estatísticas dela em
+// greedy_stats.csv/.jsonl e o traço em multistart_trace.csv
+void multiStartConstruct(Problem& p, const MultiStartOptions& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
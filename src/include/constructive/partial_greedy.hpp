@@ -2,11 +2,32 @@
 #define PARTIAL_GREEDY_HPP
 
 #include "../problem.hpp"
+#include "construction_result.hpp"
+#include <random>
+#include <vector>
 
 // Heurística parcialmente gulosa (RCL - Restricted Candidate List)
 // alpha: 0.0 -> comportamento determinístico (igual ao greedy)
 // alpha: 1.0 -> RCL máximo (mais aleatoriedade)
 // seed == 0 -> usa random_device (não determinístico). seed != 0 -> reprodutível
-void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed);
+// partiallyGreedyConstruct imprime o relatório e grava greedy_stats.csv (ou .jsonl);
+// runPartiallyGreedy só constrói e devolve o resultado (sem E/S)
+// prefPenalty: peso de cada preferência violada no score da RCL (--pref-penalty)
+constexpr int PARTIAL_PREF_PENALTY = 15;
+void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed, StatsFormat format);
+void partiallyGreedyConstruct(Problem& p, double alpha, unsigned int seed, StatsFormat format, int prefPenalty);
+ConstructionResult runPartiallyGreedy(Problem& p, double alpha, unsigned int seed);
+ConstructionResult runPartiallyGreedy(Problem& p, double alpha, unsigned int seed, int prefPenalty);
+// Núcleo da construção: não altera p e grava as reservas novas em reservations
+// (que começa com as reservas já existentes). Exige p.prefIndex em dia
+// (p.ensurePreferenceIndex()), então várias construções podem rodar em paralelo
+// sobre o mesmo Problem, cada uma com sua cópia das reservas e seu gerador.
+ConstructionResult runPartiallyGreedy(const Problem& p, std::vector<Reservation>& reservations, double alpha,
+                                      std::mt19937& rng, int prefPenalty = PARTIAL_PREF_PENALTY);
+// Idem, só para os encontros de meetings (índices em p.meetings, na ordem da instância);
+// os demais ficam de fora do resultado (ex.: a construção por dia, day_split.hpp)
+ConstructionResult runPartiallyGreedy(const Problem& p, std::vector<Reservation>& reservations,
+                                      std::vector<int> meetings, double alpha, std::mt19937& rng,
+                                      int prefPenalty = PARTIAL_PREF_PENALTY);
 
 #endif
@@ -0,0 +1,19 @@
+#ifndef INSTANCE_CACHE_HPP
+#define INSTANCE_CACHE_HPP
+
+#include "problem.hpp"
+#include <string>
+
+// Cache binário colunar das instâncias (formato em scripts/instance_cache.py).
+// Fica em <dir do JSON>/.cache/<nome>.bin e só é usado se o tamanho e o
+// mtime gravados nele ainda correspondem ao JSON de origem.
+
+// caminho do cache correspondente a um JSON de instância
+std::string instanceCachePath(const std::string& jsonPath);
+
+// Preenche p a partir do cache; false se ausente, desatualizado ou inválido
+// (nesse caso p não é alterado e o chamador deve ler o JSON).
+// Não monta prefIndex.
+bool loadInstanceCache(Problem& p, const std::string& jsonPath);
+
+#endif
@@ -0,0 +1,128 @@
+#ifndef ALLOCATION_MODEL_HPP
+#define ALLOCATION_MODEL_HPP
+
+#include "../problem.hpp"
+#include "../occupancy.hpp"
+#include "../constructive/construction_result.hpp"
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <ostream>
+#include <random>
+#include <string>
+#include <thread>
+#include <vector>
+
+// Modelo de alocação compartilhado pelas metaheurísticas multiobjetivo
+// (NSGA-II e MOLA) e pela busca local. Uma solução guarda, por encontro, a
+// sala (posição em p.classrooms, -1 = não alocado) e o horário; o dia é o do
+// encontro. Como cada encontro tem dia fixo, dias diferentes nunca disputam células.
+
+// Objetivos minimizados
+enum ObjectiveId { OBJ_UNALLOCATED = 0, OBJ_IDLE_SEATS, OBJ_STANDING, OBJ_PREFERENCES, N_OBJECTIVES };
+using Objectives = std::array<long long, N_OBJECTIVES>;
+
+// nomes das colunas nos CSVs de fronteira
+extern const char* const OBJECTIVE_NAMES[N_OBJECTIVES];
+
+// a domina b: não é pior em nenhum objetivo e é melhor em pelo menos um
+bool dominates(const Objectives& a, const Objectives& b);
+
+struct Solution {
+    std::vector<int> room;   // por encontro: posição da sala, -1 = não alocado
+    std::vector<int> sched;  // por encontro: id do horário (válido se room >= 0)
+    Objectives obj{};
+};
+
+// Ocupação de uma solução: ocupante de cada célula (sala, dia, horário)
+constexpr int CELL_FREE = -1;
+constexpr int CELL_FIXED = -2;
+
+class AllocationModel {
+public:
+    // fixed: reservas que já existiam (nunca se movem). allowStanding: salas menores
+    // que a demanda são aceitas (o excesso conta como alunos em pé)
+    AllocationModel(const Problem& p, const std::vector<Reservation>& fixed, bool allowStanding);
+
+    const Problem& problem() const { return p; }
+    size_t numMeetings() const { return p.meetings.size(); }
+    size_t numCells() const { return fixedCells.size(); }
+    // encontros com horários, na ordem da construção (demanda decrescente)
+    const std::vector<int>& order() const { return meetingOrder; }
+    // dias presentes (índices densos) e encontros de cada dia
+    size_t numDays() const { return byDay.size(); }
+    const std::vector<int>& meetingsOfDay(size_t d) const { return byDay[d]; }
+    int dayOf(int m) const { return meetingDay[m]; }
+
+    size_t cellOf(int pos, int m, int scheduleId) const;
+    bool compatible(int m, int pos) const;
+    // salas em que m pode entrar (laboratórios para práticos); capacidade ainda precisa de compatible()
+    const std::vector<int>& candidateRooms(int m) const;
+
+    // contribuição de um encontro nos objetivos (pos = -1: não alocado), O(1)
+    Objectives contribution(int m, int pos) const;
+    Objectives evaluate(const Solution& s) const;
+
+    // ocupação inicial (reservas fixas) para montar a de uma solução
+    const std::vector<int>& fixedOccupancy() const { return fixedCells; }
+    const std::vector<Reservation>& fixedReservationList() const { return fixedReservations; }
+    // marca (occupant = m) ou desmarca (occupant = CELL_FREE) as células de s em cells
+    void markCells(const Solution& s, std::vector<int>& cells, bool set) const;
+
+    // sorteia uma célula (sala compatível x horário do encontro); false se m não tem sala possível
+    bool randomCell(int m, std::mt19937& rng, int& pos, int& scheduleId) const;
+
+    Solution fromResult(const ConstructionResult& res) const;
+    // Refaz as estatísticas da solução (mesma ordem de registro da construção)
+    ConstructionResult toResult(const Solution& s, const std::string& heuristic) const;
+    std::vector<Reservation> toReservations(const Solution& s) const;
+
+private:
+    const Problem& p;
+    bool allowStanding;
+    OccupancyIndex occ;
+    size_t nDays, nScheds;
+    std::vector<int> fixedCells;
+    std::vector<int> meetingOrder;
+    std::vector<int> meetingDay;
+    std::vector<std::vector<int>> byDay;
+    std::vector<int> allRooms, labRooms;
+    std::vector<Reservation> fixedReservations;
+};
+
+// Fronteiras de não dominância (ENS-SS, Zhang et al. 2015): ordena as soluções
+// lexicograficamente e insere cada uma na primeira fronteira em que nenhum
+// membro a domina, comparando do último membro para o primeiro. O(M N log N)
+// no caso médio, contra O(M N^2) do fast non-dominated sort original.
+std::vector<std::vector<int>> nonDominatedFronts(const std::vector<Objectives>& objs);
+// Distância de aglomeração dos membros de uma fronteira (mesma ordem de front)
+std::vector<double> crowdingDistance(const std::vector<Objectives>& objs, const std::vector<int>& front);
+
+// f(i, t) para i em [0, n) em até threads threads (t = índice da thread; 0 = a chamadora)
+template <typename F>
+void parallelFor(int n, int threads, F&& f) {
+    threads = std::max(1, std::min(threads, n));
+    std::atomic<int> next{0};
+    auto worker = [&](int t) {
+        for (int i = next++; i < n; i = next++) f(i, t);
+    };
+    std::vector<std::thread> pool;
+    for (int t = 1; t < threads; ++t) pool.emplace_back(worker, t);
+    worker(0);
+    for (auto& th : pool) th.join();
+}
+
+// Soluções iniciais das construtivas, em paralelo: a primeira é a gulosa e as
+// demais parcialmente gulosas com alpha de 0.1 a 0.9 (gerador de cada uma
+// derivado de seed e do índice). p.ensurePreferenceIndex() já deve ter sido chamado
+std::vector<Solution> constructiveSolutions(const Problem& p, const AllocationModel& model, int count,
+                                            unsigned int seed, int threads);
+
+// Solução da fronteira com menor soma ponderada dos objetivos (pesos da busca local)
+size_t weightedRepresentative(const std::vector<Solution>& front);
+
+// CSV da fronteira: Solucao,<objetivos>,EncontrosAlocados
+void writeFrontCsv(std::ostream& out, const std::vector<Solution>& front);
+bool writeFrontCsv(const std::string& path, const std::vector<Solution>& front);
+
+#endif
@@ -0,0 +1,81 @@
+#ifndef LOCAL_SEARCH_HPP
+#define LOCAL_SEARCH_HPP
+
+#include "../problem.hpp"
+#include "../constructive/construction_result.hpp"
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Busca local sobre a alocação de uma construção (greedy, partial ou cada
+// iteração do multi-start). Vizinhanças:
+//   relocate      move um encontro (alocado ou não) para uma célula livre (sala, horário) do seu dia
+//   swap          troca as células de dois encontros alocados no mesmo dia
+//   ejection      encontro não alocado toma a célula de outro, que vai para uma célula livre,
+//                 expulsa um encontro menor (até maxChainDepth níveis) ou fica sem sala
+// Cada movimento é avaliado em O(1) pelo custo por encontro (desperdício,
+// alunos em pé e preferências violadas da sala, ou demanda se não alocado);
+// os totais de cada componente são atualizados por delta ao aplicar.
+
+// Pesos do objetivo minimizado
+struct LocalSearchWeights {
+    double unallocated = 10.0;  // por aluno desalocado
+    double waste = 1.0;         // por vaga ociosa
+    double standing = 10.0;     // por aluno em pé
+    double preference = 15.0;   // por preferência violada (mesma penalidade da heurística parcial)
+};
+
+struct LocalSearchOptions {
+    bool enabled = false;
+    long long timeLimitMs = 1000;   // <= 0: sem limite de tempo
+    long long maxIterations = 0;    // movimentos aplicados; <= 0: sem limite
+    int maxChainDepth = 3;          // encontros deslocados por cadeia de ejeção
+    int chainBreadth = 8;           // primeiras células tentadas por cadeia (as de menor delta)
+    bool allowStanding = false;     // aceita salas menores que a demanda (as heurísticas não aceitam)
+    LocalSearchWeights weights;
+};
+
+// Componentes do objetivo (mantidos por delta)
+struct LocalSearchTotals {
+    long long waste = 0;
+    long long unallocatedDemand = 0;
+    long long standing = 0;
+    long long violations = 0;
+    int placed = 0;
+
+    double objective(const LocalSearchWeights& w) const {
+        return w.unallocated * unallocatedDemand + w.waste * waste + w.standing * standing + w.preference * violations;
+    }
+};
+
+struct LocalSearchStats {
+    LocalSearchTotals before;
+    LocalSearchTotals after;
+    double objectiveBefore = 0.0;
+    double objectiveAfter = 0.0;
+    long long iterations = 0;   // movimentos aplicados
+    long long evaluations = 0;  // movimentos avaliados
+    long long relocations = 0;
+    long long insertions = 0;   // relocate de encontro não alocado
+    long long swaps = 0;
+    long long chains = 0;
+    int passes = 0;
+    long long elapsedMs = 0;
+    std::string stopReason;     // "otimo local", "tempo" ou "iteracoes"
+
+    void print(std::ostream& out) const;
+};
+
+// Melhora res in-place. initialReservations são as reservas que existiam antes
+// da construção (fixas); reservations recebe initialReservations + a alocação final.
+// Não altera p (pode rodar em paralelo sobre o mesmo Problem); exige p.prefIndex em dia.
+LocalSearchStats localSearch(const Problem& p, const std::vector<Reservation>& initialReservations,
+                             ConstructionResult& res, std::vector<Reservation>& reservations,
+                             const LocalSearchOptions& options);
+
+// Busca local sobre res, relatório e gravação das estatísticas (como greedyConstruct/partiallyGreedyConstruct).
+// p.reservations passa a ser initialReservations + a alocação melhorada.
+void improveConstruct(Problem& p, const std::vector<Reservation>& initialReservations, ConstructionResult res,
+                      const LocalSearchOptions& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
@@ -0,0 +1,44 @@
+#ifndef MOLA_HPP
+#define MOLA_HPP
+
+#include "../problem.hpp"
+#include "../constructive/construction_result.hpp"
+#include "allocation_model.hpp"
+#include <vector>
+
+// MOLA: busca local multiobjetivo (Pareto local search) sobre o modelo de
+// alocação, com os mesmos objetivos do NSGA-II. Parte das soluções das
+// construtivas; a cada passo sorteia uma solução do arquivo e caminha por ela
+// com movimentos de realocação (inclui inserir encontros não alocados), troca
+// (um encontro não alocado pode tomar a célula de outro) e desalocação.
+// Cada movimento é avaliado em O(1) pela diferença das contribuições dos
+// encontros envolvidos. O movimento é aplicado se o novo ponto entra no arquivo
+// (pareto_archive.hpp) ou domina o atual.
+
+struct MolaOptions {
+    long long timeLimitMs = 10000;  // <= 0: sem limite de tempo
+    long long maxIterations = 0;    // movimentos tentados (0 = sem limite; com tempo <= 0 usa 100000)
+    size_t archiveSize = 100;
+    int initialSolutions = 8;       // construções iniciais (1 gulosa + parcialmente gulosas)
+    int threads = 0;                // threads das construções iniciais; 0 -> hardware_concurrency()
+    unsigned int seed = 0;          // 0 -> random_device
+    int walkLength = 50;            // movimentos tentados a partir de cada solução sorteada
+    bool allowStanding = true;
+    long long progressEveryMs = 1000;  // 0 = sem progresso
+};
+
+struct MolaResult {
+    std::vector<Solution> front;    // arquivo final, em ordem lexicográfica dos objetivos
+    long long iterations = 0;       // movimentos tentados
+    long long evaluated = 0;        // movimentos válidos avaliados
+    long long accepted = 0;         // movimentos aplicados
+    unsigned int seed = 0;
+    long long elapsedMs = 0;
+};
+
+MolaResult runMola(Problem& p, const MolaOptions& options);
+// Roda a MOLA, grava o arquivo final em pareto_front.csv e as estatísticas da
+// solução com menor soma ponderada (pesos da busca local) em greedy_stats.csv/.jsonl
+void molaConstruct(Problem& p, const MolaOptions& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
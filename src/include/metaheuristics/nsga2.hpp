@@ -0,0 +1,45 @@
+#ifndef NSGA2_HPP
+#define NSGA2_HPP
+
+#include "../problem.hpp"
+#include "../constructive/construction_result.hpp"
+#include "allocation_model.hpp"
+#include <vector>
+
+// NSGA-II sobre o modelo de alocação (allocation_model.hpp), com os quatro
+// objetivos: demanda não alocada, vagas ociosas, alunos em pé e preferências
+// violadas. A população inicial vem das heurísticas construtivas (uma gulosa e
+// as demais parcialmente gulosas com alpha entre 0.1 e 0.9), como no artigo.
+//
+// Cruzamento por dia: o filho herda de um dos pais a alocação inteira de cada
+// dia, então nunca há conflito de sala. Mutação: inserir, realocar, trocar ou
+// desalocar encontros, escolhendo a melhor de algumas células sorteadas por uma
+// soma ponderada dos objetivos com pesos aleatórios por filho.
+// Cada filho tem seu gerador (seed derivada da seed mestre, da geração e do
+// índice), então o resultado não depende do número de threads.
+
+struct Nsga2Options {
+    int population = 100;
+    int generations = 200;
+    long long timeLimitMs = 60000;  // <= 0: sem limite de tempo
+    int threads = 0;                // 0 -> std::thread::hardware_concurrency()
+    unsigned int seed = 0;          // 0 -> random_device
+    double crossoverRate = 0.9;
+    double mutationRate = 0.02;     // fração dos encontros mutados por filho (pelo menos 1)
+    bool allowStanding = true;      // salas menores que a demanda (alunos em pé) são aceitas
+    int progressEvery = 10;         // gerações entre linhas de progresso (0 = sem progresso)
+};
+
+struct Nsga2Result {
+    std::vector<Solution> front;    // fronteira final, por demanda não alocada crescente
+    int generations = 0;
+    unsigned int seed = 0;
+    long long elapsedMs = 0;
+};
+
+Nsga2Result runNsga2(Problem& p, const Nsga2Options& options);
+// Roda o NSGA-II, grava a fronteira em pareto_front.csv e as estatísticas da
+// solução da fronteira com menor soma ponderada (pesos da busca local) em greedy_stats.csv/.jsonl
+void nsga2Construct(Problem& p, const Nsga2Options& options, StatsFormat format = StatsFormat::Csv);
+
+#endif
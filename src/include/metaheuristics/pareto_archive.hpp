@@ -0,0 +1,65 @@
+#ifndef PARETO_ARCHIVE_HPP
+#define PARETO_ARCHIVE_HPP
+
+#include "allocation_model.hpp"
+#include <vector>
+
+// Arquivo de soluções não dominadas com tamanho máximo.
+//
+// As soluções ficam numa ND-Tree (Jaszkiewicz & Lust, 2018): cada nó guarda o
+// ponto ideal e o nadir aproximados do seu conjunto. Na inserção, um nó inteiro
+// é descartado quando o novo ponto não pode dominar nem ser dominado por ele,
+// rejeitado de uma vez quando o nadir do nó domina o ponto e removido de uma vez
+// quando o ponto domina o ideal. Só as folhas na região do ponto são comparadas
+// uma a uma, em vez de varrer o arquivo inteiro.
+//
+// Quando o arquivo passa do limite, sai a solução de menor distância de
+// aglomeração (os extremos de cada objetivo nunca saem).
+class ParetoArchive {
+public:
+    explicit ParetoArchive(size_t capacity, size_t maxLeaf = 20, size_t branching = N_OBJECTIVES + 1);
+
+    // nenhuma solução do arquivo domina fracamente obj (igualdade também rejeita)
+    bool accepts(const Objectives& obj) const;
+    // insere s se for aceita; remove as que s domina. false se foi rejeitada
+    bool insert(const Solution& s);
+
+    size_t size() const { return live.size(); }
+    size_t capacity() const { return limit; }
+    // acesso por índice em [0, size()); a ordem muda a cada inserção
+    const Solution& at(size_t i) const { return slots[live[i]]; }
+    // soluções do arquivo em ordem lexicográfica dos objetivos
+    std::vector<Solution> solutions() const;
+
+private:
+    struct Node {
+        Objectives ideal{}, nadir{};
+        int parent = -1;
+        std::vector<int> children;  // nós filhos (nó interno)
+        std::vector<int> points;    // slots (folha)
+        bool leaf = true;
+    };
+
+    size_t limit, maxLeaf, branching;
+    std::vector<Node> nodes;        // nodes[0] é a raiz
+    std::vector<int> freeNodes;
+    std::vector<Solution> slots;
+    std::vector<int> freeSlots;
+    std::vector<int> live;          // slots ocupados
+    std::vector<int> livePos;       // slot -> posição em live
+    std::vector<int> leafOf;        // slot -> folha
+
+    bool empty(int n) const;
+    bool coveredBy(int n, const Objectives& y) const;
+    // atualiza o nó com y: false se y é dominado; remove os pontos que y domina
+    bool update(int n, const Objectives& y);
+    void insertAt(int n, int slot);
+    void split(int n);
+    int newNode(int parent, bool leaf);
+    void expand(int n, const Objectives& y);
+    void releaseSubtree(int n);
+    void removeSlot(int slot, bool fromLeaf);
+    void evictMostCrowded();
+};
+
+#endif
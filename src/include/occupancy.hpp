@@ -0,0 +1,66 @@
+#ifndef OCCUPANCY_HPP
+#define OCCUPANCY_HPP
+
+#include "problem.hpp"
+#include <unordered_map>
+#include <vector>
+
+// Índice denso de ocupação (sala x dia x horário) com consulta O(1).
+// Substitui a varredura linear de p.reservations nas heurísticas: é
+// construído a partir das reservas já carregadas e cada nova reserva deve
+// entrar por reserve(), que mantém p.reservations e o índice sincronizados.
+class OccupancyIndex {
+public:
+    explicit OccupancyIndex(const Problem& p);
+    // Mesmo índice, mas a partir de um conjunto de reservas que não é o de p
+    // (ex.: a cópia privada de cada construção do multi-start)
+    OccupancyIndex(const Problem& p, const std::vector<Reservation>& reservations);
+    // Só com os dias e horários desses encontros (posições em p.meetings) e das
+    // reservas: o índice de uma construção parcial (ex.: um dia da decomposição por dia)
+    OccupancyIndex(const Problem& p, const std::vector<Reservation>& reservations, const std::vector<int>& meetings);
+
+    // -1 quando o dia/horário não aparece na instância
+    int dayIndex(int day) const;
+    int scheduleIndex(int scheduleId) const;
+    // tamanho dos eixos (dayIndex/scheduleIndex ficam em [0, dayCount/scheduleCount))
+    size_t dayCount() const { return nDays; }
+    size_t scheduleCount() const { return nScheds; }
+
+    // classroomPos = posição da sala em p.classrooms
+    bool isFree(size_t classroomPos, int dayIdx, int schedIdx) const {
+        if (dayIdx < 0 || schedIdx < 0) return true;
+        return !busy[cell(slotOfClassroom[classroomPos], dayIdx, schedIdx)];
+    }
+
+    // Marca a sala como ocupada e registra a reserva em p.reservations
+    void reserve(Problem& p, size_t classroomPos, Reservation r);
+    // Idem, registrando a reserva em reservations
+    void reserve(std::vector<Reservation>& reservations, size_t classroomPos, Reservation r);
+    // Marca/libera a célula (dia e horário já em índices válidos) sem tocar em lista de reservas,
+    // para quem guarda a alocação à parte (ex.: a re-solução incremental)
+    void occupy(size_t classroomPos, int dayIdx, int schedIdx) {
+        busy[cell(slotOfClassroom[classroomPos], dayIdx, schedIdx)] = true;
+    }
+    void release(size_t classroomPos, int dayIdx, int schedIdx) {
+        busy[cell(slotOfClassroom[classroomPos], dayIdx, schedIdx)] = false;
+    }
+
+private:
+    size_t cell(int slot, int dayIdx, int schedIdx) const {
+        return (static_cast<size_t>(slot) * nDays + dayIdx) * nScheds + schedIdx;
+    }
+    // meetings == nullptr: todos os encontros de p
+    void build(const Problem& p, const std::vector<Reservation>& reservations, const std::vector<int>* meetings);
+    void mark(int classroomId, int day, int scheduleId);
+
+    // salas com o mesmo id compartilham o mesmo slot (como na comparação por id)
+    std::vector<int> slotOfClassroom;
+    std::unordered_map<int, int> slotOfId;
+    std::unordered_map<int, int> dayIdx;
+    std::unordered_map<int, int> schedIdx;
+    size_t nDays = 0;
+    size_t nScheds = 0;
+    std::vector<bool> busy;
+};
+
+#endif // OCCUPANCY_HPP
@@ -2,6 +2,8 @@
 #define PROBLEM_HPP
 
 #include <string>
+#include <unordered_map>
+#include <utility>
 #include <vector>
 
 // ============= STRUCTS =============
@@ -75,6 +77,49 @@ struct Reservation {
     int classroomId = 0;
     int dayOfWeek = 0;
     int scheduleId = 0;
+    int meeting = -1;  // índice em meetings; -1 nas reservas fixas da instância
+};
+
+// Alterações sobre uma instância já carregada (Problem::loadDelta). Encontros
+// são referenciados pelo índice na instância antes das alterações.
+struct InstanceDelta {
+    std::vector<Meeting> addedMeetings;                    // entram no fim de meetings, nesta ordem
+    std::vector<std::pair<int, Meeting>> modifiedMeetings; // índice -> encontro já com as alterações
+    std::vector<int> removedMeetings;
+    std::vector<Reservation> addedReservations;            // reservas fixas novas (sala indisponível)
+    std::vector<Reservation> removedReservations;          // casadas por (sala, dia, horário)
+
+    bool empty() const {
+        return addedMeetings.empty() && modifiedMeetings.empty() && removedMeetings.empty() &&
+               addedReservations.empty() && removedReservations.empty();
+    }
+};
+
+// Preferência com os campos de comparação já convertidos para inteiros
+struct CompiledPreference {
+    int buildingId = -1;   // -1: sem preferência (vazio ou não numérico)
+    int floor = -1;        // -1: sem preferência
+    int boardId = -1;      // -1: sem preferência; ids internados junto com os quadros das salas
+    bool projector = false;
+};
+
+// Índice de preferências montado em loadInstance (buildPreferenceIndex).
+// Encontros com o mesmo conjunto de preferências aplicáveis compartilham um
+// perfil; cada perfil guarda quantas preferências cada sala viola.
+struct PreferenceIndex {
+    std::unordered_map<std::string, std::vector<int>> byProfessor; // código -> índices em preferences
+    std::unordered_map<std::string, std::vector<int>> bySubject;
+    std::unordered_map<std::string, std::vector<int>> byClass;
+    std::vector<CompiledPreference> compiled;        // paralelo a preferences
+    std::vector<int> meetingProfile;                 // encontro -> perfil (0 = nenhuma preferência)
+    std::vector<std::vector<int>> profilePrefs;      // perfil -> índices em preferences
+    std::vector<std::vector<int>> profileViolations; // perfil -> violações por sala (posição em classrooms)
+    std::vector<int> profileMaxViolations;           // perfil -> maior número de violações entre as salas
+
+    // índices das preferências aplicáveis / violações por sala de um encontro
+    const std::vector<int>& prefsOf(size_t meeting) const { return profilePrefs[meetingProfile[meeting]]; }
+    const std::vector<int>& violationsOf(size_t meeting) const { return profileViolations[meetingProfile[meeting]]; }
+    int maxViolationsOf(size_t meeting) const { return profileMaxViolations[meetingProfile[meeting]]; }
 };
 
 class Problem {
@@ -89,8 +134,20 @@ public:
     std::vector<Restriction> restrictions;
     std::vector<Reservation> reservations;
 
+    PreferenceIndex prefIndex;
+
     // Métodos
+    // filename relativo a data/generated_instances/
     void loadInstance(const std::string& filename);
+    // caminho completo; false se o arquivo não puder ser lido/parseado
+    bool loadInstanceFile(const std::string& path);
+    // (Re)monta prefIndex a partir de meetings, preferences e classrooms
+    void buildPreferenceIndex();
+    // Monta prefIndex se ainda não corresponde aos meetings/classrooms atuais
+    void ensurePreferenceIndex();
+    // Lê um arquivo de alterações (caminho completo) sobre os encontros atuais;
+    // false se o arquivo não puder ser lido/parseado ou citar um encontro inexistente
+    bool loadDelta(const std::string& path, InstanceDelta& delta) const;
 };
 
 #endif // PROBLEM_HPP
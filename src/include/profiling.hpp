@@ -0,0 +1,69 @@
+#ifndef PROFILING_HPP
+#define PROFILING_HPP
+
+#include <atomic>
+#include <chrono>
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Perfil por fase do binário (./bin/app ... --profile).
+// Cada fase é um prof::Scope; tempos e alocações são exclusivos: uma fase
+// aninhada (ex.: "stats" dentro de "construct") não entra na de fora.
+// Desligado, um Scope custa só o teste de prof::enabled().
+namespace prof {
+
+// Contadores de alocação da thread atual, incrementados pelo operator new de main.cpp
+// só com o perfil ligado (ficam em zero na biblioteca e nos benchmarks, que não
+// substituem o alocador). Por thread: cada Scope só vê as alocações da sua thread.
+extern thread_local unsigned long long allocCount;
+extern thread_local unsigned long long allocBytes;
+// Igual a enabled(), lido pelo operator new a cada alocação
+extern std::atomic<bool> countAllocs;
+
+struct PhaseStats {
+    std::string name;
+    unsigned long long calls = 0;
+    double ms = 0.0;
+    unsigned long long allocs = 0;
+    unsigned long long bytes = 0;
+};
+
+void enable(bool on = true);
+bool enabled();
+// fases na ordem em que apareceram pela primeira vez
+std::vector<PhaseStats> phases();
+// Zera as fases já registradas (o modo lote começa um perfil novo a cada execução)
+void reset();
+// pico de memória residente do próprio processo em kB (VmHWM no Linux, ru_maxrss no macOS)
+long peakRssKb();
+
+// Seção "Perfil de Execucao" (CSV) / {"section": "profile"} (JSON Lines),
+// acrescentada ao final do arquivo de estatísticas
+void writeCsv(std::ostream& out);
+void writeJsonl(std::ostream& out);
+
+class Scope {
+public:
+    explicit Scope(const char* name);
+    ~Scope();
+    Scope(const Scope&) = delete;
+    Scope& operator=(const Scope&) = delete;
+
+private:
+    using clock = std::chrono::steady_clock;
+    const char* name;
+    bool active;
+    clock::time_point start;
+    unsigned long long allocs0 = 0;
+    unsigned long long bytes0 = 0;
+    // totais (inclusivos) das fases filhas, descontados desta
+    long long childNs = 0;
+    unsigned long long childAllocs = 0;
+    unsigned long long childBytes = 0;
+    Scope* parent = nullptr;
+};
+
+} // namespace prof
+
+#endif
@@ -0,0 +1,30 @@
+#ifndef ROOM_INDEX_HPP
+#define ROOM_INDEX_HPP
+
+#include "problem.hpp"
+#include <vector>
+
+// Salas por tipo, em ordem crescente de capacidade (empates na ordem de
+// p.classrooms). Práticos só usam laboratórios; os demais usam qualquer sala.
+// As heurísticas começam a busca na primeira sala em que o encontro cabe
+// (busca binária) e param quando o desperdício sozinho já passa do melhor
+// score, em vez de varrer todas as salas para cada horário.
+class RoomIndex {
+public:
+    explicit RoomIndex(const Problem& p);
+
+    // posições em p.classrooms das salas que o encontro pode usar, e as capacidades (paralelas)
+    const std::vector<int>& rooms(bool practical) const { return practical ? labs.pos : all.pos; }
+    const std::vector<int>& capacities(bool practical) const { return practical ? labs.cap : all.cap; }
+    // primeiro índice em rooms(practical) com capacidade >= demand (rooms().size() se nenhuma)
+    size_t firstFitting(bool practical, int demand) const;
+
+private:
+    struct Sorted {
+        std::vector<int> pos;
+        std::vector<int> cap;
+    };
+    Sorted all, labs;
+};
+
+#endif // ROOM_INDEX_HPP
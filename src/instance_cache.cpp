@@ -0,0 +1,304 @@
+#include "include/instance_cache.hpp"
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <unordered_map>
+#include <sys/stat.h>
+
+namespace {
+
+const char MAGIC[8] = {'T', 'P', 'I', 'N', 'S', 'T', '0', '1'};
+const size_t HEADER_SIZE = 32;
+const size_t ENTRY_SIZE = 72;
+
+struct Array {
+    std::string dtype;
+    uint64_t count = 0;
+    uint64_t offset = 0;
+};
+
+// leitura little-endian independente de alinhamento
+template <typename T>
+T readLE(const char* p) {
+    T v;
+    std::memcpy(&v, p, sizeof(T));
+    return v;
+}
+
+bool statSource(const std::string& path, uint64_t& size, int64_t& mtimeNs) {
+    struct stat st;
+    if (stat(path.c_str(), &st) != 0) return false;
+    size = static_cast<uint64_t>(st.st_size);
+#ifdef __APPLE__
+    mtimeNs = static_cast<int64_t>(st.st_mtimespec.tv_sec) * 1000000000LL + st.st_mtimespec.tv_nsec;
+#else
+    mtimeNs = static_cast<int64_t>(st.st_mtim.tv_sec) * 1000000000LL + st.st_mtim.tv_nsec;
+#endif
+    return true;
+}
+
+class CacheReader {
+public:
+    CacheReader(const std::string& buf, std::unordered_map<std::string, Array> table)
+        : buf(buf), table(std::move(table)) {}
+
+    bool ok() const { return valid; }
+
+    size_t count(const std::string& name) {
+        const Array* a = find(name, "");
+        return a ? a->count : 0;
+    }
+
+    std::vector<int> ints(const std::string& name) {
+        std::vector<int> out;
+        const Array* a = find(name, "i4");
+        if (!a) return out;
+        out.resize(a->count);
+        for (size_t i = 0; i < a->count; ++i) out[i] = readLE<int32_t>(buf.data() + a->offset + 4 * i);
+        return out;
+    }
+
+    std::vector<bool> flags(const std::string& name) {
+        std::vector<bool> out;
+        const Array* a = find(name, "u1");
+        if (!a) return out;
+        out.resize(a->count);
+        for (size_t i = 0; i < a->count; ++i) out[i] = buf[a->offset + i] != 0;
+        return out;
+    }
+
+    std::vector<int64_t> offsets(const std::string& name) {
+        std::vector<int64_t> out;
+        const Array* a = find(name, "i8");
+        if (!a) return out;
+        out.resize(a->count);
+        for (size_t i = 0; i < a->count; ++i) out[i] = readLE<int64_t>(buf.data() + a->offset + 8 * i);
+        return out;
+    }
+
+    std::vector<std::string> strings(const std::string& name) {
+        std::vector<std::string> out;
+        for (int id : ints(name)) out.push_back(pooled(id));
+        return out;
+    }
+
+    // campo de tamanho variável: offsets (n + 1) + valores
+    template <typename T, typename Values>
+    std::vector<std::vector<T>> ragged(const std::string& name, Values values) {
+        std::vector<int64_t> off = offsets(name + ".offsets");
+        std::vector<std::vector<T>> out;
+        if (off.empty()) { valid = false; return out; }
+        out.resize(off.size() - 1);
+        for (size_t i = 0; i + 1 < off.size(); ++i) {
+            if (off[i] > off[i + 1] || static_cast<size_t>(off[i + 1]) > values.size()) { valid = false; break; }
+            out[i].assign(values.begin() + off[i], values.begin() + off[i + 1]);
+        }
+        return out;
+    }
+
+    void loadPool() {
+        poolOffsets = offsets("strings.offsets");
+        poolData = find("strings.data", "u1");
+        if (!poolData || poolOffsets.empty()) valid = false;
+    }
+
+private:
+    const Array* find(const std::string& name, const std::string& dtype) {
+        auto it = table.find(name);
+        if (it == table.end() || (!dtype.empty() && it->second.dtype != dtype)) {
+            valid = false;
+            return nullptr;
+        }
+        return &it->second;
+    }
+
+    std::string pooled(int id) {
+        if (!poolData || id < 0 || static_cast<size_t>(id) + 1 >= poolOffsets.size()) {
+            valid = false;
+            return "";
+        }
+        int64_t begin = poolOffsets[id], end = poolOffsets[id + 1];
+        if (begin > end || static_cast<uint64_t>(end) > poolData->count) { valid = false; return ""; }
+        return buf.substr(poolData->offset + begin, end - begin);
+    }
+
+    const std::string& buf;
+    std::unordered_map<std::string, Array> table;
+    std::vector<int64_t> poolOffsets;
+    const Array* poolData = nullptr;
+    bool valid = true;
+};
+
+} // namespace
+
+std::string instanceCachePath(const std::string& jsonPath) {
+    size_t slash = jsonPath.find_last_of('/');
+    std::string dir = slash == std::string::npos ? "" : jsonPath.substr(0, slash + 1);
+    std::string file = slash == std::string::npos ? jsonPath : jsonPath.substr(slash + 1);
+    size_t dot = file.find_last_of('.');
+    if (dot != std::string::npos && dot > 0) file = file.substr(0, dot);
+    return dir + ".cache/" + file + ".bin";
+}
+
+bool loadInstanceCache(Problem& p, const std::string& jsonPath) {
+    uint64_t srcSize;
+    int64_t srcMtime;
+    if (!statSource(jsonPath, srcSize, srcMtime)) return false;
+
+    std::ifstream in(instanceCachePath(jsonPath), std::ios::binary);
+    if (!in) return false;
+    std::string buf((std::istreambuf_iterator<char>(in)), std::istreambuf_iterator<char>());
+
+    if (buf.size() < HEADER_SIZE || std::memcmp(buf.data(), MAGIC, 8) != 0) return false;
+    if (readLE<uint64_t>(buf.data() + 8) != srcSize || readLE<int64_t>(buf.data() + 16) != srcMtime) return false;
+
+    uint32_t n = readLE<uint32_t>(buf.data() + 24);
+    if (buf.size() < HEADER_SIZE + ENTRY_SIZE * static_cast<size_t>(n)) return false;
+
+    std::unordered_map<std::string, Array> table;
+    for (uint32_t i = 0; i < n; ++i) {
+        const char* e = buf.data() + HEADER_SIZE + ENTRY_SIZE * i;
+        Array a;
+        a.dtype = std::string(e + 48, strnlen(e + 48, 8));
+        a.count = readLE<uint64_t>(e + 56);
+        a.offset = readLE<uint64_t>(e + 64);
+        size_t width = a.dtype == "i8" ? 8 : a.dtype == "i4" ? 4 : 1;
+        if (a.offset > buf.size() || a.count > (buf.size() - a.offset) / width) return false;
+        table[std::string(e, strnlen(e, 48))] = a;
+    }
+
+    CacheReader r(buf, std::move(table));
+    r.loadPool();
+
+    std::vector<Schedule> schedules(r.count("schedules.id"));
+    {
+        auto id = r.ints("schedules.id");
+        auto start = r.strings("schedules.startTime"), end = r.strings("schedules.endTime");
+        if (!r.ok() || start.size() != schedules.size() || end.size() != schedules.size()) return false;
+        for (size_t i = 0; i < schedules.size(); ++i) schedules[i] = {id[i], start[i], end[i]};
+    }
+
+    std::vector<Building> buildings(r.count("buildings.id"));
+    {
+        auto id = r.ints("buildings.id");
+        auto name = r.strings("buildings.name");
+        if (!r.ok() || name.size() != buildings.size()) return false;
+        for (size_t i = 0; i < buildings.size(); ++i) buildings[i] = {id[i], name[i]};
+    }
+
+    std::vector<Classroom> classrooms(r.count("classrooms.id"));
+    {
+        auto id = r.ints("classrooms.id");
+        auto isLab = r.flags("classrooms.isLab");
+        auto capacity = r.ints("classrooms.capacity");
+        auto buildingId = r.ints("classrooms.buildingId");
+        auto description = r.strings("classrooms.description");
+        auto floor = r.ints("classrooms.floor");
+        auto board = r.strings("classrooms.board");
+        auto projector = r.flags("classrooms.projector");
+        size_t n = classrooms.size();
+        if (!r.ok() || isLab.size() != n || capacity.size() != n || buildingId.size() != n ||
+            description.size() != n || floor.size() != n || board.size() != n || projector.size() != n) return false;
+        for (size_t i = 0; i < n; ++i)
+            classrooms[i] = {id[i], isLab[i], capacity[i], buildingId[i], description[i], floor[i], board[i], projector[i]};
+    }
+
+    std::vector<Professor> professors(r.count("professors.code"));
+    {
+        auto code = r.strings("professors.code"), name = r.strings("professors.name");
+        if (!r.ok() || name.size() != professors.size()) return false;
+        for (size_t i = 0; i < professors.size(); ++i) professors[i] = {code[i], name[i]};
+    }
+
+    std::vector<Subject> subjects(r.count("subjects.code"));
+    {
+        auto code = r.strings("subjects.code"), name = r.strings("subjects.name");
+        if (!r.ok() || name.size() != subjects.size()) return false;
+        for (size_t i = 0; i < subjects.size(); ++i) subjects[i] = {code[i], name[i]};
+    }
+
+    std::vector<Meeting> meetings(r.count("meetings.id"));
+    {
+        auto id = r.strings("meetings.id");
+        auto isPractical = r.flags("meetings.isPractical");
+        auto professorCodes = r.ragged<std::string>("meetings.professorCodes",
+                                                    r.strings("meetings.professorCodes.values"));
+        auto subjectCode = r.strings("meetings.subjectCode");
+        auto classIds = r.ragged<std::string>("meetings.classIds", r.strings("meetings.classIds.values"));
+        auto scheduleIds = r.ragged<int>("meetings.scheduleIds", r.ints("meetings.scheduleIds.values"));
+        auto demand = r.ints("meetings.demand");
+        auto vacancies = r.ints("meetings.vacancies");
+        auto dayOfWeek = r.ints("meetings.dayOfWeek");
+        size_t n = meetings.size();
+        if (!r.ok() || isPractical.size() != n || professorCodes.size() != n || subjectCode.size() != n ||
+            classIds.size() != n || scheduleIds.size() != n || demand.size() != n || vacancies.size() != n ||
+            dayOfWeek.size() != n) return false;
+        for (size_t i = 0; i < n; ++i) {
+            Meeting& m = meetings[i];
+            m.id = id[i];
+            m.isPractical = isPractical[i];
+            m.professorCodes = std::move(professorCodes[i]);
+            m.subjectCode = subjectCode[i];
+            m.classIds = std::move(classIds[i]);
+            m.scheduleIds = std::move(scheduleIds[i]);
+            m.demand = demand[i];
+            m.vacancies = vacancies[i];
+            m.dayOfWeek = dayOfWeek[i];
+        }
+    }
+
+    std::vector<Preference> preferences(r.count("preferences.id"));
+    {
+        auto id = r.strings("preferences.id");
+        auto category = r.strings("preferences.category");
+        auto categoryCode = r.strings("preferences.categoryCode");
+        auto buildingId = r.strings("preferences.buildingId");
+        auto floor = r.ints("preferences.floor");
+        auto board = r.strings("preferences.board");
+        auto projector = r.flags("preferences.projector");
+        size_t n = preferences.size();
+        if (!r.ok() || category.size() != n || categoryCode.size() != n || buildingId.size() != n ||
+            floor.size() != n || board.size() != n || projector.size() != n) return false;
+        for (size_t i = 0; i < n; ++i)
+            preferences[i] = {id[i], category[i], categoryCode[i], buildingId[i], floor[i], board[i], projector[i]};
+    }
+
+    std::vector<Restriction> restrictions(r.count("restrictions.id"));
+    {
+        auto id = r.strings("restrictions.id");
+        auto category = r.strings("restrictions.category");
+        auto categoryCode = r.strings("restrictions.categoryCode");
+        auto buildingId = r.strings("restrictions.buildingId");
+        auto floor = r.ints("restrictions.floor");
+        auto board = r.strings("restrictions.board");
+        auto projector = r.flags("restrictions.projector");
+        size_t n = restrictions.size();
+        if (!r.ok() || category.size() != n || categoryCode.size() != n || buildingId.size() != n ||
+            floor.size() != n || board.size() != n || projector.size() != n) return false;
+        for (size_t i = 0; i < n; ++i)
+            restrictions[i] = {id[i], category[i], categoryCode[i], buildingId[i], floor[i], board[i], projector[i]};
+    }
+
+    std::vector<Reservation> reservations(r.count("reservations.id"));
+    {
+        auto id = r.strings("reservations.id");
+        auto classroomId = r.ints("reservations.classroomId");
+        auto dayOfWeek = r.ints("reservations.dayOfWeek");
+        auto scheduleId = r.ints("reservations.scheduleId");
+        size_t n = reservations.size();
+        if (!r.ok() || classroomId.size() != n || dayOfWeek.size() != n || scheduleId.size() != n) return false;
+        for (size_t i = 0; i < n; ++i) reservations[i] = {id[i], classroomId[i], dayOfWeek[i], scheduleId[i]};
+    }
+
+    p.schedules = std::move(schedules);
+    p.buildings = std::move(buildings);
+    p.classrooms = std::move(classrooms);
+    p.professors = std::move(professors);
+    p.subjects = std::move(subjects);
+    p.meetings = std::move(meetings);
+    p.preferences = std::move(preferences);
+    p.restrictions = std::move(restrictions);
+    p.reservations = std::move(reservations);
+    return true;
+}
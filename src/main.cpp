@@ -1,110 +1,333 @@
-#include "include/problem.hpp"
-#include "include/constructive/constructive_heuristic.hpp"
-#include <iostream>
-#include <string>
-#include <sstream>
-
-// If Makefile defines DEFAULT_HEUR at compile time, use it to set binary default.
-#ifndef DEFAULT_HEUR
-#define DEFAULT_HEUR 1
-#endif
-#ifndef DEFAULT_ALPHA
-#define DEFAULT_ALPHA 0.0
-#endif
-#ifndef DEFAULT_SEED
-#define DEFAULT_SEED 0
-#endif
-
-int main(int argc, char** argv) {
-    Problem p;
-
-    std::string instancePath = "instance1.json"; // nome relativo a data/generated_instances/
-    std::string heuristicArg;
-    double alpha = 1;
-    unsigned int seed = 0;   
-#if DEFAULT_HEUR == 2
-    heuristicArg = "partial";
-    alpha = DEFAULT_ALPHA;
-    seed = DEFAULT_SEED;
-#else
-    heuristicArg = "greedy";
-    alpha = DEFAULT_ALPHA;
-    seed = DEFAULT_SEED;
-#endif
-
-// Parsear argumentos: primeiro argumento posicional não-flag é o instancePath
-    for (int i = 1; i < argc; ++i) {
-        std::string a = argv[i];
-        if (a.rfind("--heuristic=", 0) == 0) {
-            heuristicArg = a.substr(std::string("--heuristic=").size());
-        } else if (a == "--heuristic" && i + 1 < argc) {
-            heuristicArg = argv[++i];
-        } else if (!a.empty() && a[0] == '-') {
-            // ignorar outras flags por enquanto
-        } else {
-            // primeiro posicional não-flag -> instancePath
-            instancePath = a;
-            // se começar com "data/generated_instances/", remover o prefixo (será re-adicionado em loadInstance)
-            const std::string prefix = "data/generated_instances/";
-            if (instancePath.rfind(prefix, 0) == 0) {
-                instancePath = instancePath.substr(prefix.size());
-            }
-        }
-    }
-
-    if (heuristicArg.rfind("partial", 0) == 0) {
-        if (heuristicArg == "partial") {
-            if (alpha <= 0.0) alpha = 0.5; // default razoável se não veio do compile-time
-        } else {
-            std::string tail;
-            if (heuristicArg.size() > 8 && heuristicArg[7] == ':') tail = heuristicArg.substr(8);
-            else if (heuristicArg.size() > 7 && heuristicArg[7] != '\0') tail = heuristicArg.substr(7);
-            // split tail por ':'
-            std::istringstream ss(tail);
-            std::string part;
-            if (std::getline(ss, part, ':')) {
-                try { alpha = std::stod(part); } catch(...) { if (alpha <= 0.0) alpha = 0.5; }
-            }
-            if (std::getline(ss, part, ':')) {
-                try { seed = static_cast<unsigned int>(std::stoul(part)); } catch(...) { /* keep previous seed */ }
-            }
-        }
-    } else if (heuristicArg == "greedy") {
-        // nada adicional
-    } else {
-        if (!heuristicArg.empty()) {
-            if (heuristicArg.find(':') != std::string::npos) {
-                std::istringstream ss(heuristicArg);
-                std::string part;
-                if (std::getline(ss, part, ':')) {
-                    try { alpha = std::stod(part); heuristicArg = "partial"; }
-                    catch(...) { heuristicArg = "greedy"; }
-                }
-                if (std::getline(ss, part, ':')) {
-                    try { seed = static_cast<unsigned int>(std::stoul(part)); } catch(...) { /* keep previous seed */ }
-                }
-            }
-        }
-    }
-
-    p.loadInstance(instancePath);
-
-    if (heuristicArg.rfind("partial", 0) == 0) {
-        std::cout << "Executando heuristica parcialmente gulosa (alpha=" << alpha << ", seed=" << seed << ")\n";
-        partiallyGreedyConstruct(p, alpha, seed);
-    } else {
-        std::cout << "Executando heuristica gulosa deterministica\n";
-        greedyConstruct(p);
-    }
-
-    std::cout << "schedules: " << p.schedules.size() << "\n";
-    std::cout << "buildings: " << p.buildings.size() << "\n";
-    std::cout << "classrooms: " << p.classrooms.size() << "\n";
-    std::cout << "professors: " << p.professors.size() << "\n";
-    std::cout << "subjects: " << p.subjects.size() << "\n";
-    std::cout << "meetings: " << p.meetings.size() << "\n";
-    std::cout << "preferences: " << p.preferences.size() << "\n";
-    std::cout << "restrictions: " << p.restrictions.size() << "\n";
-    std::cout << "reservations: " << p.reservations.size() << "\n";
-    return 0;
+#include "include/problem.hpp"
+#include "include/assignment_io.hpp"
+#include "include/batch.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/constructive/day_split.hpp"
+#include "include/constructive/exact_matching.hpp"
+#include "include/constructive/incremental.hpp"
+#include "include/constructive/multi_start.hpp"
+#include "include/constructive/partial_greedy.hpp"
+#include "include/metaheuristics/local_search.hpp"
+#include "include/metaheuristics/nsga2.hpp"
+#include "include/metaheuristics/mola.hpp"
+#include "include/profiling.hpp"
+#include <cstdlib>
+#include <fstream>
+#include <iostream>
+#include <new>
+#include <string>
+#include <sstream>
+#include <vector>
+
+// Contagem de alocações para --profile (só no executável; ver profiling.hpp)
+void* operator new(std::size_t n) {
+    if (prof::countAllocs.load(std::memory_order_relaxed)) {
+        ++prof::allocCount;
+        prof::allocBytes += n;
+    }
+    if (void* ptr = std::malloc(n ? n : 1)) return ptr;
+    throw std::bad_alloc();
+}
+void operator delete(void* ptr) noexcept { std::free(ptr); }
+void operator delete(void* ptr, std::size_t) noexcept { std::free(ptr); }
+
+// If Makefile defines DEFAULT_HEUR at compile time, use it to set binary default.
+#ifndef DEFAULT_HEUR
+#define DEFAULT_HEUR 1
+#endif
+#ifndef DEFAULT_ALPHA
+#define DEFAULT_ALPHA 0.0
+#endif
+#ifndef DEFAULT_SEED
+#define DEFAULT_SEED 0
+#endif
+
+int main(int argc, char** argv) {
+    Problem p;
+
+    std::string instancePath = "instance1.json"; // nome relativo a data/generated_instances/
+    std::string heuristicArg;
+    StatsFormat statsFormat = StatsFormat::Csv;
+    MultiStartOptions multiStart;
+    multiStart.iterations = 0;  // 0 -> uma construção só (sem multi-start)
+    Nsga2Options nsga2;
+    bool useNsga2 = false;
+    MolaOptions mola;
+    bool useMola = false;
+    ExactOptions exact;
+    bool useExact = false;
+    bool byDay = false;          // construção decomposta por dia (--by-day)
+    std::string warmStartPath;   // alocação anterior (--warm-start=)
+    std::string deltaPath;       // alterações na instância (--delta=)
+    std::string saveAssignmentPath;
+    std::string batchPath;       // manifesto do modo lote (--batch=)
+    double alpha = 1;
+    unsigned int seed = 0;   
+#if DEFAULT_HEUR == 2
+    heuristicArg = "partial";
+    alpha = DEFAULT_ALPHA;
+    seed = DEFAULT_SEED;
+#else
+    heuristicArg = "greedy";
+    alpha = DEFAULT_ALPHA;
+    seed = DEFAULT_SEED;
+#endif
+
+// Parsear argumentos: primeiro argumento posicional não-flag é o instancePath
+    for (int i = 1; i < argc; ++i) {
+        std::string a = argv[i];
+        if (a.rfind("--heuristic=", 0) == 0) {
+            heuristicArg = a.substr(std::string("--heuristic=").size());
+        } else if (a == "--heuristic" && i + 1 < argc) {
+            heuristicArg = argv[++i];
+        } else if (a == "--profile") {
+            prof::enable();
+        } else if (a == "--format=jsonl") {
+            statsFormat = StatsFormat::Jsonl;
+        } else if (a == "--format=csv") {
+            statsFormat = StatsFormat::Csv;
+        } else if (a.rfind("--multistart=", 0) == 0) {
+            try { multiStart.iterations = std::stoi(a.substr(13)); } catch(...) { multiStart.iterations = 0; }
+        } else if (a.rfind("--threads=", 0) == 0) {
+            try { multiStart.threads = std::stoi(a.substr(10)); } catch(...) { multiStart.threads = 0; }
+        } else if (a.rfind("--pref-penalty=", 0) == 0) {
+            try { multiStart.prefPenalty = exact.prefPenalty = std::stoi(a.substr(15)); } catch(...) { /* mantém o padrão */ }
+        } else if (a == "--local-search") {
+            multiStart.localSearch.enabled = true;
+        } else if (a.rfind("--ls-time-ms=", 0) == 0) {
+            multiStart.localSearch.enabled = true;
+            try { multiStart.localSearch.timeLimitMs = std::stoll(a.substr(13)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--ls-iters=", 0) == 0) {
+            multiStart.localSearch.enabled = true;
+            try { multiStart.localSearch.maxIterations = std::stoll(a.substr(11)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--ls-depth=", 0) == 0) {
+            multiStart.localSearch.enabled = true;
+            try { multiStart.localSearch.maxChainDepth = std::stoi(a.substr(11)); } catch(...) { /* mantém o padrão */ }
+        } else if (a == "--nsga2") {
+            useNsga2 = true;
+        } else if (a.rfind("--nsga2-pop=", 0) == 0) {
+            useNsga2 = true;
+            try { nsga2.population = std::stoi(a.substr(12)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--nsga2-gens=", 0) == 0) {
+            useNsga2 = true;
+            try { nsga2.generations = std::stoi(a.substr(13)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--nsga2-time-ms=", 0) == 0) {
+            useNsga2 = true;
+            try { nsga2.timeLimitMs = std::stoll(a.substr(16)); } catch(...) { /* mantém o padrão */ }
+        } else if (a == "--mola") {
+            useMola = true;
+        } else if (a.rfind("--mola-time-ms=", 0) == 0) {
+            useMola = true;
+            try { mola.timeLimitMs = std::stoll(a.substr(15)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--mola-iters=", 0) == 0) {
+            useMola = true;
+            try { mola.maxIterations = std::stoll(a.substr(13)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--mola-archive=", 0) == 0) {
+            useMola = true;
+            try { mola.archiveSize = std::stoul(a.substr(15)); } catch(...) { /* mantém o padrão */ }
+        } else if (a == "--by-day") {
+            byDay = true;
+        } else if (a == "--exact") {
+            useExact = true;
+        } else if (a.rfind("--exact-iters=", 0) == 0) {
+            useExact = true;
+            try { exact.iterations = std::stoi(a.substr(14)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--exact-time-ms=", 0) == 0) {
+            useExact = true;
+            try { exact.timeLimitMs = std::stoll(a.substr(16)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--exact-max-work=", 0) == 0) {
+            useExact = true;
+            try { exact.maxBlockWork = std::stoll(a.substr(17)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--unallocated-penalty=", 0) == 0) {
+            try { exact.unallocatedPenalty = std::stoi(a.substr(22)); } catch(...) { /* mantém o padrão */ }
+        } else if (a.rfind("--warm-start=", 0) == 0) {
+            warmStartPath = a.substr(13);
+        } else if (a.rfind("--delta=", 0) == 0) {
+            deltaPath = a.substr(8);
+        } else if (a.rfind("--batch=", 0) == 0) {
+            batchPath = a.substr(8);
+        } else if (a.rfind("--save-assignment=", 0) == 0) {
+            saveAssignmentPath = a.substr(18);
+        } else if (a.rfind("--objective=", 0) == 0) {
+            if (!parseMultiStartObjective(a.substr(12), multiStart.objective)) {
+                std::cerr << "Objetivo desconhecido: " << a.substr(12)
+                          << " (use unallocated, waste, standing ou weighted)\n";
+                return 1;
+            }
+        } else if (!a.empty() && a[0] == '-') {
+            // ignorar outras flags por enquanto
+        } else {
+            // primeiro posicional não-flag -> instancePath
+            instancePath = a;
+            // se começar com "data/generated_instances/", remover o prefixo (será re-adicionado em loadInstance)
+            const std::string prefix = "data/generated_instances/";
+            if (instancePath.rfind(prefix, 0) == 0) {
+                instancePath = instancePath.substr(prefix.size());
+            }
+        }
+    }
+
+    if (heuristicArg.rfind("partial", 0) == 0) {
+        if (heuristicArg == "partial") {
+            if (alpha <= 0.0) alpha = 0.5; // default razoável se não veio do compile-time
+        } else {
+            std::string tail;
+            if (heuristicArg.size() > 8 && heuristicArg[7] == ':') tail = heuristicArg.substr(8);
+            else if (heuristicArg.size() > 7 && heuristicArg[7] != '\0') tail = heuristicArg.substr(7);
+            // split tail por ':'
+            std::istringstream ss(tail);
+            std::string part;
+            if (std::getline(ss, part, ':')) {
+                try { alpha = std::stod(part); } catch(...) { if (alpha <= 0.0) alpha = 0.5; }
+            }
+            if (std::getline(ss, part, ':')) {
+                try { seed = static_cast<unsigned int>(std::stoul(part)); } catch(...) { /* keep previous seed */ }
+            }
+        }
+    } else if (heuristicArg == "greedy") {
+        // nada adicional
+    } else {
+        if (!heuristicArg.empty()) {
+            if (heuristicArg.find(':') != std::string::npos) {
+                std::istringstream ss(heuristicArg);
+                std::string part;
+                if (std::getline(ss, part, ':')) {
+                    try { alpha = std::stod(part); heuristicArg = "partial"; }
+                    catch(...) { heuristicArg = "greedy"; }
+                }
+                if (std::getline(ss, part, ':')) {
+                    try { seed = static_cast<unsigned int>(std::stoul(part)); } catch(...) { /* keep previous seed */ }
+                }
+            }
+        }
+    }
+
+    // os modos são exclusivos; combinar dois faria um deles ser ignorado sem aviso
+    std::vector<std::string> modes;
+    if (!batchPath.empty()) modes.push_back("--batch");
+    if (!warmStartPath.empty() || !deltaPath.empty()) modes.push_back("--warm-start/--delta");
+    if (useExact) modes.push_back("--exact");
+    if (useNsga2) modes.push_back("--nsga2");
+    if (useMola) modes.push_back("--mola");
+    if (byDay) modes.push_back("--by-day");
+    if (multiStart.iterations > 0) modes.push_back("--multistart");
+    if (modes.size() > 1) {
+        std::cerr << "Erro: " << modes[0] << " e " << modes[1] << " nao podem ser usados juntos\n";
+        return 1;
+    }
+    if (multiStart.localSearch.enabled && !modes.empty() && modes[0] != "--multistart") {
+        std::cerr << "Erro: a busca local (--local-search/--ls-*) so vale com greedy, partial ou --multistart, nao com "
+                  << modes[0] << "\n";
+        return 1;
+    }
+
+    if (!batchPath.empty()) {
+        // instância e heurística vêm de cada linha do manifesto; --format e --pref-penalty valem para todas
+        std::vector<BatchRun> runs;
+        if (!readManifest(batchPath, runs)) return 1;
+        BatchOptions batch;
+        batch.format = statsFormat;
+        batch.prefPenalty = multiStart.prefPenalty;
+        return runBatch(runs, batch) == 0 ? 0 : 1;
+    }
+
+    p.loadInstance(instancePath);
+
+    if (!warmStartPath.empty() || !deltaPath.empty()) {
+        // re-solução incremental: mantém a alocação anterior e só realoca o que o delta afetou
+        std::vector<Reservation> previous;
+        InstanceDelta delta;
+        int previousMeetings = static_cast<int>(p.meetings.size());
+        if (!warmStartPath.empty() && !readAssignment(warmStartPath, previous, previousMeetings)) return 1;
+        if (previousMeetings != static_cast<int>(p.meetings.size())) {
+            std::cerr << "Erro: " << warmStartPath << " tem " << previousMeetings << " encontros e a instancia "
+                      << p.meetings.size() << "\n";
+            return 1;
+        }
+        if (!deltaPath.empty() && !p.loadDelta(deltaPath, delta)) return 1;
+        std::cout << "Executando re-solucao incremental (" << previous.size() << " reservas anteriores, "
+                  << delta.addedMeetings.size() << " encontros novos, " << delta.modifiedMeetings.size()
+                  << " alterados, " << delta.removedMeetings.size() << " removidos, "
+                  << delta.addedReservations.size() << "/" << delta.removedReservations.size()
+                  << " reservas fixas novas/removidas)\n";
+        incrementalConstruct(p, previous, delta, statsFormat);
+    } else if (useExact) {
+        exact.threads = multiStart.threads;
+        std::cout << "Executando solver exato por blocos (dia, horario) (penalidade de preferencia="
+                  << exact.prefPenalty << ", sem sala=" << exact.unallocatedPenalty << ")\n";
+        exactConstruct(p, exact, statsFormat);
+    } else if (useNsga2) {
+        // população inicial vem das construtivas; a seed da heurística vira a seed do NSGA-II
+        nsga2.seed = seed;
+        nsga2.threads = multiStart.threads;
+        std::cout << "Executando NSGA-II (populacao=" << nsga2.population << ", geracoes=" << nsga2.generations
+                  << ", limite=" << nsga2.timeLimitMs << " ms)\n";
+        nsga2Construct(p, nsga2, statsFormat);
+    } else if (useMola) {
+        mola.seed = seed;
+        mola.threads = multiStart.threads;
+        std::cout << "Executando MOLA (arquivo=" << mola.archiveSize << ", limite=" << mola.timeLimitMs << " ms)\n";
+        molaConstruct(p, mola, statsFormat);
+    } else if (byDay) {
+        DaySplitOptions daySplit;
+        daySplit.partial = heuristicArg.rfind("partial", 0) == 0;
+        daySplit.alpha = alpha;
+        daySplit.seed = seed;
+        daySplit.prefPenalty = multiStart.prefPenalty;
+        daySplit.threads = multiStart.threads;
+        if (daySplit.partial) {
+            std::cout << "Executando heuristica parcialmente gulosa por dia (alpha=" << alpha << ", seed=" << seed << ")\n";
+        } else {
+            std::cout << "Executando heuristica gulosa deterministica por dia\n";
+        }
+        byDayConstruct(p, daySplit, statsFormat);
+    } else if (multiStart.iterations > 0) {
+        // multi-start sempre usa a heurística parcialmente gulosa; a seed vira a seed mestre
+        multiStart.alpha = heuristicArg.rfind("partial", 0) == 0 ? alpha : 0.5;
+        multiStart.masterSeed = seed;
+        std::cout << "Executando multi-start da heuristica parcialmente gulosa (alpha=" << multiStart.alpha
+                  << ", iteracoes=" << multiStart.iterations << ")\n";
+        multiStartConstruct(p, multiStart, statsFormat);
+    } else if (multiStart.localSearch.enabled) {
+        // construção + busca local; as reservas da instância continuam fixas
+        const std::vector<Reservation> initial = p.reservations;
+        ConstructionResult res;
+        if (heuristicArg.rfind("partial", 0) == 0) {
+            std::cout << "Executando heuristica parcialmente gulosa (alpha=" << alpha << ", seed=" << seed
+                      << ") + busca local\n";
+            res = runPartiallyGreedy(p, alpha, seed, multiStart.prefPenalty);
+        } else {
+            std::cout << "Executando heuristica gulosa deterministica + busca local\n";
+            res = runGreedy(p);
+        }
+        improveConstruct(p, initial, std::move(res), multiStart.localSearch, statsFormat);
+    } else if (heuristicArg.rfind("partial", 0) == 0) {
+        std::cout << "Executando heuristica parcialmente gulosa (alpha=" << alpha << ", seed=" << seed << ")\n";
+        partiallyGreedyConstruct(p, alpha, seed, statsFormat, multiStart.prefPenalty);
+    } else {
+        std::cout << "Executando heuristica gulosa deterministica\n";
+        greedyConstruct(p, statsFormat);
+    }
+
+    if (!saveAssignmentPath.empty() && writeAssignment(saveAssignmentPath, p)) {
+        std::cout << "Alocacao exportada para: " << saveAssignmentPath << "\n";
+    }
+
+    // perfil por fase acrescentado ao arquivo de estatísticas
+    if (prof::enabled()) {
+        std::ofstream stats(statsFilename(statsFormat), std::ios::app);
+        if (statsFormat == StatsFormat::Jsonl) prof::writeJsonl(stats);
+        else prof::writeCsv(stats);
+    }
+
+    std::cout << "schedules: " << p.schedules.size() << "\n";
+    std::cout << "buildings: " << p.buildings.size() << "\n";
+    std::cout << "classrooms: " << p.classrooms.size() << "\n";
+    std::cout << "professors: " << p.professors.size() << "\n";
+    std::cout << "subjects: " << p.subjects.size() << "\n";
+    std::cout << "meetings: " << p.meetings.size() << "\n";
+    std::cout << "preferences: " << p.preferences.size() << "\n";
+    std::cout << "restrictions: " << p.restrictions.size() << "\n";
+    std::cout << "reservations: " << p.reservations.size() << "\n";
+    return 0;
 }
\ No newline at end of file
@@ -0,0 +1,253 @@
+#include "include/metaheuristics/allocation_model.hpp"
+#include "include/metaheuristics/local_search.hpp"
+#include "include/constructive/constructive_heuristic.hpp"
+#include "include/constructive/partial_greedy.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <fstream>
+#include <iostream>
+#include <limits>
+#include <numeric>
+#include <unordered_map>
+
+const char* const OBJECTIVE_NAMES[N_OBJECTIVES] = {
+    "DemandaNaoAlocada", "VagasOciosas", "AlunosEmPe", "PrefVioladas",
+};
+
+bool dominates(const Objectives& a, const Objectives& b) {
+    bool better = false;
+    for (int k = 0; k < N_OBJECTIVES; ++k) {
+        if (a[k] > b[k]) return false;
+        if (a[k] < b[k]) better = true;
+    }
+    return better;
+}
+
+AllocationModel::AllocationModel(const Problem& p, const std::vector<Reservation>& fixed, bool allowStanding)
+    : p(p), allowStanding(allowStanding), occ(p, fixed), nDays(occ.dayCount()), nScheds(occ.scheduleCount()),
+      fixedReservations(fixed) {
+    const size_t nRooms = p.classrooms.size();
+    fixedCells.assign(nRooms * nDays * nScheds, CELL_FREE);
+    for (size_t ci = 0; ci < nRooms; ++ci) {
+        for (size_t d = 0; d < nDays; ++d)
+            for (size_t s = 0; s < nScheds; ++s)
+                if (!occ.isFree(ci, static_cast<int>(d), static_cast<int>(s)))
+                    fixedCells[(ci * nDays + d) * nScheds + s] = CELL_FIXED;
+        allRooms.push_back(static_cast<int>(ci));
+        if (p.classrooms[ci].isLab) labRooms.push_back(static_cast<int>(ci));
+    }
+
+    meetingDay.assign(p.meetings.size(), -1);
+    byDay.assign(nDays, {});
+    for (size_t i = 0; i < p.meetings.size(); ++i) {
+        if (p.meetings[i].scheduleIds.empty()) continue;
+        meetingOrder.push_back(static_cast<int>(i));
+        meetingDay[i] = occ.dayIndex(p.meetings[i].dayOfWeek);
+        byDay[meetingDay[i]].push_back(static_cast<int>(i));
+    }
+    std::stable_sort(meetingOrder.begin(), meetingOrder.end(), [&](int a, int b) {
+        return p.meetings[a].demand > p.meetings[b].demand;
+    });
+}
+
+size_t AllocationModel::cellOf(int pos, int m, int scheduleId) const {
+    return (static_cast<size_t>(pos) * nDays + meetingDay[m]) * nScheds + occ.scheduleIndex(scheduleId);
+}
+
+bool AllocationModel::compatible(int m, int pos) const {
+    const Meeting& mt = p.meetings[m];
+    const Classroom& c = p.classrooms[pos];
+    if (mt.isPractical && !c.isLab) return false;
+    return allowStanding || c.capacity >= mt.demand;
+}
+
+const std::vector<int>& AllocationModel::candidateRooms(int m) const {
+    return p.meetings[m].isPractical ? labRooms : allRooms;
+}
+
+Objectives AllocationModel::contribution(int m, int pos) const {
+    const int d = p.meetings[m].demand;
+    if (pos < 0) return {d, 0, 0, 0};
+    const int cap = p.classrooms[pos].capacity;
+    return {0, std::max(0, cap - d), std::max(0, d - cap), p.prefIndex.violationsOf(m)[pos]};
+}
+
+Objectives AllocationModel::evaluate(const Solution& s) const {
+    Objectives total{};
+    for (int m : meetingOrder) {
+        const Objectives c = contribution(m, s.room[m]);
+        for (int k = 0; k < N_OBJECTIVES; ++k) total[k] += c[k];
+    }
+    return total;
+}
+
+void AllocationModel::markCells(const Solution& s, std::vector<int>& cells, bool set) const {
+    for (int m : meetingOrder) {
+        if (s.room[m] < 0) continue;
+        cells[cellOf(s.room[m], m, s.sched[m])] = set ? m : CELL_FREE;
+    }
+}
+
+bool AllocationModel::randomCell(int m, std::mt19937& rng, int& pos, int& scheduleId) const {
+    const std::vector<int>& rooms = candidateRooms(m);
+    const auto& scheds = p.meetings[m].scheduleIds;
+    if (rooms.empty() || scheds.empty()) return false;
+    // poucas tentativas: com allowStanding = false parte das salas não cabe o encontro
+    for (int attempt = 0; attempt < 8; ++attempt) {
+        const int r = rooms[std::uniform_int_distribution<size_t>(0, rooms.size() - 1)(rng)];
+        if (!compatible(m, r)) continue;
+        pos = r;
+        scheduleId = scheds[std::uniform_int_distribution<size_t>(0, scheds.size() - 1)(rng)];
+        return true;
+    }
+    return false;
+}
+
+Solution AllocationModel::fromResult(const ConstructionResult& res) const {
+    std::unordered_map<int, int> posOfId;
+    for (size_t ci = 0; ci < p.classrooms.size(); ++ci) posOfId.emplace(p.classrooms[ci].id, static_cast<int>(ci));
+    Solution s;
+    s.room.assign(p.meetings.size(), -1);
+    s.sched.assign(p.meetings.size(), 0);
+    for (const auto& a : res.assignments) {
+        auto it = posOfId.find(a.classroomId);
+        if (it == posOfId.end()) continue;
+        s.room[a.meeting] = it->second;
+        s.sched[a.meeting] = a.scheduleId;
+    }
+    s.obj = evaluate(s);
+    return s;
+}
+
+ConstructionResult AllocationModel::toResult(const Solution& s, const std::string& heuristic) const {
+    prof::Scope phase("stats");
+    ConstructionResult out;
+    out.heuristic = heuristic;
+    for (int m : meetingOrder) {
+        const int pos = s.room[m];
+        if (pos < 0) {
+            out.recordUnallocated(p, m);
+            continue;
+        }
+        const Classroom& c = p.classrooms[pos];
+        out.recordPlacement(p, m, pos, s.sched[m], std::max(0, c.capacity - p.meetings[m].demand),
+                            p.prefIndex.violationsOf(m)[pos]);
+    }
+    out.finalize();
+    return out;
+}
+
+std::vector<Reservation> AllocationModel::toReservations(const Solution& s) const {
+    std::vector<Reservation> out = fixedReservations;
+    for (int m : meetingOrder) {
+        if (s.room[m] < 0) continue;
+        Reservation r;
+        r.id = p.meetings[m].id;
+        r.meeting = m;
+        r.classroomId = p.classrooms[s.room[m]].id;
+        r.dayOfWeek = p.meetings[m].dayOfWeek;
+        r.scheduleId = s.sched[m];
+        out.push_back(std::move(r));
+    }
+    return out;
+}
+
+std::vector<std::vector<int>> nonDominatedFronts(const std::vector<Objectives>& objs) {
+    std::vector<int> idx(objs.size());
+    std::iota(idx.begin(), idx.end(), 0);
+    // em ordem lexicográfica ninguém é dominado por quem vem depois
+    std::sort(idx.begin(), idx.end(), [&](int a, int b) {
+        return objs[a] != objs[b] ? objs[a] < objs[b] : a < b;
+    });
+    std::vector<std::vector<int>> fronts;
+    for (int i : idx) {
+        size_t f = 0;
+        for (; f < fronts.size(); ++f) {
+            const auto& front = fronts[f];
+            bool dominated = false;
+            for (auto it = front.rbegin(); it != front.rend(); ++it) {
+                if (dominates(objs[*it], objs[i])) { dominated = true; break; }
+            }
+            if (!dominated) break;
+        }
+        if (f == fronts.size()) fronts.emplace_back();
+        fronts[f].push_back(i);
+    }
+    return fronts;
+}
+
+std::vector<double> crowdingDistance(const std::vector<Objectives>& objs, const std::vector<int>& front) {
+    const size_t n = front.size();
+    std::vector<double> dist(n, 0.0);
+    if (n <= 2) {
+        std::fill(dist.begin(), dist.end(), std::numeric_limits<double>::infinity());
+        return dist;
+    }
+    std::vector<size_t> order(n);
+    for (int k = 0; k < N_OBJECTIVES; ++k) {
+        std::iota(order.begin(), order.end(), 0);
+        std::sort(order.begin(), order.end(), [&](size_t a, size_t b) {
+            return objs[front[a]][k] < objs[front[b]][k];
+        });
+        const double lo = static_cast<double>(objs[front[order.front()]][k]);
+        const double hi = static_cast<double>(objs[front[order.back()]][k]);
+        dist[order.front()] = dist[order.back()] = std::numeric_limits<double>::infinity();
+        if (hi <= lo) continue;
+        for (size_t j = 1; j + 1 < n; ++j) {
+            dist[order[j]] += (objs[front[order[j + 1]]][k] - objs[front[order[j - 1]]][k]) / (hi - lo);
+        }
+    }
+    return dist;
+}
+
+std::vector<Solution> constructiveSolutions(const Problem& p, const AllocationModel& model, int count,
+                                            unsigned int seed, int threads) {
+    std::vector<Solution> out(std::max(0, count));
+    parallelFor(count, threads, [&](int i, int) {
+        std::vector<Reservation> reservations = model.fixedReservationList();
+        ConstructionResult r;
+        if (i == 0) {
+            r = runGreedy(p, reservations);
+        } else {
+            std::seed_seq seq{seed, 0u, static_cast<unsigned int>(i)};
+            std::mt19937 rng(seq);
+            const double alpha = 0.1 + 0.8 * (i - 1) / std::max(1, count - 2);
+            r = runPartiallyGreedy(p, reservations, alpha, rng);
+        }
+        out[i] = model.fromResult(r);
+    });
+    return out;
+}
+
+size_t weightedRepresentative(const std::vector<Solution>& front) {
+    const LocalSearchWeights w;
+    auto weighted = [&](const Objectives& o) {
+        return w.unallocated * o[OBJ_UNALLOCATED] + w.waste * o[OBJ_IDLE_SEATS] + w.standing * o[OBJ_STANDING] +
+               w.preference * o[OBJ_PREFERENCES];
+    };
+    size_t best = 0;
+    for (size_t i = 1; i < front.size(); ++i)
+        if (weighted(front[i].obj) < weighted(front[best].obj)) best = i;
+    return best;
+}
+
+void writeFrontCsv(std::ostream& out, const std::vector<Solution>& front) {
+    out << "Solucao";
+    for (const char* name : OBJECTIVE_NAMES) out << "," << name;
+    out << ",EncontrosAlocados\n";
+    for (size_t i = 0; i < front.size(); ++i) {
+        out << i;
+        for (long long v : front[i].obj) out << "," << v;
+        out << "," << std::count_if(front[i].room.begin(), front[i].room.end(), [](int r) { return r >= 0; }) << "\n";
+    }
+}
+
+bool writeFrontCsv(const std::string& path, const std::vector<Solution>& front) {
+    std::ofstream f(path);
+    if (!f.is_open()) {
+        std::cerr << "Erro: nao foi possivel criar " << path << "\n";
+        return false;
+    }
+    writeFrontCsv(f, front);
+    return true;
+}
@@ -0,0 +1,350 @@
+#include "include/metaheuristics/local_search.hpp"
+#include "include/metaheuristics/allocation_model.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <chrono>
+#include <iomanip>
+#include <iostream>
+
+namespace {
+
+using search_clock = std::chrono::steady_clock;
+
+constexpr double EPS = 1e-9;
+
+// célula-alvo de um movimento
+struct Target {
+    int pos = -1;       // posição da sala em p.classrooms
+    int scheduleId = 0;
+    size_t cell = 0;
+};
+
+// Salas, células e reservas fixas vêm do AllocationModel (o mesmo do NSGA-II e do MOLA)
+class Search {
+public:
+    Search(const Problem& p, const std::vector<Reservation>& initial, const ConstructionResult& res,
+           const LocalSearchOptions& options)
+        : p(p), o(options), w(options.weights), model(p, initial, options.allowStanding),
+          cells(model.fixedOccupancy()) {
+        const Solution start = model.fromResult(res);
+        sol.room.assign(p.meetings.size(), -1);
+        sol.sched.assign(p.meetings.size(), 0);
+        cellOf.assign(p.meetings.size(), 0);
+
+        // parte da alocação da construção; model.order() é a ordem dela (demanda decrescente)
+        for (int m : model.order()) totals.unallocatedDemand += p.meetings[m].demand;
+        for (int m : model.order()) {
+            if (start.room[m] < 0) continue;
+            const size_t c = model.cellOf(start.room[m], m, start.sched[m]);
+            if (cells[c] != CELL_FREE) continue;
+            place(m, {start.room[m], start.sched[m], c});
+        }
+    }
+
+    LocalSearchStats run() {
+        LocalSearchStats st;
+        st.before = totals;
+        st.objectiveBefore = totals.objective(w);
+        const auto t0 = search_clock::now();
+        deadline = o.timeLimitMs > 0 ? t0 + std::chrono::milliseconds(o.timeLimitMs) : search_clock::time_point::max();
+
+        while (stop.empty()) {
+            ++st.passes;
+            bool improved = false;
+            for (int m : model.order()) {
+                if (sol.room[m] >= 0 || !budgetLeft(st)) continue;
+                if (tryRelocate(m, st) || tryEjectionChain(m, st)) improved = true;
+            }
+            for (int m : model.order()) {
+                if (sol.room[m] < 0 || !budgetLeft(st)) continue;
+                if (tryRelocate(m, st)) improved = true;
+            }
+            for (int m : model.order()) {
+                if (sol.room[m] < 0 || !budgetLeft(st)) continue;
+                if (trySwap(m, st)) improved = true;
+            }
+            if (!improved && stop.empty()) stop = "otimo local";
+        }
+
+        st.after = totals;
+        st.objectiveAfter = totals.objective(w);
+        st.stopReason = stop;
+        st.elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(search_clock::now() - t0).count();
+        return st;
+    }
+
+    // Refaz o resultado a partir da alocação final (mesma ordem de registro da construção)
+    void exportResult(ConstructionResult& res, std::vector<Reservation>& reservations, long long extraMs) const {
+        ConstructionResult out = model.toResult(sol, res.heuristic);
+        out.alpha = res.alpha;
+        out.seed = res.seed;
+        out.rclTotal = res.rclTotal;
+        out.rclSizeSum = res.rclSizeSum;
+        out.rclMultiCount = res.rclMultiCount;
+        out.elapsedMs = res.elapsedMs + extraMs;
+        reservations = model.toReservations(sol);
+        res = std::move(out);
+    }
+
+private:
+    const Problem& p;
+    const LocalSearchOptions& o;
+    const LocalSearchWeights& w;
+    AllocationModel model;
+    std::vector<int> cells;     // ocupante de cada (sala, dia, horário): encontro, CELL_FREE ou CELL_FIXED
+    Solution sol;               // sala (-1 = não alocado) e horário de cada encontro
+    std::vector<size_t> cellOf;
+    LocalSearchTotals totals;
+    search_clock::time_point deadline;
+    std::string stop;
+
+    // custo de um encontro na sala pos / sem sala: O(1)
+    double cost(int m, int pos) const {
+        const int d = p.meetings[m].demand, cap = p.classrooms[pos].capacity;
+        return w.waste * std::max(0, cap - d) + w.standing * std::max(0, d - cap) +
+               w.preference * p.prefIndex.violationsOf(m)[pos];
+    }
+    double unplacedCost(int m) const { return w.unallocated * p.meetings[m].demand; }
+    double current(int m) const { return sol.room[m] < 0 ? unplacedCost(m) : cost(m, sol.room[m]); }
+
+    // soma (sign = +1) ou retira (-1) a contribuição do encontro m nos totais
+    void account(int m, int sign) {
+        const int d = p.meetings[m].demand;
+        const int pos = sol.room[m];
+        if (pos < 0) {
+            totals.unallocatedDemand += sign * d;
+            return;
+        }
+        const int cap = p.classrooms[pos].capacity;
+        totals.waste += sign * std::max(0, cap - d);
+        totals.standing += sign * std::max(0, d - cap);
+        totals.violations += sign * p.prefIndex.violationsOf(m)[pos];
+        totals.placed += sign;
+    }
+
+    void place(int m, const Target& t) {
+        account(m, -1);
+        if (sol.room[m] >= 0 && cells[cellOf[m]] == m) cells[cellOf[m]] = CELL_FREE;
+        sol.room[m] = t.pos;
+        if (t.pos >= 0) {
+            sol.sched[m] = t.scheduleId;
+            cellOf[m] = t.cell;
+            cells[t.cell] = m;
+        }
+        account(m, +1);
+    }
+
+    bool budgetLeft(LocalSearchStats& st) {
+        if (!stop.empty()) return false;
+        if (o.maxIterations > 0 && st.iterations >= o.maxIterations) stop = "iteracoes";
+        else if (search_clock::now() >= deadline) stop = "tempo";
+        return stop.empty();
+    }
+
+    // chama f(Target) para cada célula do dia de m em que m cabe
+    template <typename F>
+    void forEachCell(int m, F&& f) const {
+        for (int sched : p.meetings[m].scheduleIds) {
+            for (int pos : model.candidateRooms(m)) {
+                if (!model.compatible(m, pos)) continue;
+                f(Target{pos, sched, model.cellOf(pos, m, sched)});
+            }
+        }
+    }
+
+    static bool taken(const std::vector<size_t>& used, size_t c) {
+        return std::find(used.begin(), used.end(), c) != used.end();
+    }
+
+    // melhor célula livre para m (fora de used); custo em bestCost
+    bool bestFree(int m, const std::vector<size_t>& used, Target& best, double& bestCost, LocalSearchStats& st) const {
+        bool found = false;
+        forEachCell(m, [&](const Target& t) {
+            if (cells[t.cell] != CELL_FREE || taken(used, t.cell)) return;
+            ++st.evaluations;
+            const double c = cost(m, t.pos);
+            if (!found || c < bestCost) {
+                found = true;
+                bestCost = c;
+                best = t;
+            }
+        });
+        return found;
+    }
+
+    bool apply(LocalSearchStats& st) {
+        ++st.iterations;
+        return true;
+    }
+
+    bool tryRelocate(int m, LocalSearchStats& st) {
+        Target best;
+        double bestCost = 0.0;
+        static const std::vector<size_t> none;
+        if (!bestFree(m, none, best, bestCost, st) || bestCost >= current(m) - EPS) return false;
+        if (sol.room[m] < 0) ++st.insertions;
+        else ++st.relocations;
+        place(m, best);
+        return apply(st);
+    }
+
+    bool trySwap(int a, LocalSearchStats& st) {
+        const int ra = sol.room[a];
+        const int schedA = sol.sched[a];
+        const size_t cellA = cellOf[a];
+        const double costA = cost(a, ra);
+        double bestDelta = -EPS;
+        int bestB = -1;
+        Target bestT;
+        forEachCell(a, [&](const Target& t) {
+            const int b = cells[t.cell];
+            if (b < 0 || b == a || !model.compatible(b, ra)) return;
+            const auto& sb = p.meetings[b].scheduleIds;
+            if (std::find(sb.begin(), sb.end(), schedA) == sb.end()) return;
+            ++st.evaluations;
+            const double delta = cost(a, t.pos) + cost(b, ra) - costA - cost(b, t.pos);
+            if (delta < bestDelta) {
+                bestDelta = delta;
+                bestB = b;
+                bestT = t;
+            }
+        });
+        if (bestB < 0) return false;
+        // libera a célula de b antes de mover a para lá
+        place(bestB, Target{});
+        place(a, bestT);
+        place(bestB, Target{ra, schedA, cellA});
+        ++st.swaps;
+        return apply(st);
+    }
+
+    // Cadeia de ejeção a partir de um encontro não alocado u: u toma a célula
+    // de v; v vai para uma célula livre, fica sem sala ou (até maxChainDepth)
+    // toma a célula de um encontro de demanda menor, e assim por diante.
+    bool tryEjectionChain(int u, LocalSearchStats& st) {
+        if (o.maxChainDepth <= 0) return false;
+        struct First { double delta; Target t; };
+        std::vector<First> firsts;
+        forEachCell(u, [&](const Target& t) {
+            const int v = cells[t.cell];
+            if (v < 0) return;
+            ++st.evaluations;
+            firsts.push_back({cost(u, t.pos) - unplacedCost(u) - cost(v, t.pos), t});
+        });
+        if (firsts.empty()) return false;
+        const size_t breadth = std::min(firsts.size(), static_cast<size_t>(std::max(1, o.chainBreadth)));
+        std::partial_sort(firsts.begin(), firsts.begin() + breadth, firsts.end(),
+                          [](const First& a, const First& b) { return a.delta < b.delta; });
+
+        struct Step { int meeting; Target to; };
+        double bestDelta = -EPS;
+        std::vector<Step> bestSteps;
+        int bestDropped = -1;  // encontro que termina sem sala
+
+        for (size_t k = 0; k < breadth; ++k) {
+            if (!budgetLeft(st)) break;
+            std::vector<Step> steps{{u, firsts[k].t}};
+            std::vector<size_t> used{firsts[k].t.cell};
+            double delta = firsts[k].delta;
+            int cur = cells[firsts[k].t.cell];  // deslocado, ainda sem destino
+
+            for (int depth = 1; cur >= 0; ++depth) {
+                // fim da cadeia neste nível: célula livre ou sem sala
+                Target free;
+                double freeCost = 0.0;
+                const bool hasFree = bestFree(cur, used, free, freeCost, st);
+                const double drop = unplacedCost(cur);
+                const double end = delta + (hasFree ? std::min(freeCost, drop) : drop);
+                if (end < bestDelta) {
+                    bestDelta = end;
+                    bestSteps = steps;
+                    bestDropped = cur;
+                    if (hasFree && freeCost < drop) {
+                        bestSteps.push_back({cur, free});
+                        bestDropped = -1;
+                    }
+                }
+                if (depth >= o.maxChainDepth) break;
+
+                // próximo nível: cur expulsa um encontro menor
+                const int curDemand = p.meetings[cur].demand;
+                double nextDelta = 0.0;
+                Target next;
+                int nextMeeting = -1;
+                forEachCell(cur, [&](const Target& t) {
+                    const int x = cells[t.cell];
+                    if (x < 0 || taken(used, t.cell) || p.meetings[x].demand >= curDemand) return;
+                    ++st.evaluations;
+                    const double d = cost(cur, t.pos) - cost(x, t.pos);
+                    if (nextMeeting < 0 || d < nextDelta) {
+                        nextDelta = d;
+                        next = t;
+                        nextMeeting = x;
+                    }
+                });
+                if (nextMeeting < 0) break;
+                steps.push_back({cur, next});
+                used.push_back(next.cell);
+                delta += nextDelta;
+                cur = nextMeeting;
+            }
+        }
+        if (bestSteps.empty()) return false;
+
+        // aplica do fim para o começo: cada passo libera a célula que o anterior ocupa
+        if (bestDropped >= 0) place(bestDropped, Target{});
+        for (auto it = bestSteps.rbegin(); it != bestSteps.rend(); ++it) place(it->meeting, it->to);
+        ++st.chains;
+        return apply(st);
+    }
+};
+
+} // namespace
+
+void LocalSearchStats::print(std::ostream& out) const {
+    out << "\n  Busca local (" << passes << " passadas, " << elapsedMs << " ms, parada: " << stopReason << ")\n";
+    out << "    Objetivo:           " << std::fixed << std::setprecision(1) << objectiveBefore << " -> "
+        << objectiveAfter << "\n";
+    out << "    Encontros alocados: " << before.placed << " -> " << after.placed << "\n";
+    out << "    Alunos desalocados: " << before.unallocatedDemand << " -> " << after.unallocatedDemand << "\n";
+    out << "    Vagas ociosas:      " << before.waste << " -> " << after.waste << "\n";
+    out << "    Alunos em pe:       " << before.standing << " -> " << after.standing << "\n";
+    out << "    Pref. violadas:     " << before.violations << " -> " << after.violations << "\n";
+    out << "    Movimentos:         " << iterations << " aplicados (" << insertions << " insercoes, "
+        << relocations << " realocacoes, " << swaps << " trocas, " << chains << " cadeias), "
+        << evaluations << " avaliados\n";
+    out.unsetf(std::ios::floatfield);
+}
+
+LocalSearchStats localSearch(const Problem& p, const std::vector<Reservation>& initialReservations,
+                             ConstructionResult& res, std::vector<Reservation>& reservations,
+                             const LocalSearchOptions& options) {
+    prof::Scope phase("local_search");
+    Search search(p, initialReservations, res, options);
+    LocalSearchStats st = search.run();
+    search.exportResult(res, reservations, st.elapsedMs);
+    return st;
+}
+
+void improveConstruct(Problem& p, const std::vector<Reservation>& initialReservations, ConstructionResult res,
+                      const LocalSearchOptions& options, StatsFormat format) {
+    p.ensurePreferenceIndex();
+    std::vector<Reservation> reservations;
+    LocalSearchStats st = localSearch(p, initialReservations, res, reservations, options);
+    p.reservations = std::move(reservations);
+    {
+        prof::Scope phase("report");
+        st.print(std::cout);
+        res.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = res.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Dados exportados para: " << statsFilename(format) << "\n";
+        std::cout << "Tempo de execucao (ms): " << res.elapsedMs << "\n";
+    }
+}
@@ -1 +1,187 @@
-// Etapa 3 do trabalho
\ No newline at end of file
+#include "include/metaheuristics/mola.hpp"
+#include "include/metaheuristics/pareto_archive.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <chrono>
+#include <iostream>
+#include <random>
+#include <thread>
+
+namespace {
+
+using mola_clock = std::chrono::steady_clock;
+
+// Movimento: a vai para (pos, sched); b (se >= 0) é o ocupante da célula e vai
+// para a antiga célula de a (ou fica sem sala, se a não tinha). pos = -1 desaloca a.
+struct Move {
+    int a = -1, b = -1;
+    int pos = -1, sched = 0;
+    Objectives delta{};
+};
+
+class Walker {
+public:
+    Walker(const AllocationModel& model, std::vector<int>& cells, std::mt19937& rng)
+        : model(model), p(model.problem()), cells(cells), rng(rng) {}
+
+    // sorteia um movimento a partir de s; false se o sorteio não deu um movimento válido
+    bool sample(const Solution& s, Move& mv) {
+        const auto& order = model.order();
+        if (order.empty()) return false;
+        mv = Move{};
+        mv.a = order[std::uniform_int_distribution<size_t>(0, order.size() - 1)(rng)];
+        const int ra = s.room[mv.a];
+        const double r = std::uniform_real_distribution<double>(0.0, 1.0)(rng);
+        if (ra >= 0 && r >= 0.95) {
+            addDelta(mv, mv.a, ra, -1);
+            return true;
+        }
+        if (!model.randomCell(mv.a, rng, mv.pos, mv.sched)) return false;
+        const int occupant = cells[model.cellOf(mv.pos, mv.a, mv.sched)];
+        if (occupant == CELL_FIXED || occupant == mv.a) return false;
+        addDelta(mv, mv.a, ra, mv.pos);
+        if (occupant == CELL_FREE) return true;
+
+        // troca: b vai para a antiga célula de a (ou fica sem sala)
+        mv.b = occupant;
+        if (ra >= 0) {
+            if (!model.compatible(mv.b, ra)) return false;
+            const auto& sb = p.meetings[mv.b].scheduleIds;
+            if (std::find(sb.begin(), sb.end(), s.sched[mv.a]) == sb.end()) return false;
+        }
+        addDelta(mv, mv.b, mv.pos, ra);
+        return true;
+    }
+
+    void apply(Solution& s, const Move& mv) {
+        const int ra = s.room[mv.a], sa = s.sched[mv.a];
+        if (mv.b >= 0) place(s, mv.b, -1, 0);
+        place(s, mv.a, mv.pos, mv.sched);
+        if (mv.b >= 0) place(s, mv.b, ra, sa);
+        for (int k = 0; k < N_OBJECTIVES; ++k) s.obj[k] += mv.delta[k];
+    }
+
+private:
+    const AllocationModel& model;
+    const Problem& p;
+    std::vector<int>& cells;
+    std::mt19937& rng;
+
+    void addDelta(Move& mv, int m, int from, int to) const {
+        const Objectives before = model.contribution(m, from);
+        const Objectives after = model.contribution(m, to);
+        for (int k = 0; k < N_OBJECTIVES; ++k) mv.delta[k] += after[k] - before[k];
+    }
+
+    void place(Solution& s, int m, int pos, int sched) {
+        if (s.room[m] >= 0) cells[model.cellOf(s.room[m], m, s.sched[m])] = CELL_FREE;
+        s.room[m] = pos;
+        if (pos >= 0) {
+            s.sched[m] = sched;
+            cells[model.cellOf(pos, m, sched)] = m;
+        }
+    }
+};
+
+void printProgress(long long ms, const ParetoArchive& archive, long long iterations, long long accepted) {
+    Objectives best = archive.at(0).obj;
+    for (size_t i = 1; i < archive.size(); ++i)
+        for (int k = 0; k < N_OBJECTIVES; ++k) best[k] = std::min(best[k], archive.at(i).obj[k]);
+    std::cout << "  " << ms << " ms: arquivo " << archive.size() << ", movimentos " << iterations << " (aceitos "
+              << accepted << "), minimos";
+    for (int k = 0; k < N_OBJECTIVES; ++k) std::cout << " " << OBJECTIVE_NAMES[k] << "=" << best[k];
+    std::cout << "\n";
+}
+
+} // namespace
+
+MolaResult runMola(Problem& p, const MolaOptions& options) {
+    const auto t0 = mola_clock::now();
+    auto elapsedMs = [&] {
+        return std::chrono::duration_cast<std::chrono::milliseconds>(mola_clock::now() - t0).count();
+    };
+    prof::Scope phase("mola");
+
+    MolaResult out;
+    out.seed = options.seed;
+    if (out.seed == 0) {
+        std::random_device rd;
+        out.seed = rd();
+    }
+    const int threads = options.threads > 0 ? options.threads : std::max(1u, std::thread::hardware_concurrency());
+    long long maxIterations = options.maxIterations;
+    if (options.timeLimitMs <= 0 && maxIterations <= 0) maxIterations = 100000;
+
+    p.ensurePreferenceIndex();
+    const AllocationModel model(p, p.reservations, options.allowStanding);
+    ParetoArchive archive(options.archiveSize);
+    for (const Solution& s : constructiveSolutions(p, model, std::max(1, options.initialSolutions), out.seed, threads))
+        archive.insert(s);
+
+    std::vector<int> cells = model.fixedOccupancy();
+    std::mt19937 rng(out.seed);
+    Walker walker(model, cells, rng);
+    long long nextProgress = 0;
+    Solution cur;
+    Move mv;
+
+    for (;;) {
+        if (maxIterations > 0 && out.iterations >= maxIterations) break;
+        const long long now = elapsedMs();
+        if (options.timeLimitMs > 0 && now >= options.timeLimitMs) break;
+        if (options.progressEveryMs > 0 && now >= nextProgress) {
+            printProgress(now, archive, out.iterations, out.accepted);
+            nextProgress = now + options.progressEveryMs;
+        }
+
+        cur = archive.at(std::uniform_int_distribution<size_t>(0, archive.size() - 1)(rng));
+        model.markCells(cur, cells, true);
+        for (int step = 0; step < options.walkLength; ++step) {
+            if (maxIterations > 0 && out.iterations >= maxIterations) break;
+            ++out.iterations;
+            if (!walker.sample(cur, mv)) continue;
+            ++out.evaluated;
+            Objectives cand = cur.obj;
+            for (int k = 0; k < N_OBJECTIVES; ++k) cand[k] += mv.delta[k];
+            const bool archived = archive.accepts(cand);
+            if (!archived && !dominates(cand, cur.obj)) continue;
+            walker.apply(cur, mv);
+            ++out.accepted;
+            if (archived) archive.insert(cur);
+        }
+        model.markCells(cur, cells, false);
+    }
+    if (options.progressEveryMs > 0) printProgress(elapsedMs(), archive, out.iterations, out.accepted);
+
+    out.front = archive.solutions();
+    out.elapsedMs = elapsedMs();
+    return out;
+}
+
+void molaConstruct(Problem& p, const MolaOptions& options, StatsFormat format) {
+    MolaResult res = runMola(p, options);
+    const AllocationModel model(p, p.reservations, options.allowStanding);
+
+    const size_t best = weightedRepresentative(res.front);
+    ConstructionResult chosen = model.toResult(res.front[best], "mola");
+    chosen.seed = res.seed;
+    chosen.elapsedMs = res.elapsedMs;
+
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  MOLA: " << res.iterations << " movimentos (" << res.evaluated << " avaliados, "
+                  << res.accepted << " aceitos), seed " << res.seed << ", " << res.elapsedMs << " ms\n";
+        std::cout << "  Fronteira de Pareto: " << res.front.size() << " solucoes (representante: " << best << ")\n";
+        chosen.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = writeFrontCsv("pareto_front.csv", res.front) && chosen.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Dados exportados para: pareto_front.csv e " << statsFilename(format) << "\n";
+    }
+    p.reservations = model.toReservations(res.front[best]);
+}
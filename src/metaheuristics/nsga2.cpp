@@ -1 +1,298 @@
-// Etapa 3 do trabalho
+#include "include/metaheuristics/nsga2.hpp"
+#include "include/metaheuristics/local_search.hpp"
+#include "include/profiling.hpp"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <iostream>
+#include <random>
+
+namespace {
+
+using nsga_clock = std::chrono::steady_clock;
+
+constexpr int CELL_SAMPLES = 8;  // células sorteadas por mutação
+
+std::mt19937 streamFor(unsigned int seed, unsigned int a, unsigned int b) {
+    std::seed_seq seq{seed, a, b};
+    return std::mt19937(seq);
+}
+
+// Mutação de um filho sobre a ocupação cells (ocupante de cada célula)
+class Mutator {
+public:
+    Mutator(const AllocationModel& model, std::vector<int>& cells, Solution& s, std::mt19937& rng)
+        : model(model), p(model.problem()), cells(cells), s(s), rng(rng) {
+        // pesos aleatórios por filho, na escala dos pesos da busca local
+        const LocalSearchWeights base;
+        const double scale[N_OBJECTIVES] = {base.unallocated, base.waste, base.standing, base.preference};
+        std::uniform_real_distribution<double> u(0.05, 1.0);
+        for (int k = 0; k < N_OBJECTIVES; ++k) w[k] = scale[k] * u(rng);
+    }
+
+    void mutate(int m) {
+        sample(m);
+        if (samples.empty()) return;
+        if (s.room[m] < 0) insert(m);
+        else {
+            const double r = uni(rng);
+            if (r < 0.55) relocate(m);
+            else if (r < 0.95) swap(m);
+            else place(m, -1, 0);
+        }
+    }
+
+private:
+    struct Cand { int pos; int sched; size_t cell; int occupant; };
+
+    const AllocationModel& model;
+    const Problem& p;
+    std::vector<int>& cells;
+    Solution& s;
+    std::mt19937& rng;
+    double w[N_OBJECTIVES];
+    std::vector<Cand> samples;
+    std::uniform_real_distribution<double> uni{0.0, 1.0};
+
+    double cost(int m, int pos) const {
+        const Objectives c = model.contribution(m, pos);
+        double v = 0.0;
+        for (int k = 0; k < N_OBJECTIVES; ++k) v += w[k] * c[k];
+        return v;
+    }
+
+    void sample(int m) {
+        samples.clear();
+        for (int i = 0; i < CELL_SAMPLES; ++i) {
+            int pos, sched;
+            if (!model.randomCell(m, rng, pos, sched)) continue;
+            const size_t c = model.cellOf(pos, m, sched);
+            if (cells[c] == CELL_FIXED || cells[c] == m) continue;
+            samples.push_back({pos, sched, c, cells[c]});
+        }
+    }
+
+    void place(int m, int pos, int sched) {
+        if (s.room[m] >= 0) cells[model.cellOf(s.room[m], m, s.sched[m])] = CELL_FREE;
+        s.room[m] = pos;
+        if (pos >= 0) {
+            s.sched[m] = sched;
+            cells[model.cellOf(pos, m, sched)] = m;
+        }
+    }
+
+    const Cand* bestFree(int m) const {
+        const Cand* best = nullptr;
+        for (const auto& c : samples) {
+            if (c.occupant != CELL_FREE) continue;
+            if (!best || cost(m, c.pos) < cost(m, best->pos)) best = &c;
+        }
+        return best;
+    }
+
+    // encontro sem sala: célula livre, ou expulsa um encontro menor (que tenta uma célula livre)
+    void insert(int m) {
+        if (const Cand* c = bestFree(m)) {
+            place(m, c->pos, c->sched);
+            return;
+        }
+        const Cand* victim = nullptr;
+        for (const auto& c : samples) {
+            if (c.occupant < 0 || p.meetings[c.occupant].demand >= p.meetings[m].demand) continue;
+            if (!victim || cost(m, c.pos) - cost(c.occupant, c.pos) < cost(m, victim->pos) - cost(victim->occupant, victim->pos))
+                victim = &c;
+        }
+        if (!victim) return;
+        const Cand v = *victim;
+        place(v.occupant, -1, 0);
+        place(m, v.pos, v.sched);
+        sample(v.occupant);
+        if (const Cand* c = bestFree(v.occupant)) place(v.occupant, c->pos, c->sched);
+    }
+
+    void relocate(int m) {
+        const Cand* c = bestFree(m);
+        if (!c) return;
+        // melhora pelos pesos do filho; às vezes aceita piora para diversificar
+        if (cost(m, c->pos) <= cost(m, s.room[m]) || uni(rng) < 0.3) place(m, c->pos, c->sched);
+    }
+
+    void swap(int a) {
+        const int ra = s.room[a], sa = s.sched[a];
+        for (const auto& c : samples) {
+            const int b = c.occupant;
+            if (b < 0 || !model.compatible(b, ra)) continue;
+            const auto& sb = p.meetings[b].scheduleIds;
+            if (std::find(sb.begin(), sb.end(), sa) == sb.end()) continue;
+            place(b, -1, 0);
+            place(a, c.pos, c.sched);
+            place(b, ra, sa);
+            return;
+        }
+    }
+};
+
+// posto e aglomeração de cada solução (para o torneio)
+void rankPopulation(const std::vector<Solution>& pop, std::vector<int>& rank, std::vector<double>& crowd) {
+    std::vector<Objectives> objs(pop.size());
+    for (size_t i = 0; i < pop.size(); ++i) objs[i] = pop[i].obj;
+    rank.assign(pop.size(), 0);
+    crowd.assign(pop.size(), 0.0);
+    const auto fronts = nonDominatedFronts(objs);
+    for (size_t f = 0; f < fronts.size(); ++f) {
+        const auto dist = crowdingDistance(objs, fronts[f]);
+        for (size_t j = 0; j < fronts[f].size(); ++j) {
+            rank[fronts[f][j]] = static_cast<int>(f);
+            crowd[fronts[f][j]] = dist[j];
+        }
+    }
+}
+
+// Seleção ambiental: as n melhores de pool por (fronteira, aglomeração)
+std::vector<Solution> selectSurvivors(std::vector<Solution>& pool, size_t n) {
+    std::vector<Objectives> objs(pool.size());
+    for (size_t i = 0; i < pool.size(); ++i) objs[i] = pool[i].obj;
+    std::vector<Solution> next;
+    next.reserve(n);
+    for (const auto& front : nonDominatedFronts(objs)) {
+        if (next.size() + front.size() <= n) {
+            for (int i : front) next.push_back(std::move(pool[i]));
+        } else {
+            const auto dist = crowdingDistance(objs, front);
+            std::vector<size_t> order(front.size());
+            for (size_t j = 0; j < order.size(); ++j) order[j] = j;
+            std::stable_sort(order.begin(), order.end(), [&](size_t a, size_t b) { return dist[a] > dist[b]; });
+            for (size_t j = 0; next.size() < n; ++j) next.push_back(std::move(pool[front[order[j]]]));
+        }
+        if (next.size() >= n) break;
+    }
+    return next;
+}
+
+void printProgress(int generation, const std::vector<Solution>& pop, long long ms) {
+    std::vector<Objectives> objs(pop.size());
+    for (size_t i = 0; i < pop.size(); ++i) objs[i] = pop[i].obj;
+    const auto fronts = nonDominatedFronts(objs);
+    Objectives best = fronts[0].empty() ? Objectives{} : objs[fronts[0][0]];
+    for (int i : fronts[0])
+        for (int k = 0; k < N_OBJECTIVES; ++k) best[k] = std::min(best[k], objs[i][k]);
+    std::cout << "  Geracao " << generation << ": fronteira " << fronts[0].size() << ", minimos";
+    for (int k = 0; k < N_OBJECTIVES; ++k) std::cout << " " << OBJECTIVE_NAMES[k] << "=" << best[k];
+    std::cout << " (" << ms << " ms)\n";
+}
+
+} // namespace
+
+Nsga2Result runNsga2(Problem& p, const Nsga2Options& options) {
+    const auto t0 = nsga_clock::now();
+    auto elapsedMs = [&] {
+        return std::chrono::duration_cast<std::chrono::milliseconds>(nsga_clock::now() - t0).count();
+    };
+    prof::Scope phase("nsga2");
+
+    Nsga2Result out;
+    out.seed = options.seed;
+    if (out.seed == 0) {
+        std::random_device rd;
+        out.seed = rd();
+    }
+    const int n = std::max(4, options.population);
+    const int threads = options.threads > 0 ? options.threads : std::max(1u, std::thread::hardware_concurrency());
+
+    p.ensurePreferenceIndex();
+    const AllocationModel model(p, p.reservations, options.allowStanding);
+
+    // população inicial: gulosa + parcialmente gulosas com alpha em [0.1, 0.9]
+    std::vector<Solution> pop = constructiveSolutions(p, model, n, out.seed, threads);
+
+    std::vector<std::vector<int>> workspace(threads, model.fixedOccupancy());
+    const int mutations = std::max(1, static_cast<int>(std::lround(options.mutationRate * model.order().size())));
+    std::vector<int> rank;
+    std::vector<double> crowd;
+
+    int gen = 0;
+    for (; gen < options.generations; ++gen) {
+        if (options.timeLimitMs > 0 && elapsedMs() >= options.timeLimitMs) break;
+        if (options.progressEvery > 0 && gen % options.progressEvery == 0) printProgress(gen, pop, elapsedMs());
+        rankPopulation(pop, rank, crowd);
+
+        std::vector<Solution> offspring(n);
+        parallelFor(n, threads, [&](int i, int t) {
+            std::mt19937 rng = streamFor(out.seed, static_cast<unsigned int>(gen + 1), static_cast<unsigned int>(i));
+            std::uniform_int_distribution<int> pick(0, n - 1);
+            auto tournament = [&] {
+                const int a = pick(rng), b = pick(rng);
+                if (rank[a] != rank[b]) return rank[a] < rank[b] ? a : b;
+                return crowd[a] >= crowd[b] ? a : b;
+            };
+            const Solution& pa = pop[tournament()];
+            const Solution& pb = pop[tournament()];
+
+            // cruzamento por dia: cada dia vem inteiro de um dos pais
+            Solution child = pa;
+            if (std::uniform_real_distribution<double>(0.0, 1.0)(rng) < options.crossoverRate) {
+                for (size_t d = 0; d < model.numDays(); ++d) {
+                    if (rng() & 1u) continue;
+                    for (int m : model.meetingsOfDay(d)) {
+                        child.room[m] = pb.room[m];
+                        child.sched[m] = pb.sched[m];
+                    }
+                }
+            }
+
+            std::vector<int>& cells = workspace[t];
+            model.markCells(child, cells, true);
+            Mutator mutator(model, cells, child, rng);
+            std::uniform_int_distribution<size_t> pickMeeting(0, model.order().size() - 1);
+            for (int k = 0; k < mutations && !model.order().empty(); ++k) mutator.mutate(model.order()[pickMeeting(rng)]);
+            model.markCells(child, cells, false);
+
+            child.obj = model.evaluate(child);
+            offspring[i] = std::move(child);
+        });
+
+        std::vector<Solution> pool = std::move(pop);
+        for (auto& c : offspring) pool.push_back(std::move(c));
+        pop = selectSurvivors(pool, n);
+    }
+    if (options.progressEvery > 0) printProgress(gen, pop, elapsedMs());
+
+    std::vector<Objectives> objs(pop.size());
+    for (size_t i = 0; i < pop.size(); ++i) objs[i] = pop[i].obj;
+    const auto fronts = nonDominatedFronts(objs);
+    // soluções repetidas aparecem uma vez só
+    for (int i : fronts[0]) {
+        if (out.front.empty() || out.front.back().obj != pop[i].obj) out.front.push_back(std::move(pop[i]));
+    }
+    out.generations = gen;
+    out.elapsedMs = elapsedMs();
+    return out;
+}
+
+void nsga2Construct(Problem& p, const Nsga2Options& options, StatsFormat format) {
+    Nsga2Result res = runNsga2(p, options);
+    const AllocationModel model(p, p.reservations, options.allowStanding);
+
+    const size_t best = weightedRepresentative(res.front);
+    ConstructionResult chosen = model.toResult(res.front[best], "nsga2");
+    chosen.seed = res.seed;
+    chosen.elapsedMs = res.elapsedMs;
+
+    {
+        prof::Scope phase("report");
+        std::cout << "\n  NSGA-II: " << res.generations << " geracoes, populacao " << std::max(4, options.population)
+                  << ", seed " << res.seed << ", " << res.elapsedMs << " ms\n";
+        std::cout << "  Fronteira de Pareto: " << res.front.size() << " solucoes (representante: " << best << ")\n";
+        chosen.printReport(std::cout);
+    }
+
+    bool written;
+    {
+        prof::Scope phase("export");
+        written = writeFrontCsv("pareto_front.csv", res.front) && chosen.writeStats(statsFilename(format), format);
+    }
+    if (written) {
+        std::cout << "Dados exportados para: pareto_front.csv e " << statsFilename(format) << "\n";
+    }
+    p.reservations = model.toReservations(res.front[best]);
+}
@@ -0,0 +1,266 @@
+#include "include/metaheuristics/pareto_archive.hpp"
+#include <algorithm>
+#include <cmath>
+
+namespace {
+
+// a <= b em todos os objetivos
+bool weaklyDominates(const Objectives& a, const Objectives& b) {
+    for (int k = 0; k < N_OBJECTIVES; ++k)
+        if (a[k] > b[k]) return false;
+    return true;
+}
+
+double distance(const Objectives& a, const Objectives& b) {
+    double d = 0.0;
+    for (int k = 0; k < N_OBJECTIVES; ++k) d += double(a[k] - b[k]) * double(a[k] - b[k]);
+    return std::sqrt(d);
+}
+
+} // namespace
+
+ParetoArchive::ParetoArchive(size_t capacity, size_t maxLeaf, size_t branching)
+    : limit(std::max<size_t>(1, capacity)), maxLeaf(std::max<size_t>(2, maxLeaf)),
+      branching(std::max<size_t>(2, branching)) {
+    newNode(-1, true);
+}
+
+int ParetoArchive::newNode(int parent, bool leaf) {
+    int id;
+    if (!freeNodes.empty()) {
+        id = freeNodes.back();
+        freeNodes.pop_back();
+        nodes[id] = Node{};
+    } else {
+        id = static_cast<int>(nodes.size());
+        nodes.emplace_back();
+    }
+    nodes[id].parent = parent;
+    nodes[id].leaf = leaf;
+    return id;
+}
+
+bool ParetoArchive::empty(int n) const {
+    return nodes[n].leaf ? nodes[n].points.empty() : nodes[n].children.empty();
+}
+
+bool ParetoArchive::coveredBy(int n, const Objectives& y) const {
+    const Node& node = nodes[n];
+    if (empty(n)) return false;
+    if (weaklyDominates(node.nadir, y)) return true;   // todo ponto do nó domina y
+    if (!weaklyDominates(node.ideal, y)) return false; // nenhum ponto do nó domina y
+    if (node.leaf) {
+        for (int s : node.points)
+            if (weaklyDominates(slots[s].obj, y)) return true;
+        return false;
+    }
+    for (int c : node.children)
+        if (coveredBy(c, y)) return true;
+    return false;
+}
+
+bool ParetoArchive::accepts(const Objectives& obj) const {
+    return !coveredBy(0, obj);
+}
+
+bool ParetoArchive::update(int n, const Objectives& y) {
+    if (empty(n)) return true;
+    if (weaklyDominates(nodes[n].nadir, y)) return false;
+    if (weaklyDominates(y, nodes[n].ideal) && y != nodes[n].ideal) {
+        // y domina todos os pontos do nó
+        releaseSubtree(n);
+        return true;
+    }
+    if (!weaklyDominates(nodes[n].ideal, y) && !weaklyDominates(y, nodes[n].nadir)) return true;
+
+    if (nodes[n].leaf) {
+        auto& points = nodes[n].points;
+        for (size_t i = 0; i < points.size();) {
+            const Objectives& p = slots[points[i]].obj;
+            if (weaklyDominates(p, y)) return false;
+            if (dominates(y, p)) {
+                removeSlot(points[i], false);
+                points[i] = points.back();
+                points.pop_back();
+            } else {
+                ++i;
+            }
+        }
+        return true;
+    }
+    for (size_t i = 0; i < nodes[n].children.size(); ++i) {
+        if (!update(nodes[n].children[i], y)) return false;
+    }
+    auto& children = nodes[n].children;
+    for (size_t i = 0; i < children.size();) {
+        if (empty(children[i])) {
+            freeNodes.push_back(children[i]);
+            children[i] = children.back();
+            children.pop_back();
+        } else {
+            ++i;
+        }
+    }
+    return true;
+}
+
+void ParetoArchive::releaseSubtree(int n) {
+    if (nodes[n].leaf) {
+        for (int s : nodes[n].points) removeSlot(s, false);
+        nodes[n].points.clear();
+        return;
+    }
+    for (int c : nodes[n].children) {
+        releaseSubtree(c);
+        freeNodes.push_back(c);
+    }
+    nodes[n].children.clear();
+}
+
+void ParetoArchive::removeSlot(int slot, bool fromLeaf) {
+    if (fromLeaf) {
+        auto& points = nodes[leafOf[slot]].points;
+        auto it = std::find(points.begin(), points.end(), slot);
+        *it = points.back();
+        points.pop_back();
+    }
+    const int pos = livePos[slot];
+    live[pos] = live.back();
+    livePos[live[pos]] = pos;
+    live.pop_back();
+    slots[slot] = Solution{};
+    freeSlots.push_back(slot);
+}
+
+void ParetoArchive::expand(int n, const Objectives& y) {
+    Node& node = nodes[n];
+    if (empty(n)) {
+        node.ideal = node.nadir = y;
+        return;
+    }
+    for (int k = 0; k < N_OBJECTIVES; ++k) {
+        node.ideal[k] = std::min(node.ideal[k], y[k]);
+        node.nadir[k] = std::max(node.nadir[k], y[k]);
+    }
+}
+
+void ParetoArchive::insertAt(int n, int slot) {
+    const Objectives& y = slots[slot].obj;
+    for (;;) {
+        expand(n, y);
+        if (nodes[n].leaf) {
+            nodes[n].points.push_back(slot);
+            leafOf[slot] = n;
+            if (nodes[n].points.size() > maxLeaf) split(n);
+            return;
+        }
+        // filho com o ponto médio (ideal + nadir) / 2 mais próximo de y
+        int best = -1;
+        double bestDist = 0.0;
+        for (int c : nodes[n].children) {
+            Objectives mid;
+            for (int k = 0; k < N_OBJECTIVES; ++k) mid[k] = (nodes[c].ideal[k] + nodes[c].nadir[k]) / 2;
+            const double d = distance(mid, y);
+            if (best < 0 || d < bestDist) {
+                best = c;
+                bestDist = d;
+            }
+        }
+        n = best;
+    }
+}
+
+void ParetoArchive::split(int n) {
+    const std::vector<int> points = std::move(nodes[n].points);
+    nodes[n].points.clear();
+    nodes[n].leaf = false;
+
+    // sementes espalhadas: a mais distante das demais, depois a mais distante das já escolhidas
+    const size_t k = std::min(branching, points.size());
+    std::vector<int> seeds;
+    std::vector<bool> used(points.size(), false);
+    size_t first = 0;
+    double far = -1.0;
+    for (size_t i = 0; i < points.size(); ++i) {
+        double sum = 0.0;
+        for (size_t j = 0; j < points.size(); ++j) sum += distance(slots[points[i]].obj, slots[points[j]].obj);
+        if (sum > far) {
+            far = sum;
+            first = i;
+        }
+    }
+    seeds.push_back(static_cast<int>(first));
+    used[first] = true;
+    while (seeds.size() < k) {
+        size_t pick = 0;
+        double pickDist = -1.0;
+        for (size_t i = 0; i < points.size(); ++i) {
+            if (used[i]) continue;
+            double nearest = -1.0;
+            for (int s : seeds) {
+                const double d = distance(slots[points[i]].obj, slots[points[s]].obj);
+                if (nearest < 0 || d < nearest) nearest = d;
+            }
+            if (nearest > pickDist) {
+                pickDist = nearest;
+                pick = i;
+            }
+        }
+        seeds.push_back(static_cast<int>(pick));
+        used[pick] = true;
+    }
+
+    for (int s : seeds) {
+        const int child = newNode(n, true);
+        nodes[n].children.push_back(child);
+        insertAt(child, points[s]);
+    }
+    for (size_t i = 0; i < points.size(); ++i) {
+        if (used[i]) continue;
+        // o nó n já contém todos os pontos: insertAt só desce até a folha
+        insertAt(n, points[i]);
+    }
+}
+
+bool ParetoArchive::insert(const Solution& s) {
+    if (!update(0, s.obj)) return false;
+    if (!nodes[0].leaf && nodes[0].children.empty()) nodes[0].leaf = true;
+
+    int slot;
+    if (!freeSlots.empty()) {
+        slot = freeSlots.back();
+        freeSlots.pop_back();
+    } else {
+        slot = static_cast<int>(slots.size());
+        slots.emplace_back();
+        livePos.push_back(-1);
+        leafOf.push_back(-1);
+    }
+    slots[slot] = s;
+    livePos[slot] = static_cast<int>(live.size());
+    live.push_back(slot);
+    insertAt(0, slot);
+
+    if (live.size() > limit) evictMostCrowded();
+    return true;
+}
+
+void ParetoArchive::evictMostCrowded() {
+    std::vector<Objectives> objs(live.size());
+    std::vector<int> all(live.size());
+    for (size_t i = 0; i < live.size(); ++i) {
+        objs[i] = slots[live[i]].obj;
+        all[i] = static_cast<int>(i);
+    }
+    const std::vector<double> dist = crowdingDistance(objs, all);
+    const size_t victim = std::min_element(dist.begin(), dist.end()) - dist.begin();
+    removeSlot(live[victim], true);
+}
+
+std::vector<Solution> ParetoArchive::solutions() const {
+    std::vector<Solution> out;
+    out.reserve(live.size());
+    for (int s : live) out.push_back(slots[s]);
+    std::sort(out.begin(), out.end(), [](const Solution& a, const Solution& b) { return a.obj < b.obj; });
+    return out;
+}
@@ -0,0 +1,79 @@
+#include "include/occupancy.hpp"
+#include <algorithm>
+
+static int index_of(const std::unordered_map<int, int>& m, int key) {
+    auto it = m.find(key);
+    return it == m.end() ? -1 : it->second;
+}
+
+OccupancyIndex::OccupancyIndex(const Problem& p) : OccupancyIndex(p, p.reservations) {}
+
+OccupancyIndex::OccupancyIndex(const Problem& p, const std::vector<Reservation>& reservations) {
+    build(p, reservations, nullptr);
+}
+
+OccupancyIndex::OccupancyIndex(const Problem& p, const std::vector<Reservation>& reservations,
+                               const std::vector<int>& meetings) {
+    build(p, reservations, &meetings);
+}
+
+void OccupancyIndex::build(const Problem& p, const std::vector<Reservation>& reservations,
+                           const std::vector<int>* meetings) {
+    slotOfClassroom.reserve(p.classrooms.size());
+    for (const auto& c : p.classrooms) {
+        auto it = slotOfId.emplace(c.id, static_cast<int>(slotOfId.size())).first;
+        slotOfClassroom.push_back(it->second);
+    }
+
+    // eixos: todos os dias/horários usados pelos encontros ou pelas reservas
+    std::vector<int> days, scheds;
+    for (const auto& s : p.schedules) scheds.push_back(s.id);
+    auto addMeeting = [&](const Meeting& m) {
+        days.push_back(m.dayOfWeek);
+        scheds.insert(scheds.end(), m.scheduleIds.begin(), m.scheduleIds.end());
+    };
+    if (meetings) {
+        for (int mi : *meetings) addMeeting(p.meetings[mi]);
+    } else {
+        for (const auto& m : p.meetings) addMeeting(m);
+    }
+    for (const auto& r : reservations) {
+        days.push_back(r.dayOfWeek);
+        scheds.push_back(r.scheduleId);
+    }
+    for (auto* v : {&days, &scheds}) {
+        std::sort(v->begin(), v->end());
+        v->erase(std::unique(v->begin(), v->end()), v->end());
+    }
+    for (size_t i = 0; i < days.size(); ++i) dayIdx[days[i]] = static_cast<int>(i);
+    for (size_t i = 0; i < scheds.size(); ++i) schedIdx[scheds[i]] = static_cast<int>(i);
+    nDays = days.size();
+    nScheds = scheds.size();
+    busy.assign(slotOfId.size() * nDays * nScheds, false);
+
+    for (const auto& r : reservations) mark(r.classroomId, r.dayOfWeek, r.scheduleId);
+}
+
+int OccupancyIndex::dayIndex(int day) const { return index_of(dayIdx, day); }
+
+int OccupancyIndex::scheduleIndex(int scheduleId) const { return index_of(schedIdx, scheduleId); }
+
+void OccupancyIndex::mark(int classroomId, int day, int scheduleId) {
+    int slot = index_of(slotOfId, classroomId);
+    int d = dayIndex(day);
+    int s = scheduleIndex(scheduleId);
+    // reservas de salas/dias/horários fora da instância nunca bloqueiam candidatos
+    if (slot < 0 || d < 0 || s < 0) return;
+    busy[cell(slot, d, s)] = true;
+}
+
+void OccupancyIndex::reserve(Problem& p, size_t classroomPos, Reservation r) {
+    reserve(p.reservations, classroomPos, std::move(r));
+}
+
+void OccupancyIndex::reserve(std::vector<Reservation>& reservations, size_t classroomPos, Reservation r) {
+    int d = dayIndex(r.dayOfWeek);
+    int s = scheduleIndex(r.scheduleId);
+    if (d >= 0 && s >= 0) busy[cell(slotOfClassroom[classroomPos], d, s)] = true;
+    reservations.push_back(std::move(r));
+}
@@ -1,10 +1,13 @@
 #include "include/problem.hpp"
+#include "include/instance_cache.hpp"
+#include "include/profiling.hpp"
 #include <vector>
 #include <string>
 #include <iostream>
 #include <fstream>
 #include <sstream>
 #include <algorithm>
+#include <map>
 #include <nlohmann/json.hpp>
 using json = nlohmann::json;
 
@@ -73,21 +76,69 @@ static std::vector<int> get_vector_of_ints(const json& j, const std::string& key
 }
 
 void Problem::loadInstance(const std::string& filename) {
-    const std::string path = "data/generated_instances/" + filename;
-    std::string content = readFileToString(path);
+    loadInstanceFile("data/generated_instances/" + filename);
+}
+
+static Reservation parse_reservation(const json& item) {
+    Reservation r;
+    r.id = get_string_or(item, "id");
+    r.classroomId = get_int_or(item, "classroomID", get_int_or(item, "classroomId", get_int_or(item, "classroom", 0)));
+    r.dayOfWeek = get_int_or(item, "dayOfWeek", get_int_or(item, "day", 0));
+    r.scheduleId = get_int_or(item, "scheduleID", get_int_or(item, "scheduleId", get_int_or(item, "schedule", 0)));
+    return r;
+}
+
+// Sobrescreve em m só os campos presentes em item (mesmas chaves de loadInstanceFile)
+static void read_meeting_fields(const json& item, Meeting& m) {
+    auto has = [&](const char* key) { return item.contains(key) && !item.at(key).is_null(); };
+    if (has("id")) m.id = get_string_or(item, "id");
+    if (has("isPractical")) m.isPractical = get_bool_or(item, "isPractical");
+    else if (has("practical")) m.isPractical = get_bool_or(item, "practical");
+    if (has("professorCodes")) m.professorCodes = get_vector_of_strings(item, "professorCodes");
+    else if (has("professors")) m.professorCodes = get_vector_of_strings(item, "professors");
+    if (has("subjectCode")) m.subjectCode = get_string_or(item, "subjectCode");
+    else if (has("subject")) m.subjectCode = get_string_or(item, "subject");
+    if (has("classIds")) m.classIds = get_vector_of_strings(item, "classIds");
+    if (has("scheduleIds")) m.scheduleIds = get_vector_of_ints(item, "scheduleIds");
+    else if (has("schedules")) m.scheduleIds = get_vector_of_ints(item, "schedules");
+    if (has("demand")) m.demand = get_int_or(item, "demand", 0);
+    if (has("vacancies")) m.vacancies = get_int_or(item, "vacancies", 0);
+    if (has("dayOfWeek")) m.dayOfWeek = get_int_or(item, "dayOfWeek", 0);
+    else if (has("day")) m.dayOfWeek = get_int_or(item, "day", 0);
+}
+
+bool Problem::loadInstanceFile(const std::string& path) {
+    // cache binário em dia (scripts/instance_cache.py) evita o parse do JSON
+    bool cached;
+    {
+        prof::Scope phase("cache_load");
+        cached = loadInstanceCache(*this, path);
+    }
+    if (cached) {
+        buildPreferenceIndex();
+        return true;
+    }
+
+    std::string content;
+    {
+        prof::Scope phase("json_read");
+        content = readFileToString(path);
+    }
     if (content.empty()) {
         std::cerr << "Erro ao abrir ou ler o arquivo: " << path << std::endl;
-        return;
+        return false;
     }
 
     json j;
     try {
+        prof::Scope phase("json_parse");
         j = json::parse(content);
     } catch (const std::exception& e) {
         std::cerr << "Erro ao parsear JSON: " << e.what() << std::endl;
-        return;
+        return false;
     }
 
+    prof::Scope populate("populate");  // até o fim da função (pref_index é medido à parte)
     schedules.clear();
     buildings.clear();
     classrooms.clear();
@@ -211,12 +262,158 @@ void Problem::loadInstance(const std::string& filename) {
     // Reservations
     if (j.contains("reservations") && j.at("reservations").is_array()) {
         for (const auto& item : j.at("reservations")) {
-            Reservation r;
-            r.id = get_string_or(item, "id");
-            r.classroomId = get_int_or(item, "classroomID", get_int_or(item, "classroomId", get_int_or(item, "classroom", 0)));
-            r.dayOfWeek = get_int_or(item, "dayOfWeek", get_int_or(item, "day", 0));
-            r.scheduleId = get_int_or(item, "scheduleID", get_int_or(item, "scheduleId", get_int_or(item, "schedule", 0)));
-            reservations.push_back(std::move(r));
+            reservations.push_back(parse_reservation(item));
+        }
+    }
+
+    buildPreferenceIndex();
+    return true;
+}
+
+void Problem::buildPreferenceIndex() {
+    prof::Scope phase("pref_index");
+    PreferenceIndex idx;
+
+    std::unordered_map<std::string, int> boardIds;
+    auto board_id = [&](const std::string& b) {
+        return boardIds.emplace(b, static_cast<int>(boardIds.size())).first->second;
+    };
+    std::vector<int> classroomBoard;
+    classroomBoard.reserve(classrooms.size());
+    for (const auto& c : classrooms) classroomBoard.push_back(board_id(c.board));
+
+    for (size_t i = 0; i < preferences.size(); ++i) {
+        const Preference& pref = preferences[i];
+        const int pi = static_cast<int>(i);
+        if (pref.category == "professor") idx.byProfessor[pref.categoryCode].push_back(pi);
+        else if (pref.category == "subject") idx.bySubject[pref.categoryCode].push_back(pi);
+        else if (pref.category == "class") idx.byClass[pref.categoryCode].push_back(pi);
+
+        CompiledPreference cp;
+        if (!pref.buildingId.empty()) {
+            try { cp.buildingId = std::stoi(pref.buildingId); } catch (...) { /* se não for número, não compara */ }
+        }
+        cp.floor = pref.floor;
+        if (!pref.board.empty()) cp.boardId = board_id(pref.board);
+        cp.projector = pref.projector;
+        idx.compiled.push_back(cp);
+    }
+
+    // violações de cada preferência em cada sala
+    auto violations = [&](const CompiledPreference& cp, size_t ci) {
+        const Classroom& c = classrooms[ci];
+        int v = 0;
+        if (cp.buildingId != -1 && cp.buildingId != c.buildingId) ++v;
+        if (cp.floor != -1 && cp.floor != c.floor) ++v;
+        if (cp.boardId != -1 && cp.boardId != classroomBoard[ci]) ++v;
+        // só considera preferência positiva por projetor (se true)
+        if (cp.projector && !c.projector) ++v;
+        return v;
+    };
+
+    std::map<std::vector<int>, int> profileOf;
+    idx.profilePrefs.push_back({});
+    idx.profileViolations.push_back(std::vector<int>(classrooms.size(), 0));
+    idx.profileMaxViolations.push_back(0);
+    profileOf[{}] = 0;
+
+    idx.meetingProfile.reserve(meetings.size());
+    std::vector<int> applicable;
+    for (const auto& m : meetings) {
+        applicable.clear();
+        auto collect = [&](const std::unordered_map<std::string, std::vector<int>>& by, const std::string& code) {
+            auto it = by.find(code);
+            if (it != by.end()) applicable.insert(applicable.end(), it->second.begin(), it->second.end());
+        };
+        for (const auto& pc : m.professorCodes) collect(idx.byProfessor, pc);
+        collect(idx.bySubject, m.subjectCode);
+        for (const auto& cid : m.classIds) collect(idx.byClass, cid);
+        std::sort(applicable.begin(), applicable.end());
+        applicable.erase(std::unique(applicable.begin(), applicable.end()), applicable.end());
+
+        auto it = profileOf.find(applicable);
+        if (it == profileOf.end()) {
+            std::vector<int> viol(classrooms.size(), 0);
+            for (int pi : applicable)
+                for (size_t ci = 0; ci < classrooms.size(); ++ci) viol[ci] += violations(idx.compiled[pi], ci);
+            it = profileOf.emplace(applicable, static_cast<int>(idx.profilePrefs.size())).first;
+            idx.profilePrefs.push_back(applicable);
+            idx.profileMaxViolations.push_back(viol.empty() ? 0 : *std::max_element(viol.begin(), viol.end()));
+            idx.profileViolations.push_back(std::move(viol));
         }
+        idx.meetingProfile.push_back(it->second);
     }
-}
\ No newline at end of file
+
+    prefIndex = std::move(idx);
+}
+
+void Problem::ensurePreferenceIndex() {
+    if (prefIndex.profileViolations.empty() ||
+        prefIndex.meetingProfile.size() != meetings.size() ||
+        prefIndex.compiled.size() != preferences.size() ||
+        prefIndex.profileViolations[0].size() != classrooms.size()) {
+        buildPreferenceIndex();
+    }
+}
+
+bool Problem::loadDelta(const std::string& path, InstanceDelta& delta) const {
+    std::string content = readFileToString(path);
+    if (content.empty()) {
+        std::cerr << "Erro ao abrir ou ler o arquivo: " << path << std::endl;
+        return false;
+    }
+    json j;
+    try {
+        j = json::parse(content);
+    } catch (const std::exception& e) {
+        std::cerr << "Erro ao parsear JSON: " << e.what() << std::endl;
+        return false;
+    }
+
+    delta = InstanceDelta{};
+    auto meetingIndex = [&](const json& item, int& out) {
+        out = item.is_number_integer() ? item.get<int>() : get_int_or(item, "index", -1);
+        if (out < 0 || out >= static_cast<int>(meetings.size())) {
+            std::cerr << "Erro: encontro " << item.dump() << " nao existe na instancia (" << meetings.size()
+                      << " encontros)" << std::endl;
+            return false;
+        }
+        return true;
+    };
+    auto section = [&](const char* name, const char* op) -> const json* {
+        if (!j.contains(name) || !j.at(name).is_object()) return nullptr;
+        const json& s = j.at(name);
+        return s.contains(op) && s.at(op).is_array() ? &s.at(op) : nullptr;
+    };
+
+    if (const json* items = section("meetings", "add")) {
+        for (const auto& item : *items) {
+            Meeting m;
+            read_meeting_fields(item, m);
+            delta.addedMeetings.push_back(std::move(m));
+        }
+    }
+    if (const json* items = section("meetings", "modify")) {
+        for (const auto& item : *items) {
+            int mi;
+            if (!meetingIndex(item, mi)) return false;
+            Meeting m = meetings[mi];
+            read_meeting_fields(item, m);
+            delta.modifiedMeetings.emplace_back(mi, std::move(m));
+        }
+    }
+    if (const json* items = section("meetings", "remove")) {
+        for (const auto& item : *items) {
+            int mi;
+            if (!meetingIndex(item, mi)) return false;
+            delta.removedMeetings.push_back(mi);
+        }
+    }
+    if (const json* items = section("reservations", "add")) {
+        for (const auto& item : *items) delta.addedReservations.push_back(parse_reservation(item));
+    }
+    if (const json* items = section("reservations", "remove")) {
+        for (const auto& item : *items) delta.removedReservations.push_back(parse_reservation(item));
+    }
+    return true;
+}
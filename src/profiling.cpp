@@ -0,0 +1,125 @@
+#include "include/profiling.hpp"
+#include <fstream>
+#include <mutex>
+#include <nlohmann/json.hpp>
+#include <sys/resource.h>
+
+namespace prof {
+
+thread_local unsigned long long allocCount = 0;
+thread_local unsigned long long allocBytes = 0;
+std::atomic<bool> countAllocs{false};
+
+namespace {
+
+bool isEnabled = false;
+std::mutex recordMutex;
+std::vector<PhaseStats> records;
+thread_local Scope* current = nullptr;
+
+void record(const char* name, long long ns, unsigned long long allocs, unsigned long long bytes) {
+    std::lock_guard<std::mutex> lock(recordMutex);
+    for (auto& r : records) {
+        if (r.name == name) {
+            ++r.calls;
+            r.ms += ns / 1e6;
+            r.allocs += allocs;
+            r.bytes += bytes;
+            return;
+        }
+    }
+    records.push_back({name, 1, ns / 1e6, allocs, bytes});
+}
+
+} // namespace
+
+void enable(bool on) {
+    isEnabled = on;
+    countAllocs.store(on, std::memory_order_relaxed);
+}
+bool enabled() { return isEnabled; }
+
+std::vector<PhaseStats> phases() {
+    std::lock_guard<std::mutex> lock(recordMutex);
+    return records;
+}
+
+void reset() {
+    std::lock_guard<std::mutex> lock(recordMutex);
+    records.clear();
+}
+
+long peakRssKb() {
+#ifdef __APPLE__
+    struct rusage ru;
+    if (getrusage(RUSAGE_SELF, &ru) == 0) return ru.ru_maxrss / 1024;  // bytes no macOS
+    return -1;
+#else
+    // VmHWM é do espaço de endereçamento atual (zera no exec), ao contrário de
+    // ru_maxrss, que herda o pico do processo que nos lançou
+    std::ifstream status("/proc/self/status");
+    std::string key;
+    while (status >> key) {
+        if (key == "VmHWM:") {
+            long kb = -1;
+            status >> kb;
+            return kb;
+        }
+        status.ignore(4096, '\n');
+    }
+    struct rusage ru;
+    if (getrusage(RUSAGE_SELF, &ru) == 0) return ru.ru_maxrss;
+    return -1;
+#endif
+}
+
+void writeCsv(std::ostream& out) {
+    out << "\nPerfil de Execucao\n";
+    out << "Fase,Chamadas,Tempo(ms),Alocacoes,Bytes\n";
+    for (const auto& p : phases()) {
+        out << p.name << "," << p.calls << "," << p.ms << "," << p.allocs << "," << p.bytes << "\n";
+    }
+    out << "PicoRSS(kB)," << peakRssKb() << "\n";
+}
+
+void writeJsonl(std::ostream& out) {
+    nlohmann::ordered_json cols = {{"phase", nlohmann::ordered_json::array()},
+                                   {"calls", nlohmann::ordered_json::array()},
+                                   {"ms", nlohmann::ordered_json::array()},
+                                   {"allocs", nlohmann::ordered_json::array()},
+                                   {"bytes", nlohmann::ordered_json::array()}};
+    for (const auto& p : phases()) {
+        cols["phase"].push_back(p.name);
+        cols["calls"].push_back(p.calls);
+        cols["ms"].push_back(p.ms);
+        cols["allocs"].push_back(p.allocs);
+        cols["bytes"].push_back(p.bytes);
+    }
+    nlohmann::ordered_json rec = {{"section", "profile"}, {"peak_rss_kb", peakRssKb()}, {"columns", cols}};
+    out << rec.dump() << "\n";
+}
+
+Scope::Scope(const char* name) : name(name), active(isEnabled) {
+    if (!active) return;
+    parent = current;
+    current = this;
+    allocs0 = allocCount;
+    bytes0 = allocBytes;
+    start = clock::now();
+}
+
+Scope::~Scope() {
+    if (!active) return;
+    long long ns = std::chrono::duration_cast<std::chrono::nanoseconds>(clock::now() - start).count();
+    unsigned long long allocs = allocCount - allocs0;
+    unsigned long long bytes = allocBytes - bytes0;
+    record(name, ns - childNs, allocs - childAllocs, bytes - childBytes);
+    current = parent;
+    if (parent) {
+        parent->childNs += ns;
+        parent->childAllocs += allocs;
+        parent->childBytes += bytes;
+    }
+}
+
+} // namespace prof
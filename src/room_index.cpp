@@ -0,0 +1,24 @@
+#include "include/room_index.hpp"
+#include <algorithm>
+
+RoomIndex::RoomIndex(const Problem& p) {
+    std::vector<int> order(p.classrooms.size());
+    for (size_t i = 0; i < order.size(); ++i) order[i] = static_cast<int>(i);
+    std::stable_sort(order.begin(), order.end(), [&](int a, int b) {
+        return p.classrooms[a].capacity < p.classrooms[b].capacity;
+    });
+    for (int ci : order) {
+        const Classroom& c = p.classrooms[ci];
+        all.pos.push_back(ci);
+        all.cap.push_back(c.capacity);
+        if (c.isLab) {
+            labs.pos.push_back(ci);
+            labs.cap.push_back(c.capacity);
+        }
+    }
+}
+
+size_t RoomIndex::firstFitting(bool practical, int demand) const {
+    const std::vector<int>& cap = capacities(practical);
+    return std::lower_bound(cap.begin(), cap.end(), demand) - cap.begin();
+}
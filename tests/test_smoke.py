@@ -0,0 +1,123 @@
+"""
+Teste de fumaça do binário: roda a gulosa, a parcialmente gulosa com seed
+fixa e os modos de MODES numa instância de data/generated_instances/ e confere
+a alocação gravada com scripts/evaluate_assignment.py --compare (nenhuma
+restrição rígida violada e estatísticas iguais às recalculadas).
+
+Usa o binário em $APP; sem ele, compila as fontes atuais com `make CHOICE=1`
+num diretório temporário (o bin/app do repositório pode ser de outra
+plataforma) e pula o teste se a compilação falhar (ex.: sem nlohmann/json).
+
+Usage:
+  python3 -m pytest -q tests
+  APP=/caminho/do/app python3 -m pytest -q tests
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+INSTANCE = 'instance1.json'
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    if os.environ.get('APP'):
+        return Path(os.environ['APP']).resolve()
+    path = tmp_path_factory.mktemp('bin') / 'app'
+    build = subprocess.run(['make', 'CHOICE=1', f'TARGET={path}', str(path)], cwd=ROOT,
+                           capture_output=True, text=True)
+    if build.returncode != 0 or not path.exists():
+        pytest.skip(f'binario nao compilou:\n{build.stderr[-2000:]}')
+    return path
+
+
+def run_app(app, workdir, *args):
+    # o binário lê data/generated_instances/ e grava greedy_stats.csv no diretório atual
+    if not (workdir / 'data').exists():
+        (workdir / 'data').symlink_to(ROOT / 'data')
+    run = subprocess.run([str(app), *args], cwd=workdir, capture_output=True, text=True, timeout=300)
+    assert run.returncode == 0, run.stderr
+    return run
+
+
+def run_and_evaluate(app, workdir, *args):
+    run_app(app, workdir, INSTANCE, *args, '--save-assignment=alocacao.asg')
+    assert (workdir / 'greedy_stats.csv').exists() and (workdir / 'alocacao.asg').exists()
+    return subprocess.run([sys.executable, str(ROOT / 'scripts' / 'evaluate_assignment.py'), INSTANCE,
+                           str(workdir / 'alocacao.asg'), '--compare', str(workdir / 'greedy_stats.csv')],
+                          capture_output=True, text=True, timeout=300)
+
+
+def test_greedy_matches_evaluator(app, tmp_path):
+    ev = run_and_evaluate(app, tmp_path, '--heuristic=greedy')
+    assert ev.returncode == 0, ev.stdout + ev.stderr
+    assert 'sem divergencias' in ev.stdout
+
+
+def test_partial_matches_evaluator(app, tmp_path):
+    ev = run_and_evaluate(app, tmp_path, '--heuristic=partial:0.5:12345')
+    assert ev.returncode == 0, ev.stdout + ev.stderr
+    assert 'sem divergencias' in ev.stdout
+
+
+# modos além da construção simples: a alocação gravada tem de bater com as estatísticas
+MODES = {
+    'local-search': ['--heuristic=partial:0.5:12345', '--local-search', '--ls-iters=2000'],
+    'nsga2': ['--heuristic=partial:0.5:12345', '--nsga2-gens=5', '--nsga2-pop=20'],
+    'mola': ['--heuristic=partial:0.5:12345', '--mola-iters=300'],
+    'exact': ['--exact'],
+    'by-day': ['--heuristic=partial:0.5:12345', '--by-day'],
+}
+
+
+@pytest.mark.parametrize('args', MODES.values(), ids=MODES.keys())
+def test_mode_matches_evaluator(app, tmp_path, args):
+    ev = run_and_evaluate(app, tmp_path, *args)
+    assert ev.returncode == 0, ev.stdout + ev.stderr
+    assert 'sem divergencias' in ev.stdout
+
+
+def test_warm_start_with_empty_delta_keeps_assignment(app, tmp_path):
+    run_app(app, tmp_path, INSTANCE, '--save-assignment=alocacao.asg')
+    (tmp_path / 'delta.json').write_text('{}')
+    run_app(app, tmp_path, INSTANCE, '--warm-start=alocacao.asg', '--delta=delta.json',
+            '--save-assignment=alocacao2.asg')
+    assert (tmp_path / 'alocacao2.asg').read_bytes() == (tmp_path / 'alocacao.asg').read_bytes()
+
+
+def test_exact_proves_optimum(app, tmp_path):
+    # instance1 é pequena: o limite inferior fecha e o gap vai a zero
+    run = run_app(app, tmp_path, INSTANCE, '--exact')
+    assert 'otimo comprovado' in run.stdout
+
+
+def _without_timing(path):
+    return [line for line in path.read_text().splitlines() if not line.startswith('ExecutionTimeMs')]
+
+
+def test_batch_matches_standalone(app, tmp_path):
+    (tmp_path / 'runs.csv').write_text('instance,heuristic,alpha,seed,output\n'
+                                       f'{INSTANCE},partial,0.5,12345,lote.csv\n')
+    run_app(app, tmp_path, '--batch=runs.csv')
+    run_app(app, tmp_path, INSTANCE, '--heuristic=partial:0.5:12345')
+    assert _without_timing(tmp_path / 'lote.csv') == _without_timing(tmp_path / 'greedy_stats.csv')
+
+
+def test_cache_load_matches_json_load(app, tmp_path):
+    # dados próprios: o cache de data/generated_instances/.cache não entra no teste
+    instances = tmp_path / 'data' / 'generated_instances'
+    instances.mkdir(parents=True)
+    shutil.copyfile(ROOT / 'data' / 'generated_instances' / INSTANCE, instances / INSTANCE)
+    run_app(app, tmp_path, INSTANCE, '--profile', '--save-assignment=json.asg')
+    assert 'json_parse' in (tmp_path / 'greedy_stats.csv').read_text()
+
+    subprocess.run([sys.executable, str(ROOT / 'scripts' / 'instance_cache.py'), str(instances / INSTANCE)],
+                   check=True, capture_output=True, timeout=300)
+    run_app(app, tmp_path, INSTANCE, '--profile', '--save-assignment=cache.asg')
+    assert 'json_parse' not in (tmp_path / 'greedy_stats.csv').read_text()
+    assert (tmp_path / 'cache.asg').read_bytes() == (tmp_path / 'json.asg').read_bytes()
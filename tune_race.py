@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Ajuste automático de parâmetros por corrida (F-race, como no irace).
+
+Parâmetros ajustados da heurística parcialmente gulosa:
+  alpha          tamanho da RCL
+  pref_penalty   peso de cada preferência violada no score da RCL (--pref-penalty)
+  iterations     construções do multi-start (1 = uma construção, sem --multistart)
+
+Cada configuração é uma combinação dos valores de --alphas, --penalties e
+--iterations (ou uma amostra de --configs delas). A corrida avança por blocos
+(instância, seed): em cada bloco todas as configurações vivas rodam com a mesma
+seed, e o custo é o objetivo do multi-start (--objective, padrão weighted:
+alunos desalocados + desperdício total + 15 x preferências violadas), mais
+--time-weight por segundo de execução. Sem peso de tempo, mais iterações nunca
+pioram o custo.
+
+A partir de --first-test blocos, um teste de Friedman sobre os postos dentro de
+cada bloco decide se há diferença entre as configurações. Se houver, o teste
+post-hoc de Conover elimina as que ficaram significativamente piores que a de
+menor soma de postos. A corrida para quando acaba o orçamento (--budget
+execuções), os blocos, ou restam --min-survivors configurações.
+
+Saídas:
+  data/results/tuning_race.csv       todas as execuções (bloco, instância, seed, configuração, custo, tempo)
+  data/results/tuning_survivors.csv  configurações sobreviventes, por posto médio
+
+Usage:
+  python3 tune_race.py --workers 4
+  python3 tune_race.py --alphas 0.1,0.3,0.5 --penalties 0,15,50 --iterations 1,20 --time-weight 2000
+"""
+import argparse
+import csv
+import itertools
+import math
+import random
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+from stats_reader import read_stats  # noqa: E402
+from run_and_aggregate import BIN, CSV_DIR, INST_DIR, make_scratch_dir, run_measured  # noqa: E402
+
+RACE_CSV = CSV_DIR / 'tuning_race.csv'
+SURVIVORS_CSV = CSV_DIR / 'tuning_survivors.csv'
+OBJECTIVES = ('unallocated', 'waste', 'standing', 'weighted')
+
+
+# ============================================================================
+# Distribuições (sem scipy): gama e beta incompletas regularizadas
+# ============================================================================
+
+def _gamma_series(a, x):
+    term = total = 1.0 / a
+    n = a
+    for _ in range(500):
+        n += 1.0
+        term *= x / n
+        total += term
+        if abs(term) < abs(total) * 1e-15:
+            break
+    return total * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def _gamma_cf(a, x):
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 500):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        h *= d * c
+        if abs(d * c - 1.0) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+
+def chi2_sf(x, df):
+    """P(X > x) para X ~ qui-quadrado com df graus de liberdade."""
+    if x <= 0:
+        return 1.0
+    a, half = df / 2.0, x / 2.0
+    if half < a + 1.0:
+        return 1.0 - _gamma_series(a, half)
+    return _gamma_cf(a, half)
+
+
+def _beta_cf(a, b, x):
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = tiny if abs(d) < tiny else d
+    d = 1.0 / d
+    h = d
+    for m in range(1, 500):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = tiny if abs(d) < tiny else d
+        c = 1.0 + aa / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = tiny if abs(d) < tiny else d
+        c = 1.0 + aa / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        h *= d * c
+        if abs(d * c - 1.0) < 1e-15:
+            break
+    return h
+
+
+def beta_inc(a, b, x):
+    """Beta incompleta regularizada I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _beta_cf(a, b, x) / a
+    return 1.0 - front * _beta_cf(b, a, 1.0 - x) / b
+
+
+def t_cdf(t, df):
+    tail = 0.5 * beta_inc(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t > 0 else tail
+
+
+def t_ppf(q, df):
+    """Quantil q da t de Student (bisseção sobre t_cdf)."""
+    lo, hi = -1e3, 1e3
+    for _ in range(200):
+        mid = (lo + hi) / 2.0
+        if t_cdf(mid, df) < q:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+# ============================================================================
+# Teste de Friedman + post-hoc de Conover (o mesmo do irace)
+# ============================================================================
+
+def block_ranks(costs):
+    """Postos (1 = menor custo) de uma linha, com empates pela média."""
+    order = sorted(range(len(costs)), key=lambda j: costs[j])
+    ranks = [0.0] * len(costs)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and costs[order[j + 1]] == costs[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2.0 + 1.0
+        i = j + 1
+    return ranks
+
+
+def friedman_race_step(matrix, confidence):
+    """Índices (colunas de matrix) que sobrevivem e o p-valor do Friedman.
+
+    matrix: uma linha de custos por bloco, uma coluna por configuração viva.
+    """
+    b, k = len(matrix), len(matrix[0])
+    ranks = [block_ranks(row) for row in matrix]
+    rank_sums = [sum(r[j] for r in ranks) for j in range(k)]
+    a1 = sum(x * x for r in ranks for x in r)
+    c1 = b * k * (k + 1) ** 2 / 4.0
+    if a1 - c1 <= 1e-12:
+        return list(range(k)), 1.0  # todos empatados em todos os blocos
+    t1 = (k - 1) * sum((r - b * (k + 1) / 2.0) ** 2 for r in rank_sums) / (a1 - c1)
+    p_value = chi2_sf(t1, k - 1)
+    if p_value >= 1.0 - confidence:
+        return list(range(k)), p_value
+
+    dof = (b - 1) * (k - 1)
+    critical = t_ppf(1.0 - (1.0 - confidence) / 2.0, dof) * math.sqrt(
+        max(0.0, 2.0 * b * (a1 - c1) / dof * (1.0 - t1 / (b * (k - 1)))))
+    best = min(rank_sums)
+    return [j for j in range(k) if rank_sums[j] - best <= critical], p_value
+
+
+# ============================================================================
+# Execução de uma configuração em um bloco
+# ============================================================================
+
+def objective_value(stats, objective):
+    """Mesmo objetivo do multi-start (multiStartObjectiveValue), a partir das estatísticas."""
+    m = stats.metrics
+    if objective == 'unallocated':
+        return float(m['Alunos Desalocados'])
+    if objective == 'waste':
+        return float(m['Desperdicio Medio'])
+    if objective == 'standing':
+        return float(m['Alunos em Pe'])
+    pref_total, pref_satisfied = stats.preference_totals()
+    waste_total = float(m['Desperdicio Medio']) * float(m['Encontros Alocados'])
+    return float(m['Alunos Desalocados']) + waste_total + 15.0 * (pref_total - pref_satisfied)
+
+
+def run_config(inst_name, seed, config, objective, threads):
+    """Executa o binário para uma configuração; devolve (custo sem tempo, tempo em s) ou None."""
+    alpha, penalty, iterations = config
+    cmd = [str(BIN), inst_name, '--format=jsonl', f'--heuristic=partial:{alpha}:{seed}',
+           f'--pref-penalty={penalty}']
+    if iterations > 1:
+        cmd += [f'--multistart={iterations}', f'--threads={threads}', f'--objective={objective}']
+    scratch = make_scratch_dir(Path(inst_name).stem)
+    try:
+        returncode, usage = run_measured(cmd, scratch, scratch / 'app.log')
+        stats_path = scratch / 'greedy_stats.jsonl'
+        if returncode != 0 or not stats_path.exists():
+            print(f'Erro: {" ".join(cmd)} terminou com código {returncode}', flush=True)
+            return None
+        return objective_value(read_stats(stats_path), objective), usage['wall_s']
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _run_config_star(args):
+    return run_config(*args)
+
+
+def parse_list(text, cast):
+    return [cast(v) for v in text.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alphas', default='0.1,0.2,0.3,0.4,0.5,0.6,0.7,0.8,0.9')
+    parser.add_argument('--penalties', default='0,5,10,15,25,50')
+    parser.add_argument('--iterations', default='1,10,50', help='construções do multi-start (1 = sem multi-start)')
+    parser.add_argument('--configs', type=int, default=0,
+                        help='amostra aleatória de N configurações da grade (padrão: a grade inteira)')
+    parser.add_argument('--instances', nargs='*', default=None,
+                        help='instâncias em data/generated_instances/ (padrão: todas)')
+    parser.add_argument('--seeds-per-instance', type=int, default=5)
+    parser.add_argument('--budget', type=int, default=2000, help='máximo de execuções do binário')
+    parser.add_argument('--first-test', type=int, default=5, help='blocos antes do primeiro teste')
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--min-survivors', type=int, default=1)
+    parser.add_argument('--objective', choices=OBJECTIVES, default='weighted')
+    parser.add_argument('--time-weight', type=float, default=0.0, help='custo somado por segundo de execução')
+    parser.add_argument('--threads', type=int, default=1, help='threads de cada multi-start')
+    parser.add_argument('--workers', '-j', type=int, default=1, help='execuções simultâneas')
+    parser.add_argument('--seed', type=int, default=1, help='seed da corrida (amostra, ordem dos blocos, seeds)')
+    args = parser.parse_args()
+
+    if not BIN.exists():
+        print('Erro: binário ./bin/app não encontrado. Compile o projeto primeiro (make).')
+        sys.exit(1)
+    if args.instances:
+        instances = [INST_DIR / (n if n.endswith('.json') else f'{n}.json') for n in args.instances]
+    else:
+        instances = sorted(INST_DIR.glob('*.json'))
+    missing = [str(p) for p in instances if not p.exists()]
+    if missing or not instances:
+        print(f'Instâncias não encontradas: {", ".join(missing) or INST_DIR}')
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    configs = list(itertools.product(parse_list(args.alphas, float), parse_list(args.penalties, int),
+                                     parse_list(args.iterations, int)))
+    if 0 < args.configs < len(configs):
+        configs = sorted(rng.sample(configs, args.configs))
+
+    # blocos intercalam as instâncias, para os primeiros testes já verem todas
+    blocks = []
+    for _ in range(args.seeds_per_instance):
+        order = list(instances)
+        rng.shuffle(order)
+        blocks += [(inst.name, rng.randrange(1, 2 ** 31)) for inst in order]
+
+    print(f'Corrida: {len(configs)} configurações, {len(blocks)} blocos, orçamento {args.budget} execuções')
+    alive = list(range(len(configs)))
+    costs = []       # por bloco: {configuração: custo}
+    evaluations = []
+    used = 0
+    CSV_DIR.mkdir(exist_ok=True)
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for b, (inst_name, seed) in enumerate(blocks):
+            if used + len(alive) > args.budget or len(alive) <= args.min_survivors:
+                break
+            jobs = [(inst_name, seed, configs[c], args.objective, args.threads) for c in alive]
+            results = list(pool.map(_run_config_star, jobs)) if pool else [run_config(*j) for j in jobs]
+            used += len(jobs)
+
+            row = {}
+            for c, res in zip(alive, results):
+                if res is None:
+                    continue
+                cost, wall = res
+                row[c] = cost + args.time_weight * wall
+                evaluations.append({'block': b, 'instance': inst_name, 'seed': seed, 'alpha': configs[c][0],
+                                    'pref_penalty': configs[c][1], 'iterations': configs[c][2],
+                                    'cost': cost, 'runtime_s': f'{wall:.4f}', 'race_cost': row[c]})
+            # configuração que falhou sai da corrida
+            alive = [c for c in alive if c in row]
+            costs.append(row)
+
+            msg = f'Bloco {b + 1}/{len(blocks)} ({inst_name}, seed {seed}): {len(alive)} vivas'
+            if len(costs) >= args.first_test and len(alive) > 1:
+                matrix = [[r[c] for c in alive] for r in costs]
+                keep, p_value = friedman_race_step(matrix, args.confidence)
+                before = len(alive)
+                alive = [alive[j] for j in keep]
+                msg += f', Friedman p={p_value:.3g}'
+                if len(alive) < before:
+                    msg += f', eliminadas {before - len(alive)} -> {len(alive)}'
+            print(msg, flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # postos médios das sobreviventes sobre todos os blocos
+    survivors = []
+    if costs:
+        matrix = [[r[c] for c in alive] for r in costs]
+        ranks = [block_ranks(row) for row in matrix]
+        for j, c in enumerate(alive):
+            survivors.append({'alpha': configs[c][0], 'pref_penalty': configs[c][1], 'iterations': configs[c][2],
+                              'mean_rank': sum(r[j] for r in ranks) / len(ranks),
+                              'mean_cost': sum(row[j] for row in matrix) / len(matrix), 'blocks': len(matrix)})
+        survivors.sort(key=lambda s: (s['mean_rank'], s['mean_cost']))
+
+    with open(RACE_CSV, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['block', 'instance', 'seed', 'alpha', 'pref_penalty', 'iterations',
+                                               'cost', 'runtime_s', 'race_cost'])
+        writer.writeheader()
+        writer.writerows(evaluations)
+    with open(SURVIVORS_CSV, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['alpha', 'pref_penalty', 'iterations', 'mean_rank', 'mean_cost',
+                                               'blocks'])
+        writer.writeheader()
+        for s in survivors:
+            writer.writerow(dict(s, mean_rank=f"{s['mean_rank']:.3f}", mean_cost=f"{s['mean_cost']:.2f}"))
+
+    print(f'\n✔️ Corrida concluída: {used} execuções, {len(costs)} blocos, {len(survivors)} sobreviventes')
+    print(f"{'alpha':>6} {'pen':>5} {'it':>5} {'posto':>7} {'custo medio':>12}")
+    for s in survivors[:20]:
+        print(f"{s['alpha']:>6} {s['pref_penalty']:>5} {s['iterations']:>5} {s['mean_rank']:>7.2f} "
+              f"{s['mean_cost']:>12.2f}")
+    if survivors:
+        best = survivors[0]
+        extra = f" --multistart={best['iterations']}" if best['iterations'] > 1 else ''
+        print(f"\nMelhor: ./bin/app --heuristic=partial:{best['alpha']}:<seed> "
+              f"--pref-penalty={best['pref_penalty']}{extra}")
+    print(f'Arquivos: {RACE_CSV.relative_to(ROOT)} e {SURVIVORS_CSV.relative_to(ROOT)}')
+
+
+if __name__ == '__main__':
+    main()